@@ -0,0 +1,45 @@
+"""Backfill the CustomerProductIndex from existing reviews and verified purchases.
+
+SubmitReview answers "already reviewed?" and "verified purchase?" from the
+index alone, so reviews and deliveries recorded before the index existed
+must be indexed before that release takes traffic. The backfill is safe to
+re-run: it sets each active review and first delivered order again, and
+clears entries whose review has been removed.
+
+Rollout (see docs/reviews/README.md):
+    1. make setup-db                      # creates customer_product_index
+    2. python scripts/backfill_customer_product_index.py   # previous release still live
+    3. Deploy the release that reads the index
+    4. python scripts/backfill_customer_product_index.py   # catch up on steps 2-3
+
+Usage:
+    python scripts/backfill_customer_product_index.py
+    python scripts/backfill_customer_product_index.py --batch-size 1000
+"""
+
+import argparse
+import sys
+import time
+
+# Add src/ to path so we can import domain modules
+sys.path.insert(0, "src")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the review submission index")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows read per batch (default: 500)")
+    args = parser.parse_args()
+
+    from reviews.domain import reviews
+    from reviews.projections.customer_product_index import backfill_customer_product_index
+
+    reviews.init()
+
+    start = time.monotonic()
+    with reviews.domain_context():
+        written = backfill_customer_product_index(batch_size=args.batch_size)
+    print(f"  Wrote {written:,} index entries in {time.monotonic() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark: carrier tracking polling — per-shipment vs bulk lookups, fixed vs adaptive intervals.
+
+Two measurements against the local FakeBulkCarrier, no infrastructure needed:
+
+1. One polling round over N in-transit shipments, looked up one request per
+   shipment and then through get_tracking_many, with a fixed per-request
+   carrier latency. Reports wall time and carrier requests.
+2. A simulated multi-day window over the same shipments, with estimated
+   deliveries spread over the window, counting carrier lookups when every
+   shipment is polled at the fast interval versus the poller's adaptive
+   intervals (fast near estimated delivery, slow otherwise).
+
+Usage:
+    python scripts/carrier_tracking_poll_benchmark.py
+    python scripts/carrier_tracking_poll_benchmark.py --shipments 5000 --latency 0.02 --max-batch 100 --days 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+# Add src/ to path so we can import domain modules
+sys.path.insert(0, "src")
+
+
+def polling_round(args, numbers: list[str]) -> list[tuple[str, float, int]]:
+    from fulfillment.carrier.fake_bulk_carrier import FakeBulkCarrier
+
+    rows = []
+    carrier = FakeBulkCarrier(latency=args.latency, max_batch=args.max_batch)
+    start = time.perf_counter()
+    for number in numbers:
+        carrier.get_tracking(number)
+    rows.append(("Per-shipment get_tracking", time.perf_counter() - start, carrier.requests))
+
+    carrier = FakeBulkCarrier(latency=args.latency, max_batch=args.max_batch)
+    start = time.perf_counter()
+    for offset in range(0, len(numbers), args.batch_size):
+        carrier.get_tracking_many(numbers[offset : offset + args.batch_size])
+    rows.append(("Bulk get_tracking_many", time.perf_counter() - start, carrier.requests))
+    return rows
+
+
+def simulated_lookups(args, adaptive: bool) -> int:
+    from fulfillment.fulfillment.tracking_poller import TrackingPollerSettings, poll_interval
+
+    settings = TrackingPollerSettings(
+        fast_interval=args.fast_interval,
+        slow_interval=args.slow_interval,
+        fast_window=args.fast_window,
+    )
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    end = start + timedelta(days=args.days)
+    rng = random.Random(args.seed)
+
+    lookups = 0
+    for _ in range(args.shipments):
+        estimated_delivery = start + timedelta(seconds=rng.uniform(0, (end - start).total_seconds()))
+        now = start
+        while now < min(end, estimated_delivery):  # delivered at its estimate, then no longer polled
+            lookups += 1
+            interval = poll_interval(settings, now, estimated_delivery) if adaptive else settings.fast_interval
+            now += timedelta(seconds=interval)
+    return lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark carrier tracking polling")
+    parser.add_argument("--shipments", type=int, default=1_000, help="In-transit shipments (default: 1000)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Carrier latency per request (default: 0.005)")
+    parser.add_argument("--max-batch", type=int, default=100, help="Numbers per carrier bulk request (default: 100)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Numbers per get_tracking_many (default: 100)")
+    parser.add_argument("--days", type=int, default=5, help="Simulated window in days (default: 5)")
+    parser.add_argument("--fast-interval", type=float, default=900, help="Fast poll interval, s (default: 900)")
+    parser.add_argument("--slow-interval", type=float, default=14400, help="Slow poll interval, s (default: 14400)")
+    parser.add_argument("--fast-window", type=float, default=86400, help="Fast window before ETA, s (default: 86400)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    numbers = [f"BENCH-{n:06d}" for n in range(args.shipments)]
+    rows = polling_round(args, numbers)
+    fixed = simulated_lookups(args, adaptive=False)
+    adaptive = simulated_lookups(args, adaptive=True)
+
+    print(f"\n{'=' * 60}")
+    print("  ShopStream Carrier Tracking Poll Benchmark")
+    print(f"{'=' * 60}")
+    print(f"  Shipments:                {args.shipments:,}")
+    print(f"  Carrier latency:          {args.latency * 1000:.0f} ms per request")
+    print(f"  Carrier bulk limit:       {args.max_batch} numbers per request\n")
+    print("  One polling round:")
+    for label, elapsed, requests in rows:
+        print(f"    {label:<28} {elapsed:>7.2f} s  {requests:>7,} requests")
+    print(f"\n  Lookups over {args.days} days:")
+    print(f"    {'Fixed fast interval':<28} {fixed:>17,}")
+    print(f"    {'Adaptive intervals':<28} {adaptive:>17,}  ({fixed / max(adaptive, 1):.1f}x fewer)")
+    print(f"{'=' * 60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Migrate review votes and reports written before the ReviewVote/ReviewReport stores.
+
+Before the move, each helpful vote was a HelpfulVote child row of its
+review (the ``helpful_vote`` table) and each report an element of the
+review's ``reported_reasons`` JSON column. This copies both into the
+``review_vote`` and ``review_report`` tables that review_feedback.py reads.
+The review's counters already hold the totals and are left alone.
+
+The copy is idempotent: votes keep their ``<review_id>:<customer_id>`` key
+and legacy reports get ``<review_id>:legacy:<n>``, and rows that already
+exist are skipped — so it is safe to re-run.
+
+Rollout:
+    1. Deploy the code with the new stores (``make setup-db`` creates the
+       review_vote and review_report tables).
+    2. Run this script. Until it has run, customers who voted before the
+       deploy can vote on the same review again.
+    3. Once the counts check out, re-run with ``--drop-legacy`` to drop the
+       helpful_vote table and the reported_reasons column.
+
+Usage:
+    python scripts/migrate_review_feedback.py
+    python scripts/migrate_review_feedback.py --drop-legacy
+"""
+
+import argparse
+import sys
+
+# Add src/ to path so we can import domain modules
+sys.path.insert(0, "src")
+
+COPY_VOTES = """
+INSERT INTO review_vote (vote_id, review_id, customer_id, vote_type, voted_at)
+SELECT review_id || ':' || customer_id, review_id, customer_id, vote_type, voted_at
+FROM helpful_vote
+ON CONFLICT (vote_id) DO NOTHING
+"""
+
+COPY_REPORTS = """
+INSERT INTO review_report (report_id, review_id, customer_id, reason, detail, reported_at)
+SELECT review.id || ':legacy:' || report.n,
+       review.id,
+       report.value ->> 'customer_id',
+       report.value ->> 'reason',
+       report.value ->> 'detail',
+       (report.value ->> 'reported_at')::timestamptz
+FROM review,
+     jsonb_array_elements(review.reported_reasons::jsonb) WITH ORDINALITY AS report(value, n)
+WHERE review.reported_reasons IS NOT NULL
+ON CONFLICT (report_id) DO NOTHING
+"""
+
+DROP_LEGACY = [
+    "DROP TABLE IF EXISTS helpful_vote",
+    "ALTER TABLE review DROP COLUMN IF EXISTS reported_reasons",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy legacy review votes and reports into their own stores")
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="Drop the helpful_vote table and the reported_reasons column after copying",
+    )
+    args = parser.parse_args()
+
+    from protean import UnitOfWork
+
+    from reviews.domain import reviews
+
+    reviews.init()
+
+    with reviews.domain_context():
+        provider = reviews.providers["default"]
+        with UnitOfWork():
+            votes = provider.raw(COPY_VOTES).rowcount
+            reports = provider.raw(COPY_REPORTS).rowcount
+        print(f"  Copied {votes:,} votes and {reports:,} reports")
+
+        if args.drop_legacy:
+            with UnitOfWork():
+                for statement in DROP_LEGACY:
+                    provider.raw(statement)
+            print("  Dropped helpful_vote and review.reported_reasons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: async payment gateway client against the fake HTTP gateway.
+
+Fires N charges (default 1,000) concurrently at an in-process fake gateway
+that answers after a fixed latency, with a share of them retried while the
+original is still in flight (same idempotency key). Reports wall time,
+charges/sec, gateway requests actually made and how many retries were
+deduplicated in flight. No infrastructure needed.
+
+Usage:
+    python scripts/payment_gateway_benchmark.py
+    python scripts/payment_gateway_benchmark.py --charges 5000 --latency 0.2 --concurrency 50 --retry-rate 0.3
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+# Add src/ to path so we can import domain modules
+sys.path.insert(0, "src")
+
+
+async def run(args) -> None:
+    import httpx
+
+    from payments.gateway.fake_http_gateway import FakeGatewayApp
+    from payments.gateway.http_adapter import HTTPGateway
+
+    app = FakeGatewayApp(latency=args.latency)
+    gateway = HTTPGateway(
+        base_url="http://fake-gateway",
+        transport=httpx.ASGITransport(app=app),
+        timeout=args.timeout,
+        max_concurrency=args.concurrency,
+        max_connections=args.concurrency,
+    )
+
+    keys = [f"bench-{n}" for n in range(args.charges)]
+    keys += [key for key in keys if random.random() < args.retry_rate]
+    random.shuffle(keys)
+
+    async def charge(key: str):
+        return await gateway.create_charge(
+            amount=59.99,
+            currency="USD",
+            payment_method_type="credit_card",
+            last4="4242",
+            idempotency_key=key,
+        )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(charge(key) for key in keys))
+    elapsed = time.perf_counter() - start
+    await gateway.aclose()
+
+    succeeded = sum(result.success for result in results)
+    timed_out = sum(result.gateway_status == "timeout" for result in results)
+
+    print(f"\n{'=' * 60}")
+    print("  ShopStream Payment Gateway Client Benchmark")
+    print(f"{'=' * 60}")
+    print(f"  Charges (incl. retries):  {len(keys):,}")
+    print(f"  Gateway latency:          {args.latency * 1000:.0f} ms")
+    print(f"  Max concurrency:          {args.concurrency}")
+    print(f"  Per-call timeout:         {args.timeout} s\n")
+    print(f"  Wall time:                {elapsed:.2f} s")
+    print(f"  Throughput:               {len(keys) / elapsed:,.0f} calls/sec")
+    print(f"  Gateway requests:         {len(app.requests):,}")
+    print(f"  Deduplicated in flight:   {gateway.deduplicated:,}")
+    print(f"  Succeeded / timed out:    {succeeded:,} / {timed_out:,}")
+    print(f"{'=' * 60}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the async payment gateway client")
+    parser.add_argument("--charges", type=int, default=1_000, help="Distinct charges (default: 1000)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Gateway latency in seconds (default: 0.05)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Max requests in flight (default: 20)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds (default: 30)")
+    parser.add_argument("--retry-rate", type=float, default=0.2, help="Share of charges retried (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Benchmark: OrderCheckoutSaga throughput on an inventory-heavy event mix.
+
+OrderCheckoutSaga subscribes to every inventory item and payment stream, so
+most of what it consumes is stock movement for SKUs with no checkout in
+flight. This script replays a realistic mix of such messages through the
+saga twice:
+
+    indexed   — OrderCheckoutSaga._handle: header-type filter + correlation
+                index, saga state loaded only for live checkouts
+    baseline  — Protean's default process manager dispatch: every message is
+                deserialized and its order's saga stream read from the event
+                store
+
+and reports events/sec for each. Runs entirely in memory (memory database,
+event store and broker) — no infrastructure needed. The memory adapters copy
+their whole store on every session, so absolute rates are far below a
+Postgres/MessageDB deployment; compare the two runs, not the raw numbers.
+
+Default mix (per 100 messages):
+    70  inventory events the saga never handles (received, adjusted, ...)
+    10  payment events the saga never handles (initiated, processing)
+    12  StockReserved / ReservationReleased for orders without a checkout
+     8  PaymentFailed (retryable) for orders with a live checkout
+
+Usage:
+    python scripts/saga_benchmark.py
+    python scripts/saga_benchmark.py --events 5000 --live-sagas 200
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+
+# Add src/ to path so we can import domain modules
+sys.path.insert(0, "src")
+
+MIX = [
+    (70, "Inventory", ["StockReceived", "StockAdjusted", "StockCommitted", "StockCheckRecorded", "LowStockDetected"]),
+    (10, "Payments", ["PaymentInitiated", "PaymentProcessing"]),
+    (12, "Inventory", ["StockReserved", "ReservationReleased"]),
+    (8, "Payments", ["PaymentFailed"]),
+]
+
+
+def _payload(event_name: str, order_id: str) -> dict:
+    now = datetime.now(UTC).isoformat()
+    item_id = f"inv-{random.randint(1, 5000)}"
+    payloads = {
+        "StockReceived": {
+            "inventory_item_id": item_id,
+            "quantity": 10,
+            "previous_on_hand": 40,
+            "new_on_hand": 50,
+            "new_available": 45,
+            "received_at": now,
+        },
+        "StockAdjusted": {
+            "inventory_item_id": item_id,
+            "product_id": "prod-1",
+            "adjustment_type": "Count",
+            "quantity_change": -1,
+            "reason": "cycle count",
+            "adjusted_by": "bench",
+            "previous_on_hand": 50,
+            "new_on_hand": 49,
+            "new_available": 44,
+            "adjusted_at": now,
+        },
+        "StockCommitted": {
+            "inventory_item_id": item_id,
+            "reservation_id": str(uuid.uuid4()),
+            "order_id": order_id,
+            "quantity": 1,
+            "previous_on_hand": 50,
+            "new_on_hand": 49,
+            "previous_reserved": 5,
+            "new_reserved": 4,
+            "committed_at": now,
+        },
+        "StockCheckRecorded": {
+            "inventory_item_id": item_id,
+            "counted_quantity": 49,
+            "expected_quantity": 50,
+            "discrepancy": -1,
+            "checked_by": "bench",
+            "checked_at": now,
+        },
+        "LowStockDetected": {
+            "inventory_item_id": item_id,
+            "product_id": "prod-1",
+            "variant_id": "var-1",
+            "sku": "SKU-1",
+            "current_available": 2,
+            "reorder_point": 5,
+            "detected_at": now,
+        },
+        "PaymentInitiated": {
+            "payment_id": str(uuid.uuid4()),
+            "order_id": order_id,
+            "customer_id": "cust-1",
+            "amount": 10.0,
+            "currency": "USD",
+            "payment_method_type": "card",
+            "gateway_name": "fake",
+            "idempotency_key": str(uuid.uuid4()),
+            "initiated_at": now,
+        },
+        "PaymentProcessing": {"payment_id": str(uuid.uuid4()), "order_id": order_id, "processing_at": now},
+        "StockReserved": {
+            "inventory_item_id": item_id,
+            "reservation_id": str(uuid.uuid4()),
+            "order_id": order_id,
+            "quantity": 1,
+            "previous_available": 10,
+            "new_available": 9,
+            "reserved_at": now,
+            "expires_at": now,
+        },
+        "ReservationReleased": {
+            "inventory_item_id": item_id,
+            "reservation_id": str(uuid.uuid4()),
+            "order_id": order_id,
+            "quantity": 1,
+            "reason": "expired",
+            "previous_available": 9,
+            "new_available": 10,
+            "released_at": now,
+        },
+        "PaymentFailed": {
+            "payment_id": str(uuid.uuid4()),
+            "order_id": order_id,
+            "customer_id": "cust-1",
+            "reason": "Declined",
+            "attempt_number": 1,
+            "can_retry": True,
+            "failed_at": now,
+        },
+    }
+    return payloads[event_name]
+
+
+def build_messages(count: int, live_orders: list[str]) -> list:
+    """Build broker messages following MIX, as the engine would receive them."""
+    from protean.utils.eventing import DomainMeta, Message, MessageHeaders, Metadata
+
+    weights = [weight for weight, _, _ in MIX]
+    messages = []
+    for _ in range(count):
+        _, context, names = random.choices(MIX, weights=weights)[0]
+        event_name = random.choice(names)
+        order_id = random.choice(live_orders) if event_name == "PaymentFailed" else f"ext-{uuid.uuid4()}"
+        category = "inventory::inventory_item" if context == "Inventory" else "payments::payment"
+
+        messages.append(
+            Message(
+                data=_payload(event_name, order_id),
+                metadata=Metadata(
+                    headers=MessageHeaders(
+                        id=str(uuid.uuid4()),
+                        type=f"{context}.{event_name}.v1",
+                        stream=f"{category}-{uuid.uuid4()}",
+                    ),
+                    domain=DomainMeta(kind="EVENT", stream_category=category),
+                ),
+            )
+        )
+    return messages
+
+
+def register_unhandled_events(domain) -> None:
+    """Register the event types the saga ignores, so the baseline can deserialize them."""
+    from shared.events import inventory, payments
+
+    for context, module, names in (
+        ("Inventory", inventory, MIX[0][2]),
+        ("Payments", payments, MIX[1][2]),
+    ):
+        for name in names:
+            type_string = f"{context}.{name}.v1"
+            if type_string not in domain._events_and_commands:
+                domain.register_external_event(getattr(module, name), type_string)
+
+
+def run(handle, messages: list) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        handle(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OrderCheckoutSaga on an inventory-heavy mix")
+    parser.add_argument("--events", type=int, default=2000, help="Messages per run (default: 2000)")
+    parser.add_argument("--live-sagas", type=int, default=100, help="Checkouts in flight (default: 100)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    import os
+
+    os.environ["PROTEAN_ENV"] = "memory"
+
+    from protean.core.process_manager import BaseProcessManager
+
+    from ordering.checkout.saga import OrderCheckoutSaga
+    from ordering.domain import ordering
+    from ordering.order.events import OrderConfirmed
+
+    random.seed(args.seed)
+    ordering.init()
+
+    with ordering.domain_context():
+        register_unhandled_events(ordering)
+
+        live_orders = [f"ord-{n}" for n in range(args.live_sagas)]
+        for order_id in live_orders:
+            OrderCheckoutSaga._handle(OrderConfirmed(order_id=order_id, confirmed_at=datetime.now(UTC)))
+
+        messages = build_messages(args.events, live_orders)
+        baseline = BaseProcessManager._handle.__func__
+
+        print(f"\n{'=' * 60}")
+        print("  ShopStream Saga Benchmark — OrderCheckoutSaga")
+        print(f"{'=' * 60}")
+        print(f"  Messages per run:  {args.events:,}")
+        print(f"  Live checkouts:    {args.live_sagas:,}")
+
+        indexed_rate = run(OrderCheckoutSaga._handle, messages)
+        baseline_rate = run(lambda message: baseline(OrderCheckoutSaga, message), messages)
+
+        print(f"\n  indexed:   {indexed_rate:>12,.0f} events/sec")
+        print(f"  baseline:  {baseline_rate:>12,.0f} events/sec")
+        print(f"  speedup:   {indexed_rate / baseline_rate:>12.1f}x")
+        print(f"{'=' * 60}\n")
+
+
+if __name__ == "__main__":
+    main()
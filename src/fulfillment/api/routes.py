@@ -1,20 +1,25 @@
 """FastAPI routes for the Fulfillment domain."""
 
-import json
 import os
 from datetime import datetime
 
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
 from protean.utils.globals import current_domain
+from pydantic import BaseModel as PydanticBaseModel
 
 from fulfillment.api.schemas import (
     AssignPickerRequest,
+    AssignPickWaveRequest,
     CancelFulfillmentRequest,
     CarrierConfigResponse,
     ConfigureCarrierRequest,
     CreateFulfillmentRequest,
     FulfillmentIdResponse,
     GenerateShippingLabelRequest,
+    PickStopResponse,
+    PickWaveAssignedResponse,
+    PickWaveResponse,
+    PickWavesResponse,
     RecordExceptionRequest,
     RecordHandoffRequest,
     RecordItemPickedRequest,
@@ -31,7 +36,13 @@ from fulfillment.fulfillment.delivery import RecordDeliveryConfirmation, RecordD
 from fulfillment.fulfillment.packing import GenerateShippingLabel, RecordPacking
 from fulfillment.fulfillment.picking import AssignPicker, CompletePickList, RecordItemPicked
 from fulfillment.fulfillment.shipping import RecordHandoff
-from fulfillment.fulfillment.tracking import UpdateTrackingEvent
+from fulfillment.fulfillment.tracking_inbox import (
+    accept_tracking_webhook,
+    drain_tracking_webhooks,
+    requeue_dead_tracking_webhooks,
+)
+from fulfillment.fulfillment.waves import AssignPickWave, plan_waves
+from shared.api.webhooks import parse_webhook, webhook_body_schema, webhook_text
 
 # ---------------------------------------------------------------------------
 # Fulfillment Router
@@ -56,7 +67,8 @@ async def create_fulfillment(body: CreateFulfillmentRequest) -> FulfillmentIdRes
         order_id=body.order_id,
         customer_id=body.customer_id,
         warehouse_id=body.warehouse_id,
-        items=[item.model_dump() for item in body.items],
+        service_level=body.service_level,
+        items=[item.model_dump(exclude_none=True) for item in body.items],
     )
     result = current_domain.process(command, asynchronous=False)
     return FulfillmentIdResponse(fulfillment_id=result)
@@ -73,6 +85,43 @@ async def assign_picker(fulfillment_id: str, body: AssignPickerRequest) -> Statu
     return StatusResponse(status="picker_assigned")
 
 
+@fulfillment_router.get("/waves", response_model=PickWavesResponse)
+async def get_pick_waves(warehouse_id: str | None = None, limit: int = 500) -> PickWavesResponse:
+    """Plan pick waves over pending fulfillments, most urgent first, each with its pick sequence."""
+    return PickWavesResponse(
+        waves=[
+            PickWaveResponse(
+                wave_id=wave.wave_id,
+                warehouse_id=wave.warehouse_id,
+                service_level=wave.service_level,
+                zones=wave.zones,
+                fulfillment_ids=wave.fulfillment_ids,
+                item_units=wave.item_units,
+                stops=[
+                    PickStopResponse(
+                        location=stop.location,
+                        zone=stop.zone,
+                        sku=stop.sku,
+                        quantity=stop.quantity,
+                        fulfillment_id=stop.fulfillment_id,
+                        item_id=stop.item_id,
+                    )
+                    for stop in wave.stops
+                ],
+            )
+            for wave in plan_waves(warehouse_id=warehouse_id, limit=limit)
+        ]
+    )
+
+
+@fulfillment_router.post("/waves/assign", response_model=PickWaveAssignedResponse)
+async def assign_pick_wave(body: AssignPickWaveRequest) -> PickWaveAssignedResponse:
+    """Assign one picker to every fulfillment of a pick wave; unknown ones and ones no longer pending are skipped."""
+    command = AssignPickWave(picker_name=body.picker_name, fulfillment_ids=body.fulfillment_ids)
+    result = current_domain.process(command, asynchronous=False)
+    return PickWaveAssignedResponse(**result)
+
+
 @fulfillment_router.put("/{fulfillment_id}/items/{item_id}/pick", response_model=StatusResponse)
 async def record_item_picked(fulfillment_id: str, item_id: str, body: RecordItemPickedRequest) -> StatusResponse:
     """Record that a single item has been picked."""
@@ -134,24 +183,99 @@ async def record_handoff(fulfillment_id: str, body: RecordHandoffRequest) -> Sta
     return StatusResponse(status="shipment_handed_off")
 
 
-@fulfillment_router.post("/tracking/webhook", response_model=StatusResponse)
+@fulfillment_router.post(
+    "/tracking/webhook",
+    status_code=202,
+    response_model=StatusResponse,
+    openapi_extra=webhook_body_schema(UpdateTrackingRequest),
+)
 async def tracking_webhook(
-    body: UpdateTrackingRequest,
+    request: Request,
     x_carrier_signature: str = Header(default=""),
 ) -> StatusResponse:
-    """Process a carrier tracking webhook callback."""
-    carrier = get_carrier()
-    if not carrier.verify_webhook_signature(json.dumps(body.model_dump()), x_carrier_signature):
+    """Accept a carrier tracking webhook callback for processing.
+
+    The signature is checked over the raw body and the callback queued in
+    the tracking webhook inbox; drain_tracking_webhooks applies it.
+    """
+    raw = await request.body()
+    if not get_carrier().verify_webhook_signature(webhook_text(raw), x_carrier_signature):
         raise HTTPException(status_code=401, detail="Invalid carrier webhook signature")
 
-    command = UpdateTrackingEvent(
-        fulfillment_id=body.fulfillment_id,
-        status=body.status,
-        location=body.location,
-        description=body.description,
+    body = parse_webhook(UpdateTrackingRequest, raw)
+    queued = accept_tracking_webhook(body.fulfillment_id, body.model_dump(), raw)
+    return StatusResponse(status="accepted" if queued else "duplicate")
+
+
+class DrainWebhooksRequest(PydanticBaseModel):
+    limit: int = 200
+
+
+class DrainWebhooksResponse(PydanticBaseModel):
+    processed_count: int
+
+
+@fulfillment_router.post("/maintenance/drain-webhooks", response_model=DrainWebhooksResponse)
+async def drain_webhooks(
+    body: DrainWebhooksRequest | None = None,
+) -> DrainWebhooksResponse:
+    """Process queued carrier tracking webhooks in arrival order.
+
+    Designed to be called periodically by an external scheduler (e.g., every few seconds).
+    At most ``limit`` webhooks are processed per call.
+    """
+    limit = body.limit if body else 200
+    return DrainWebhooksResponse(processed_count=drain_tracking_webhooks(limit))
+
+
+class RequeueWebhooksRequest(PydanticBaseModel):
+    fulfillment_id: str
+
+
+class RequeueWebhooksResponse(PydanticBaseModel):
+    requeued_count: int
+
+
+@fulfillment_router.post("/maintenance/requeue-webhooks", response_model=RequeueWebhooksResponse)
+async def requeue_webhooks(body: RequeueWebhooksRequest) -> RequeueWebhooksResponse:
+    """Requeue a fulfillment's dead-lettered carrier tracking webhooks once the cause is fixed.
+
+    The requeued webhooks, and those held behind them, are processed by the next drain run.
+    """
+    return RequeueWebhooksResponse(requeued_count=requeue_dead_tracking_webhooks(body.fulfillment_id))
+
+
+class PollTrackingRequest(PydanticBaseModel):
+    limit: int = 500
+
+
+class PollTrackingResponse(PydanticBaseModel):
+    polled_count: int
+    queued_count: int
+    skipped_count: int
+    completed_count: int
+    failed_count: int
+
+
+@fulfillment_router.post("/maintenance/poll-tracking", response_model=PollTrackingResponse)
+async def poll_tracking(
+    body: PollTrackingRequest | None = None,
+) -> PollTrackingResponse:
+    """Poll carriers for tracking updates on shipments that are due.
+
+    Designed to be called periodically by an external scheduler (e.g., every minute).
+    Changed statuses are queued in the tracking webhook inbox for the drain to apply.
+    """
+    from fulfillment.fulfillment.tracking_poller import poll_carrier_tracking
+
+    summary = poll_carrier_tracking(limit=body.limit if body else 500)
+    return PollTrackingResponse(
+        polled_count=summary.polled,
+        queued_count=summary.queued,
+        skipped_count=summary.skipped,
+        completed_count=summary.completed,
+        failed_count=summary.failed,
     )
-    current_domain.process(command, asynchronous=False)
-    return StatusResponse(status="tracking_updated")
 
 
 @fulfillment_router.put("/{fulfillment_id}/deliver", response_model=StatusResponse)
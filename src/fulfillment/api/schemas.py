@@ -15,12 +15,14 @@ class FulfillmentItemRequest(BaseModel):
     product_id: str
     sku: str
     quantity: int
+    pick_location: str | None = None
 
 
 class CreateFulfillmentRequest(BaseModel):
     order_id: str
     customer_id: str
     warehouse_id: str | None = None
+    service_level: str | None = None
     items: list[FulfillmentItemRequest]
 
 
@@ -69,6 +71,11 @@ class ConfigureCarrierRequest(BaseModel):
     failure_reason: str = "Carrier unavailable"
 
 
+class AssignPickWaveRequest(BaseModel):
+    picker_name: str
+    fulfillment_ids: list[str]
+
+
 # ---------------------------------------------------------------------------
 # Response schemas
 # ---------------------------------------------------------------------------
@@ -86,6 +93,11 @@ class CarrierConfigResponse(BaseModel):
     failure_reason: str
 
 
+class PickWaveAssignedResponse(BaseModel):
+    assigned: list[str]
+    skipped: list[str] = []  # unknown or no longer pending
+
+
 # ---------------------------------------------------------------------------
 # Read Response Schemas
 # ---------------------------------------------------------------------------
@@ -99,3 +111,26 @@ class ShipmentTrackingResponse(BaseModel):
     events: list[dict] | None = None
     shipped_at: str | None = None
     delivered_at: str | None = None
+
+
+class PickStopResponse(BaseModel):
+    location: str | None = None
+    zone: str
+    sku: str
+    quantity: int
+    fulfillment_id: str
+    item_id: str
+
+
+class PickWaveResponse(BaseModel):
+    wave_id: str
+    warehouse_id: str | None = None
+    service_level: str
+    zones: list[str]
+    fulfillment_ids: list[str]
+    item_units: int
+    stops: list[PickStopResponse]
+
+
+class PickWavesResponse(BaseModel):
+    waves: list[PickWaveResponse]
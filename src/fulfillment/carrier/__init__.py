@@ -3,27 +3,66 @@
 import os
 
 _carrier_instance = None
+_carriers_by_name: dict = {}
 
 
-def get_carrier():
-    """Return the configured carrier adapter (singleton).
+def _build_adapter(adapter: str):
+    if adapter == "fake":
+        from fulfillment.carrier.fake_adapter import FakeCarrier
+
+        return FakeCarrier()
+    if adapter == "fake-bulk":
+        from fulfillment.carrier.fake_bulk_carrier import FakeBulkCarrier
+
+        return FakeBulkCarrier()
+    raise ValueError(f"Unknown carrier adapter: {adapter}")
+
+
+def _configured_adapters() -> dict[str, str]:
+    """Parse CARRIER_ADAPTERS, e.g. "UPS=fake-bulk,FedEx=fake", into carrier name → adapter."""
+    adapters = {}
+    for entry in os.environ.get("CARRIER_ADAPTERS", "").split(","):
+        name, _, adapter = entry.partition("=")
+        if name.strip() and adapter.strip():
+            adapters[name.strip()] = adapter.strip()
+    return adapters
+
+
+def get_carrier(name: str | None = None):
+    """Return the carrier adapter for a carrier name, or the default adapter (singleton).
 
     Uses FakeCarrier by default. In production, configure via
-    CARRIER_ADAPTER environment variable.
+    CARRIER_ADAPTER environment variable ("fake-bulk" serves tracking
+    lookups through FakeBulkCarrier's bulk API). Carriers that need an
+    adapter of their own are mapped in CARRIER_ADAPTERS
+    ("UPS=fake-bulk,FedEx=fake") or registered with set_carrier(name=...);
+    other carrier names get the default adapter.
     """
     global _carrier_instance
-    if _carrier_instance is None:
-        adapter = os.environ.get("CARRIER_ADAPTER", "fake")
-        if adapter == "fake":
-            from fulfillment.carrier.fake_adapter import FakeCarrier
+    if name is not None:
+        if name not in _carriers_by_name:
+            adapter = _configured_adapters().get(name)
+            if adapter is None:
+                return get_carrier()
+            _carriers_by_name[name] = _build_adapter(adapter)
+        return _carriers_by_name[name]
 
-            _carrier_instance = FakeCarrier()
-        else:
-            raise ValueError(f"Unknown carrier adapter: {adapter}")
+    if _carrier_instance is None:
+        _carrier_instance = _build_adapter(os.environ.get("CARRIER_ADAPTER", "fake"))
     return _carrier_instance
 
 
+def set_carrier(carrier, name: str | None = None):
+    """Override the default carrier adapter, or the one for ``name`` (useful for tests)."""
+    global _carrier_instance
+    if name is not None:
+        _carriers_by_name[name] = carrier
+    else:
+        _carrier_instance = carrier
+
+
 def reset_carrier():
-    """Reset the carrier singleton (useful for testing)."""
+    """Reset the carrier singleton and per-carrier adapters (useful for testing)."""
     global _carrier_instance
     _carrier_instance = None
+    _carriers_by_name.clear()
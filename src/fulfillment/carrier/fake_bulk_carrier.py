@@ -0,0 +1,62 @@
+"""Fake bulk carrier — a FakeCarrier with a bulk tracking API, for polling benchmarks.
+
+Carriers without webhooks are polled (fulfillment/tracking_poller.py), and
+most of them offer a bulk tracking endpoint that answers for up to a
+hundred or so tracking numbers per request. This fake serves that endpoint
+locally: every request costs ``latency`` seconds whatever its size, holds at
+most ``max_batch`` numbers, and is counted in ``requests``, so a benchmark
+can compare per-shipment and bulk lookups without a network.
+
+Each lookup of a tracking number moves its parcel one step along
+picked_up → in_transit → out_for_delivery → delivered, so repeated polls
+see progress.
+"""
+
+import time
+from datetime import UTC, datetime
+
+from fulfillment.carrier.fake_adapter import FakeCarrier
+
+PROGRESSION = [
+    ("picked_up", "Warehouse, CA", "Package picked up by carrier"),
+    ("in_transit", "Distribution Center, NY", "Package in transit"),
+    ("out_for_delivery", "Local Office, NY", "Out for delivery"),
+    ("delivered", "Front Door", "Delivered"),
+]
+
+
+class FakeBulkCarrier(FakeCarrier):
+    """FakeCarrier whose tracking lookups are served in bulk requests."""
+
+    def __init__(self, latency: float = 0.0, max_batch: int = 100):
+        super().__init__()
+        self.latency = latency
+        self.max_batch = max_batch
+        self.requests = 0
+        self._lookups: dict[str, int] = {}
+
+    def get_tracking(self, tracking_number: str) -> dict:
+        return self.get_tracking_many([tracking_number])[tracking_number]
+
+    def get_tracking_many(self, tracking_numbers: list[str]) -> dict[str, dict]:
+        results = {}
+        for start in range(0, len(tracking_numbers), self.max_batch):
+            self.requests += 1
+            if self.latency:
+                time.sleep(self.latency)
+            for number in tracking_numbers[start : start + self.max_batch]:
+                results[number] = self._track(number)
+        return results
+
+    def _track(self, tracking_number: str) -> dict:
+        if not self.should_succeed:
+            return {"status": "unknown", "location": None, "events": [], "error": self.failure_reason}
+
+        step = min(self._lookups.get(tracking_number, 0), len(PROGRESSION) - 1)
+        self._lookups[tracking_number] = step + 1
+        now = datetime.now(UTC).isoformat()
+        events = [
+            {"status": status, "location": location, "description": description, "occurred_at": now}
+            for status, location, description in PROGRESSION[: step + 1]
+        ]
+        return {"status": events[-1]["status"], "location": events[-1]["location"], "events": events}
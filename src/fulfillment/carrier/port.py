@@ -35,6 +35,19 @@ class CarrierPort(ABC):
         """
         ...
 
+    def get_tracking_many(self, tracking_numbers: list[str]) -> dict[str, dict]:
+        """Get current tracking status for several shipments.
+
+        Adapters for carriers with a bulk tracking API override this to look
+        the shipments up in as few requests as the carrier allows; the
+        default asks for each shipment in turn.
+
+        Returns:
+            dict of tracking number -> get_tracking() result; numbers the
+            carrier does not know are left out
+        """
+        return {number: self.get_tracking(number) for number in tracking_numbers}
+
     @abstractmethod
     def cancel_shipment(self, tracking_number: str) -> dict:
         """Cancel a shipment with the carrier.
@@ -1,7 +1,7 @@
 """Fulfillment creation — command and handler."""
 
 from protean import handle
-from protean.fields import Dict, Identifier, List
+from protean.fields import Dict, Identifier, List, String
 from protean.utils.globals import current_domain
 
 from fulfillment.domain import fulfillment
@@ -15,6 +15,7 @@ class CreateFulfillment:
     order_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     warehouse_id = Identifier()
+    service_level = String(max_length=50)
     items = List(Dict(), required=True)
 
 
@@ -27,6 +28,7 @@ class CreateFulfillmentHandler:
             customer_id=command.customer_id,
             items_data=command.items,
             warehouse_id=command.warehouse_id,
+            service_level=command.service_level,
         )
         current_domain.repository_for(Fulfillment).add(ff)
         return str(ff.id)
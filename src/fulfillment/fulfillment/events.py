@@ -17,6 +17,7 @@ class FulfillmentCreated:
     order_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     warehouse_id = String()
+    service_level = String()
     items = List(Dict(), required=True)
     item_count = Integer(required=True)
     created_at = DateTime(required=True)
@@ -94,6 +95,17 @@ class TrackingEventReceived:
     occurred_at = DateTime(required=True)
 
 
+@fulfillment.event(part_of="Fulfillment")
+class TrackingScansReceived:
+    """Several carrier tracking events for one fulfillment, recorded together."""
+
+    fulfillment_id = Identifier(required=True)
+    scans = List(Dict())  # [{status, location, description, occurred_at (ISO)}], oldest first
+    status = String(required=True)  # Latest scan
+    location = String()  # Latest scan
+    occurred_at = DateTime(required=True)  # Latest scan
+
+
 @fulfillment.event(part_of="Fulfillment", published=True)
 class DeliveryConfirmed:
     """The carrier confirmed delivery to the customer."""
@@ -38,6 +38,7 @@ from fulfillment.fulfillment.events import (
     ShipmentHandedOff,
     ShippingLabelGenerated,
     TrackingEventReceived,
+    TrackingScansReceived,
 )
 
 
@@ -200,26 +201,38 @@ class Fulfillment:
         customer_id: str,
         items_data: list[dict],
         warehouse_id: str | None = None,
+        service_level: str | None = None,
     ):
-        """Create a new fulfillment for a paid order."""
+        """Create a new fulfillment for a paid order.
+
+        ``service_level`` is the level the customer paid for; it orders pick
+        waves until the shipping label fixes the carrier's service level.
+        Items may carry the ``pick_location`` they are slotted at.
+        """
         now = datetime.now(UTC)
+        service_level = service_level or ServiceLevel.STANDARD.value
         ff = cls(
             order_id=order_id,
             customer_id=customer_id,
             warehouse_id=warehouse_id,
             status=FulfillmentStatus.PENDING.value,
+            shipment=ShipmentInfo(service_level=service_level),
             created_at=now,
             updated_at=now,
         )
+        items = []
         for item_data in items_data:
-            ff.add_items(FulfillmentItem(**item_data))
+            item = FulfillmentItem(**item_data)
+            ff.add_items(item)
+            items.append({**item_data, "item_id": str(item.id)})
         ff.raise_(
             FulfillmentCreated(
                 fulfillment_id=str(ff.id),
                 order_id=order_id,
                 customer_id=customer_id,
                 warehouse_id=warehouse_id or "",
-                items=items_data,
+                service_level=service_level,
+                items=items,
                 item_count=len(items_data),
                 created_at=now,
             )
@@ -387,8 +400,7 @@ class Fulfillment:
     # -------------------------------------------------------------------
     # Tracking
     # -------------------------------------------------------------------
-    def add_tracking_event(self, status: str, location: str | None = None, description: str | None = None) -> None:
-        """Record a tracking event from the carrier."""
+    def _enter_transit_on_tracking(self) -> None:
         current = FulfillmentStatus(self.status)
         if current not in (
             FulfillmentStatus.SHIPPED,
@@ -397,22 +409,29 @@ class Fulfillment:
         ):
             raise ValidationError({"status": ["Tracking events can only be added after shipment"]})
 
-        now = datetime.now(UTC)
-
-        # Auto-transition to IN_TRANSIT on first tracking event after SHIPPED
-        if current == FulfillmentStatus.SHIPPED:
+        # Auto-transition to IN_TRANSIT on first tracking event after SHIPPED,
+        # and re-enter IN_TRANSIT from EXCEPTION if carrier reports movement
+        if current in (FulfillmentStatus.SHIPPED, FulfillmentStatus.EXCEPTION):
             self.status = FulfillmentStatus.IN_TRANSIT.value
 
-        # Re-enter IN_TRANSIT from EXCEPTION if carrier reports movement
-        if current == FulfillmentStatus.EXCEPTION:
-            self.status = FulfillmentStatus.IN_TRANSIT.value
+    def add_tracking_event(
+        self,
+        status: str,
+        location: str | None = None,
+        description: str | None = None,
+        occurred_at: datetime | None = None,
+    ) -> None:
+        """Record a tracking event from the carrier."""
+        self._enter_transit_on_tracking()
+        now = datetime.now(UTC)
+        occurred_at = occurred_at or now
 
         self.add_tracking_events(
             TrackingEvent(
                 status=status,
                 location=location or "",
                 description=description or "",
-                occurred_at=now,
+                occurred_at=occurred_at,
             )
         )
         self.updated_at = now
@@ -422,7 +441,58 @@ class Fulfillment:
                 status=status,
                 location=location or "",
                 description=description or "",
-                occurred_at=now,
+                occurred_at=occurred_at,
+            )
+        )
+
+    def add_tracking_scans(self, scans: list[dict]) -> None:
+        """Record several carrier tracking events at once, oldest first.
+
+        Each scan is a dict with ``status`` and optional ``location``,
+        ``description`` and ``occurred_at`` (defaults to now). A batch raises
+        one TrackingScansReceived; a single scan is recorded as a regular
+        TrackingEventReceived.
+        """
+        if not scans:
+            return
+        if len(scans) == 1:
+            scan = scans[0]
+            self.add_tracking_event(
+                scan["status"], scan.get("location"), scan.get("description"), scan.get("occurred_at")
+            )
+            return
+
+        self._enter_transit_on_tracking()
+        now = datetime.now(UTC)
+
+        events = [
+            TrackingEvent(
+                status=scan["status"],
+                location=scan.get("location") or "",
+                description=scan.get("description") or "",
+                occurred_at=scan.get("occurred_at") or now,
+            )
+            for scan in scans
+        ]
+        self.add_tracking_events(events)
+        self.updated_at = now
+
+        latest = events[-1]
+        self.raise_(
+            TrackingScansReceived(
+                fulfillment_id=str(self.id),
+                scans=[
+                    {
+                        "status": event.status,
+                        "location": event.location,
+                        "description": event.description,
+                        "occurred_at": event.occurred_at.isoformat(),
+                    }
+                    for event in events
+                ],
+                status=latest.status,
+                location=latest.location,
+                occurred_at=latest.occurred_at,
             )
         )
 
@@ -1,10 +1,14 @@
-"""Fulfillment tracking — command and handler.
+"""Fulfillment tracking — commands and handler.
 
-Processes carrier webhook updates to record tracking events.
+Processes carrier webhook updates to record tracking events. UpdateTrackingEvent
+records one scan; RecordTrackingScans records a burst of scans for one
+fulfillment with a single aggregate load and save.
 """
 
+from datetime import datetime
+
 from protean import handle
-from protean.fields import Identifier, String
+from protean.fields import Dict, Identifier, List, String
 from protean.utils.globals import current_domain
 
 from fulfillment.domain import fulfillment
@@ -21,6 +25,14 @@ class UpdateTrackingEvent:
     description = String(max_length=500)
 
 
+@fulfillment.command(part_of="Fulfillment")
+class RecordTrackingScans:
+    """Record several tracking events from the carrier for one fulfillment."""
+
+    fulfillment_id = Identifier(required=True)
+    scans = List(Dict(), required=True)  # [{status, location, description, occurred_at (ISO)}], oldest first
+
+
 @fulfillment.command_handler(part_of=Fulfillment)
 class TrackingHandler:
     @handle(UpdateTrackingEvent)
@@ -33,3 +45,18 @@ class TrackingHandler:
             description=command.description,
         )
         repo.add(ff)
+
+    @handle(RecordTrackingScans)
+    def record_tracking_scans(self, command):
+        repo = current_domain.repository_for(Fulfillment)
+        ff = repo.get(command.fulfillment_id)
+        ff.add_tracking_scans(
+            [
+                {
+                    **scan,
+                    "occurred_at": datetime.fromisoformat(scan["occurred_at"]) if scan.get("occurred_at") else None,
+                }
+                for scan in command.scans
+            ]
+        )
+        repo.add(ff)
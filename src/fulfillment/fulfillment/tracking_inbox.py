@@ -0,0 +1,191 @@
+"""Carrier tracking webhook inbox — queued tracking callbacks, drained in batches.
+
+The tracking webhook endpoint verifies the carrier signature, appends the
+callback to TrackingWebhookInbox and answers 202 without touching the
+Fulfillment. ``drain_tracking_webhooks``, triggered periodically by an
+external scheduler via the maintenance API endpoint, processes pending
+callbacks in arrival order (and so in order per fulfillment).
+
+Busy parcels collect many scans between two drain runs, so the interval
+between runs is the buffering window: the scans pending for a fulfillment
+are recorded together through RecordTrackingScans — one aggregate load and
+save, and one TrackingScansReceived for the projectors — in a unit of work
+of their own. Each scan keeps the time its webhook was received, or the
+carrier's scan time when the payload carries one (scans queued by the
+tracking poller do). A ``delivered`` scan also records the delivery
+(RecordDeliveryConfirmation) in the same unit of work, whether it came
+from a carrier callback or from the poller.
+
+If a fulfillment's batch fails, its scans are applied again one at a time
+in arrival order, so the scans before the bad one are recorded and only the
+bad one is counted as failed. A failed scan is retried with backoff and
+dead-lettered after ``max_attempts``; later scans for the same fulfillment
+wait behind it, dead-lettered or not.
+Processed callbacks stay in the inbox for the retention window, so a
+redelivered callback is acknowledged from its ``message_id`` instead of
+adding the tracking event twice. Dead-lettered callbacks are kept until an
+operator fixes the cause and requeues them (``requeue_dead_tracking_webhooks``,
+behind the ``/fulfillments/maintenance/requeue-webhooks`` endpoint), which
+also releases the scans held behind them. See shared/webhooks.py for the
+retry and retention settings.
+"""
+
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean.core.unit_of_work import UnitOfWork
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Dict, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.processing import Priority, processing_priority
+
+from fulfillment.domain import fulfillment
+from fulfillment.fulfillment.delivery import RecordDeliveryConfirmation
+from fulfillment.fulfillment.tracking import RecordTrackingScans
+from shared.clock import utc_naive
+from shared.webhooks import (
+    DEAD,
+    PENDING,
+    PROCESSED,
+    due_messages,
+    inbox_settings,
+    message_id,
+    receive_time,
+    record_failure,
+    requeue,
+)
+
+logger = structlog.get_logger(__name__)
+
+TRACKING = "tracking"
+DELIVERED_SCAN = "delivered"  # carrier status that confirms delivery
+
+
+@fulfillment.projection
+class TrackingWebhookInbox:
+    message_id = String(identifier=True, required=True, max_length=64)
+    fulfillment_id = Identifier(required=True)
+    payload = Dict(required=True)
+    status = String(max_length=20, default=PENDING)  # pending, processed, dead
+    attempts = Integer(default=0)  # failed attempts so far
+    next_attempt_at = DateTime()  # set after a failure: not retried before then
+    error = String(max_length=500)
+    received_at = DateTime(required=True)
+
+
+def accept_tracking_webhook(fulfillment_id: str, payload: dict, raw: bytes) -> bool:
+    """Queue a verified tracking webhook; return False if this delivery is already in the inbox."""
+    repo = current_domain.repository_for(TrackingWebhookInbox)
+    identity = message_id(TRACKING, raw)
+    try:
+        repo.get(identity)
+        return False
+    except ObjectNotFoundError:
+        pass
+
+    repo.add(
+        TrackingWebhookInbox(
+            message_id=identity,
+            fulfillment_id=fulfillment_id,
+            payload=payload,
+            received_at=receive_time(),
+        )
+    )
+    return True
+
+
+def pending_tracking_webhooks(limit: int, now: datetime | None = None) -> list[TrackingWebhookInbox]:
+    """Return up to ``limit`` pending tracking webhooks due at ``now``, oldest first.
+
+    Webhooks for a fulfillment with an earlier webhook awaiting retry or
+    dead-lettered are held back.
+    """
+    now = utc_naive(now or datetime.now(UTC))
+    return due_messages(current_domain.view_for(TrackingWebhookInbox), "fulfillment_id", limit, now)
+
+
+def requeue_dead_tracking_webhooks(fulfillment_id: str) -> int:
+    """Requeue a fulfillment's dead-lettered tracking webhooks for the next drain run; return how many."""
+    repo = current_domain.repository_for(TrackingWebhookInbox)
+    dead = repo.query.filter(fulfillment_id=fulfillment_id, status=DEAD).limit(None).all().items
+    for message in dead:
+        requeue(message)
+        repo.add(message)
+    if dead:
+        logger.info("Requeued dead-lettered tracking webhooks", fulfillment_id=fulfillment_id, count=len(dead))
+    return len(dead)
+
+
+def _scan(message: TrackingWebhookInbox) -> dict:
+    return {
+        "status": message.payload["status"],
+        "location": message.payload.get("location"),
+        "description": message.payload.get("description"),
+        "occurred_at": message.payload.get("occurred_at")
+        or utc_naive(message.received_at).replace(tzinfo=UTC).isoformat(),
+    }
+
+
+def _apply(repo, fulfillment_id: str, messages: list[TrackingWebhookInbox]) -> None:
+    """Record the scans in one unit of work, together with their inbox status."""
+    scans = [_scan(m) for m in messages]
+    with UnitOfWork():
+        current_domain.process(RecordTrackingScans(fulfillment_id=fulfillment_id, scans=scans), asynchronous=False)
+        if any(scan["status"] == DELIVERED_SCAN for scan in scans):
+            current_domain.process(RecordDeliveryConfirmation(fulfillment_id=fulfillment_id), asynchronous=False)
+        for message in messages:
+            message.status = PROCESSED
+            repo.add(message)
+
+
+def _fail(repo, message: TrackingWebhookInbox, error: Exception, settings, now: datetime) -> None:
+    record_failure(message, error, settings, now)
+    repo.add(message)
+    logger.warning(
+        "Failed to process tracking webhook",
+        fulfillment_id=str(message.fulfillment_id),
+        attempts=message.attempts,
+        status=message.status,
+        error=str(error),
+    )
+
+
+def drain_tracking_webhooks(limit: int | None = None) -> int:
+    """Process up to ``limit`` pending tracking webhooks in arrival order; return how many were applied."""
+    with processing_priority(Priority.LOW):
+        settings = inbox_settings(fulfillment)
+        limit = limit or settings.batch_size
+        repo = current_domain.repository_for(TrackingWebhookInbox)
+        now = utc_naive(datetime.now(UTC))
+
+        by_fulfillment: defaultdict[str, list[TrackingWebhookInbox]] = defaultdict(list)
+        for message in pending_tracking_webhooks(limit, now):
+            by_fulfillment[str(message.fulfillment_id)].append(message)
+
+        processed_count = 0
+        for fulfillment_id, messages in by_fulfillment.items():
+            try:
+                _apply(repo, fulfillment_id, messages)
+                processed_count += len(messages)
+                continue
+            except Exception as exc:
+                if len(messages) == 1:
+                    _fail(repo, messages[0], exc, settings, now)
+                    continue
+
+            # One of the scans spoils the batch: apply them one at a time, up to the failing one
+            for message in messages:
+                try:
+                    _apply(repo, fulfillment_id, [message])
+                    processed_count += 1
+                except Exception as exc:
+                    _fail(repo, message, exc, settings, now)
+                    break
+
+        cutoff = now - timedelta(seconds=settings.retention)
+        purged = repo.query.filter(status=PROCESSED, received_at__lte=cutoff).limit(limit).delete()
+
+        if processed_count or purged:
+            logger.info("Drained tracking webhooks", processed=processed_count, purged=purged)
+        return processed_count
@@ -0,0 +1,265 @@
+"""Carrier tracking poller — tracking updates for carriers that do not send webhooks.
+
+Every handed-off shipment of a polled carrier gets a TrackingPollSchedule
+entry. ``poll_carrier_tracking``, triggered periodically by an external
+scheduler via the maintenance API endpoint, picks the entries that are due,
+drops those whose fulfillment FulfillmentStatusView shows as delivered or
+cancelled, and looks the rest up with ``CarrierPort.get_tracking_many`` —
+grouped per carrier, through that carrier's adapter (``get_carrier(name)``),
+``batch_size`` tracking numbers per call. A fulfillment the view does not
+show yet (the projection lags the handoff) is polled like any other.
+
+A lookup call that raises — a carrier outage, an unknown adapter — fails
+only its batch: the batch's shipments are pushed back to their next poll
+interval and counted as ``failed``, and the other batches and carriers are
+still polled.
+
+Intervals are adaptive: a shipment is polled every ``fast_interval``
+seconds once it is within ``fast_window`` of its estimated delivery (or out
+for delivery, or overdue), and every ``slow_interval`` seconds otherwise,
+so most lookups go to the parcels whose status is about to change.
+
+A changed status or location is queued in the tracking webhook inbox like
+a carrier callback, so polled scans are applied by the same batched drain
+(see tracking_inbox.py); a ``delivered`` scan confirms the delivery there.
+Once the carrier reports a terminal status the schedule is dropped, so the
+shipment is not looked up again while the drain catches up.
+
+    [custom.tracking_poller]
+    fast_interval = 900       # seconds between polls near estimated delivery
+    slow_interval = 14400     # seconds between polls otherwise
+    fast_window = 86400       # seconds before estimated delivery polling speeds up
+    batch_size = 100          # tracking numbers per get_tracking_many call
+    carriers = []             # carriers to poll; empty polls every carrier
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean.core.projector import on
+from protean.fields import DateTime, Identifier, String
+from protean.utils.globals import current_domain
+from protean.utils.processing import Priority, processing_priority
+
+from fulfillment.carrier import get_carrier
+from fulfillment.domain import fulfillment
+from fulfillment.fulfillment.events import ShipmentHandedOff
+from fulfillment.fulfillment.fulfillment import Fulfillment
+from fulfillment.fulfillment.tracking_inbox import DELIVERED_SCAN, accept_tracking_webhook
+from fulfillment.projections.fulfillment_status import FulfillmentStatusView
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+FINISHED_STATUSES = ("Delivered", "Cancelled")
+FAST_CARRIER_STATUSES = ("out_for_delivery",)
+TERMINAL_CARRIER_STATUSES = (DELIVERED_SCAN,)
+
+
+@dataclass(frozen=True)
+class TrackingPollerSettings:
+    fast_interval: float = 900.0
+    slow_interval: float = 14400.0
+    fast_window: float = 86400.0
+    batch_size: int = 100
+    carriers: tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "TrackingPollerSettings":
+        return cls(
+            fast_interval=float(settings.get("fast_interval", 900)),
+            slow_interval=float(settings.get("slow_interval", 14400)),
+            fast_window=float(settings.get("fast_window", 86400)),
+            batch_size=max(1, int(settings.get("batch_size", 100))),
+            carriers=tuple(settings.get("carriers", ()) or ()),
+        )
+
+    def polls(self, carrier: str) -> bool:
+        return not self.carriers or carrier in self.carriers
+
+
+def poller_settings() -> TrackingPollerSettings:
+    return TrackingPollerSettings.from_config(custom_settings(fulfillment, "tracking_poller"))
+
+
+def poll_interval(
+    settings: TrackingPollerSettings,
+    now: datetime,
+    estimated_delivery: datetime | None,
+    carrier_status: str | None = None,
+) -> float:
+    """Seconds until a shipment should be polled again."""
+    if carrier_status in FAST_CARRIER_STATUSES:
+        return settings.fast_interval
+    if estimated_delivery is None:
+        return settings.slow_interval
+    if utc_naive(estimated_delivery) - utc_naive(now) <= timedelta(seconds=settings.fast_window):
+        return settings.fast_interval
+    return settings.slow_interval
+
+
+@fulfillment.projection
+class TrackingPollSchedule:
+    fulfillment_id = Identifier(identifier=True, required=True)
+    carrier = String(max_length=100, required=True)
+    tracking_number = String(max_length=255, required=True)
+    estimated_delivery = DateTime()
+    carrier_status = String(max_length=50)
+    carrier_location = String(max_length=255)
+    last_polled_at = DateTime()
+    next_poll_at = DateTime(required=True)
+
+
+@fulfillment.projector(projector_for=TrackingPollSchedule, aggregates=[Fulfillment])
+class TrackingPollScheduleProjector:
+    @on(ShipmentHandedOff)
+    def on_shipment_handed_off(self, event):
+        settings = poller_settings()
+        if not settings.polls(event.carrier):
+            return
+
+        shipped_at = utc_naive(event.shipped_at)
+        estimated_delivery = utc_naive(event.estimated_delivery) if event.estimated_delivery else None
+        current_domain.repository_for(TrackingPollSchedule).add(
+            TrackingPollSchedule(
+                fulfillment_id=event.fulfillment_id,
+                carrier=event.carrier,
+                tracking_number=event.tracking_number,
+                estimated_delivery=estimated_delivery,
+                next_poll_at=shipped_at + timedelta(seconds=poll_interval(settings, shipped_at, estimated_delivery)),
+            )
+        )
+
+
+@dataclass(frozen=True)
+class PollSummary:
+    polled: int = 0  # shipments looked up with their carrier
+    queued: int = 0  # changed statuses queued as tracking scans
+    skipped: int = 0  # schedules dropped because the fulfillment is delivered or cancelled
+    completed: int = 0  # schedules dropped because the carrier reported a terminal status
+    failed: int = 0  # shipments whose lookup call failed, pushed back to their next poll
+
+
+def due_schedules(now: datetime, limit: int) -> list[TrackingPollSchedule]:
+    """Return up to ``limit`` schedules due at ``now``, most overdue first."""
+    return (
+        current_domain.view_for(TrackingPollSchedule)
+        .query.filter(next_poll_at__lte=utc_naive(now))
+        .order_by("next_poll_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+def _fulfillment_statuses(fulfillment_ids: list[str]) -> dict[str, str]:
+    views = (
+        current_domain.view_for(FulfillmentStatusView)
+        .query.filter(fulfillment_id__in=fulfillment_ids)
+        .limit(len(fulfillment_ids))
+        .all()
+        .items
+    )
+    return {str(view.fulfillment_id): view.status for view in views}
+
+
+def _queue_scan(schedule: TrackingPollSchedule, result: dict) -> bool:
+    latest = (result.get("events") or [{}])[-1]
+    payload = {
+        "fulfillment_id": str(schedule.fulfillment_id),
+        "status": result["status"],
+        "location": result.get("location"),
+        "description": latest.get("description"),
+        "occurred_at": latest.get("occurred_at"),
+    }
+    raw = json.dumps({"tracking_number": schedule.tracking_number, **payload}, sort_keys=True).encode()
+    return accept_tracking_webhook(payload["fulfillment_id"], payload, raw)
+
+
+def _reschedule(repo, schedule: TrackingPollSchedule, settings: TrackingPollerSettings, now: datetime) -> None:
+    schedule.next_poll_at = now + timedelta(
+        seconds=poll_interval(settings, now, schedule.estimated_delivery, schedule.carrier_status)
+    )
+    repo.add(schedule)
+
+
+def poll_carrier_tracking(limit: int = 500, now: datetime | None = None) -> PollSummary:
+    """Poll carriers for up to ``limit`` due shipments and queue the changes they report."""
+    with processing_priority(Priority.LOW):
+        settings = poller_settings()
+        now = utc_naive(now or datetime.now(UTC))
+        repo = current_domain.repository_for(TrackingPollSchedule)
+
+        due = due_schedules(now, limit)
+        if not due:
+            return PollSummary()
+
+        statuses = _fulfillment_statuses([str(schedule.fulfillment_id) for schedule in due])
+        by_carrier: defaultdict[str, list[TrackingPollSchedule]] = defaultdict(list)
+        finished = []
+        for schedule in due:
+            if statuses.get(str(schedule.fulfillment_id)) in FINISHED_STATUSES:
+                finished.append(str(schedule.fulfillment_id))
+            else:
+                by_carrier[schedule.carrier].append(schedule)
+        skipped = len(finished)
+        if finished:
+            repo.query.filter(fulfillment_id__in=finished).limit(skipped).delete()
+
+        polled = queued = failed = 0
+        completed = []
+        for carrier_name, schedules in by_carrier.items():
+            for start in range(0, len(schedules), settings.batch_size):
+                batch = schedules[start : start + settings.batch_size]
+                try:
+                    results = get_carrier(carrier_name).get_tracking_many(
+                        [schedule.tracking_number for schedule in batch]
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "Carrier tracking lookup call failed", carrier=carrier_name, batch=len(batch), error=str(exc)
+                    )
+                    for schedule in batch:
+                        _reschedule(repo, schedule, settings, now)
+                    failed += len(batch)
+                    continue
+
+                for schedule in batch:
+                    result = results.get(schedule.tracking_number)
+                    if result is None or result.get("error"):
+                        logger.warning(
+                            "Carrier tracking lookup failed",
+                            carrier=carrier_name,
+                            tracking_number=schedule.tracking_number,
+                            error=(result or {}).get("error", "unknown tracking number"),
+                        )
+                    elif (result["status"], result.get("location")) != (
+                        schedule.carrier_status,
+                        schedule.carrier_location,
+                    ):
+                        queued += _queue_scan(schedule, result)
+                        schedule.carrier_status = result["status"]
+                        schedule.carrier_location = result.get("location")
+
+                    if schedule.carrier_status in TERMINAL_CARRIER_STATUSES:
+                        completed.append(str(schedule.fulfillment_id))
+                        continue
+                    schedule.last_polled_at = now
+                    _reschedule(repo, schedule, settings, now)
+                polled += len(batch)
+        if completed:
+            repo.query.filter(fulfillment_id__in=completed).limit(len(completed)).delete()
+
+        logger.info(
+            "Polled carrier tracking",
+            polled=polled,
+            queued=queued,
+            skipped=skipped,
+            completed=len(completed),
+            failed=failed,
+        )
+        return PollSummary(polled=polled, queued=queued, skipped=skipped, completed=len(completed), failed=failed)
@@ -0,0 +1,287 @@
+"""Pick waves — batching pending fulfillments for the warehouse floor.
+
+Picking one fulfillment at a time sends a picker through the warehouse once
+per order. ``plan_waves`` groups the pending fulfillments in
+WarehouseQueueView into waves of orders that need the same zones at the
+same service level, so one walk picks a whole wave, and gives each wave a
+pick sequence ordered along the pick path: zone by zone, aisle by aisle,
+alternating direction in each aisle (a serpentine walk). Overnight waves
+come first, then Express, then Standard, oldest first within a level.
+
+``AssignPickWave`` then assigns a picker to every fulfillment in a wave
+with one command and one unit of work, instead of one AssignPicker per
+order. Picks are still recorded per item with RecordItemPicked; fulfillment
+ids that are unknown or no longer pending are skipped and reported.
+
+Pick locations follow the ``zone-aisle-bin`` convention (``A-3-12``); the
+zone is the first segment. Orders rarely carry a pick location, so every
+recorded pick also updates SkuPickLocation — where each SKU was last picked
+in each warehouse — and an item created without a location is planned at
+its SKU's slot. Items whose SKU has never been picked in the warehouse are
+grouped in an UNSLOTTED zone, walked last.
+
+    [custom.pick_waves]
+    max_orders = 20     # fulfillments per wave
+    max_items = 200     # item units per wave
+"""
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import structlog
+from protean import handle
+from protean.core.projector import on
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, List, String
+from protean.utils.globals import current_domain
+
+from fulfillment.domain import fulfillment
+from fulfillment.fulfillment.events import ItemPicked
+from fulfillment.fulfillment.fulfillment import Fulfillment, FulfillmentStatus, ServiceLevel
+from fulfillment.projections.warehouse_queue import WarehouseQueueView
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+UNSLOTTED = "UNSLOTTED"
+
+_SERVICE_LEVEL_RANK = {
+    ServiceLevel.OVERNIGHT.value: 0,
+    ServiceLevel.EXPRESS.value: 1,
+    ServiceLevel.STANDARD.value: 2,
+}
+
+
+@dataclass(frozen=True)
+class WaveSettings:
+    max_orders: int = 20
+    max_items: int = 200
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "WaveSettings":
+        return cls(
+            max_orders=max(1, int(settings.get("max_orders", 20))),
+            max_items=max(1, int(settings.get("max_items", 200))),
+        )
+
+
+def wave_settings() -> WaveSettings:
+    return WaveSettings.from_config(custom_settings(fulfillment, "pick_waves"))
+
+
+def zone_of(location: str | None) -> str:
+    """Zone of a ``zone-aisle-bin`` pick location."""
+    return location.split("-", 1)[0] if location else UNSLOTTED
+
+
+def slot_id(warehouse_id: str | None, sku: str) -> str:
+    return f"{warehouse_id or ''}:{sku}"
+
+
+@fulfillment.projection
+class SkuPickLocation:
+    slot_id = String(identifier=True, required=True, max_length=255)  # <warehouse_id>:<sku>
+    warehouse_id = String()
+    sku = String(required=True, max_length=100)
+    pick_location = String(required=True, max_length=100)
+    picked_at = DateTime()
+
+
+@fulfillment.projector(projector_for=SkuPickLocation, aggregates=[Fulfillment])
+class SkuPickLocationProjector:
+    @on(ItemPicked)
+    def on_item_picked(self, event):
+        try:
+            queued = current_domain.view_for(WarehouseQueueView).get(event.fulfillment_id)
+        except ObjectNotFoundError:
+            return
+        sku = next((item.get("sku") for item in queued.items or [] if item.get("item_id") == event.item_id), None)
+        if not sku:
+            return
+
+        repo = current_domain.repository_for(SkuPickLocation)
+        identity = slot_id(queued.warehouse_id, sku)
+        try:
+            slot = repo.get(identity)
+            slot.pick_location = event.pick_location
+            slot.picked_at = event.picked_at
+        except ObjectNotFoundError:
+            slot = SkuPickLocation(
+                slot_id=identity,
+                warehouse_id=queued.warehouse_id,
+                sku=sku,
+                pick_location=event.pick_location,
+                picked_at=event.picked_at,
+            )
+        repo.add(slot)
+
+
+def _slots_for(views: list[WarehouseQueueView]) -> dict[str, str]:
+    """Learned pick locations for the SKUs of the views' items that carry none, by slot id."""
+    wanted = {
+        slot_id(view.warehouse_id, item["sku"])
+        for view in views
+        for item in view.items or []
+        if item.get("sku") and not item.get("pick_location")
+    }
+    if not wanted:
+        return {}
+    slots = (
+        current_domain.view_for(SkuPickLocation).query.filter(slot_id__in=sorted(wanted)).limit(len(wanted)).all().items
+    )
+    return {slot.slot_id: slot.pick_location for slot in slots}
+
+
+def _segment_key(segment: str) -> tuple:
+    return (0, int(segment), "") if segment.isdigit() else (1, 0, segment)
+
+
+@dataclass(frozen=True)
+class PickStop:
+    location: str | None
+    sku: str
+    quantity: int
+    fulfillment_id: str
+    item_id: str
+
+    @property
+    def zone(self) -> str:
+        return zone_of(self.location)
+
+
+def pick_sequence(stops: list[PickStop]) -> list[PickStop]:
+    """Order stops along the pick path: zones in order, aisles in order, bins serpentine."""
+
+    def zone_key(stop: PickStop) -> tuple:
+        return (stop.zone == UNSLOTTED, _segment_key(stop.zone))
+
+    def aisle_key(stop: PickStop) -> tuple:
+        segments = (stop.location or "").split("-")
+        return _segment_key(segments[1]) if len(segments) > 1 else (-1, 0, "")
+
+    def bin_key(stop: PickStop) -> tuple:
+        return tuple(_segment_key(segment) for segment in (stop.location or "").split("-")[2:])
+
+    by_aisle: defaultdict[tuple, list[PickStop]] = defaultdict(list)
+    for stop in stops:
+        by_aisle[(zone_key(stop), aisle_key(stop))].append(stop)
+
+    sequence = []
+    current_zone, reverse = None, False
+    for zone, aisle in sorted(by_aisle):
+        if zone != current_zone:
+            current_zone, reverse = zone, False
+        sequence.extend(sorted(by_aisle[(zone, aisle)], key=bin_key, reverse=reverse))
+        reverse = not reverse
+    return sequence
+
+
+@dataclass
+class PickWave:
+    wave_id: str
+    warehouse_id: str | None
+    service_level: str
+    zones: list[str]
+    fulfillment_ids: list[str] = field(default_factory=list)
+    stops: list[PickStop] = field(default_factory=list)
+
+    @property
+    def item_units(self) -> int:
+        return sum(stop.quantity for stop in self.stops)
+
+
+def _stops_for(view: WarehouseQueueView, slots: dict[str, str]) -> list[PickStop]:
+    return [
+        PickStop(
+            location=item.get("pick_location") or slots.get(slot_id(view.warehouse_id, item.get("sku") or "")),
+            sku=item.get("sku") or "",
+            quantity=int(item.get("quantity") or 1),
+            fulfillment_id=str(view.fulfillment_id),
+            item_id=str(item.get("item_id") or ""),
+        )
+        for item in view.items or []
+    ]
+
+
+def _new_wave(warehouse_id, service_level, zones) -> PickWave:
+    return PickWave(wave_id="", warehouse_id=warehouse_id, service_level=service_level, zones=list(zones))
+
+
+def plan_waves(warehouse_id: str | None = None, limit: int = 500) -> list[PickWave]:
+    """Group up to ``limit`` pending, unassigned fulfillments into pick waves, most urgent first."""
+    settings = wave_settings()
+    filters = {"status": FulfillmentStatus.PENDING.value}
+    if warehouse_id:
+        filters["warehouse_id"] = warehouse_id
+    pending = current_domain.view_for(WarehouseQueueView).query.filter(**filters).order_by("created_at").limit(limit)
+
+    views = pending.all().items
+    slots = _slots_for(views)
+    groups: defaultdict[tuple, list[tuple[WarehouseQueueView, list[PickStop]]]] = defaultdict(list)
+    for view in views:
+        stops = _stops_for(view, slots)
+        if not stops:
+            continue
+        zones = tuple(sorted({stop.zone for stop in stops}, key=lambda zone: (zone == UNSLOTTED, zone)))
+        service_level = view.service_level or ServiceLevel.STANDARD.value
+        groups[(view.warehouse_id or None, service_level, zones)].append((view, stops))
+
+    waves: list[tuple[tuple, PickWave]] = []
+    for (group_warehouse, service_level, zones), members in groups.items():
+        wave = _new_wave(group_warehouse, service_level, zones)
+        oldest = members[0][0].created_at
+        for view, stops in members:
+            units = sum(stop.quantity for stop in stops)
+            if wave.fulfillment_ids and (
+                len(wave.fulfillment_ids) >= settings.max_orders or wave.item_units + units > settings.max_items
+            ):
+                waves.append(((_SERVICE_LEVEL_RANK.get(service_level, 3), oldest), wave))
+                wave = _new_wave(group_warehouse, service_level, zones)
+                oldest = view.created_at
+            wave.fulfillment_ids.append(str(view.fulfillment_id))
+            wave.stops.extend(stops)
+        waves.append(((_SERVICE_LEVEL_RANK.get(service_level, 3), oldest), wave))
+
+    planned = []
+    for _, wave in sorted(waves, key=lambda ranked: ranked[0]):
+        wave.stops = pick_sequence(wave.stops)
+        wave.wave_id = "wave-" + hashlib.sha1("|".join(sorted(wave.fulfillment_ids)).encode()).hexdigest()[:12]
+        planned.append(wave)
+    return planned
+
+
+@fulfillment.command(part_of="Fulfillment")
+class AssignPickWave:
+    """Assign one picker to every fulfillment in a pick wave."""
+
+    picker_name = String(required=True, max_length=100)
+    fulfillment_ids = List(Identifier(), required=True)
+
+
+@fulfillment.command_handler(part_of=Fulfillment)
+class PickWaveHandler:
+    @handle(AssignPickWave)
+    def assign_pick_wave(self, command):
+        """Assign the picker in one unit of work.
+
+        Fulfillments that are unknown or no longer pending are skipped;
+        returns the ``assigned`` and ``skipped`` ids.
+        """
+        repo = current_domain.repository_for(Fulfillment)
+        assigned, skipped = [], []
+        for fulfillment_id in command.fulfillment_ids:
+            try:
+                ff = repo.get(fulfillment_id)
+            except ObjectNotFoundError:
+                skipped.append(str(fulfillment_id))
+                continue
+            if ff.status != FulfillmentStatus.PENDING.value:
+                skipped.append(str(fulfillment_id))
+                continue
+            ff.assign_picker(command.picker_name)
+            repo.add(ff)
+            assigned.append(str(ff.id))
+        if skipped:
+            logger.info("Pick wave fulfillments skipped", picker=command.picker_name, skipped=skipped)
+        return {"assigned": assigned, "skipped": skipped}
@@ -1,8 +1,17 @@
-"""Delivery performance — carrier SLA monitoring view."""
+"""Delivery performance — carrier SLA monitoring view.
+
+Rows are keyed by carrier and ship date. Delivery and exception events do
+not name the carrier, so the projector records each shipment's row and
+ship time in DeliveryPerformanceShipment at handoff; later events for the
+fulfillment update exactly that row, and deliveries add their transit
+hours to it. The lookup is dropped once the shipment is delivered.
+"""
 
 from datetime import datetime
 
+import structlog
 from protean.core.projector import on
+from protean.exceptions import ObjectNotFoundError
 from protean.fields import DateTime, Float, Identifier, Integer, String
 from protean.utils.globals import current_domain
 
@@ -13,6 +22,9 @@ from fulfillment.fulfillment.events import (
     ShipmentHandedOff,
 )
 from fulfillment.fulfillment.fulfillment import Fulfillment
+from shared.clock import utc_naive
+
+logger = structlog.get_logger(__name__)
 
 
 @fulfillment.projection
@@ -29,6 +41,15 @@ class DeliveryPerformanceView:
     updated_at = DateTime()
 
 
+@fulfillment.projection
+class DeliveryPerformanceShipment:
+    """Which DeliveryPerformanceView row a shipped fulfillment counts towards."""
+
+    fulfillment_id = Identifier(identifier=True, required=True)
+    performance_id = String(required=True)  # DeliveryPerformanceView.id — "<carrier>-<ship date>"
+    shipped_at = DateTime(required=True)
+
+
 def _date_key(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d") if dt else ""
 
@@ -59,25 +80,53 @@ class DeliveryPerformanceProjector:
             )
         repo.add(view)
 
+        current_domain.repository_for(DeliveryPerformanceShipment).add(
+            DeliveryPerformanceShipment(
+                fulfillment_id=event.fulfillment_id,
+                performance_id=record_id,
+                shipped_at=event.shipped_at,
+            )
+        )
+
     @on(DeliveryConfirmed)
     def on_delivery_confirmed(self, event):
-        date_str = _date_key(event.delivered_at)
-        # We try all carriers for this date — in practice we'd key by fulfillment_id
+        shipment = _shipment_for(event)
+        if shipment is None:
+            return
+
         repo = current_domain.repository_for(DeliveryPerformanceView)
-        results = repo.query.filter(date=date_str).all()
-        if results and results.items:
-            view = results.first
-            view.delivered_count = (view.delivered_count or 0) + 1
-            view.updated_at = event.delivered_at
-            repo.add(view)
+        view = repo.get(shipment.performance_id)
+        view.delivered_count = (view.delivered_count or 0) + 1
+        view.total_delivery_hours = (view.total_delivery_hours or 0.0) + _hours_between(
+            shipment.shipped_at, event.delivered_at
+        )
+        view.updated_at = event.delivered_at
+        repo.add(view)
+
+        shipments = current_domain.repository_for(DeliveryPerformanceShipment)
+        shipments.query.filter(fulfillment_id=str(shipment.fulfillment_id)).delete()
 
     @on(DeliveryException)
     def on_delivery_exception(self, event):
-        date_str = _date_key(event.occurred_at)
+        shipment = _shipment_for(event)
+        if shipment is None:
+            return
+
         repo = current_domain.repository_for(DeliveryPerformanceView)
-        results = repo.query.filter(date=date_str).all()
-        if results and results.items:
-            view = results.first
-            view.exception_count = (view.exception_count or 0) + 1
-            view.updated_at = event.occurred_at
-            repo.add(view)
+        view = repo.get(shipment.performance_id)
+        view.exception_count = (view.exception_count or 0) + 1
+        view.updated_at = event.occurred_at
+        repo.add(view)
+
+
+def _shipment_for(event) -> DeliveryPerformanceShipment | None:
+    try:
+        return current_domain.repository_for(DeliveryPerformanceShipment).get(event.fulfillment_id)
+    except ObjectNotFoundError:
+        # Shipped before the lookup existed — better uncounted than counted for the wrong carrier
+        logger.warning("No delivery performance row for fulfillment", fulfillment_id=str(event.fulfillment_id))
+        return None
+
+
+def _hours_between(start: datetime, end: datetime) -> float:
+    return max((utc_naive(end) - utc_naive(start)).total_seconds() / 3600, 0.0)
@@ -16,6 +16,7 @@ from fulfillment.fulfillment.events import (
     ShipmentHandedOff,
     ShippingLabelGenerated,
     TrackingEventReceived,
+    TrackingScansReceived,
 )
 from fulfillment.fulfillment.fulfillment import Fulfillment
 
@@ -103,6 +104,10 @@ class FulfillmentStatusProjector:
         view.updated_at = event.occurred_at
         repo.add(view)
 
+    @on(TrackingScansReceived)
+    def on_tracking_scans_received(self, event):
+        self.on_tracking_event_received(event)
+
     @on(DeliveryConfirmed)
     def on_delivery_confirmed(self, event):
         repo = current_domain.repository_for(FulfillmentStatusView)
@@ -10,6 +10,7 @@ from fulfillment.fulfillment.events import (
     DeliveryException,
     ShipmentHandedOff,
     TrackingEventReceived,
+    TrackingScansReceived,
 )
 from fulfillment.fulfillment.fulfillment import Fulfillment
 
@@ -63,6 +64,15 @@ class ShipmentTrackingProjector:
         view.events = existing
         repo.add(view)
 
+    @on(TrackingScansReceived)
+    def on_tracking_scans_received(self, event):
+        repo = current_domain.repository_for(ShipmentTrackingView)
+        view = repo.get(event.fulfillment_id)
+        view.current_status = event.status
+        view.current_location = event.location
+        view.events = list(view.events or []) + [dict(scan) for scan in event.scans]
+        repo.add(view)
+
     @on(DeliveryConfirmed)
     def on_delivery_confirmed(self, event):
         repo = current_domain.repository_for(ShipmentTrackingView)
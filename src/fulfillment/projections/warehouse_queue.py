@@ -1,7 +1,7 @@
 """Warehouse queue — picker's work queue view for warehouse operations."""
 
 from protean.core.projector import on
-from protean.fields import DateTime, Identifier, Integer, String
+from protean.fields import DateTime, Dict, Identifier, Integer, List, String
 from protean.utils.globals import current_domain
 
 from fulfillment.domain import fulfillment
@@ -23,7 +23,9 @@ class WarehouseQueueView:
     warehouse_id = String()
     status = String(required=True)
     assigned_to = String()
+    service_level = String()
     item_count = Integer(default=0)
+    items = List(Dict())  # item_id, sku, quantity, pick_location — for pick-wave planning
     created_at = DateTime()
     updated_at = DateTime()
 
@@ -38,7 +40,17 @@ class WarehouseQueueProjector:
                 order_id=event.order_id,
                 warehouse_id=event.warehouse_id,
                 status="Pending",
+                service_level=event.service_level,
                 item_count=event.item_count,
+                items=[
+                    {
+                        "item_id": item.get("item_id"),
+                        "sku": item.get("sku"),
+                        "quantity": item.get("quantity"),
+                        "pick_location": item.get("pick_location"),
+                    }
+                    for item in event.items
+                ],
                 created_at=event.created_at,
                 updated_at=event.created_at,
             )
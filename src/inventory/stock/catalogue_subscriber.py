@@ -4,7 +4,7 @@ Listens for VariantAdded messages from the Catalogue domain's broker stream
 to automatically initialize inventory records for new product variants.
 
 Uses the subscriber (ACL) pattern: receives raw dict payloads from the broker,
-filters by event type, and translates into an InitializeStock command.
+declares the event types it handles, and translates into an InitializeStock command.
 No dependency on shared event classes or register_external_event.
 """
 
@@ -12,6 +12,7 @@ import structlog
 from protean.utils.globals import current_domain
 
 from inventory.domain import inventory
+from shared.subscribers import TypedSubscriber
 
 logger = structlog.get_logger(__name__)
 
@@ -20,21 +21,18 @@ _DEFAULT_WAREHOUSE_ID = "default-warehouse"
 
 
 @inventory.subscriber(stream="catalogue::product")
-class CatalogueVariantSubscriber:
+class CatalogueVariantSubscriber(TypedSubscriber):
     """Reacts to VariantAdded events to initialize inventory records.
 
-    ACL pattern: receives raw broker message dict, extracts event type from
-    metadata.headers.type, and dispatches an InitializeStock command with
-    default warehouse and quantity settings. Ignores all other event types.
+    ACL pattern: receives the raw ``data`` dict of VariantAdded messages and
+    dispatches an InitializeStock command with default warehouse and quantity
+    settings. Other event types are dropped by ``TypedSubscriber`` from
+    metadata.headers.type alone.
     """
 
-    def __call__(self, payload: dict) -> None:
-        event_type = payload.get("metadata", {}).get("headers", {}).get("type", "")
-        if "VariantAdded" not in event_type:
-            return
-
-        data = payload.get("data", {})
+    event_types = frozenset({"Catalogue.VariantAdded"})
 
+    def handle(self, data: dict) -> None:
         logger.info(
             "Initializing inventory for new variant",
             product_id=str(data.get("product_id", "")),
@@ -207,3 +207,117 @@ async def process_scheduled_notifications(
     command = ProcessScheduledNotifications(as_of=body.as_of if body else None)
     current_domain.process(command, asynchronous=False)
     return ProcessScheduledResponse()
+
+
+class ReleaseDeferredRequest(PydanticBaseModel):
+    as_of: dt_datetime | None = None
+    limit: int | None = None
+
+
+class ReleaseDeferredResponse(PydanticBaseModel):
+    released_count: int
+
+
+@router.post("/maintenance/release-deferred", response_model=ReleaseDeferredResponse)
+async def release_deferred_notifications(
+    body: ReleaseDeferredRequest | None = None,
+) -> ReleaseDeferredResponse:
+    """Send notifications held for quiet hours whose release time has come.
+
+    Designed to be called once per release bucket (e.g., every minute).
+    Each deferred notification is released once; at most ``limit`` per call.
+    """
+    from notifications.notification.deferral import ReleaseDeferredNotifications
+
+    command = ReleaseDeferredNotifications(
+        as_of=body.as_of if body else None,
+        limit=body.limit if body else None,
+    )
+    result = current_domain.process(command, asynchronous=False)
+    return ReleaseDeferredResponse(released_count=result or 0)
+
+
+class FlushDigestsRequest(PydanticBaseModel):
+    as_of: dt_datetime | None = None
+    limit: int = 500
+
+
+class FlushDigestsResponse(PydanticBaseModel):
+    digest_count: int
+
+
+@router.post("/maintenance/flush-digests", response_model=FlushDigestsResponse)
+async def flush_notification_digests(
+    body: FlushDigestsRequest | None = None,
+) -> FlushDigestsResponse:
+    """Send the digests of coalescing windows that have closed.
+
+    Designed to be called periodically by an external scheduler (e.g., every minute).
+    Each window is flushed once; at most ``limit`` windows per call.
+    """
+    from notifications.notification.digest import FlushNotificationDigests
+
+    command = FlushNotificationDigests(
+        as_of=body.as_of if body else None,
+        limit=body.limit if body else 500,
+    )
+    result = current_domain.process(command, asynchronous=False)
+    return FlushDigestsResponse(digest_count=result or 0)
+
+
+class RetryFailedRequest(PydanticBaseModel):
+    as_of: dt_datetime | None = None
+    limit: int | None = None
+
+
+class RetryFailedResponse(PydanticBaseModel):
+    sent_count: int
+
+
+@router.post("/maintenance/retry-failed", response_model=RetryFailedResponse)
+async def retry_failed_notifications(
+    body: RetryFailedRequest | None = None,
+) -> RetryFailedResponse:
+    """Retry failed notifications whose backoff has elapsed.
+
+    Designed to be called periodically by an external scheduler (e.g., every 30 seconds).
+    At most ``limit`` retries are claimed per call; channels whose provider
+    circuit is open are skipped.
+    """
+    from notifications.notification.retry_scheduler import RetryFailedNotifications
+
+    command = RetryFailedNotifications(
+        as_of=body.as_of if body else None,
+        limit=body.limit if body else None,
+    )
+    result = current_domain.process(command, asynchronous=False)
+    return RetryFailedResponse(sent_count=result or 0)
+
+
+class RecoverDispatchesRequest(PydanticBaseModel):
+    as_of: dt_datetime | None = None
+    limit: int = 500
+
+
+class RecoverDispatchesResponse(PydanticBaseModel):
+    recovered_count: int
+
+
+@router.post("/maintenance/recover-dispatches", response_model=RecoverDispatchesResponse)
+async def recover_interrupted_dispatches(
+    body: RecoverDispatchesRequest | None = None,
+) -> RecoverDispatchesResponse:
+    """Fail pooled sends whose result was never written back, so the retry scheduler picks them up.
+
+    Designed to be called periodically by an external scheduler (e.g., every minute)
+    while ``[custom.dispatch] mode = "pooled"``. Only claims older than
+    ``claim_timeout`` are recovered; at most ``limit`` per call.
+    """
+    from notifications.notification.dispatch_pool import RecoverInterruptedDispatches
+
+    command = RecoverInterruptedDispatches(
+        as_of=body.as_of if body else None,
+        limit=body.limit if body else 500,
+    )
+    result = current_domain.process(command, asynchronous=False)
+    return RecoverDispatchesResponse(recovered_count=result or 0)
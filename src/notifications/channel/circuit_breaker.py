@@ -0,0 +1,74 @@
+"""Circuit breaker for channel providers.
+
+While a provider is failing, sending to it only adds load and burns retry
+attempts. A breaker counts consecutive failures for one provider:
+
+    CLOSED     sends allowed; ``failure_threshold`` consecutive failures open it
+    OPEN       no sends until ``cooldown`` seconds have passed
+    HALF_OPEN  up to ``probe_size`` sends probe the provider: a success closes
+               the breaker, a failure opens it for another cooldown
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        probe_size: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.probe_size = max(1, probe_size)
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def allowance(self, wanted: int) -> int:
+        """Return how many of ``wanted`` sends may be attempted now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.OPEN:
+                return 0
+            if state == CircuitState.HALF_OPEN:
+                return min(wanted, self.probe_size)
+            return wanted
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.cooldown:
+            self._state = CircuitState.HALF_OPEN
+        return self._state
@@ -6,6 +6,9 @@ from abc import ABC, abstractmethod
 class EmailPort(ABC):
     """Abstract interface for email dispatch adapters."""
 
+    # Most messages one provider request may carry (SendGrid: 1000 personalizations)
+    max_batch_size: int = 1000
+
     @abstractmethod
     def send(
         self,
@@ -20,3 +23,13 @@ class EmailPort(ABC):
             dict with keys: message_id, status ("sent" or "failed"), error (optional)
         """
         ...
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        """Send several email messages in as few provider requests as possible.
+
+        Each message is a dict of ``send`` keyword arguments. Returns one
+        result dict per message, in the same order, shaped like ``send``'s.
+        Adapters with a bulk endpoint override this; the default sends one
+        message at a time.
+        """
+        return [self.send(**message) for message in messages]
@@ -1,5 +1,6 @@
 """Fake email adapter — records sent emails for testing."""
 
+import time
 from uuid import uuid4
 
 from notifications.channel.email_port import EmailPort
@@ -12,11 +13,27 @@ class FakeEmailAdapter(EmailPort):
         self.sent_emails: list[dict] = []
         self.should_succeed = True
         self.failure_reason = "Email delivery failed"
+        self.latency = 0.0
+        self.rejected: set[str] = set()
+        self.batch_sizes: list[int] = []
 
-    def configure(self, should_succeed: bool = True, failure_reason: str = "Email delivery failed"):
-        """Configure the fake adapter behavior for testing."""
+    def configure(
+        self,
+        should_succeed: bool = True,
+        failure_reason: str = "Email delivery failed",
+        latency: float = 0.0,
+        rejected: set[str] | None = None,
+    ):
+        """Configure the fake adapter behavior for testing.
+
+        ``latency`` (seconds) is slept once per provider request — every ``send``
+        and every ``send_batch`` — to simulate a slow provider. Messages whose
+        ``to`` is in ``rejected`` fail individually, even within a batch.
+        """
         self.should_succeed = should_succeed
         self.failure_reason = failure_reason
+        self.latency = latency
+        self.rejected = set(rejected or ())
 
     def send(
         self,
@@ -24,6 +41,23 @@ class FakeEmailAdapter(EmailPort):
         subject: str,
         body: str,
         html_body: str | None = None,
+    ) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._deliver(to=to, subject=subject, body=body, html_body=html_body)
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        self.batch_sizes.append(len(messages))
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._deliver(**message) for message in messages]
+
+    def _deliver(
+        self,
+        to: str,
+        subject: str,
+        body: str,
+        html_body: str | None = None,
     ) -> dict:
         if not self.should_succeed:
             return {
@@ -31,6 +65,12 @@ class FakeEmailAdapter(EmailPort):
                 "status": "failed",
                 "error": self.failure_reason,
             }
+        if to in self.rejected:
+            return {
+                "message_id": None,
+                "status": "failed",
+                "error": f"Rejected recipient: {to}",
+            }
 
         message_id = f"email-{uuid4().hex[:12]}"
         record = {
@@ -49,3 +89,6 @@ class FakeEmailAdapter(EmailPort):
         self.sent_emails.clear()
         self.should_succeed = True
         self.failure_reason = "Email delivery failed"
+        self.latency = 0.0
+        self.rejected = set()
+        self.batch_sizes.clear()
@@ -1,5 +1,6 @@
 """Fake push notification adapter — records sent pushes for testing."""
 
+import time
 from uuid import uuid4
 
 from notifications.channel.push_port import PushPort
@@ -12,11 +13,27 @@ class FakePushAdapter(PushPort):
         self.sent_pushes: list[dict] = []
         self.should_succeed = True
         self.failure_reason = "Push delivery failed"
+        self.latency = 0.0
+        self.rejected: set[str] = set()
+        self.batch_sizes: list[int] = []
 
-    def configure(self, should_succeed: bool = True, failure_reason: str = "Push delivery failed"):
-        """Configure the fake adapter behavior for testing."""
+    def configure(
+        self,
+        should_succeed: bool = True,
+        failure_reason: str = "Push delivery failed",
+        latency: float = 0.0,
+        rejected: set[str] | None = None,
+    ):
+        """Configure the fake adapter behavior for testing.
+
+        ``latency`` (seconds) is slept once per provider request — every ``send``
+        and every ``send_batch`` — to simulate a slow provider. Messages whose
+        ``device_token`` is in ``rejected`` fail individually, even within a batch.
+        """
         self.should_succeed = should_succeed
         self.failure_reason = failure_reason
+        self.latency = latency
+        self.rejected = set(rejected or ())
 
     def send(
         self,
@@ -24,6 +41,23 @@ class FakePushAdapter(PushPort):
         title: str,
         body: str,
         data: dict | None = None,
+    ) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._deliver(device_token=device_token, title=title, body=body, data=data)
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        self.batch_sizes.append(len(messages))
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._deliver(**message) for message in messages]
+
+    def _deliver(
+        self,
+        device_token: str,
+        title: str,
+        body: str,
+        data: dict | None = None,
     ) -> dict:
         if not self.should_succeed:
             return {
@@ -31,6 +65,12 @@ class FakePushAdapter(PushPort):
                 "status": "failed",
                 "error": self.failure_reason,
             }
+        if device_token in self.rejected:
+            return {
+                "message_id": None,
+                "status": "failed",
+                "error": f"Rejected recipient: {device_token}",
+            }
 
         message_id = f"push-{uuid4().hex[:12]}"
         record = {
@@ -49,3 +89,6 @@ class FakePushAdapter(PushPort):
         self.sent_pushes.clear()
         self.should_succeed = True
         self.failure_reason = "Push delivery failed"
+        self.latency = 0.0
+        self.rejected = set()
+        self.batch_sizes.clear()
@@ -1,5 +1,6 @@
 """Fake Slack adapter — records sent messages for testing."""
 
+import time
 from uuid import uuid4
 
 from notifications.channel.slack_port import SlackPort
@@ -12,17 +13,49 @@ class FakeSlackAdapter(SlackPort):
         self.sent_messages: list[dict] = []
         self.should_succeed = True
         self.failure_reason = "Slack delivery failed"
+        self.latency = 0.0
+        self.rejected: set[str] = set()
+        self.batch_sizes: list[int] = []
 
-    def configure(self, should_succeed: bool = True, failure_reason: str = "Slack delivery failed"):
-        """Configure the fake adapter behavior for testing."""
+    def configure(
+        self,
+        should_succeed: bool = True,
+        failure_reason: str = "Slack delivery failed",
+        latency: float = 0.0,
+        rejected: set[str] | None = None,
+    ):
+        """Configure the fake adapter behavior for testing.
+
+        ``latency`` (seconds) is slept once per provider request — every ``send``
+        and every ``send_batch`` — to simulate a slow provider. Messages whose
+        ``channel`` is in ``rejected`` fail individually, even within a batch.
+        """
         self.should_succeed = should_succeed
         self.failure_reason = failure_reason
+        self.latency = latency
+        self.rejected = set(rejected or ())
 
     def send(
         self,
         channel: str,
         message: str,
         blocks: list | None = None,
+    ) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._deliver(channel=channel, message=message, blocks=blocks)
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        self.batch_sizes.append(len(messages))
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._deliver(**message) for message in messages]
+
+    def _deliver(
+        self,
+        channel: str,
+        message: str,
+        blocks: list | None = None,
     ) -> dict:
         if not self.should_succeed:
             return {
@@ -30,6 +63,12 @@ class FakeSlackAdapter(SlackPort):
                 "status": "failed",
                 "error": self.failure_reason,
             }
+        if channel in self.rejected:
+            return {
+                "message_id": None,
+                "status": "failed",
+                "error": f"Rejected recipient: {channel}",
+            }
 
         message_id = f"slack-{uuid4().hex[:12]}"
         record = {
@@ -47,3 +86,6 @@ class FakeSlackAdapter(SlackPort):
         self.sent_messages.clear()
         self.should_succeed = True
         self.failure_reason = "Slack delivery failed"
+        self.latency = 0.0
+        self.rejected = set()
+        self.batch_sizes.clear()
@@ -1,5 +1,6 @@
 """Fake SMS adapter — records sent messages for testing."""
 
+import time
 from uuid import uuid4
 
 from notifications.channel.sms_port import SMSPort
@@ -12,19 +13,52 @@ class FakeSMSAdapter(SMSPort):
         self.sent_messages: list[dict] = []
         self.should_succeed = True
         self.failure_reason = "SMS delivery failed"
+        self.latency = 0.0
+        self.rejected: set[str] = set()
+        self.batch_sizes: list[int] = []
 
-    def configure(self, should_succeed: bool = True, failure_reason: str = "SMS delivery failed"):
-        """Configure the fake adapter behavior for testing."""
+    def configure(
+        self,
+        should_succeed: bool = True,
+        failure_reason: str = "SMS delivery failed",
+        latency: float = 0.0,
+        rejected: set[str] | None = None,
+    ):
+        """Configure the fake adapter behavior for testing.
+
+        ``latency`` (seconds) is slept once per provider request — every ``send``
+        and every ``send_batch`` — to simulate a slow provider. Messages whose
+        ``to`` is in ``rejected`` fail individually, even within a batch.
+        """
         self.should_succeed = should_succeed
         self.failure_reason = failure_reason
+        self.latency = latency
+        self.rejected = set(rejected or ())
 
     def send(self, to: str, body: str) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._deliver(to=to, body=body)
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        self.batch_sizes.append(len(messages))
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._deliver(**message) for message in messages]
+
+    def _deliver(self, to: str, body: str) -> dict:
         if not self.should_succeed:
             return {
                 "message_id": None,
                 "status": "failed",
                 "error": self.failure_reason,
             }
+        if to in self.rejected:
+            return {
+                "message_id": None,
+                "status": "failed",
+                "error": f"Rejected recipient: {to}",
+            }
 
         message_id = f"sms-{uuid4().hex[:12]}"
         record = {
@@ -41,3 +75,6 @@ class FakeSMSAdapter(SMSPort):
         self.sent_messages.clear()
         self.should_succeed = True
         self.failure_reason = "SMS delivery failed"
+        self.latency = 0.0
+        self.rejected = set()
+        self.batch_sizes.clear()
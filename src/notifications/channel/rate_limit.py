@@ -0,0 +1,48 @@
+"""Token-bucket rate limiter for channel providers.
+
+Providers (SMTP relays, SMS gateways, push services) enforce per-account send
+rates. Each channel's dispatch workers share one limiter, so however many
+workers run, the provider never sees more than ``rate`` sends per second
+(after an initial burst of up to ``burst``).
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class RateLimiter:
+    """Thread-safe token bucket. A rate of 0 disables limiting."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a send is allowed."""
+        if not self.rate:
+            return
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            self._sleep(wait)
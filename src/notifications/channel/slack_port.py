@@ -6,6 +6,9 @@ from abc import ABC, abstractmethod
 class SlackPort(ABC):
     """Abstract interface for Slack dispatch adapters."""
 
+    # Slack has no bulk endpoint: one message per request
+    max_batch_size: int = 1
+
     @abstractmethod
     def send(
         self,
@@ -19,3 +22,13 @@ class SlackPort(ABC):
             dict with keys: message_id, status ("sent" or "failed"), error (optional)
         """
         ...
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        """Send several Slack messages in as few provider requests as possible.
+
+        Each message is a dict of ``send`` keyword arguments. Returns one
+        result dict per message, in the same order, shaped like ``send``'s.
+        Adapters with a bulk endpoint override this; the default sends one
+        message at a time.
+        """
+        return [self.send(**message) for message in messages]
@@ -6,6 +6,9 @@ from abc import ABC, abstractmethod
 class SMSPort(ABC):
     """Abstract interface for SMS dispatch adapters."""
 
+    # Most messages one provider request may carry (typical bulk SMS APIs: 100)
+    max_batch_size: int = 100
+
     @abstractmethod
     def send(self, to: str, body: str) -> dict:
         """Send an SMS message.
@@ -14,3 +17,13 @@ class SMSPort(ABC):
             dict with keys: message_id, status ("sent" or "failed"), error (optional)
         """
         ...
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        """Send several SMS messages in as few provider requests as possible.
+
+        Each message is a dict of ``send`` keyword arguments. Returns one
+        result dict per message, in the same order, shaped like ``send``'s.
+        Adapters with a bulk endpoint override this; the default sends one
+        message at a time.
+        """
+        return [self.send(**message) for message in messages]
@@ -0,0 +1,228 @@
+"""Quiet-hours deferral — hold notifications until the customer's quiet hours end.
+
+create_notifications_for_customer asks ``release_time`` whether a
+notification would go out inside the customer's quiet hours. If so, the
+notification is created with ``scheduled_for`` set to its release time (so
+the dispatcher skips it) and parked in the DeferredNotifications queue under
+the time bucket it is due in.
+
+Release is smoothed: rather than every customer whose window ends at 08:00
+becoming due at 08:00, each recipient is offset by a stable amount within
+``release_spread`` seconds of the window end. ReleaseDeferredNotifications,
+triggered every bucket by an external scheduler via the maintenance API
+endpoint, releases the due buckets oldest first — at most
+``release_batch_size`` notifications per run — and sends each channel/type
+group through the channel's batch API.
+
+Quiet hours are "HH:MM" times in UTC (preferences carry no timezone); a
+window may cross midnight ("22:00" to "08:00"). Configured under
+``[custom.quiet_hours]`` in domain.toml:
+
+    [custom.quiet_hours]
+    bucket_seconds = 60         # release granularity
+    release_spread = 1800       # seconds after the window end releases are spread over
+    release_batch_size = 1000   # notifications released per run
+"""
+
+import zlib
+from dataclasses import dataclass
+from datetime import UTC, datetime, time, timedelta
+
+import structlog
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.mixins import handle
+from protean.utils.processing import Priority, processing_priority
+
+from notifications.channel import get_channel
+from notifications.domain import notifications
+from notifications.notification.dispatch import _dispatch_batch_via_channel
+from notifications.notification.notification import Notification, NotificationStatus
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class DeferralSettings:
+    bucket_seconds: int = 60
+    release_spread: int = 1800
+    release_batch_size: int = 1000
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "DeferralSettings":
+        return cls(
+            bucket_seconds=max(1, int(settings.get("bucket_seconds", 60))),
+            release_spread=max(0, int(settings.get("release_spread", 1800))),
+            release_batch_size=max(1, int(settings.get("release_batch_size", 1000))),
+        )
+
+
+def deferral_settings() -> DeferralSettings:
+    return DeferralSettings.from_config(custom_settings(notifications, "quiet_hours"))
+
+
+@notifications.projection
+class DeferredNotifications:
+    notification_id: Identifier(identifier=True, required=True)
+    recipient_id: Identifier(required=True)
+    notification_type: String(required=True)
+    channel: String(required=True)
+    bucket: DateTime(required=True)
+    release_at: DateTime(required=True)
+
+
+def _parse(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def quiet_hours_end(quiet_hours: tuple[str, str], at: datetime) -> datetime | None:
+    """Return when the quiet hours containing ``at`` end, or None if ``at`` is outside them."""
+    start, end = (_parse(value) for value in quiet_hours)
+    at = utc_naive(at)
+    now = at.time()
+    ends_today = datetime.combine(at.date(), end)
+
+    if start < end:
+        return ends_today if start <= now < end else None
+    if start > end:  # Crosses midnight
+        if now >= start:
+            return ends_today + timedelta(days=1)
+        return ends_today if now < end else None
+    return None  # Empty window
+
+
+def release_time(
+    quiet_hours: tuple[str, str] | None,
+    recipient_id: str,
+    at: datetime,
+    settings: DeferralSettings,
+) -> datetime | None:
+    """Return when a notification due at ``at`` may be sent, or None if it need not wait.
+
+    The recipient's offset into the release spread is stable, so all of a
+    customer's deferred notifications come out together.
+    """
+    if not quiet_hours:
+        return None
+    end = quiet_hours_end(quiet_hours, at)
+    if end is None:
+        return None
+    offset = zlib.crc32(str(recipient_id).encode()) % settings.release_spread if settings.release_spread else 0
+    return end + timedelta(seconds=offset)
+
+
+def bucket_of(at: datetime, bucket_seconds: int) -> datetime:
+    """Return the start of the time bucket ``at`` falls in."""
+    at = utc_naive(at).replace(microsecond=0)
+    return at - timedelta(seconds=int((at - datetime.min).total_seconds()) % bucket_seconds)
+
+
+def defer(notification: Notification, release_at: datetime, settings: DeferralSettings) -> None:
+    """Park a notification in the deferral queue until ``release_at``."""
+    release_at = utc_naive(release_at)
+    current_domain.repository_for(DeferredNotifications).add(
+        DeferredNotifications(
+            notification_id=str(notification.id),
+            recipient_id=str(notification.recipient_id),
+            notification_type=notification.notification_type,
+            channel=notification.channel,
+            bucket=bucket_of(release_at, settings.bucket_seconds),
+            release_at=release_at,
+        )
+    )
+
+
+def due_deferrals(as_of: datetime, limit: int, bucket_seconds: int) -> list[DeferredNotifications]:
+    """Return up to ``limit`` deferred notifications due at ``as_of``, earliest first.
+
+    The bucket bounds the scan; ``release_at`` keeps entries later in the
+    current bucket parked until their own release time.
+    """
+    return (
+        current_domain.view_for(DeferredNotifications)
+        .query.filter(bucket__lte=bucket_of(as_of, bucket_seconds), release_at__lte=utc_naive(as_of))
+        .order_by("release_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+def deferred_ids(notification_ids: list[str]) -> set[str]:
+    """Return which of ``notification_ids`` are parked in the deferral queue."""
+    if not notification_ids:
+        return set()
+    entries = current_domain.view_for(DeferredNotifications).query.filter(notification_id__in=notification_ids)
+    return {str(entry.notification_id) for entry in entries.all().items}
+
+
+@notifications.command(part_of="Notification")
+class ReleaseDeferredNotifications:
+    """Send deferred notifications whose quiet hours have ended."""
+
+    as_of: DateTime()  # Optional: defaults to now
+    limit: Integer()  # Optional: defaults to [custom.quiet_hours] release_batch_size
+
+
+@notifications.command_handler(part_of=Notification)
+class ReleaseDeferredNotificationsHandler:
+    @handle(ReleaseDeferredNotifications)
+    def release_deferred(self, command: ReleaseDeferredNotifications):
+        with processing_priority(Priority.LOW):
+            settings = deferral_settings()
+            as_of = command.as_of or datetime.now(UTC)
+            due = due_deferrals(as_of, command.limit or settings.release_batch_size, settings.bucket_seconds)
+
+            if not due:
+                logger.info("No deferred notifications due")
+                return 0
+
+            queue = current_domain.repository_for(DeferredNotifications)
+            repo = current_domain.repository_for(Notification)
+
+            # Each entry is released once; notifications cancelled or sent
+            # meanwhile are dropped from the queue without dispatch
+            due_ids = [str(entry.notification_id) for entry in due]
+            queue.query.filter(notification_id__in=due_ids).limit(len(due_ids)).delete()
+            batches: dict[tuple[str, str], list[Notification]] = {}
+            for entry in due:
+                try:
+                    notification = repo.get(str(entry.notification_id))
+                except Exception:
+                    continue
+                if notification.status != NotificationStatus.PENDING.value:
+                    continue
+                batches.setdefault((notification.channel, notification.notification_type), []).append(notification)
+
+            released_count = 0
+            for (channel, _), batch in batches.items():
+                try:
+                    results = _dispatch_batch_via_channel(get_channel(channel), batch)
+                except Exception as e:
+                    logger.error(
+                        "Deferred notification dispatch failed",
+                        channel=channel,
+                        notification_ids=[str(n.id) for n in batch],
+                        error=str(e),
+                    )
+                    results = [{"status": "failed", "error": str(e)} for _ in batch]
+                else:
+                    released_count += len(batch)
+
+                for notification, result in zip(batch, results, strict=True):
+                    if result.get("status") == "sent":
+                        notification.mark_sent()
+                    else:
+                        notification.mark_failed(result.get("error", "Unknown dispatch error"))
+                    repo.add(notification)
+
+            logger.info(
+                "Deferred notifications released",
+                released=released_count,
+                dequeued=len(due),
+                as_of=str(as_of),
+            )
+            return released_count
@@ -0,0 +1,257 @@
+"""Notification digests — coalesce bursts of one notification type per recipient.
+
+Some sources fire in bursts: carrier tracking updates during peak shipping,
+or LowStockDetected raised again and again for the same SKU. For the
+notification types given a window under ``[custom.digest.windows]``, the
+notification helpers run each notification through ``coalesce`` before
+creating it:
+
+- The first notification for a (recipient, type) opens a DigestWindow and is
+  sent as usual, so the recipient hears about the burst right away.
+- Notifications arriving while the window is open are absorbed into it: each
+  adds one DigestEntry row holding its summary line (the template's
+  ``summarize`` of its context), and no Notification is created.
+  Absorbing only ever inserts, so concurrent absorbs into one window cannot
+  overwrite each other's counts.
+- When the window closes, everything absorbed goes out as one digest
+  notification listing the summaries, created through the same helpers (so
+  preferences and quiet hours still apply). Entries that land while a window
+  is being closed stay keyed to the (recipient, type) and go out with the
+  next digest.
+
+Windows close through FlushNotificationDigests, triggered periodically by an
+external scheduler via the maintenance API endpoint, or when the next
+notification for the same recipient and type arrives after the window end.
+
+    [custom.digest]
+    max_lines = 20          # distinct summaries listed in a digest; the rest are counted
+
+    [custom.digest.windows]
+    LowStockAlert = 900     # seconds; types not listed are never coalesced
+"""
+
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.mixins import handle
+from protean.utils.processing import Priority, processing_priority
+
+from notifications.domain import notifications
+from notifications.notification.notification import Notification, RecipientType
+from notifications.templates import get_template
+from notifications.templates.engine import text_to_html
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class DigestSettings:
+    windows: dict[str, int] = field(default_factory=dict)
+    max_lines: int = 20
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "DigestSettings":
+        windows = settings.get("windows", {}) or {}
+        return cls(
+            windows={notification_type: int(seconds) for notification_type, seconds in windows.items() if seconds},
+            max_lines=max(1, int(settings.get("max_lines", 20))),
+        )
+
+
+def digest_settings() -> DigestSettings:
+    return DigestSettings.from_config(custom_settings(notifications, "digest"))
+
+
+@notifications.projection
+class DigestWindow:
+    window_id: Identifier(identifier=True, required=True)  # "<recipient_id>:<notification_type>"
+    recipient_id: Identifier(required=True)
+    recipient_type: String(required=True)
+    notification_type: String(required=True)
+    channel: String()  # Internal notifications only: the channel to send the digest on
+    source_event_type: String(max_length=200)
+    opened_at: DateTime(required=True)
+    closes_at: DateTime(required=True)
+
+
+@notifications.projection
+class DigestEntry:
+    entry_id: Identifier(identifier=True, required=True)
+    window_id: Identifier(required=True)
+    summary: String(required=True, max_length=500)
+    absorbed_at: DateTime(required=True)
+
+
+# Entries read and deleted at a time when a window closes
+ENTRY_BATCH_SIZE = 500
+
+
+def window_key(recipient_id: str, notification_type: str) -> str:
+    return f"{recipient_id}:{notification_type}"
+
+
+def coalesce(
+    recipient_id: str,
+    notification_type: str,
+    summary: str,
+    recipient_type: str = RecipientType.CUSTOMER.value,
+    channel: str | None = None,
+    source_event_type: str | None = None,
+) -> bool:
+    """Return True if the notification was absorbed into an open digest window.
+
+    False means the caller should create the notification as usual: the type
+    is not coalesced, or this notification opens a new window.
+    """
+    settings = digest_settings()
+    window_seconds = settings.windows.get(notification_type)
+    if not window_seconds:
+        return False
+
+    now = utc_naive(datetime.now(UTC))
+    repo = current_domain.repository_for(DigestWindow)
+    window_id = window_key(recipient_id, notification_type)
+    try:
+        window = repo.get(window_id)
+    except ObjectNotFoundError:
+        window = None
+
+    if window is not None and window.closes_at > now:
+        current_domain.repository_for(DigestEntry).add(
+            DigestEntry(entry_id=str(uuid.uuid4()), window_id=window_id, summary=summary[:500], absorbed_at=now)
+        )
+        return True
+
+    if window is not None:
+        close_window(window)
+
+    repo.add(
+        DigestWindow(
+            window_id=window_id,
+            recipient_id=str(recipient_id),
+            recipient_type=recipient_type,
+            notification_type=notification_type,
+            channel=channel,
+            source_event_type=source_event_type,
+            opened_at=now,
+            closes_at=now + timedelta(seconds=window_seconds),
+        )
+    )
+    return False
+
+
+def take_entries(window_id: str) -> Counter:
+    """Delete a window's absorbed entries; return how many times each summary was absorbed, in arrival order."""
+    summaries: Counter = Counter()
+    repo = current_domain.repository_for(DigestEntry)
+    while True:
+        entries = repo.query.filter(window_id=window_id).order_by("absorbed_at").limit(ENTRY_BATCH_SIZE).all().items
+        if not entries:
+            return summaries
+        for entry in entries:
+            summaries[entry.summary] += 1
+        repo.query.filter(entry_id__in=[entry.entry_id for entry in entries]).limit(len(entries)).delete()
+        if len(entries) < ENTRY_BATCH_SIZE:
+            return summaries
+
+
+def render_digest(window: DigestWindow, summaries: Counter) -> dict:
+    """Render the digest of the summaries a window absorbed."""
+    template_cls = get_template(window.notification_type)
+    count = sum(summaries.values())
+    subject = (template_cls.digest_subject or "{count} updates").format(count=count)
+
+    listed = list(summaries.items())[: digest_settings().max_lines]
+    lines = [f"- {line} (x{times})" if times > 1 else f"- {line}" for line, times in listed]
+    unlisted = count - sum(times for _, times in listed)
+    if unlisted:
+        lines.append(f"- and {unlisted} more")
+
+    body = f"{count} more updates since {window.opened_at:%H:%M} UTC:\n\n" + "\n".join(lines)
+    return {"subject": subject, "body": body, "html_body": text_to_html(body)}
+
+
+def close_window(window: DigestWindow) -> list[str]:
+    """Remove a window and send its digest if it absorbed anything; return the notification IDs."""
+    from notifications.notification.helpers import create_internal_notification, create_notifications_for_customer
+
+    current_domain.repository_for(DigestWindow).query.filter(window_id=window.window_id).delete()
+    summaries = take_entries(window.window_id)
+    if not summaries:
+        return []
+
+    absorbed = sum(summaries.values())
+    rendered = render_digest(window, summaries)
+    context = {"digest_count": absorbed}
+    if window.recipient_type == RecipientType.INTERNAL.value:
+        notification_ids = [
+            create_internal_notification(
+                notification_type=window.notification_type,
+                context=context,
+                channel=window.channel,
+                recipient_id=str(window.recipient_id),
+                source_event_type=window.source_event_type,
+                rendered=rendered,
+            )
+        ]
+    else:
+        notification_ids = create_notifications_for_customer(
+            customer_id=str(window.recipient_id),
+            notification_type=window.notification_type,
+            context=context,
+            source_event_type=window.source_event_type,
+            rendered=rendered,
+        )
+
+    logger.info(
+        "Notification digest sent",
+        recipient_id=str(window.recipient_id),
+        notification_type=window.notification_type,
+        absorbed=absorbed,
+    )
+    return notification_ids
+
+
+def closed_windows(as_of: datetime, limit: int) -> list[DigestWindow]:
+    """Return up to ``limit`` windows closed at ``as_of``, earliest first."""
+    return (
+        current_domain.view_for(DigestWindow)
+        .query.filter(closes_at__lte=utc_naive(as_of))
+        .order_by("closes_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+@notifications.command(part_of="Notification")
+class FlushNotificationDigests:
+    """Send the digests of coalescing windows that have closed."""
+
+    as_of: DateTime()  # Optional: defaults to now
+    limit: Integer(default=500)
+
+
+@notifications.command_handler(part_of=Notification)
+class FlushNotificationDigestsHandler:
+    @handle(FlushNotificationDigests)
+    def flush_digests(self, command: FlushNotificationDigests):
+        with processing_priority(Priority.LOW):
+            as_of = command.as_of or datetime.now(UTC)
+            windows = closed_windows(as_of, command.limit or 500)
+
+            digest_count = 0
+            for window in windows:
+                if close_window(window):
+                    digest_count += 1
+
+            logger.info("Notification digests flushed", windows=len(windows), digests=digest_count)
+            return digest_count
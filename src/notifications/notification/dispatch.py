@@ -3,6 +3,12 @@
 Reacts to NotificationCreated events and dispatches via the appropriate
 channel adapter (email, SMS, push, Slack). Updates the notification
 status to SENT or FAILED based on the result.
+
+With ``[custom.dispatch] mode = "pooled"`` the handler records a
+DispatchClaim, queues the send on the per-channel ChannelDispatchPool
+(dispatch_pool.py) and returns; the pool groups notifications of the same
+channel and type, sends each group through the adapter's ``send_batch`` and
+writes the statuses back in batches. Inline dispatch is the default.
 """
 
 import structlog
@@ -11,6 +17,13 @@ from protean.utils.mixins import handle
 
 from notifications.channel import get_channel
 from notifications.domain import notifications
+from notifications.notification.dispatch_pool import (
+    POOLED,
+    DispatchRequest,
+    claim_dispatch,
+    dispatch_mode,
+    get_dispatch_pool,
+)
 from notifications.notification.events import NotificationCreated
 from notifications.notification.notification import (
     Notification,
@@ -57,6 +70,11 @@ class NotificationDispatcher:
             )
             return
 
+        if dispatch_mode(current_domain) == POOLED:
+            claim_dispatch(notification)
+            get_dispatch_pool().submit(DispatchRequest.from_notification(notification))
+            return
+
         try:
             adapter = get_channel(notification.channel)
             result = _dispatch_via_channel(adapter, notification)
@@ -76,31 +94,71 @@ class NotificationDispatcher:
         repo.add(notification)
 
 
-def _dispatch_via_channel(adapter, notification: Notification) -> dict:
-    """Route dispatch to the correct adapter method based on channel."""
+def _channel_message(notification: Notification | DispatchRequest) -> dict | None:
+    """Build the adapter ``send`` arguments for a notification, or None for an unknown channel."""
     channel = notification.channel
 
     if channel == NotificationChannel.EMAIL.value:
-        return adapter.send(
-            to=str(notification.recipient_id),
-            subject=notification.subject or "",
-            body=notification.body,
-        )
+        return {
+            "to": str(notification.recipient_id),
+            "subject": notification.subject or "",
+            "body": notification.body,
+            "html_body": notification.html_body,
+        }
     elif channel == NotificationChannel.SMS.value:
-        return adapter.send(
-            to=str(notification.recipient_id),
-            body=notification.body,
-        )
+        return {
+            "to": str(notification.recipient_id),
+            "body": notification.body,
+        }
     elif channel == NotificationChannel.PUSH.value:
-        return adapter.send(
-            device_token=str(notification.recipient_id),
-            title=notification.subject or "",
-            body=notification.body,
-        )
+        return {
+            "device_token": str(notification.recipient_id),
+            "title": notification.subject or "",
+            "body": notification.body,
+        }
     elif channel == NotificationChannel.SLACK.value:
-        return adapter.send(
-            channel="#operations",
-            message=notification.body,
-        )
-    else:
-        return {"status": "failed", "error": f"Unknown channel: {channel}"}
+        return {
+            "channel": "#operations",
+            "message": notification.body,
+        }
+    return None
+
+
+def _dispatch_via_channel(adapter, notification: Notification | DispatchRequest) -> dict:
+    """Route dispatch to the correct adapter method based on channel."""
+    message = _channel_message(notification)
+    if message is None:
+        return {"status": "failed", "error": f"Unknown channel: {notification.channel}"}
+    return adapter.send(**message)
+
+
+def _dispatch_batch_via_channel(adapter, batch: list[Notification | DispatchRequest]) -> list[dict]:
+    """Send notifications of one channel through the adapter's batch API.
+
+    The batch is split into provider requests of at most
+    ``adapter.max_batch_size`` messages. Returns one result per notification,
+    in order; a request that raises, or answers with the wrong number of
+    results, fails every notification it carried.
+    """
+    results: list[dict] = []
+    size = max(1, getattr(adapter, "max_batch_size", 1))
+
+    for start in range(0, len(batch), size):
+        chunk = batch[start : start + size]
+        messages = [_channel_message(notification) for notification in chunk]
+        if any(message is None for message in messages):
+            # Batches are grouped by channel, so one unknown channel fails them all
+            error = f"Unknown channel: {chunk[0].channel}"
+            results.extend({"status": "failed", "error": error} for _ in chunk)
+            continue
+
+        try:
+            responses = adapter.send_batch(messages)
+            if len(responses) != len(chunk):
+                raise ValueError(f"Provider returned {len(responses)} results for {len(chunk)} messages")
+        except Exception as exc:
+            logger.error("Batch dispatch failed", channel=chunk[0].channel, size=len(chunk), error=str(exc))
+            responses = [{"status": "failed", "error": str(exc)} for _ in chunk]
+        results.extend(responses)
+
+    return results
@@ -0,0 +1,415 @@
+"""Pooled channel dispatch — concurrent, rate-limited sends for NotificationDispatcher.
+
+Inline dispatch calls the channel adapter on the event handler's thread, so a
+slow SMTP relay or SMS gateway caps the whole notifications engine. In pooled
+mode the dispatcher hands each notification to this pool and returns:
+
+- every channel (Email, SMS, Push, Slack) has its own bounded worker pool, so
+  a slow provider only slows its own channel;
+- at most ``max_pending`` sends per channel may be queued or in flight —
+  beyond that ``submit`` blocks, pushing back on the engine instead of
+  buffering without limit;
+- notifications of the same channel and type are accumulated and sent
+  ``batch_size`` at a time through the adapter's ``send_batch``; a partial
+  batch goes out on the next background tick (``flush_interval``);
+- a channel's workers share one token-bucket RateLimiter for its provider;
+- results are written back in batches — one unit of work marks up to
+  ``flush_size`` notifications SENT or FAILED.
+
+Queued sends and unwritten results live in process memory, so before the
+dispatcher hands a notification to the pool it records a ``DispatchClaim``
+row in its own unit of work. Write-back deletes the claim with the result.
+A claim that outlives ``claim_timeout`` belongs to a send that was lost
+(crash, deploy, SIGKILL) or whose result could not be written; the
+``RecoverInterruptedDispatches`` maintenance command marks such
+notifications FAILED, which schedules them for the retry scheduler. A send
+that went out before the process died may therefore be sent twice.
+
+Configured under ``[custom.dispatch]`` in domain.toml:
+
+    [custom.dispatch]
+    mode = "inline"            # or "pooled"
+    flush_size = 100
+    flush_interval = 0.2       # seconds between background write-backs
+    claim_timeout = 300        # seconds before an unresolved claim is recovered
+
+    [custom.dispatch.channels.Email]
+    workers = 8
+    max_pending = 200
+    rate_per_second = 50       # 0 = unlimited
+    batch_size = 100           # 1 = one provider request per notification
+"""
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+from protean.core.unit_of_work import UnitOfWork
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.mixins import handle
+from protean.utils.processing import Priority, processing_priority
+
+from notifications.channel import get_channel
+from notifications.channel.rate_limit import RateLimiter
+from notifications.domain import notifications
+from notifications.notification.notification import Notification, NotificationStatus
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+INLINE = "inline"
+POOLED = "pooled"
+
+
+@dataclass(frozen=True)
+class ChannelLimits:
+    """Concurrency, queue depth, provider rate and batch size for one channel."""
+
+    workers: int = 4
+    max_pending: int = 100
+    rate_per_second: float = 0.0
+    batch_size: int = 1
+
+
+@dataclass(frozen=True)
+class DispatchRequest:
+    """Snapshot of the notification fields a channel adapter needs."""
+
+    id: str
+    channel: str
+    notification_type: str
+    recipient_id: str
+    subject: str | None
+    body: str
+    html_body: str | None = None
+
+    @classmethod
+    def from_notification(cls, notification: Notification) -> "DispatchRequest":
+        return cls(
+            id=str(notification.id),
+            channel=notification.channel,
+            notification_type=notification.notification_type,
+            recipient_id=str(notification.recipient_id),
+            subject=notification.subject,
+            body=notification.body,
+            html_body=notification.html_body,
+        )
+
+
+@dataclass(frozen=True)
+class DispatchResult:
+    notification_id: str
+    sent: bool
+    error: str | None = None
+
+
+def dispatch_settings(domain: Any) -> dict:
+    """Return the ``[custom.dispatch]`` table of a domain's config."""
+    return custom_settings(domain, "dispatch")
+
+
+def dispatch_mode(domain: Any) -> str:
+    return dispatch_settings(domain).get("mode", INLINE)
+
+
+def claim_timeout(domain: Any) -> float:
+    return float(dispatch_settings(domain).get("claim_timeout", 300))
+
+
+@notifications.projection
+class DispatchClaim:
+    notification_id: Identifier(identifier=True, required=True)
+    channel: String(max_length=50, required=True)
+    claimed_at: DateTime(required=True)  # naive UTC
+
+
+def claim_dispatch(notification: Notification) -> None:
+    """Record that a notification has been handed to the pool and awaits its result."""
+    current_domain.repository_for(DispatchClaim).add(
+        DispatchClaim(
+            notification_id=str(notification.id),
+            channel=notification.channel,
+            claimed_at=utc_naive(datetime.now(UTC)),
+        )
+    )
+
+
+def stale_claims(as_of: datetime, timeout: float, limit: int) -> list[DispatchClaim]:
+    """Return up to ``limit`` claims older than ``timeout`` seconds at ``as_of``, oldest first."""
+    return (
+        current_domain.view_for(DispatchClaim)
+        .query.filter(claimed_at__lte=utc_naive(as_of) - timedelta(seconds=timeout))
+        .order_by("claimed_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+class ChannelDispatchPool:
+    """Per-channel worker pools with batching, backpressure, rate limiting and batched write-back."""
+
+    def __init__(
+        self,
+        limits: dict[str, ChannelLimits] | None = None,
+        flush_size: int = 100,
+        flush_interval: float = 0.2,
+    ):
+        self.limits = limits or {}
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._limiters: dict[str, RateLimiter] = {}
+        self._setup_lock = threading.Lock()
+
+        # Requests waiting for their batch to fill, keyed by (channel, notification type)
+        self._batches: dict[tuple[str, str], list[DispatchRequest]] = {}
+        self._batches_lock = threading.Lock()
+
+        self._results: list[DispatchResult] = []
+        self._results_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition()
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "ChannelDispatchPool":
+        channels = settings.get("channels", {}) or {}
+        return cls(
+            limits={name: ChannelLimits(**values) for name, values in channels.items()},
+            flush_size=int(settings.get("flush_size", 100)),
+            flush_interval=float(settings.get("flush_interval", 0.2)),
+        )
+
+    # -------------------------------------------------------------------
+    # Submission
+    # -------------------------------------------------------------------
+    def submit(self, request: DispatchRequest) -> None:
+        """Queue a send on the request's channel, blocking while that channel is full."""
+        self._channel(request.channel)
+        # Started first: a partial batch holding the channel's slots is only
+        # released by the background tick
+        self._ensure_flusher()
+        self._slots[request.channel].acquire()
+
+        with self._idle:
+            self._pending += 1
+
+        key = (request.channel, request.notification_type)
+        with self._batches_lock:
+            batch = self._batches.setdefault(key, [])
+            batch.append(request)
+            if len(batch) < self.limits.get(request.channel, ChannelLimits()).batch_size:
+                return
+            del self._batches[key]
+
+        self._executors[request.channel].submit(self._send_batch, batch)
+
+    def release_batches(self) -> None:
+        """Send every partially filled batch now."""
+        with self._batches_lock:
+            batches, self._batches = list(self._batches.values()), {}
+        for batch in batches:
+            self._executors[batch[0].channel].submit(self._send_batch, batch)
+
+    def _channel(self, channel: str) -> ThreadPoolExecutor:
+        with self._setup_lock:
+            if channel not in self._executors:
+                limits = self.limits.get(channel, ChannelLimits())
+                self._executors[channel] = ThreadPoolExecutor(
+                    max_workers=limits.workers,
+                    thread_name_prefix=f"dispatch-{channel.lower()}",
+                )
+                self._slots[channel] = threading.BoundedSemaphore(limits.max_pending)
+                self._limiters[channel] = RateLimiter(limits.rate_per_second)
+            return self._executors[channel]
+
+    def _send_batch(self, batch: list[DispatchRequest]) -> None:
+        from notifications.notification.dispatch import _dispatch_batch_via_channel
+
+        channel = batch[0].channel
+        try:
+            limiter = self._limiters[channel]
+            for _ in batch:
+                limiter.acquire()
+            responses = _dispatch_batch_via_channel(get_channel(channel), batch)
+        except Exception as exc:
+            logger.error("Notification dispatch failed", channel=channel, size=len(batch), error=str(exc))
+            responses = [{"status": "failed", "error": str(exc)} for _ in batch]
+        finally:
+            for _ in batch:
+                self._slots[channel].release()
+
+        results = [
+            DispatchResult(request.id, sent=True)
+            if response.get("status") == "sent"
+            else DispatchResult(request.id, sent=False, error=response.get("error", "Unknown dispatch error"))
+            for request, response in zip(batch, responses, strict=True)
+        ]
+
+        with self._results_lock:
+            self._results.extend(results)
+            if len(self._results) >= self.flush_size:
+                self._wake.set()
+
+        with self._idle:
+            self._pending -= len(batch)
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    # -------------------------------------------------------------------
+    # Write-back
+    # -------------------------------------------------------------------
+    def flush(self) -> int:
+        """Write back all collected results, ``flush_size`` per unit of work."""
+        with self._flush_lock:
+            with self._results_lock:
+                results, self._results = self._results, []
+
+            for start in range(0, len(results), self.flush_size):
+                self._write_back(results[start : start + self.flush_size])
+            return len(results)
+
+    def _write_back(self, batch: list[DispatchResult]) -> None:
+        with notifications.domain_context():
+            try:
+                with UnitOfWork():
+                    for result in batch:
+                        _apply_result(result)
+            except Exception as exc:
+                # One conflicting notification must not lose the whole batch
+                logger.warning("Batched write-back failed, retrying one by one", size=len(batch), error=str(exc))
+                for result in batch:
+                    try:
+                        _apply_result(result)
+                    except Exception as item_exc:
+                        logger.error(
+                            "Failed to record dispatch result",
+                            notification_id=result.notification_id,
+                            error=str(item_exc),
+                        )
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None:
+            with self._setup_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="dispatch-flusher", daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.release_batches()
+                self.flush()
+            except Exception as exc:
+                logger.error("Dispatch write-back loop error", error=str(exc))
+
+    # -------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------
+    def drain(self, timeout: float | None = None) -> int:
+        """Send any partial batches, wait for every send to finish, then write back the results."""
+        self.release_batches()
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+        return self.flush()
+
+    def shutdown(self) -> None:
+        """Drain outstanding sends and stop the worker and flusher threads."""
+        self.drain()
+        self._stopped.set()
+        self._wake.set()
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+
+def _apply_result(result: DispatchResult) -> None:
+    repo = current_domain.repository_for(Notification)
+    notification = repo.get(result.notification_id)
+    if result.sent:
+        notification.mark_sent()
+    else:
+        notification.mark_failed(result.error or "Unknown dispatch error")
+    repo.add(notification)
+    current_domain.repository_for(DispatchClaim).query.filter(notification_id=result.notification_id).delete()
+
+
+@notifications.command(part_of="Notification")
+class RecoverInterruptedDispatches:
+    """Fail pooled sends whose result was never written back, so they are retried."""
+
+    as_of: DateTime()  # Optional: defaults to now
+    limit: Integer(default=500)
+
+
+@notifications.command_handler(part_of=Notification)
+class RecoverInterruptedDispatchesHandler:
+    @handle(RecoverInterruptedDispatches)
+    def recover_interrupted(self, command: RecoverInterruptedDispatches):
+        with processing_priority(Priority.LOW):
+            as_of = command.as_of or datetime.now(UTC)
+            stale = stale_claims(as_of, claim_timeout(current_domain), command.limit or 500)
+            if not stale:
+                return 0
+
+            claims = current_domain.repository_for(DispatchClaim)
+            stale_ids = [str(claim.notification_id) for claim in stale]
+            claims.query.filter(notification_id__in=stale_ids).limit(len(stale_ids)).delete()
+
+            # Notifications whose result did land (claim written after a fast
+            # write-back) are no longer PENDING and are left alone
+            repo = current_domain.repository_for(Notification)
+            recovered = 0
+            for notification_id in stale_ids:
+                try:
+                    notification = repo.get(notification_id)
+                except ObjectNotFoundError:
+                    continue
+                if notification.status != NotificationStatus.PENDING.value:
+                    continue
+                notification.mark_failed("Dispatch interrupted before its result was recorded")
+                repo.add(notification)
+                recovered += 1
+
+            if recovered:
+                logger.warning("Recovered interrupted dispatches", count=recovered)
+            return recovered
+
+
+_pool: ChannelDispatchPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_dispatch_pool() -> ChannelDispatchPool:
+    """Return the process-wide dispatch pool, built from the domain config on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ChannelDispatchPool.from_config(dispatch_settings(current_domain))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def reset_dispatch_pool() -> None:
+    """Shut down and discard the process-wide pool (useful for testing)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            atexit.unregister(_pool.shutdown)
+            _pool = None
@@ -28,6 +28,7 @@ class NotificationSent:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     sent_at: DateTime(required=True)
 
 
@@ -38,6 +39,7 @@ class NotificationDelivered:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     delivered_at: DateTime(required=True)
 
 
@@ -48,6 +50,7 @@ class NotificationFailed:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     reason: String(required=True)
     retry_count: Integer(required=True)
     max_retries: Integer(required=True)
@@ -61,6 +64,7 @@ class NotificationBounced:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     reason: String(required=True)
     bounced_at: DateTime(required=True)
 
@@ -72,6 +76,7 @@ class NotificationCancelled:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     reason: String(required=True)
     cancelled_at: DateTime(required=True)
 
@@ -83,5 +88,6 @@ class NotificationRetried:
     notification_id: Identifier(required=True)
     recipient_id: Identifier(required=True)
     channel: String(required=True)
+    notification_type: String()  # Absent on events recorded before it was added
     retry_count: Integer(required=True)
     retried_at: DateTime(required=True)
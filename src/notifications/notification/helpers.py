@@ -1,18 +1,25 @@
 """Shared helpers for notification event handlers.
 
 Provides the common pattern: look up preferences → filter channels →
-render template → create Notification per channel.
+render template → create Notification per channel. Bursts of a coalesced
+notification type are merged into digests (digest.py), and notifications
+that would go out during the customer's quiet hours are deferred
+(deferral.py).
 """
 
+from datetime import UTC, datetime
+
 import structlog
 from protean.utils.globals import current_domain
 
+from notifications.notification.deferral import defer, deferral_settings, release_time
+from notifications.notification.digest import coalesce
 from notifications.notification.notification import (
     Notification,
     NotificationChannel,
     RecipientType,
 )
-from notifications.preference.preference import NotificationPreference
+from notifications.preference.cache import get_preference_cache
 from notifications.templates import get_template
 
 logger = structlog.get_logger(__name__)
@@ -25,24 +32,29 @@ def create_notifications_for_customer(
     source_event_type: str | None = None,
     source_event_id: str | None = None,
     scheduled_for=None,
+    rendered: dict | None = None,
 ):
     """Create notification(s) for a customer based on their preferences.
 
-    Looks up customer preferences, filters channels, renders template,
-    and creates one Notification aggregate per enabled channel.
+    Looks up customer preferences (via the preference cache), filters
+    channels, renders template, and creates one Notification aggregate per
+    enabled channel. If the notification would go out (now, or at
+    ``scheduled_for``) during the customer's quiet hours, it is scheduled
+    for after the window and parked in the deferral queue.
+
+    ``rendered`` supplies pre-rendered content (a digest) in place of the
+    template; such notifications are never coalesced.
 
     Returns:
-        List of notification IDs created.
+        List of notification IDs created (empty if absorbed into a digest).
     """
     template_cls = get_template(notification_type)
-    rendered = template_cls.render(context)
+    coalescible = rendered is None
     default_channels = template_cls.default_channels
 
-    # Look up customer preferences
-    pref_repo = current_domain.repository_for(NotificationPreference)
+    # Look up customer preferences (served from the in-memory preference cache)
     try:
-        prefs = pref_repo.query.filter(customer_id=customer_id).all().items
-        pref = prefs[0] if prefs else None
+        pref = get_preference_cache().lookup(customer_id)
     except Exception:
         pref = None
 
@@ -71,6 +83,25 @@ def create_notifications_for_customer(
         )
         return []
 
+    if coalescible and coalesce(
+        customer_id, notification_type, template_cls.summarize(context), source_event_type=source_event_type
+    ):
+        return []
+
+    if rendered is None:
+        if NotificationChannel.EMAIL.value in channels:
+            rendered = template_cls.render(context)
+        else:
+            rendered = template_cls.render_text(context)
+
+    # Hold notifications that would land in the customer's quiet hours
+    settings = deferral_settings()
+    release_at = None
+    if pref and pref.quiet_hours:
+        release_at = release_time(pref.quiet_hours, customer_id, scheduled_for or datetime.now(UTC), settings)
+        if release_at is not None:
+            scheduled_for = release_at
+
     # Create one notification per channel
     notification_ids = []
     repo = current_domain.repository_for(Notification)
@@ -82,6 +113,7 @@ def create_notifications_for_customer(
             channel=channel,
             subject=rendered.get("subject"),
             body=rendered["body"],
+            html_body=rendered.get("html_body") if channel == NotificationChannel.EMAIL.value else None,
             recipient_type=RecipientType.CUSTOMER.value,
             template_name=template_cls.__name__,
             source_event_type=source_event_type,
@@ -90,6 +122,8 @@ def create_notifications_for_customer(
             scheduled_for=scheduled_for,
         )
         repo.add(notification)
+        if release_at is not None:
+            defer(notification, release_at, settings)
         notification_ids.append(str(notification.id))
 
     logger.info(
@@ -98,6 +132,7 @@ def create_notifications_for_customer(
         notification_type=notification_type,
         channels=channels,
         count=len(notification_ids),
+        deferred_until=str(release_at) if release_at else None,
     )
 
     return notification_ids
@@ -110,16 +145,31 @@ def create_internal_notification(
     recipient_id: str = "operations",
     source_event_type: str | None = None,
     source_event_id: str | None = None,
+    rendered: dict | None = None,
 ):
     """Create an internal notification (e.g., Slack alert for ops).
 
-    Internal notifications skip preference checks.
+    Internal notifications skip preference checks. ``rendered`` supplies
+    pre-rendered content (a digest) in place of the template.
 
     Returns:
-        Notification ID.
+        Notification ID, or None if absorbed into a digest.
     """
     template_cls = get_template(notification_type)
-    rendered = template_cls.render(context)
+    if rendered is None:
+        if coalesce(
+            recipient_id,
+            notification_type,
+            template_cls.summarize(context),
+            recipient_type=RecipientType.INTERNAL.value,
+            channel=channel,
+            source_event_type=source_event_type,
+        ):
+            return None
+        if channel == NotificationChannel.EMAIL.value:
+            rendered = template_cls.render(context)
+        else:
+            rendered = template_cls.render_text(context)
 
     repo = current_domain.repository_for(Notification)
 
@@ -129,6 +179,7 @@ def create_internal_notification(
         channel=channel,
         subject=rendered.get("subject"),
         body=rendered["body"],
+        html_body=rendered.get("html_body") if channel == NotificationChannel.EMAIL.value else None,
         recipient_type=RecipientType.INTERNAL.value,
         template_name=template_cls.__name__,
         source_event_type=source_event_type,
@@ -115,6 +115,10 @@ class Notification:
     # Content
     subject: String(max_length=500)
     body: Text(required=True)
+    # Email only. Not sanitized: the value is markup generated by the template
+    # engine (<p>/<br> around the text body), which sanitizing would escape,
+    # and every context value in it was already HTML-escaped by the engine.
+    html_body: Text(sanitize=False)
 
     # Template
     template_name: String(max_length=200)
@@ -154,6 +158,7 @@ class Notification:
         channel,
         body,
         subject=None,
+        html_body=None,
         recipient_type=RecipientType.CUSTOMER.value,
         template_name=None,
         source_event_type=None,
@@ -172,6 +177,7 @@ class Notification:
             channel=channel,
             subject=subject,
             body=body,
+            html_body=html_body,
             template_name=template_name,
             source_event_type=source_event_type,
             source_event_id=source_event_id,
@@ -224,6 +230,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 sent_at=now,
             )
         )
@@ -242,6 +249,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 delivered_at=now,
             )
         )
@@ -261,6 +269,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 reason=reason,
                 retry_count=self.retry_count,
                 max_retries=self.max_retries,
@@ -282,6 +291,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 reason=reason,
                 bounced_at=now,
             )
@@ -301,6 +311,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 reason=reason,
                 cancelled_at=now,
             )
@@ -323,6 +334,7 @@ class Notification:
                 notification_id=str(self.id),
                 recipient_id=str(self.recipient_id),
                 channel=self.channel,
+                notification_type=self.notification_type,
                 retry_count=self.retry_count,
                 retried_at=now,
             )
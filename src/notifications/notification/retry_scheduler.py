@@ -0,0 +1,247 @@
+"""Automatic retries — jittered exponential backoff with per-provider circuit breaking.
+
+Each time a notification fails with attempts left, the ScheduledRetry index
+gets a row due after an exponential backoff:
+
+    delay = min(max_delay, base_delay * multiplier ** (retry_count - 1))
+    due_at = failed_at + delay / 2 + uniform(0, delay / 2)
+
+The jitter spreads the notifications that failed together in an outage, so
+they do not all come back at the same moment. Sends, cancellations and
+manual retries remove the row.
+
+RetryFailedNotifications, triggered periodically by an external scheduler
+via the maintenance API endpoint, claims due rows per channel, earliest
+first and at most ``claim_batch_size`` per run. It retries each
+notification and resends the claimed batch through the channel's batch API.
+Every channel provider has a CircuitBreaker fed by these resends: while it
+is open the channel's retries stay queued, and after the cooldown a small
+probe batch decides whether the rest may follow.
+
+    [custom.retry]
+    base_delay = 30             # seconds before the first retry (before jitter)
+    multiplier = 2
+    max_delay = 3600
+    claim_batch_size = 200      # retries claimed per run
+
+    [custom.retry.circuit_breaker]
+    failure_threshold = 5       # consecutive failed resends that open the breaker
+    cooldown = 60               # seconds before probing again
+    probe_size = 5              # resends allowed while probing
+"""
+
+import random
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean.core.projector import on
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.mixins import handle
+from protean.utils.processing import Priority, processing_priority
+
+from notifications.channel import get_channel
+from notifications.channel.circuit_breaker import CircuitBreaker
+from notifications.domain import notifications
+from notifications.notification.dispatch import _dispatch_batch_via_channel
+from notifications.notification.events import (
+    NotificationCancelled,
+    NotificationFailed,
+    NotificationRetried,
+    NotificationSent,
+)
+from notifications.notification.notification import Notification, NotificationChannel, NotificationStatus
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RetrySettings:
+    base_delay: float = 30.0
+    multiplier: float = 2.0
+    max_delay: float = 3600.0
+    claim_batch_size: int = 200
+    failure_threshold: int = 5
+    cooldown: float = 60.0
+    probe_size: int = 5
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "RetrySettings":
+        breaker = settings.get("circuit_breaker", {}) or {}
+        return cls(
+            base_delay=float(settings.get("base_delay", 30)),
+            multiplier=float(settings.get("multiplier", 2)),
+            max_delay=float(settings.get("max_delay", 3600)),
+            claim_batch_size=max(1, int(settings.get("claim_batch_size", 200))),
+            failure_threshold=int(breaker.get("failure_threshold", 5)),
+            cooldown=float(breaker.get("cooldown", 60)),
+            probe_size=int(breaker.get("probe_size", 5)),
+        )
+
+
+def retry_settings() -> RetrySettings:
+    return RetrySettings.from_config(custom_settings(notifications, "retry"))
+
+
+def backoff_delay(retry_count: int, settings: RetrySettings, rand: Callable[[], float] = random.random) -> float:
+    """Seconds to wait before retrying after the ``retry_count``-th failure (equal jitter)."""
+    delay = min(settings.max_delay, settings.base_delay * settings.multiplier ** max(0, retry_count - 1))
+    return delay / 2 + rand() * delay / 2
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(channel: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a channel's provider."""
+    with _breakers_lock:
+        breaker = _breakers.get(channel)
+        if breaker is None:
+            settings = retry_settings()
+            breaker = _breakers[channel] = CircuitBreaker(
+                failure_threshold=settings.failure_threshold,
+                cooldown=settings.cooldown,
+                probe_size=settings.probe_size,
+            )
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Discard all circuit breakers (useful for testing)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+@notifications.projection
+class ScheduledRetry:
+    notification_id: Identifier(identifier=True, required=True)
+    channel: String(required=True)
+    retry_count: Integer(default=0)
+    due_at: DateTime(required=True)
+
+
+@notifications.projector(projector_for=ScheduledRetry, aggregates=[Notification])
+class ScheduledRetryProjector:
+    @on(NotificationFailed)
+    def on_notification_failed(self, event):
+        if event.retry_count >= event.max_retries:
+            self._remove(event.notification_id)
+            return
+
+        delay = backoff_delay(event.retry_count, retry_settings())
+        current_domain.repository_for(ScheduledRetry).add(
+            ScheduledRetry(
+                notification_id=event.notification_id,
+                channel=event.channel,
+                retry_count=event.retry_count,
+                due_at=utc_naive(event.failed_at) + timedelta(seconds=delay),
+            )
+        )
+
+    @on(NotificationRetried)
+    def on_notification_retried(self, event):
+        self._remove(event.notification_id)
+
+    @on(NotificationSent)
+    def on_notification_sent(self, event):
+        self._remove(event.notification_id)
+
+    @on(NotificationCancelled)
+    def on_notification_cancelled(self, event):
+        self._remove(event.notification_id)
+
+    def _remove(self, notification_id):
+        current_domain.repository_for(ScheduledRetry).query.filter(notification_id=str(notification_id)).delete()
+
+
+def due_retries(channel: str, as_of: datetime, limit: int) -> list[ScheduledRetry]:
+    """Return up to ``limit`` of the channel's retries due at ``as_of``, earliest first."""
+    return (
+        current_domain.view_for(ScheduledRetry)
+        .query.filter(channel=channel, due_at__lte=utc_naive(as_of))
+        .order_by("due_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+@notifications.command(part_of="Notification")
+class RetryFailedNotifications:
+    """Retry failed notifications whose backoff has elapsed."""
+
+    as_of: DateTime()  # Optional: defaults to now
+    limit: Integer()  # Optional: defaults to [custom.retry] claim_batch_size
+
+
+@notifications.command_handler(part_of=Notification)
+class RetryFailedNotificationsHandler:
+    @handle(RetryFailedNotifications)
+    def retry_failed(self, command: RetryFailedNotifications):
+        with processing_priority(Priority.LOW):
+            as_of = command.as_of or datetime.now(UTC)
+            remaining = command.limit or retry_settings().claim_batch_size
+            queue = current_domain.repository_for(ScheduledRetry)
+            repo = current_domain.repository_for(Notification)
+
+            sent_count = 0
+            for channel in (channel.value for channel in NotificationChannel):
+                breaker = get_circuit_breaker(channel)
+                allowed = breaker.allowance(remaining)
+                if not allowed:
+                    continue
+
+                claimed = due_retries(channel, as_of, allowed)
+                remaining -= len(claimed)
+
+                # Claiming removes the row; a notification sent, cancelled or
+                # retried by hand meanwhile is no longer FAILED and is skipped
+                if claimed:
+                    claimed_ids = [str(entry.notification_id) for entry in claimed]
+                    queue.query.filter(notification_id__in=claimed_ids).limit(len(claimed_ids)).delete()
+                batch: list[Notification] = []
+                for entry in claimed:
+                    try:
+                        notification = repo.get(str(entry.notification_id))
+                    except ObjectNotFoundError:
+                        continue
+                    if notification.status != NotificationStatus.FAILED.value:
+                        continue
+                    if notification.retry_count >= notification.max_retries:
+                        continue
+                    notification.retry()
+                    batch.append(notification)
+
+                if not batch:
+                    continue
+
+                results = _dispatch_batch_via_channel(get_channel(channel), batch)
+                for notification, result in zip(batch, results, strict=True):
+                    if result.get("status") == "sent":
+                        notification.mark_sent()
+                        breaker.record_success()
+                        sent_count += 1
+                    else:
+                        notification.mark_failed(result.get("error", "Unknown dispatch error"))
+                        breaker.record_failure()
+                    repo.add(notification)
+
+                logger.info(
+                    "Retried failed notifications",
+                    channel=channel,
+                    claimed=len(claimed),
+                    retried=len(batch),
+                    circuit=breaker.state.value,
+                )
+
+                if remaining <= 0:
+                    break
+
+            return sent_count
@@ -1,7 +1,10 @@
 """ProcessScheduledNotifications command + handler — dispatch due notifications.
 
 This handler is invoked by a background job or cron to dispatch
-notifications whose scheduled_for time has passed.
+notifications whose scheduled_for time has passed. Due notifications are
+sent in batches of the same channel and type. Notifications held for quiet
+hours are left to ReleaseDeferredNotifications (deferral.py), which
+releases them in smoothed batches.
 """
 
 from datetime import UTC, datetime
@@ -14,7 +17,8 @@ from protean.utils.processing import Priority, processing_priority
 
 from notifications.channel import get_channel
 from notifications.domain import notifications
-from notifications.notification.dispatch import _dispatch_via_channel
+from notifications.notification.deferral import deferred_ids
+from notifications.notification.dispatch import _dispatch_batch_via_channel
 from notifications.notification.notification import Notification, NotificationStatus
 
 logger = structlog.get_logger(__name__)
@@ -42,7 +46,9 @@ class ProcessScheduledNotificationsHandler:
                 logger.info("No pending notifications found")
                 return
 
-            dispatched_count = 0
+            # Group due notifications by channel and type, so each group goes
+            # out through the channel's batch API
+            due: dict[tuple[str, str], list[Notification]] = {}
             for notification in pending:
                 # Skip notifications that aren't due yet
                 if notification.scheduled_for is None:
@@ -58,24 +64,33 @@ class ProcessScheduledNotificationsHandler:
                 if sched > as_of:
                     continue
 
-                try:
-                    adapter = get_channel(notification.channel)
-                    result = _dispatch_via_channel(adapter, notification)
+                due.setdefault((notification.channel, notification.notification_type), []).append(notification)
 
-                    if result.get("status") == "sent":
-                        notification.mark_sent()
-                    else:
-                        notification.mark_failed(result.get("error", "Unknown dispatch error"))
-                    dispatched_count += 1
+            held = deferred_ids([str(n.id) for batch in due.values() for n in batch])
+            if held:
+                due = {key: kept for key, batch in due.items() if (kept := [n for n in batch if str(n.id) not in held])}
+
+            dispatched_count = 0
+            for (channel, _), batch in due.items():
+                try:
+                    results = _dispatch_batch_via_channel(get_channel(channel), batch)
                 except Exception as e:
-                    notification.mark_failed(str(e))
                     logger.error(
                         "Scheduled notification dispatch failed",
-                        notification_id=str(notification.id),
+                        channel=channel,
+                        notification_ids=[str(n.id) for n in batch],
                         error=str(e),
                     )
+                    results = [{"status": "failed", "error": str(e)} for _ in batch]
+                else:
+                    dispatched_count += len(batch)
 
-                repo.add(notification)
+                for notification, result in zip(batch, results, strict=True):
+                    if result.get("status") == "sent":
+                        notification.mark_sent()
+                    else:
+                        notification.mark_failed(result.get("error", "Unknown dispatch error"))
+                    repo.add(notification)
 
             logger.info(
                 "Scheduled notifications processed",
@@ -0,0 +1,344 @@
+"""Preference cache — in-memory customer preference lookups for notification fan-out.
+
+Every notification-triggering event calls create_notifications_for_customer,
+which needs the customer's enabled channels, unsubscribed types and quiet
+hours. Instead of querying NotificationPreference each time, the lookup is
+served from a compact per-process cache:
+
+    customer_id → PreferenceEntry(channel bitmask, unsubscribed types, quiet hours)
+
+A customer is loaded from the repository on first lookup. A customer with
+no preferences is cached too, as an absent entry, so their lookups do not
+read the database either.
+
+The cache is per process, while engine workers share one subscription, so
+only the worker that consumes a NotificationPreference event sees it.
+PreferenceCacheUpdater therefore applies the change to that worker's cache
+and also records it in ``PreferenceChange``. Every cache reads the changes
+recorded since its last look, at most once per ``sync_interval``, and drops
+the entries they name — including absent entries, which PreferencesCreated
+clears this way. An opt-out reaches every worker within ``sync_interval``;
+the TTL is only a backstop, so it can be long.
+
+Each sync re-reads the last ``SYNC_OVERLAP`` of changes, so a change
+committed late, or stamped by a worker whose clock runs behind, is not
+missed.
+
+Configured under ``[custom.preference_cache]`` in domain.toml:
+
+    [custom.preference_cache]
+    max_entries = 100000    # least recently used customers are evicted beyond this
+    ttl = 3600              # seconds before an entry is reloaded regardless of changes
+    sync_interval = 1       # seconds between reads of PreferenceChange
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+
+from protean import Index
+from protean.fields import DateTime, Identifier
+from protean.utils.globals import current_domain
+from protean.utils.mixins import handle
+
+from notifications.domain import notifications
+from notifications.notification.notification import NotificationChannel
+from notifications.preference.events import (
+    ChannelsUpdated,
+    PreferencesCreated,
+    QuietHoursCleared,
+    QuietHoursSet,
+    TypeResubscribed,
+    TypeUnsubscribed,
+)
+from notifications.preference.preference import NotificationPreference
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+EMAIL = 1
+SMS = 2
+PUSH = 4
+
+DEFAULT_TTL = 3600.0
+DEFAULT_SYNC_INTERVAL = 1.0
+
+SYNC_OVERLAP = timedelta(seconds=10)  # changes re-read on every sync
+SYNC_BATCH_SIZE = 1000  # more changes than this since the last sync clear the whole cache
+CHANGE_RETENTION = timedelta(hours=1)  # recorded changes are pruned after this
+
+# In the order NotificationPreference.get_enabled_channels() lists them
+_CHANNEL_BITS = (
+    (NotificationChannel.EMAIL.value, EMAIL),
+    (NotificationChannel.SMS.value, SMS),
+    (NotificationChannel.PUSH.value, PUSH),
+)
+
+
+def channel_mask(email: bool, sms: bool, push: bool) -> int:
+    return (EMAIL if email else 0) | (SMS if sms else 0) | (PUSH if push else 0)
+
+
+@dataclass(frozen=True, slots=True)
+class PreferenceEntry:
+    """The parts of a NotificationPreference that notification fan-out reads."""
+
+    channels: int = EMAIL
+    unsubscribed: frozenset[str] = frozenset()
+    quiet_hours: tuple[str, str] | None = None
+
+    @classmethod
+    def from_preference(cls, pref: NotificationPreference) -> "PreferenceEntry":
+        quiet_hours = None
+        if pref.quiet_hours_start and pref.quiet_hours_end:
+            quiet_hours = (pref.quiet_hours_start, pref.quiet_hours_end)
+        return cls(
+            channels=channel_mask(pref.email_enabled, pref.sms_enabled, pref.push_enabled),
+            unsubscribed=frozenset(pref.unsubscribed_types or ()),
+            quiet_hours=quiet_hours,
+        )
+
+    def is_subscribed_to(self, notification_type: str) -> bool:
+        return notification_type not in self.unsubscribed
+
+    def get_enabled_channels(self) -> list[str]:
+        return [channel for channel, bit in _CHANNEL_BITS if self.channels & bit]
+
+
+@notifications.projection(indexes=[Index("changed_at")])
+class PreferenceChange:
+    change_id: Identifier(identifier=True, required=True)
+    customer_id: Identifier(required=True)
+    changed_at: DateTime(required=True)
+
+
+def _now() -> datetime:
+    return utc_naive(datetime.now(UTC))
+
+
+def record_change(customer_id: str) -> str:
+    """Record that a customer's preferences changed; prunes changes past retention. Returns the change id."""
+    repo = current_domain.repository_for(PreferenceChange)
+    now = _now()
+    change_id = str(uuid.uuid4())
+    repo.add(PreferenceChange(change_id=change_id, customer_id=str(customer_id), changed_at=now))
+    repo.query.filter(changed_at__lt=now - CHANGE_RETENTION).limit(100).delete()
+    return change_id
+
+
+def _changes_since(since: datetime) -> list[PreferenceChange]:
+    return (
+        current_domain.view_for(PreferenceChange)
+        .query.filter(changed_at__gt=since)
+        .order_by("changed_at")
+        .limit(SYNC_BATCH_SIZE + 1)
+        .all()
+        .items
+    )
+
+
+def _load(customer_id: str) -> PreferenceEntry | None:
+    prefs = current_domain.repository_for(NotificationPreference).query.filter(customer_id=customer_id).all().items
+    return PreferenceEntry.from_preference(prefs[0]) if prefs else None
+
+
+class PreferenceCache:
+    """Thread-safe LRU map of customer_id to PreferenceEntry (None: no preferences), synced from PreferenceChange."""
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl: float = DEFAULT_TTL,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0 or sync_interval < 0:
+            raise ValueError("Preference cache ttl must be positive and sync_interval not negative")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[PreferenceEntry | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._synced_at = clock()
+        self._seen_until = _now() - SYNC_OVERLAP
+        self._applied: dict[str, datetime] = {}  # changes recorded here, already applied by update()
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "PreferenceCache":
+        return cls(
+            max_entries=int(settings.get("max_entries", 100_000)),
+            ttl=float(settings.get("ttl", DEFAULT_TTL)),
+            sync_interval=float(settings.get("sync_interval", DEFAULT_SYNC_INTERVAL)),
+        )
+
+    def lookup(self, customer_id: str) -> PreferenceEntry | None:
+        """Return the customer's preferences, loading them on a miss.
+
+        Returns None for a customer with no preferences, and caches that
+        answer. Repository errors propagate and nothing is cached.
+        """
+        customer_id = str(customer_id)
+        self.sync()
+        with self._lock:
+            cached = self._entries.get(customer_id)
+            if cached is not None and not self._expired(cached[1]):
+                self._entries.move_to_end(customer_id)
+                return cached[0]
+
+        entry = _load(customer_id)
+        self.put(customer_id, entry)
+        return entry
+
+    def sync(self) -> None:
+        """Drop entries changed in other processes, if ``sync_interval`` has passed since the last sync."""
+        with self._lock:
+            if self._clock() - self._synced_at < self.sync_interval:
+                return
+            self._synced_at = self._clock()
+            since = self._seen_until
+
+        started = _now()
+        try:
+            changes = _changes_since(since)
+        except Exception:
+            with self._lock:
+                self._synced_at = float("-inf")  # retry on the next lookup
+            raise
+
+        with self._lock:
+            if len(changes) > SYNC_BATCH_SIZE:
+                self._entries.clear()
+            else:
+                for change in changes:
+                    if str(change.change_id) not in self._applied:
+                        self._entries.pop(str(change.customer_id), None)
+            self._seen_until = started - SYNC_OVERLAP
+            self._applied = {
+                change_id: at for change_id, at in self._applied.items() if at > self._seen_until - SYNC_OVERLAP
+            }
+
+    def put(self, customer_id: str, entry: PreferenceEntry | None, change_id: str | None = None) -> None:
+        """Cache an entry; ``change_id`` marks it as reflecting that recorded change (see ``update``)."""
+        with self._lock:
+            if change_id is not None:
+                self._applied[change_id] = _now()
+            self._entries[str(customer_id)] = (entry, self._clock())
+            self._entries.move_to_end(str(customer_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update(
+        self,
+        customer_id: str,
+        change: Callable[[PreferenceEntry], PreferenceEntry],
+        change_id: str | None = None,
+    ) -> None:
+        """Apply ``change`` to a cached entry; uncached or absent customers are left to load on demand.
+
+        ``change_id`` is the PreferenceChange recorded for this change, which
+        the next sync then skips instead of dropping the entry.
+        """
+        customer_id = str(customer_id)
+        with self._lock:
+            cached = self._entries.get(customer_id)
+            if cached is None or cached[0] is None:
+                self._entries.pop(customer_id, None)
+                return
+            entry, loaded_at = cached
+            self._entries[customer_id] = (change(entry), loaded_at)
+            if change_id is not None:
+                self._applied[change_id] = _now()
+
+    def discard(self, customer_id: str) -> None:
+        with self._lock:
+            self._entries.pop(str(customer_id), None)
+
+    def get(self, customer_id: str) -> PreferenceEntry | None:
+        """Return the cached entry without loading (None if absent or not cached)."""
+        with self._lock:
+            cached = self._entries.get(str(customer_id))
+        return cached[0] if cached else None
+
+    def __contains__(self, customer_id: str) -> bool:
+        with self._lock:
+            return str(customer_id) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _expired(self, loaded_at: float) -> bool:
+        return self._clock() - loaded_at > self.ttl
+
+
+_cache: PreferenceCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_preference_cache() -> PreferenceCache:
+    """Return the process-wide preference cache, built from the domain config on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PreferenceCache.from_config(custom_settings(notifications, "preference_cache"))
+        return _cache
+
+
+def reset_preference_cache() -> None:
+    """Discard the process-wide cache (useful for testing)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+def _apply(customer_id: str, change: Callable[[PreferenceEntry], PreferenceEntry]) -> None:
+    get_preference_cache().update(customer_id, change, change_id=record_change(customer_id))
+
+
+@notifications.event_handler(part_of=NotificationPreference)
+class PreferenceCacheUpdater:
+    """Keeps the preference caches in step with NotificationPreference changes.
+
+    Applies each change to this process's cache and records it for the
+    caches of every other process.
+    """
+
+    @handle(PreferencesCreated)
+    def on_preferences_created(self, event: PreferencesCreated) -> None:
+        get_preference_cache().put(
+            event.customer_id,
+            PreferenceEntry(channels=channel_mask(event.email_enabled, event.sms_enabled, event.push_enabled)),
+            change_id=record_change(event.customer_id),
+        )
+
+    @handle(ChannelsUpdated)
+    def on_channels_updated(self, event: ChannelsUpdated) -> None:
+        channels = channel_mask(event.email_enabled, event.sms_enabled, event.push_enabled)
+        _apply(event.customer_id, lambda entry: replace(entry, channels=channels))
+
+    @handle(QuietHoursSet)
+    def on_quiet_hours_set(self, event: QuietHoursSet) -> None:
+        quiet_hours = (event.start, event.end)
+        _apply(event.customer_id, lambda entry: replace(entry, quiet_hours=quiet_hours))
+
+    @handle(QuietHoursCleared)
+    def on_quiet_hours_cleared(self, event: QuietHoursCleared) -> None:
+        _apply(event.customer_id, lambda entry: replace(entry, quiet_hours=None))
+
+    @handle(TypeUnsubscribed)
+    def on_type_unsubscribed(self, event: TypeUnsubscribed) -> None:
+        notification_type = event.notification_type
+        _apply(event.customer_id, lambda entry: replace(entry, unsubscribed=entry.unsubscribed | {notification_type}))
+
+    @handle(TypeResubscribed)
+    def on_type_resubscribed(self, event: TypeResubscribed) -> None:
+        notification_type = event.notification_type
+        _apply(event.customer_id, lambda entry: replace(entry, unsubscribed=entry.unsubscribed - {notification_type}))
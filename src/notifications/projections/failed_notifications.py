@@ -31,12 +31,14 @@ class FailedNotificationsProjector:
     def on_notification_failed(self, event):
         repo = current_domain.repository_for(FailedNotifications)
 
-        # Look up the notification for type info
-        try:
-            notif = current_domain.repository_for(Notification).get(event.notification_id)
-            notification_type = notif.notification_type
-        except Exception:
-            notification_type = "Unknown"
+        notification_type = event.notification_type
+        if not notification_type:
+            # Events recorded before NotificationFailed carried the type
+            try:
+                notif = current_domain.repository_for(Notification).get(event.notification_id)
+                notification_type = notif.notification_type
+            except Exception:
+                notification_type = "Unknown"
 
         try:
             failed = repo.get(event.notification_id)
@@ -26,12 +26,14 @@ class NotificationStatsProjector:
         repo = current_domain.repository_for(NotificationStats)
 
         date_str = event.sent_at.strftime("%Y-%m-%d") if event.sent_at else "unknown"
-        # We need the notification type — load from NotificationLog or Notification
-        try:
-            notif = current_domain.repository_for(Notification).get(event.notification_id)
-            notification_type = notif.notification_type
-        except Exception:
-            notification_type = "Unknown"
+        notification_type = event.notification_type
+        if not notification_type:
+            # Events recorded before NotificationSent carried the type
+            try:
+                notif = current_domain.repository_for(Notification).get(event.notification_id)
+                notification_type = notif.notification_type
+            except Exception:
+                notification_type = "Unknown"
 
         stat_key = f"{date_str}:{notification_type}:{event.channel}"
 
@@ -1,7 +1,8 @@
 """Template registry — maps NotificationType to template classes.
 
 Each template knows its default channels and how to render content
-from event context data.
+from event context data. Templates are NotificationTemplate subclasses
+(engine.py), which derives the HTML body from the text one.
 """
 
 from notifications.notification.notification import NotificationType
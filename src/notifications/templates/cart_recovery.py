@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class CartRecoveryTemplate:
+class CartRecoveryTemplate(NotificationTemplate):
     notification_type = NotificationType.CART_RECOVERY.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(_context: dict) -> dict:
+    def render_text(_context: dict) -> dict:
         return {
             "subject": "You left items in your cart",
             "body": (
@@ -4,9 +4,10 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class DeliveryConfirmationTemplate:
+class DeliveryConfirmationTemplate(NotificationTemplate):
     notification_type = NotificationType.DELIVERY_CONFIRMATION.value
     default_channels = [
         NotificationChannel.EMAIL.value,
@@ -14,7 +15,7 @@ class DeliveryConfirmationTemplate:
     ]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         return {
             "subject": "Your Order Has Been Delivered",
@@ -4,17 +4,20 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class DeliveryExceptionTemplate:
+class DeliveryExceptionTemplate(NotificationTemplate):
     notification_type = NotificationType.DELIVERY_EXCEPTION.value
     default_channels = [
         NotificationChannel.EMAIL.value,
         NotificationChannel.SMS.value,
     ]
 
+    digest_subject = "Delivery issues with your orders ({count})"
+
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         reason = context.get("reason", "an issue during delivery")
         return {
@@ -27,3 +30,9 @@ class DeliveryExceptionTemplate:
                 "If you have questions, please contact our support team."
             ),
         }
+
+    @staticmethod
+    def summarize(context: dict) -> str:
+        order_id = context.get("order_id", "N/A")
+        reason = context.get("reason", "an issue during delivery")
+        return f"Order #{order_id}: {reason}"
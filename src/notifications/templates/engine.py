@@ -0,0 +1,62 @@
+"""Template engine — rendering notification content to text and HTML.
+
+A notification template writes its text content as a plain function of the
+event context, with a fallback for each missing key:
+
+    class ShippingUpdateTemplate(NotificationTemplate):
+        notification_type = NotificationType.SHIPPING_UPDATE.value
+        default_channels = [NotificationChannel.EMAIL.value]
+
+        @staticmethod
+        def render_text(context: dict) -> dict:
+            order_id = context.get("order_id", "N/A")
+            return {
+                "subject": f"Order #{order_id} Shipped",
+                "body": f"Your order #{order_id} has shipped.\\n\\nThank you!",
+            }
+
+f-strings are compiled with the module, so a render does no parsing at run
+time. ``render`` adds the HTML body, derived from the text body: one
+``<p>`` per blank-line separated paragraph, ``<br>`` for line breaks, text
+escaped. Only the email channel sends HTML, so notifications for other
+channels are rendered with ``render_text`` alone.
+"""
+
+import html
+from typing import ClassVar
+
+
+def text_to_html(text: str) -> str:
+    """HTML form of a plain-text body, laid out as template HTML bodies are."""
+    paragraphs = html.escape(text, quote=False).split("\n\n")
+    return "<p>" + "</p>\n<p>".join(paragraph.replace("\n", "<br>\n") for paragraph in paragraphs) + "</p>"
+
+
+class NotificationTemplate:
+    """Base class for notification templates."""
+
+    notification_type: ClassVar[str]
+    default_channels: ClassVar[list[str]]
+    # Subject of a digest coalescing several notifications (digest.py); "{count}" is filled in
+    digest_subject: ClassVar[str | None] = None
+
+    @staticmethod
+    def render_text(context: dict) -> dict:
+        """Render ``{"subject": ..., "body": ...}`` from event context."""
+        raise NotImplementedError
+
+    @classmethod
+    def render(cls, context: dict) -> dict:
+        """Render subject, text body and HTML body from event context."""
+        rendered = cls.render_text(context)
+        rendered["html_body"] = text_to_html(rendered["body"])
+        return rendered
+
+    @classmethod
+    def summarize(cls, context: dict) -> str:
+        """The line this notification contributes to a digest.
+
+        Templates whose notifications are digested override this with a
+        one-line summary; by default it is the first line of the body.
+        """
+        return cls.render_text(context)["body"].strip().split("\n", 1)[0]
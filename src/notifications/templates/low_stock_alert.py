@@ -5,15 +5,18 @@ from notifications.notification.notification import (
     NotificationType,
     RecipientType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class LowStockAlertTemplate:
+class LowStockAlertTemplate(NotificationTemplate):
     notification_type = NotificationType.LOW_STOCK_ALERT.value
     default_channels = [NotificationChannel.SLACK.value]
     recipient_type = RecipientType.INTERNAL.value
 
+    digest_subject = "[Low Stock] {count} alerts"
+
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         sku = context.get("sku", "N/A")
         product_id = context.get("product_id", "N/A")
         warehouse_id = context.get("warehouse_id", "N/A")
@@ -30,3 +33,11 @@ class LowStockAlertTemplate:
                 "Please review and reorder as needed."
             ),
         }
+
+    @staticmethod
+    def summarize(context: dict) -> str:
+        sku = context.get("sku", "N/A")
+        warehouse_id = context.get("warehouse_id", "N/A")
+        current_available = context.get("current_available", 0)
+        reorder_point = context.get("reorder_point", 0)
+        return f"{sku} at {warehouse_id}: {current_available} available, reorder point {reorder_point}"
@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class OrderCancellationTemplate:
+class OrderCancellationTemplate(NotificationTemplate):
     notification_type = NotificationType.ORDER_CANCELLATION.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         reason = context.get("reason", "as requested")
         cancelled_by = context.get("cancelled_by", "system")
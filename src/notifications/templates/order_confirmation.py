@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class OrderConfirmationTemplate:
+class OrderConfirmationTemplate(NotificationTemplate):
     notification_type = NotificationType.ORDER_CONFIRMATION.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         grand_total = context.get("grand_total", "0.00")
         currency = context.get("currency", "USD")
@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class PaymentReceiptTemplate:
+class PaymentReceiptTemplate(NotificationTemplate):
     notification_type = NotificationType.PAYMENT_RECEIPT.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         amount = context.get("amount", "0.00")
         currency = context.get("currency", "USD")
@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class ReviewPublishedTemplate:
+class ReviewPublishedTemplate(NotificationTemplate):
     notification_type = NotificationType.REVIEW_PUBLISHED.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(_context: dict) -> dict:
+    def render_text(_context: dict) -> dict:
         return {
             "subject": "Your review has been published",
             "body": (
@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class ReviewRejectedTemplate:
+class ReviewRejectedTemplate(NotificationTemplate):
     notification_type = NotificationType.REVIEW_REJECTED.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         reason = context.get("reason", "It did not meet our community guidelines")
         return {
             "subject": "Update on your review",
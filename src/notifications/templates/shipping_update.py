@@ -4,9 +4,10 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class ShippingUpdateTemplate:
+class ShippingUpdateTemplate(NotificationTemplate):
     notification_type = NotificationType.SHIPPING_UPDATE.value
     default_channels = [
         NotificationChannel.EMAIL.value,
@@ -14,8 +15,10 @@ class ShippingUpdateTemplate:
         NotificationChannel.PUSH.value,
     ]
 
+    digest_subject = "Updates on your orders ({count})"
+
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         order_id = context.get("order_id", "N/A")
         carrier = context.get("carrier", "the carrier")
         tracking_number = context.get("tracking_number", "N/A")
@@ -30,3 +33,10 @@ class ShippingUpdateTemplate:
                 "You can track your package using the tracking number above."
             ),
         }
+
+    @staticmethod
+    def summarize(context: dict) -> str:
+        order_id = context.get("order_id", "N/A")
+        carrier = context.get("carrier", "the carrier")
+        tracking_number = context.get("tracking_number", "N/A")
+        return f"Order #{order_id} shipped with {carrier}, tracking number {tracking_number}"
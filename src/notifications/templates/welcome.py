@@ -4,14 +4,15 @@ from notifications.notification.notification import (
     NotificationChannel,
     NotificationType,
 )
+from notifications.templates.engine import NotificationTemplate
 
 
-class WelcomeTemplate:
+class WelcomeTemplate(NotificationTemplate):
     notification_type = NotificationType.WELCOME.value
     default_channels = [NotificationChannel.EMAIL.value]
 
     @staticmethod
-    def render(context: dict) -> dict:
+    def render_text(context: dict) -> dict:
         first_name = context.get("first_name", "there")
         return {
             "subject": f"Welcome to ShopStream, {first_name}!",
@@ -485,3 +485,28 @@ async def detect_abandoned_carts(
     command = DetectAbandonedCarts(idle_threshold_hours=hours)
     result = current_domain.process(command, asynchronous=False)
     return DetectAbandonedResponse(abandoned_count=result or 0)
+
+
+class ExpireStalledCheckoutsRequest(PydanticBaseModel):
+    limit: int = 500
+
+
+class ExpireStalledCheckoutsResponse(PydanticBaseModel):
+    expired_count: int
+
+
+@maintenance_router.post("/expire-stalled-checkouts", response_model=ExpireStalledCheckoutsResponse)
+async def expire_stalled_checkouts(
+    body: ExpireStalledCheckoutsRequest | None = None,
+) -> ExpireStalledCheckoutsResponse:
+    """Cancel orders whose checkout saga has missed its state deadline.
+
+    Designed to be called periodically by an external scheduler (e.g., every minute).
+    Each deadline fires once; at most ``limit`` checkouts are expired per call.
+    """
+    from ordering.checkout.timeouts import ExpireStalledCheckouts
+
+    limit = body.limit if body else 500
+    command = ExpireStalledCheckouts(limit=limit)
+    result = current_domain.process(command, asynchronous=False)
+    return ExpireStalledCheckoutsResponse(expired_count=result or 0)
@@ -0,0 +1,59 @@
+"""Checkout saga correlation index — order_id → live OrderCheckoutSaga status.
+
+OrderCheckoutSaga listens to whole stream categories (every inventory item,
+every payment), so most events it receives belong to no checkout at all.
+Resolving them the default way means reading the saga's event stream for the
+order before discovering there is nothing to do.
+
+This index is written by the saga itself, in the same unit of work as each
+state transition, and is consulted before any saga state is loaded. An
+order whose entry has a terminal status has no live saga to advance.
+
+An order with no entry is not proof that there is no saga: checkouts
+started before the index existed have none until their next transition
+writes one. Callers fall back to the saga's event stream in that case.
+"""
+
+from datetime import UTC, datetime
+
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, String
+from protean.utils.globals import current_domain
+
+from ordering.domain import ordering
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+@ordering.projection
+class CheckoutSagaIndex:
+    order_id = Identifier(identifier=True, required=True)
+    status = String(max_length=50, required=True)
+    updated_at = DateTime()
+
+
+def record_checkout_status(order_id: str, status: str) -> None:
+    """Upsert the index entry for an order's checkout saga."""
+    repo = current_domain.repository_for(CheckoutSagaIndex)
+    try:
+        entry = repo.get(str(order_id))
+        entry.status = status
+    except ObjectNotFoundError:
+        entry = CheckoutSagaIndex(order_id=str(order_id), status=status)
+
+    entry.updated_at = datetime.now(UTC)
+    repo.add(entry)
+
+
+def checkout_status(order_id: str) -> str | None:
+    """Return the indexed checkout status for an order, or None if it has no entry."""
+    try:
+        return current_domain.repository_for(CheckoutSagaIndex).get(str(order_id)).status
+    except ObjectNotFoundError:
+        return None
+
+
+def is_checkout_live(order_id: str) -> bool:
+    """Return True if the index has a checkout saga for the order that is not yet finished."""
+    status = checkout_status(order_id)
+    return status is not None and status not in TERMINAL_STATUSES
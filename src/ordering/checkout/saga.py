@@ -11,70 +11,72 @@ Flow:
     3b. PaymentFailed (can_retry) → retrying (wait for external retry)
     3b. PaymentFailed (no retry) → issue CancelOrder → failed (end)
     4. ReservationReleased → issue CancelOrder → failed (end)
+    5. OrderCancelled → failed (end)
+
+Waiting states carry deadlines (STATE_DEADLINES). A checkout that stays in
+one past its deadline is cancelled by ExpireStalledCheckouts (timeouts.py),
+which releases its stock via Inventory's OrderCancelled handler.
+
+Commands are issued through shared.process_managers.dispatch_command, so the
+``[custom.process_managers]`` table in domain.toml decides whether the
+payment-recording commands run inline on the saga's consumer or are queued to
+the ordering command stream. CancelOrder always runs inline: an order that
+can no longer be cancelled is logged and skipped here, rather than retried
+and dead-lettered by the command subscription.
 
 Cross-domain events are imported from shared.events module and registered
-as external events via ordering.register_external_event().
+as external events via ordering.register_external_event(). Only the event
+types the saga handles are registered; everything else on the subscribed
+streams is dropped from its header type before deserialization.
+
+Each transition also updates the CheckoutSagaIndex (see correlation.py), and
+``_handle`` consults it before loading saga state, so inventory and payment
+events for orders whose checkout has finished never touch the event store.
+Orders with no index entry (including checkouts started before the index
+existed) go through the normal stream lookup; their next transition writes
+the entry.
 """
 
 import logging
+from datetime import timedelta
 
 from protean.exceptions import ValidationError
 from protean.fields import DateTime, Float, Identifier, Integer, String
+from protean.utils.eventing import Message
 from protean.utils.globals import current_domain
 from protean.utils.mixins import handle
-from protean.utils.processing import Priority
 
+from ordering.checkout.correlation import TERMINAL_STATUSES, checkout_status, record_checkout_status
+from ordering.checkout.timeouts import schedule_deadline
 from ordering.domain import ordering
-from ordering.order.events import OrderConfirmed
-from shared.events.inventory import (
-    DamagedStockWrittenOff,
-    LowStockDetected,
-    ReservationConfirmed,
-    ReservationReleased,
-    StockAdjusted,
-    StockCheckRecorded,
-    StockCommitted,
-    StockInitialized,
-    StockMarkedDamaged,
-    StockReceived,
-    StockReserved,
-    StockReturned,
-)
-from shared.events.payments import (
-    PaymentFailed,
-    PaymentInitiated,
-    PaymentProcessing,
-    PaymentRetryInitiated,
-    PaymentSucceeded,
-    RefundCompleted,
-    RefundRequested,
-)
+from ordering.order.events import OrderCancelled, OrderConfirmed
+from shared.events.inventory import ReservationReleased, StockReserved
+from shared.events.payments import PaymentFailed, PaymentSucceeded
+from shared.process_managers import SYNC, command_dispatch_for, dispatch_command
 
 logger = logging.getLogger(__name__)
 
-# Register external events from other domains so Protean can deserialize them
-ordering.register_external_event(StockInitialized, "Inventory.StockInitialized.v1")
-ordering.register_external_event(StockReceived, "Inventory.StockReceived.v1")
+# Register the external events the saga handles so Protean can deserialize them
 ordering.register_external_event(StockReserved, "Inventory.StockReserved.v1")
 ordering.register_external_event(ReservationReleased, "Inventory.ReservationReleased.v1")
-ordering.register_external_event(ReservationConfirmed, "Inventory.ReservationConfirmed.v1")
-ordering.register_external_event(StockCommitted, "Inventory.StockCommitted.v1")
-ordering.register_external_event(StockAdjusted, "Inventory.StockAdjusted.v1")
-ordering.register_external_event(StockMarkedDamaged, "Inventory.StockMarkedDamaged.v1")
-ordering.register_external_event(DamagedStockWrittenOff, "Inventory.DamagedStockWrittenOff.v1")
-ordering.register_external_event(StockReturned, "Inventory.StockReturned.v1")
-ordering.register_external_event(StockCheckRecorded, "Inventory.StockCheckRecorded.v1")
-ordering.register_external_event(LowStockDetected, "Inventory.LowStockDetected.v1")
-ordering.register_external_event(PaymentInitiated, "Payments.PaymentInitiated.v1")
-ordering.register_external_event(PaymentProcessing, "Payments.PaymentProcessing.v1")
 ordering.register_external_event(PaymentSucceeded, "Payments.PaymentSucceeded.v1")
 ordering.register_external_event(PaymentFailed, "Payments.PaymentFailed.v1")
-ordering.register_external_event(PaymentRetryInitiated, "Payments.PaymentRetryInitiated.v1")
-ordering.register_external_event(RefundRequested, "Payments.RefundRequested.v1")
-ordering.register_external_event(RefundCompleted, "Payments.RefundCompleted.v1")
 
 MAX_PAYMENT_RETRIES = 3
 
+# How long a checkout may wait in each state before it is considered stalled.
+# States not listed (completed, failed) have no deadline.
+STATE_DEADLINES = {
+    "awaiting_reservation": timedelta(minutes=15),
+    "awaiting_payment": timedelta(minutes=30),
+    "retrying": timedelta(hours=1),
+}
+
+
+def _command_dispatch() -> str:
+    """Dispatch mode for saga-issued commands, from the ordering domain's config."""
+    return command_dispatch_for(ordering, "OrderCheckoutSaga")
+
 
 @ordering.process_manager(
     stream_categories=[
@@ -96,31 +98,71 @@ class OrderCheckoutSaga:
     completed_at = DateTime()
     amount = Float()
 
+    @classmethod
+    def _handle(cls, item):
+        """Drop events that cannot advance a live checkout, then dispatch.
+
+        Runs before Protean deserializes the message or loads saga state:
+        unhandled event types are rejected from the header type, and
+        non-start events are rejected when the correlation index records a
+        finished saga for their order_id. Without an index entry the event
+        falls through to Protean's stream lookup, which skips it if no saga
+        exists.
+        """
+        if isinstance(item, Message):
+            event_type = item.metadata.headers.type
+            order_id = (item.data or {}).get("order_id")
+        else:
+            event_type = item.__class__.__type__
+            order_id = getattr(item, "order_id", None)
+
+        handlers = cls._handlers.get(event_type)
+        if not handlers:
+            return None
+
+        is_start = any(getattr(method, "_start", False) for method in handlers)
+        if not is_start:
+            if not order_id:
+                return None
+            status = checkout_status(order_id)
+            if status is not None and status in TERMINAL_STATUSES:
+                return None
+
+        return super()._handle(item)
+
+    def _track_status(self) -> None:
+        """Record the new status in the correlation index and reset its deadline."""
+        record_checkout_status(self.order_id, self.status)
+        schedule_deadline(self.order_id, self.status, STATE_DEADLINES.get(self.status))
+
     @handle(OrderConfirmed, start=True, correlate="order_id")
     def on_order_confirmed(self, event: OrderConfirmed) -> None:
         """Step 1: Order confirmed — wait for inventory reservation."""
         self.order_id = event.order_id
         self.status = "awaiting_reservation"
         self.started_at = event.confirmed_at
+        self._track_status()
 
     @handle(StockReserved, correlate="order_id")
     def on_stock_reserved(self, event: StockReserved) -> None:
         """Step 2: Stock reserved — initiate payment."""
         self.reservation_id = event.reservation_id
         self.status = "awaiting_payment"
+        self._track_status()
 
         # Dispatch command to ordering domain to record payment pending
         from ordering.order.payment import RecordPaymentPending
 
         try:
-            current_domain.process(
+            dispatch_command(
+                current_domain,
                 RecordPaymentPending(
                     order_id=self.order_id,
                     payment_id=f"saga-pay-{self.order_id}",
                     payment_method="credit_card",
                 ),
-                asynchronous=False,
-                priority=Priority.HIGH,
+                mode=_command_dispatch(),
+                idempotency_key=f"checkout:{self.order_id}:payment-pending",
             )
         except ValidationError:
             logger.info("Order %s already transitioned; skipping RecordPaymentPending", self.order_id)
@@ -134,19 +176,21 @@ class OrderCheckoutSaga:
         self.payment_id = event.payment_id
         self.amount = event.amount
         self.status = "completed"
+        self._track_status()
 
         from ordering.order.payment import RecordPaymentSuccess
 
         try:
-            current_domain.process(
+            dispatch_command(
+                current_domain,
                 RecordPaymentSuccess(
                     order_id=self.order_id,
                     payment_id=event.payment_id,
                     amount=event.amount,
                     payment_method="credit_card",
                 ),
-                asynchronous=False,
-                priority=Priority.HIGH,
+                mode=_command_dispatch(),
+                idempotency_key=f"checkout:{self.order_id}:payment-success:{event.payment_id}",
             )
         except ValidationError:
             logger.info("Order %s already transitioned; skipping RecordPaymentSuccess", self.order_id)
@@ -164,20 +208,23 @@ class OrderCheckoutSaga:
 
         if event.can_retry and self.retry_count < MAX_PAYMENT_RETRIES:
             self.status = "retrying"
+            self._track_status()
             # The payments domain handles retries; we just track state
         else:
             self.status = "failed"
+            self._track_status()
             from ordering.order.cancellation import CancelOrder
 
             try:
-                current_domain.process(
+                dispatch_command(
+                    current_domain,
                     CancelOrder(
                         order_id=self.order_id,
                         reason=f"Payment failed: {event.reason}",
                         cancelled_by="System",
                     ),
-                    asynchronous=False,
-                    priority=Priority.HIGH,
+                    mode=SYNC,
+                    idempotency_key=f"checkout:{self.order_id}:cancel",
                 )
             except ValidationError:
                 logger.info("Order %s already cancelled; skipping CancelOrder", self.order_id)
@@ -192,18 +239,30 @@ class OrderCheckoutSaga:
 
         self.status = "failed"
         self.failure_reason = f"Reservation released: {event.reason}"
+        self._track_status()
 
         from ordering.order.cancellation import CancelOrder
 
         try:
-            current_domain.process(
+            dispatch_command(
+                current_domain,
                 CancelOrder(
                     order_id=self.order_id,
                     reason=f"Inventory reservation released: {event.reason}",
                     cancelled_by="System",
                 ),
-                asynchronous=False,
-                priority=Priority.HIGH,
+                mode=SYNC,
+                idempotency_key=f"checkout:{self.order_id}:cancel",
             )
         except ValidationError:
             logger.info("Order %s already cancelled; skipping CancelOrder", self.order_id)
+
+    @handle(OrderCancelled, correlate="order_id", end=True)
+    def on_order_cancelled(self, event: OrderCancelled) -> None:
+        """Step 5: Order cancelled (customer, admin or checkout timeout) — close the saga."""
+        if self.status in ("completed", "failed"):
+            return  # Already reached terminal state; skip duplicate
+
+        self.status = "failed"
+        self.failure_reason = f"Order cancelled: {event.reason}"
+        self._track_status()
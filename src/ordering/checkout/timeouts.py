@@ -0,0 +1,142 @@
+"""Checkout timeouts — per-state deadlines for OrderCheckoutSaga.
+
+Every time the saga enters a waiting state it (re)schedules a deadline in the
+CheckoutDeadline store, using the duration declared for that state in
+``saga.STATE_DEADLINES``. Leaving the waiting states removes the row, so the
+store only ever holds checkouts that are still in flight.
+
+ExpireStalledCheckouts is designed to be triggered periodically by an
+external scheduler (cron, K8s CronJob) via the maintenance API endpoint. It
+reads the due rows in deadline order — a bounded range query over the live
+checkouts only — and cancels each stalled order. The resulting OrderCancelled
+event drives the rest of the compensation: Inventory releases the order's
+reservations (ReleaseReservation) and the saga closes itself as failed.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean import handle
+from protean.exceptions import InvalidOperationError, ObjectNotFoundError, ValidationError
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.processing import Priority, processing_priority
+
+from ordering.domain import ordering
+from ordering.order.order import Order, OrderStatus
+from shared.clock import utc_naive
+
+logger = structlog.get_logger(__name__)
+
+# Orders that have not been paid yet. A stalled checkout whose order has
+# moved past these (e.g. a lost PaymentSucceeded) is left alone.
+_EXPIRABLE_ORDER_STATES = (OrderStatus.CONFIRMED.value, OrderStatus.PAYMENT_PENDING.value)
+
+
+@ordering.projection
+class CheckoutDeadline:
+    order_id = Identifier(identifier=True, required=True)
+    status = String(max_length=50, required=True)
+    due_at = DateTime(required=True)
+
+
+def schedule_deadline(order_id: str, status: str, timeout: timedelta | None) -> None:
+    """Set the order's checkout deadline to ``timeout`` from now, or clear it when None."""
+    repo = current_domain.repository_for(CheckoutDeadline)
+    if timeout is None:
+        repo.query.filter(order_id=str(order_id)).delete()
+        return
+
+    entry = repo.get_or_none(str(order_id))
+
+    due_at = utc_naive(datetime.now(UTC) + timeout)
+    if entry is None:
+        entry = CheckoutDeadline(order_id=str(order_id), status=status, due_at=due_at)
+    else:
+        entry.status = status
+        entry.due_at = due_at
+    repo.add(entry)
+
+
+def due_deadlines(as_of: datetime, limit: int) -> list[CheckoutDeadline]:
+    """Return up to ``limit`` deadlines due at ``as_of``, earliest first."""
+    return (
+        current_domain.view_for(CheckoutDeadline)
+        .query.filter(due_at__lte=utc_naive(as_of))
+        .order_by("due_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+@ordering.command(part_of="Order")
+class ExpireStalledCheckouts:
+    """Cancel orders whose checkout saga has missed its state deadline."""
+
+    as_of = DateTime()  # Optional: defaults to now
+    limit = Integer(default=500)
+
+
+@ordering.command_handler(part_of=Order)
+class ExpireStalledCheckoutsHandler:
+    @handle(ExpireStalledCheckouts)
+    def expire_stalled_checkouts(self, command):
+        with processing_priority(Priority.LOW):
+            as_of = command.as_of or datetime.now(UTC)
+            due = due_deadlines(as_of, command.limit or 500)
+
+            if not due:
+                logger.info("No stalled checkouts found")
+                return 0
+
+            from ordering.order.cancellation import CancelOrder
+
+            # Each deadline fires once; a saga that moves on schedules a new one
+            deadline_repo = current_domain.repository_for(CheckoutDeadline)
+            due_ids = [str(deadline.order_id) for deadline in due]
+            deadline_repo.query.filter(order_id__in=due_ids).limit(len(due_ids)).delete()
+            order_repo = current_domain.repository_for(Order)
+
+            expired_count = 0
+            for deadline in due:
+                order_id = str(deadline.order_id)
+                try:
+                    order_status = order_repo.get(order_id).status
+                except ObjectNotFoundError:
+                    order_status = None
+
+                if order_status not in _EXPIRABLE_ORDER_STATES:
+                    logger.warning(
+                        "Stalled checkout not cancellable, skipping",
+                        order_id=order_id,
+                        saga_status=deadline.status,
+                        order_status=order_status,
+                    )
+                    continue
+
+                try:
+                    current_domain.process(
+                        CancelOrder(
+                            order_id=order_id,
+                            reason=f"Checkout timed out in {deadline.status}",
+                            cancelled_by="System",
+                        ),
+                        asynchronous=False,
+                    )
+                    expired_count += 1
+                    logger.info(
+                        "Cancelled stalled checkout",
+                        order_id=order_id,
+                        saga_status=deadline.status,
+                        due_at=str(deadline.due_at),
+                    )
+                except (ValidationError, InvalidOperationError) as exc:
+                    logger.warning(
+                        "Failed to cancel stalled checkout",
+                        order_id=order_id,
+                        error=str(exc),
+                    )
+
+            logger.info("Stalled checkout expiry complete", expired_count=expired_count)
+            return expired_count
@@ -1,10 +1,10 @@
 """FastAPI routes for the Payments domain — payments and invoices."""
 
-import json
 import os
 
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
 from protean.utils.globals import current_domain
+from pydantic import BaseModel as PydanticBaseModel
 
 from payments.api.schemas import (
     ConfigureGatewayRequest,
@@ -25,10 +25,18 @@ from payments.gateway import get_gateway
 from payments.gateway.fake_adapter import FakeGateway
 from payments.invoice.generation import GenerateInvoice
 from payments.invoice.voiding import VoidInvoice
+from payments.payment.charging import charge_payment, refund_payment
 from payments.payment.initiation import InitiatePayment
-from payments.payment.refund import ProcessRefundWebhook, RequestRefund
+from payments.payment.refund import RequestRefund
 from payments.payment.retry import RetryPayment
-from payments.payment.webhook import ProcessPaymentWebhook
+from payments.payment.webhook_inbox import (
+    PAYMENT,
+    REFUND,
+    accept_webhook,
+    drain_payment_webhooks,
+    requeue_dead_webhooks,
+)
+from shared.api.webhooks import parse_webhook, webhook_body_schema, webhook_text
 
 # ---------------------------------------------------------------------------
 # Payment Router
@@ -46,7 +54,7 @@ async def get_payment_status(payment_id: str) -> PaymentStatusResponse:
 
 @payment_router.post("", status_code=201, response_model=PaymentIdResponse)
 async def initiate_payment(body: InitiatePaymentRequest) -> PaymentIdResponse:
-    """Initiate a new payment for an order."""
+    """Initiate a new payment for an order and charge it through the gateway."""
     command = InitiatePayment(
         order_id=body.order_id,
         customer_id=body.customer_id,
@@ -57,27 +65,32 @@ async def initiate_payment(body: InitiatePaymentRequest) -> PaymentIdResponse:
         idempotency_key=body.idempotency_key,
     )
     result = current_domain.process(command, asynchronous=False)
+    await charge_payment(result, command)
     return PaymentIdResponse(payment_id=result)
 
 
-@payment_router.post("/webhook", response_model=StatusResponse)
+@payment_router.post(
+    "/webhook",
+    status_code=202,
+    response_model=StatusResponse,
+    openapi_extra=webhook_body_schema(ProcessWebhookRequest),
+)
 async def process_webhook(
-    body: ProcessWebhookRequest,
+    request: Request,
     x_gateway_signature: str = Header(default=""),
 ) -> StatusResponse:
-    """Process a payment gateway webhook callback."""
-    gateway = get_gateway()
-    if not gateway.verify_webhook_signature(json.dumps(body.model_dump()), x_gateway_signature):
+    """Accept a payment gateway webhook callback for processing.
+
+    The signature is checked over the raw body and the callback queued in
+    the webhook inbox; drain_payment_webhooks applies it to the payment.
+    """
+    raw = await request.body()
+    if not get_gateway().verify_webhook_signature(webhook_text(raw), x_gateway_signature):
         raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
-    command = ProcessPaymentWebhook(
-        payment_id=body.payment_id,
-        gateway_transaction_id=body.gateway_transaction_id,
-        gateway_status=body.gateway_status,
-        failure_reason=body.failure_reason,
-    )
-    current_domain.process(command, asynchronous=False)
-    return StatusResponse(status="processed")
+    body = parse_webhook(ProcessWebhookRequest, raw)
+    queued = accept_webhook(PAYMENT, body.payment_id, body.model_dump(), raw)
+    return StatusResponse(status="accepted" if queued else "duplicate")
 
 
 @payment_router.post("/{payment_id}/retry", response_model=StatusResponse)
@@ -90,33 +103,98 @@ async def retry_payment(payment_id: str) -> StatusResponse:
 
 @payment_router.post("/{payment_id}/refund", response_model=RefundIdResponse)
 async def request_refund(payment_id: str, body: RequestRefundRequest) -> RefundIdResponse:
-    """Request a refund for a payment."""
+    """Request a refund for a payment and submit it to the gateway."""
     command = RequestRefund(
         payment_id=payment_id,
         amount=body.amount,
         reason=body.reason,
     )
     refund_id = current_domain.process(command, asynchronous=False)
+    await refund_payment(payment_id, str(refund_id))
     return RefundIdResponse(refund_id=str(refund_id))
 
 
-@payment_router.post("/refund/webhook", response_model=StatusResponse)
+@payment_router.post(
+    "/refund/webhook",
+    status_code=202,
+    response_model=StatusResponse,
+    openapi_extra=webhook_body_schema(ProcessRefundWebhookRequest),
+)
 async def process_refund_webhook(
-    body: ProcessRefundWebhookRequest,
+    request: Request,
     x_gateway_signature: str = Header(default=""),
 ) -> StatusResponse:
-    """Process a refund confirmation from the gateway."""
-    gateway = get_gateway()
-    if not gateway.verify_webhook_signature(json.dumps(body.model_dump()), x_gateway_signature):
+    """Accept a refund confirmation from the gateway for processing."""
+    raw = await request.body()
+    if not get_gateway().verify_webhook_signature(webhook_text(raw), x_gateway_signature):
         raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
-    command = ProcessRefundWebhook(
-        payment_id=body.payment_id,
-        refund_id=body.refund_id,
-        gateway_refund_id=body.gateway_refund_id,
-    )
-    current_domain.process(command, asynchronous=False)
-    return StatusResponse(status="refund_processed")
+    body = parse_webhook(ProcessRefundWebhookRequest, raw)
+    queued = accept_webhook(REFUND, body.payment_id, body.model_dump(), raw)
+    return StatusResponse(status="accepted" if queued else "duplicate")
+
+
+class DrainWebhooksRequest(PydanticBaseModel):
+    limit: int = 200
+
+
+class DrainWebhooksResponse(PydanticBaseModel):
+    processed_count: int
+
+
+@payment_router.post("/maintenance/drain-webhooks", response_model=DrainWebhooksResponse)
+async def drain_webhooks(
+    body: DrainWebhooksRequest | None = None,
+) -> DrainWebhooksResponse:
+    """Process queued gateway webhooks in arrival order.
+
+    Designed to be called periodically by an external scheduler (e.g., every few seconds).
+    At most ``limit`` webhooks are processed per call.
+    """
+    limit = body.limit if body else 200
+    return DrainWebhooksResponse(processed_count=drain_payment_webhooks(limit))
+
+
+class RequeueWebhooksRequest(PydanticBaseModel):
+    payment_id: str
+
+
+class RequeueWebhooksResponse(PydanticBaseModel):
+    requeued_count: int
+
+
+@payment_router.post("/maintenance/requeue-webhooks", response_model=RequeueWebhooksResponse)
+async def requeue_webhooks(body: RequeueWebhooksRequest) -> RequeueWebhooksResponse:
+    """Requeue a payment's dead-lettered gateway webhooks once the cause is fixed.
+
+    The requeued webhooks, and those held behind them, are processed by the next drain run.
+    """
+    return RequeueWebhooksResponse(requeued_count=requeue_dead_webhooks(body.payment_id))
+
+
+class PurgeIdempotencyKeysRequest(PydanticBaseModel):
+    limit: int = 1000
+
+
+class PurgeIdempotencyKeysResponse(PydanticBaseModel):
+    purged_count: int
+
+
+@payment_router.post("/maintenance/purge-idempotency-keys", response_model=PurgeIdempotencyKeysResponse)
+async def purge_idempotency_keys(
+    body: PurgeIdempotencyKeysRequest | None = None,
+) -> PurgeIdempotencyKeysResponse:
+    """Delete idempotency records whose TTL has elapsed.
+
+    Designed to be called periodically by an external scheduler (e.g., every hour).
+    At most ``limit`` records are deleted per call.
+    """
+    from payments.payment.idempotency import PurgeExpiredIdempotencyKeys
+
+    limit = body.limit if body else 1000
+    command = PurgeExpiredIdempotencyKeys(limit=limit)
+    result = current_domain.process(command, asynchronous=False)
+    return PurgeIdempotencyKeysResponse(purged_count=result or 0)
 
 
 @payment_router.post("/gateway/configure", response_model=GatewayConfigResponse)
@@ -3,12 +3,16 @@
 Provides get_gateway() / set_gateway() to swap implementations:
 - FakeGateway for development and testing
 - StripeGateway for production (stub)
+
+and get_async_gateway() / set_async_gateway() for the asynchronous port,
+served by the pooled HTTPGateway configured under ``[custom.gateway]``.
 """
 
 from payments.gateway.fake_adapter import FakeGateway
-from payments.gateway.port import PaymentGateway
+from payments.gateway.port import AsyncPaymentGateway, PaymentGateway
 
 _current_gateway: PaymentGateway | None = None
+_current_async_gateway: AsyncPaymentGateway | None = None
 
 
 def get_gateway() -> PaymentGateway:
@@ -29,3 +33,31 @@ def reset_gateway() -> None:
     """Reset to default gateway."""
     global _current_gateway
     _current_gateway = None
+
+
+def get_async_gateway() -> AsyncPaymentGateway | None:
+    """Return the current async payment gateway, or None if ``[custom.gateway]`` has no base_url."""
+    global _current_async_gateway
+    if _current_async_gateway is None:
+        from payments.domain import payments
+
+        settings = (payments.config.get("custom", {}) or {}).get("gateway", {}) or {}
+        if not settings.get("base_url"):
+            return None
+
+        from payments.gateway.http_adapter import HTTPGateway
+
+        _current_async_gateway = HTTPGateway.from_config(settings)
+    return _current_async_gateway
+
+
+def set_async_gateway(gateway: AsyncPaymentGateway) -> None:
+    """Override the active async payment gateway (useful for tests)."""
+    global _current_async_gateway
+    _current_async_gateway = gateway
+
+
+def reset_async_gateway() -> None:
+    """Reset to the default async gateway."""
+    global _current_async_gateway
+    _current_async_gateway = None
@@ -0,0 +1,132 @@
+"""Fake HTTP payment gateway — a local stand-in for a card processor's REST API.
+
+FakeGateway (fake_adapter.py) fakes the gateway at the port; this fakes it
+on the wire, so the HTTP client in HTTPGateway — connection pool, timeouts,
+concurrency limit — is exercised for real. It is a plain ASGI app:
+
+- In process, through ``httpx.ASGITransport`` (in tests and the benchmark).
+- As a local server: ``uvicorn payments.gateway.fake_http_gateway:app --port 12111``
+  (latency from ``FAKE_GATEWAY_LATENCY``, in seconds), with
+  ``PAYMENT_GATEWAY_URL=http://localhost:12111`` so the payment endpoints
+  charge against it.
+
+API (JSON):
+
+    POST /v1/charges   {amount, currency, payment_method_type, last4}
+                       Idempotency-Key header; a repeated key replays the first response
+    POST /v1/refunds   {charge, amount, reason}
+
+Responses carry ``id`` and ``status`` ("succeeded" / "failed"); declines
+answer 402 with ``failure_reason``.
+"""
+
+import asyncio
+import json
+import os
+from uuid import uuid4
+
+
+class FakeGatewayApp:
+    """ASGI app simulating a payment gateway, with injectable latency and failures."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.should_succeed = True
+        self.failure_reason = "Card declined"
+        self.error_status: int | None = None  # Answer every request with this HTTP status
+        self.requests: list[dict] = []
+        self._charges: dict[str, tuple[int, dict]] = {}
+
+    def configure(
+        self,
+        should_succeed: bool = True,
+        failure_reason: str = "Card declined",
+        latency: float | None = None,
+        error_status: int | None = None,
+    ) -> None:
+        """Configure gateway behavior at runtime."""
+        self.should_succeed = should_succeed
+        self.failure_reason = failure_reason
+        self.error_status = error_status
+        if latency is not None:
+            self.latency = latency
+
+    def reset(self) -> None:
+        self.configure()
+        self.requests.clear()
+        self._charges.clear()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        headers = {name.decode().lower(): value.decode() for name, value in scope["headers"]}
+        payload = json.loads(body) if body else {}
+        self.requests.append(
+            {
+                "method": scope["method"],
+                "path": scope["path"],
+                "idempotency_key": headers.get("idempotency-key"),
+                "payload": payload,
+            }
+        )
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        status, response = self._handle(scope["method"], scope["path"], headers, payload)
+        encoded = json.dumps(response).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(encoded)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": encoded})
+
+    def _handle(self, method: str, path: str, headers: dict, payload: dict) -> tuple[int, dict]:
+        if self.error_status:
+            return self.error_status, {"error": "Gateway unavailable"}
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+
+        if path == "/v1/charges":
+            key = headers.get("idempotency-key")
+            if key and key in self._charges:
+                return self._charges[key]
+            if self.should_succeed:
+                result = (
+                    200,
+                    {"id": f"fake_txn_{uuid4().hex[:12]}", "status": "succeeded", "amount": payload.get("amount")},
+                )
+            else:
+                result = 402, {"status": "failed", "failure_reason": self.failure_reason}
+            if key:
+                self._charges[key] = result
+            return result
+
+        if path == "/v1/refunds":
+            if self.should_succeed:
+                return 200, {"id": f"fake_ref_{uuid4().hex[:12]}", "status": "succeeded"}
+            return 402, {"status": "failed", "failure_reason": self.failure_reason}
+
+        return 404, {"error": "Not found"}
+
+
+app = FakeGatewayApp(latency=float(os.environ.get("FAKE_GATEWAY_LATENCY", "0")))
@@ -0,0 +1,232 @@
+"""Pooled asynchronous HTTP payment gateway client.
+
+HTTPGateway implements AsyncPaymentGateway over a gateway's REST API (the
+shape served by fake_http_gateway.py):
+
+- Connection pooling: one ``httpx.AsyncClient`` per event loop, keeping up to
+  ``max_connections`` connections alive between calls.
+- Strict per-call timeouts: every call — waiting for a concurrency slot
+  included — finishes within ``timeout`` seconds, and connecting is bounded
+  by ``connect_timeout``. A call that runs out of time fails with
+  ``gateway_status="timeout"``; retrying it with the same idempotency key is
+  safe.
+- Bounded concurrency: at most ``max_concurrency`` requests are in flight to
+  the gateway; further calls queue.
+- In-flight deduplication: concurrent ``create_charge`` calls with the same
+  ``idempotency_key`` share one request and its result, so a retry racing
+  the original charge never reaches the gateway twice.
+
+Configured under ``[custom.gateway]`` in domain.toml. Tests and the
+benchmark point it at FakeGatewayApp (fake_http_gateway.py) through an
+in-process transport.
+"""
+
+import asyncio
+import hashlib
+import hmac
+from dataclasses import dataclass, field
+
+import httpx
+import structlog
+
+from payments.gateway.port import AsyncPaymentGateway, ChargeResult, RefundResult
+
+logger = structlog.get_logger(__name__)
+
+
+class GatewayCallError(Exception):
+    """A gateway call that produced no usable answer (timeout, transport or server error)."""
+
+    def __init__(self, status: str, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+@dataclass
+class _LoopState:
+    """Client, limiter and in-flight calls, bound to the event loop that created them."""
+
+    loop: asyncio.AbstractEventLoop
+    client: httpx.AsyncClient
+    limiter: asyncio.Semaphore
+    inflight: dict[str, asyncio.Future] = field(default_factory=dict)
+
+
+class HTTPGateway(AsyncPaymentGateway):
+    """Asynchronous gateway adapter with a pooled HTTP client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        webhook_secret: str = "",
+        timeout: float = 10.0,
+        connect_timeout: float = 2.0,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.api_key = api_key
+        self.webhook_secret = webhook_secret
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max(1, max_concurrency)
+        self.transport = transport
+        self.deduplicated = 0  # Calls served by another call's in-flight request
+        self._state: _LoopState | None = None
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "HTTPGateway":
+        return cls(
+            base_url=settings["base_url"],
+            api_key=settings.get("api_key") or "",
+            webhook_secret=settings.get("webhook_secret") or "",
+            timeout=float(settings.get("timeout", 10)),
+            connect_timeout=float(settings.get("connect_timeout", 2)),
+            max_connections=int(settings.get("max_connections", 20)),
+            max_concurrency=int(settings.get("max_concurrency", 10)),
+        )
+
+    async def create_charge(
+        self,
+        amount: float,
+        currency: str,
+        payment_method_type: str,
+        last4: str | None,
+        idempotency_key: str,
+    ) -> ChargeResult:
+        state = self._loop_state()
+        call = state.inflight.get(idempotency_key)
+        if call is None:
+            call = asyncio.ensure_future(
+                self._charge(state, amount, currency, payment_method_type, last4, idempotency_key)
+            )
+            state.inflight[idempotency_key] = call
+            call.add_done_callback(lambda done: self._forget(state, idempotency_key, done))
+        else:
+            self.deduplicated += 1
+            logger.debug("Joined in-flight charge", idempotency_key=idempotency_key)
+
+        # Shielded: one caller giving up must not cancel the call others await
+        return await asyncio.shield(call)
+
+    async def create_refund(
+        self,
+        gateway_transaction_id: str,
+        amount: float,
+        reason: str,
+    ) -> RefundResult:
+        payload = {"charge": gateway_transaction_id, "amount": amount, "reason": reason}
+        try:
+            status_code, data = await self._post(self._loop_state(), "/v1/refunds", payload)
+        except GatewayCallError as exc:
+            return RefundResult(success=False, gateway_status=exc.status, failure_reason=exc.reason)
+
+        if status_code < 300 and data.get("status") == "succeeded":
+            return RefundResult(success=True, gateway_refund_id=data.get("id"), gateway_status="succeeded")
+        return RefundResult(
+            success=False,
+            gateway_status=data.get("status", "failed"),
+            failure_reason=data.get("failure_reason", "Refund declined"),
+        )
+
+    def verify_webhook_signature(self, payload: str, signature: str) -> bool:
+        """Check an HMAC-SHA256 (hex) signature of the payload under the webhook secret."""
+        if not self.webhook_secret:
+            return False
+        expected = hmac.new(self.webhook_secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    async def aclose(self) -> None:
+        state, self._state = self._state, None
+        if state is not None and not state.loop.is_closed():
+            await state.client.aclose()
+
+    async def _charge(
+        self,
+        state: _LoopState,
+        amount: float,
+        currency: str,
+        payment_method_type: str,
+        last4: str | None,
+        idempotency_key: str,
+    ) -> ChargeResult:
+        payload = {
+            "amount": amount,
+            "currency": currency,
+            "payment_method_type": payment_method_type,
+            "last4": last4,
+        }
+        try:
+            status_code, data = await self._post(
+                state, "/v1/charges", payload, headers={"Idempotency-Key": idempotency_key}
+            )
+        except GatewayCallError as exc:
+            return ChargeResult(success=False, gateway_status=exc.status, failure_reason=exc.reason)
+
+        if status_code < 300 and data.get("status") == "succeeded":
+            return ChargeResult(
+                success=True,
+                gateway_transaction_id=data.get("id"),
+                gateway_status="succeeded",
+                gateway_response="Charge successful",
+            )
+        return ChargeResult(
+            success=False,
+            gateway_status=data.get("status", "failed"),
+            failure_reason=data.get("failure_reason", "Charge declined"),
+        )
+
+    async def _post(
+        self,
+        state: _LoopState,
+        path: str,
+        payload: dict,
+        headers: dict | None = None,
+    ) -> tuple[int, dict]:
+        """POST within the call deadline and concurrency limit; return (status code, JSON body)."""
+        try:
+            async with asyncio.timeout(self.timeout), state.limiter:
+                response = await state.client.post(path, json=payload, headers=headers)
+        except TimeoutError:
+            logger.warning("Gateway call timed out", path=path, timeout=self.timeout)
+            raise GatewayCallError("timeout", f"Gateway did not answer within {self.timeout}s") from None
+        except httpx.HTTPError as exc:
+            logger.warning("Gateway call failed", path=path, error=str(exc))
+            raise GatewayCallError("error", f"Gateway request failed: {exc}") from exc
+
+        if response.status_code >= 500:
+            raise GatewayCallError("error", f"Gateway error: HTTP {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError:
+            raise GatewayCallError("error", "Gateway returned an invalid response") from None
+        return response.status_code, data
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        if self._state is None or self._state.loop is not loop:
+            # Clients and semaphores are bound to one event loop
+            self._state = _LoopState(
+                loop=loop,
+                client=httpx.AsyncClient(
+                    base_url=self.base_url,
+                    transport=self.transport,
+                    headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else None,
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                ),
+                limiter=asyncio.Semaphore(self.max_concurrency),
+            )
+        return self._state
+
+    @staticmethod
+    def _forget(state: _LoopState, idempotency_key: str, call: asyncio.Future) -> None:
+        if state.inflight.get(idempotency_key) is call:
+            del state.inflight[idempotency_key]
@@ -3,6 +3,9 @@
 Defines the contract that all payment gateway adapters must implement.
 This enables swapping between FakeGateway (dev/test) and StripeGateway
 (production) without changing any domain or application code.
+
+AsyncPaymentGateway is the same contract for asyncio callers, implemented by
+the pooled HTTPGateway (http_adapter.py).
 """
 
 from abc import ABC, abstractmethod
@@ -63,3 +66,41 @@ class PaymentGateway(ABC):
     ) -> bool:
         """Verify that a webhook payload is authentically from the gateway."""
         ...
+
+
+class AsyncPaymentGateway(ABC):
+    """Asynchronous payment gateway interface."""
+
+    @abstractmethod
+    async def create_charge(
+        self,
+        amount: float,
+        currency: str,
+        payment_method_type: str,
+        last4: str | None,
+        idempotency_key: str,
+    ) -> ChargeResult:
+        """Create a charge via the payment gateway."""
+        ...
+
+    @abstractmethod
+    async def create_refund(
+        self,
+        gateway_transaction_id: str,
+        amount: float,
+        reason: str,
+    ) -> RefundResult:
+        """Refund a previous charge."""
+        ...
+
+    @abstractmethod
+    def verify_webhook_signature(
+        self,
+        payload: str,
+        signature: str,
+    ) -> bool:
+        """Verify that a webhook payload is authentically from the gateway."""
+        ...
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release connections held by the gateway client."""
@@ -0,0 +1,101 @@
+"""Placing charges and refunds with the payment gateway.
+
+InitiatePayment and RequestRefund record the intent on the Payment; the
+payment and refund endpoints then call the gateway through the pooled
+AsyncPaymentGateway (``get_async_gateway()``), on their own event loop and
+outside any unit of work. A definite answer is applied through the same
+commands as the gateway's webhooks (ProcessPaymentWebhook /
+ProcessRefundWebhook), so the webhook that later reports the same outcome is
+acknowledged from the idempotency store. A call that times out or errors
+leaves the payment as it was, for the webhook to settle.
+
+Charges are keyed on the payment id: a repeated InitiatePayment resolves to
+the same payment, so its charge joins the in-flight call or is replayed by
+the gateway rather than placed twice.
+
+Without a ``[custom.gateway]`` base_url there is no async gateway and nothing
+is called; payments then settle by webhook alone.
+"""
+
+import structlog
+from protean.utils.globals import current_domain
+
+from payments.gateway import get_async_gateway
+from payments.gateway.port import ChargeResult, RefundResult
+from payments.payment.initiation import InitiatePayment
+from payments.payment.payment import Payment
+from payments.payment.refund import ProcessRefundWebhook
+from payments.payment.webhook import ProcessPaymentWebhook
+
+logger = structlog.get_logger(__name__)
+
+# Gateway statuses that settle a charge; anything else (timeout, error) is left to the webhook
+_SETTLED = frozenset({"succeeded", "failed"})
+
+
+async def charge_payment(payment_id: str, command: InitiatePayment) -> ChargeResult | None:
+    """Charge an initiated payment and record the outcome; None if no gateway is configured."""
+    gateway = get_async_gateway()
+    if gateway is None:
+        return None
+
+    result = await gateway.create_charge(
+        amount=command.amount,
+        currency=command.currency or "USD",
+        payment_method_type=command.payment_method_type,
+        last4=command.last4,
+        idempotency_key=payment_id,
+    )
+    if result.gateway_status not in _SETTLED:
+        logger.warning(
+            "Charge left for the gateway webhook",
+            payment_id=payment_id,
+            gateway_status=result.gateway_status,
+            reason=result.failure_reason,
+        )
+        return result
+
+    current_domain.process(
+        ProcessPaymentWebhook(
+            payment_id=payment_id,
+            gateway_transaction_id=result.gateway_transaction_id,
+            gateway_status=result.gateway_status,
+            failure_reason=result.failure_reason,
+        ),
+        asynchronous=False,
+    )
+    return result
+
+
+async def refund_payment(payment_id: str, refund_id: str) -> RefundResult | None:
+    """Submit a requested refund and record its completion; None if no gateway is configured."""
+    gateway = get_async_gateway()
+    if gateway is None:
+        return None
+
+    payment = current_domain.repository_for(Payment).get(payment_id)
+    refund = next(refund for refund in payment.refunds if str(refund.id) == refund_id)
+    result = await gateway.create_refund(
+        gateway_transaction_id=payment.gateway_info.gateway_transaction_id,
+        amount=refund.amount,
+        reason=refund.reason,
+    )
+    if not result.success:
+        logger.warning(
+            "Refund left for the gateway webhook",
+            payment_id=payment_id,
+            refund_id=refund_id,
+            gateway_status=result.gateway_status,
+            reason=result.failure_reason,
+        )
+        return result
+
+    current_domain.process(
+        ProcessRefundWebhook(
+            payment_id=payment_id,
+            refund_id=refund_id,
+            gateway_refund_id=result.gateway_refund_id,
+        ),
+        asynchronous=False,
+    )
+    return result
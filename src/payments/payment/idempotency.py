@@ -0,0 +1,197 @@
+"""Idempotency store — short-circuit repeated payment requests and webhooks.
+
+Clients retry InitiatePayment with the same ``idempotency_key``, and gateways
+redeliver webhooks until they see a 2xx. Without a dedupe check each repeat
+replays the event-sourced Payment before being rejected (or, for
+InitiatePayment, creates a second payment). IdempotencyRecord is a compact
+table keyed by ``scope:key`` that remembers the outcome of the first
+request, so a repeat is answered with one primary-key lookup:
+
+    initiate:<customer_id>:<order_id>:<idempotency_key>  → payment id
+    webhook:<payment_id>:<gateway status>                → "processed"
+    refund-webhook:<payment_id>:<refund_id>              → "processed"
+
+Client keys are scoped by customer and order, so two customers (or two
+orders) that happen to send the same key never share a payment.
+
+Records are only ever inserted: the key is the primary key, and writing one
+that exists fails. InitiatePayment ``claim``s its key before creating the
+payment, in a transaction of its own, so of two first requests racing with
+the same key exactly one claim succeeds and the other is answered with the
+winner's payment id. A handler that fails after claiming ``release``s the
+claim so the request can be retried. Webhook outcomes are ``remember``ed in
+the handler's unit of work; webhooks for one payment are applied one at a
+time from the webhook inbox, so they do not race.
+
+A record stops counting once it expires, and an expired claim is taken
+over by the next request. PurgeExpiredIdempotencyKeys, triggered
+periodically by an external scheduler via the maintenance API endpoint,
+deletes expired records in batches.
+
+Retrying a failed payment opens a new attempt, so RetryPaymentHandler
+forgets the payment's failure webhook — the gateway's answer for the new
+attempt is not a duplicate even when its payload is identical.
+
+    [custom.idempotency]
+    ttl = 86400                 # seconds a request outcome is remembered
+    purge_batch_size = 1000     # expired records deleted per purge run
+"""
+
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean import handle
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.processing import Priority, processing_priority
+
+from payments.domain import payments
+from payments.payment.payment import Payment
+from shared.clock import utc_naive
+from shared.config import custom_settings
+
+logger = structlog.get_logger(__name__)
+
+INITIATE = "initiate"
+WEBHOOK = "webhook"
+REFUND_WEBHOOK = "refund-webhook"
+
+
+@dataclass(frozen=True)
+class IdempotencySettings:
+    ttl: float = 86400.0
+    purge_batch_size: int = 1000
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "IdempotencySettings":
+        return cls(
+            ttl=float(settings.get("ttl", 86400)),
+            purge_batch_size=max(1, int(settings.get("purge_batch_size", 1000))),
+        )
+
+
+def idempotency_settings() -> IdempotencySettings:
+    return IdempotencySettings.from_config(custom_settings(payments, "idempotency"))
+
+
+@payments.projection
+class IdempotencyRecord:
+    key = String(identifier=True, required=True, max_length=600)
+    result = String(max_length=255)
+    expires_at = DateTime(required=True)
+
+
+def _record_key(scope: str, key: str) -> str:
+    return f"{scope}:{key}"
+
+
+def recall(scope: str, key: str, now: datetime | None = None) -> str | None:
+    """Return the remembered outcome of an earlier request, or None if there is none (or it expired)."""
+    repo = current_domain.repository_for(IdempotencyRecord)
+    try:
+        record = repo.get(_record_key(scope, key))
+    except ObjectNotFoundError:
+        return None
+    if utc_naive(record.expires_at) <= utc_naive(now or datetime.now(UTC)):
+        # Expired: drop it now so the request can be remembered afresh
+        repo.query.filter(key=record.key).delete()
+        return None
+    return record.result
+
+
+def remember(scope: str, key: str, result: str, now: datetime | None = None) -> None:
+    """Remember a request's outcome for the configured TTL (in the current unit of work)."""
+    expires_at = utc_naive(now or datetime.now(UTC)) + timedelta(seconds=idempotency_settings().ttl)
+    current_domain.repository_for(IdempotencyRecord).add(
+        IdempotencyRecord(key=_record_key(scope, key), result=result, expires_at=expires_at)
+    )
+
+
+def claim(scope: str, key: str, result: str, now: datetime | None = None) -> str | None:
+    """Claim ``key`` for ``result``, committed at once; return None if claimed, else the earlier claim's result.
+
+    The insert runs outside the current unit of work, so a concurrent request
+    for the same key sees the claim before this request's work commits.
+    """
+    now = utc_naive(now or datetime.now(UTC))
+    record_key = _record_key(scope, key)
+    # Escape hatch: the record must commit on its own, ahead of the handler's unit of work
+    dao = current_domain.repository_for(IdempotencyRecord)._dao.outside_uow()
+    for _ in range(2):
+        try:
+            dao.create(key=record_key, result=result, expires_at=now + timedelta(seconds=idempotency_settings().ttl))
+            return None
+        except Exception:
+            # The key exists: the store's unique check, or the primary key if the claims raced
+            try:
+                existing = dao.get(record_key)
+            except ObjectNotFoundError:
+                continue  # Released in the meantime: claim again
+            if utc_naive(existing.expires_at) > now:
+                return existing.result
+            dao.delete(existing)  # Expired: take it over
+    raise RuntimeError(f"Could not claim idempotency key {record_key!r}")
+
+
+def release(scope: str, key: str) -> None:
+    """Drop a claim whose request failed, committed at once, so the request can be retried."""
+    dao = current_domain.repository_for(IdempotencyRecord)._dao.outside_uow()
+    with suppress(ObjectNotFoundError):
+        dao.delete(dao.get(_record_key(scope, key)))
+
+
+def initiate_key(customer_id: str, order_id: str, idempotency_key: str) -> str:
+    # A client key only identifies a request within its customer's order
+    return f"{customer_id}:{order_id}:{idempotency_key}"
+
+
+def forget(scope: str, key: str) -> None:
+    current_domain.repository_for(IdempotencyRecord).query.filter(key=_record_key(scope, key)).delete()
+
+
+def webhook_key(payment_id: str, gateway_status: str) -> str:
+    # An attempt succeeds or fails once; retries forget the failure
+    return f"{payment_id}:{gateway_status}"
+
+
+def expired_records(as_of: datetime, limit: int) -> list[IdempotencyRecord]:
+    """Return up to ``limit`` records expired at ``as_of``, oldest first."""
+    return (
+        current_domain.view_for(IdempotencyRecord)
+        .query.filter(expires_at__lte=utc_naive(as_of))
+        .order_by("expires_at")
+        .limit(limit)
+        .all()
+        .items
+    )
+
+
+@payments.command(part_of="Payment")
+class PurgeExpiredIdempotencyKeys:
+    """Delete idempotency records whose TTL has elapsed."""
+
+    as_of = DateTime()  # Optional: defaults to now
+    limit = Integer()  # Optional: defaults to [custom.idempotency] purge_batch_size
+
+
+@payments.command_handler(part_of=Payment)
+class PurgeExpiredIdempotencyKeysHandler:
+    @handle(PurgeExpiredIdempotencyKeys)
+    def purge_expired(self, command):
+        with processing_priority(Priority.LOW):
+            as_of = command.as_of or datetime.now(UTC)
+            limit = command.limit or idempotency_settings().purge_batch_size
+            repo = current_domain.repository_for(IdempotencyRecord)
+
+            purged = (
+                repo.query.filter(key__in=[record.key for record in expired_records(as_of, limit)])
+                .limit(limit)
+                .delete()
+            )
+
+            if purged:
+                logger.info("Purged expired idempotency keys", count=purged)
+            return purged
@@ -1,6 +1,9 @@
 """Payment initiation — command and handler.
 
-Creates a new Payment aggregate and initiates a charge via the gateway.
+Creates a new Payment aggregate; the payment endpoint then places the charge
+with the gateway (charging.py). A repeated ``idempotency_key`` returns the
+payment the first request created for the same customer and order, including
+while that request is still being processed.
 """
 
 from protean import handle
@@ -10,6 +13,7 @@ from protean.utils.processing import Priority, processing_priority
 
 from payments.domain import payments
 from payments.gateway import get_gateway
+from payments.payment.idempotency import INITIATE, claim, initiate_key, release
 from payments.payment.payment import Payment
 
 
@@ -43,5 +47,15 @@ class InitiatePaymentHandler:
                 gateway_name=type(gateway).__name__,
                 idempotency_key=command.idempotency_key,
             )
-            current_domain.repository_for(Payment).add(payment)
+            # Claim the key before storing the payment: a repeated or concurrent
+            # request with the key is answered with the payment that claimed it
+            key = initiate_key(command.customer_id, command.order_id, command.idempotency_key)
+            existing = claim(INITIATE, key, str(payment.id))
+            if existing:
+                return existing
+            try:
+                current_domain.repository_for(Payment).add(payment)
+            except Exception:
+                release(INITIATE, key)
+                raise
             return str(payment.id)
@@ -4,7 +4,7 @@ Listens for OrderReturned messages from the Ordering domain's broker stream
 to automatically initiate a refund for the returned order's payment.
 
 Uses the subscriber (ACL) pattern: receives raw dict payloads from the broker,
-filters by event type, and dispatches a RequestRefund command.
+declares the event types it handles, and dispatches a RequestRefund command.
 No dependency on shared event classes or register_external_event.
 """
 
@@ -13,25 +13,24 @@ from protean.utils.globals import current_domain
 
 from payments.domain import payments
 from payments.projections.payment_status import PaymentStatusView
+from shared.subscribers import TypedSubscriber
 
 logger = structlog.get_logger(__name__)
 
 
 @payments.subscriber(stream="ordering::order")
-class OrderReturnedSubscriber:
+class OrderReturnedSubscriber(TypedSubscriber):
     """Reacts to OrderReturned events to initiate refunds.
 
-    ACL pattern: receives raw broker message dict, extracts event type from
-    metadata.headers.type, looks up the succeeded payment for the order,
-    and dispatches a RequestRefund command. Ignores all other event types.
+    ACL pattern: receives the raw ``data`` dict of OrderReturned messages,
+    looks up the succeeded payment for the order, and dispatches a
+    RequestRefund command. Other event types are dropped by
+    ``TypedSubscriber`` from metadata.headers.type alone.
     """
 
-    def __call__(self, payload: dict) -> None:
-        event_type = payload.get("metadata", {}).get("headers", {}).get("type", "")
-        if "OrderReturned" not in event_type:
-            return
+    event_types = frozenset({"Ordering.OrderReturned"})
 
-        data = payload.get("data", {})
+    def handle(self, data: dict) -> None:
         order_id = str(data["order_id"])
 
         logger.info(
@@ -1,6 +1,8 @@
 """Payment refund — commands and handler.
 
-Handles refund requests and gateway refund confirmations.
+Handles refund requests and gateway refund confirmations. Redelivered
+confirmations are acknowledged from the idempotency store without loading the
+Payment.
 """
 
 from protean import handle
@@ -8,6 +10,7 @@ from protean.fields import Float, Identifier, String
 from protean.utils.globals import current_domain
 
 from payments.domain import payments
+from payments.payment.idempotency import REFUND_WEBHOOK, recall, remember
 from payments.payment.payment import Payment
 
 
@@ -44,6 +47,10 @@ class RefundHandler:
 
     @handle(ProcessRefundWebhook)
     def process_refund_webhook(self, command):
+        key = f"{command.payment_id}:{command.refund_id}"
+        if recall(REFUND_WEBHOOK, key):
+            return
+
         repo = current_domain.repository_for(Payment)
         payment = repo.get(command.payment_id)
         payment.complete_refund(
@@ -51,3 +58,4 @@ class RefundHandler:
             gateway_refund_id=command.gateway_refund_id,
         )
         repo.add(payment)
+        remember(REFUND_WEBHOOK, key, "processed")
@@ -1,6 +1,8 @@
 """Payment retry — command and handler.
 
-Retries a failed payment (up to MAX_PAYMENT_ATTEMPTS).
+Retries a failed payment (up to MAX_PAYMENT_ATTEMPTS). The failure webhook
+of the previous attempt is forgotten, so the gateway's answer for the new
+attempt is processed even if its payload is identical.
 """
 
 from protean import handle
@@ -8,6 +10,7 @@ from protean.fields import Identifier
 from protean.utils.globals import current_domain
 
 from payments.domain import payments
+from payments.payment.idempotency import WEBHOOK, forget, webhook_key
 from payments.payment.payment import Payment
 
 
@@ -26,3 +29,4 @@ class RetryPaymentHandler:
         payment = repo.get(command.payment_id)
         payment.retry()
         repo.add(payment)
+        forget(WEBHOOK, webhook_key(command.payment_id, "failed"))
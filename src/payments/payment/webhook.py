@@ -1,6 +1,8 @@
 """Payment webhook processing — command and handler.
 
-Handles gateway webhook callbacks for payment success/failure.
+Handles gateway webhook callbacks for payment success/failure. Redelivered
+webhooks are acknowledged from the idempotency store without loading the
+Payment.
 """
 
 from protean import handle
@@ -8,6 +10,7 @@ from protean.fields import Identifier, String
 from protean.utils.globals import current_domain
 
 from payments.domain import payments
+from payments.payment.idempotency import WEBHOOK, recall, remember, webhook_key
 from payments.payment.payment import Payment
 
 
@@ -25,6 +28,10 @@ class ProcessPaymentWebhook:
 class ProcessWebhookHandler:
     @handle(ProcessPaymentWebhook)
     def process_webhook(self, command):
+        key = webhook_key(command.payment_id, command.gateway_status)
+        if recall(WEBHOOK, key):
+            return
+
         repo = current_domain.repository_for(Payment)
         payment = repo.get(command.payment_id)
 
@@ -38,3 +45,4 @@ class ProcessWebhookHandler:
             )
 
         repo.add(payment)
+        remember(WEBHOOK, key, "processed")
@@ -0,0 +1,165 @@
+"""Payment webhook inbox — queued gateway callbacks, drained in batches.
+
+The payment and refund webhook endpoints verify the gateway signature,
+append the callback to PaymentWebhookInbox and answer 202 without touching
+the Payment. ``drain_payment_webhooks``, triggered periodically by an
+external scheduler via the maintenance API endpoint, processes pending
+callbacks in arrival order (and so in order per payment) through
+ProcessPaymentWebhook and ProcessRefundWebhook.
+
+The drain is a plain function rather than a command: each callback needs
+its own unit of work, and commands processed inside a command handler join
+the handler's unit of work, where one failure would roll back the batch.
+
+A callback that fails to apply is retried with backoff and dead-lettered
+after ``max_attempts``; later callbacks for the same payment wait behind
+it, dead-lettered or not. Processed callbacks stay in the inbox for the
+retention window, so a redelivery is acknowledged from its ``message_id``
+alone; each drain run also deletes a batch of those past retention.
+Dead-lettered callbacks are kept until an operator fixes the cause and
+requeues them (``requeue_dead_webhooks``, behind the
+``/payments/maintenance/requeue-webhooks`` endpoint), which also releases
+the callbacks held behind them. See shared/webhooks.py for the retry and
+retention settings.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from protean.core.unit_of_work import UnitOfWork
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Dict, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.processing import Priority, processing_priority
+
+from payments.domain import payments
+from shared.clock import utc_naive
+from shared.webhooks import (
+    DEAD,
+    PENDING,
+    PROCESSED,
+    due_messages,
+    inbox_settings,
+    message_id,
+    receive_time,
+    record_failure,
+    requeue,
+)
+
+logger = structlog.get_logger(__name__)
+
+PAYMENT = "payment"
+REFUND = "refund"
+
+
+@payments.projection
+class PaymentWebhookInbox:
+    message_id = String(identifier=True, required=True, max_length=64)
+    kind = String(max_length=20, required=True)  # payment, refund
+    payment_id = Identifier(required=True)
+    payload = Dict(required=True)
+    status = String(max_length=20, default=PENDING)  # pending, processed, dead
+    attempts = Integer(default=0)  # failed attempts so far
+    next_attempt_at = DateTime()  # set after a failure: not retried before then
+    error = String(max_length=500)
+    received_at = DateTime(required=True)
+
+
+def accept_webhook(kind: str, payment_id: str, payload: dict, raw: bytes) -> bool:
+    """Queue a verified webhook; return False if this delivery is already in the inbox."""
+    repo = current_domain.repository_for(PaymentWebhookInbox)
+    identity = message_id(kind, raw)
+    try:
+        repo.get(identity)
+        return False
+    except ObjectNotFoundError:
+        pass
+
+    repo.add(
+        PaymentWebhookInbox(
+            message_id=identity,
+            kind=kind,
+            payment_id=payment_id,
+            payload=payload,
+            received_at=receive_time(),
+        )
+    )
+    return True
+
+
+def pending_webhooks(limit: int, now: datetime | None = None) -> list[PaymentWebhookInbox]:
+    """Return up to ``limit`` pending webhooks due at ``now``, oldest first.
+
+    Webhooks for a payment with an earlier webhook awaiting retry or
+    dead-lettered are held back.
+    """
+    now = utc_naive(now or datetime.now(UTC))
+    return due_messages(current_domain.view_for(PaymentWebhookInbox), "payment_id", limit, now)
+
+
+def requeue_dead_webhooks(payment_id: str) -> int:
+    """Requeue a payment's dead-lettered webhooks for the next drain run; return how many."""
+    repo = current_domain.repository_for(PaymentWebhookInbox)
+    dead = repo.query.filter(payment_id=payment_id, status=DEAD).limit(None).all().items
+    for message in dead:
+        requeue(message)
+        repo.add(message)
+    if dead:
+        logger.info("Requeued dead-lettered payment webhooks", payment_id=payment_id, count=len(dead))
+    return len(dead)
+
+
+def _command_for(message: PaymentWebhookInbox):
+    from payments.payment.refund import ProcessRefundWebhook
+    from payments.payment.webhook import ProcessPaymentWebhook
+
+    if message.kind == REFUND:
+        return ProcessRefundWebhook(**message.payload)
+    return ProcessPaymentWebhook(**message.payload)
+
+
+def drain_payment_webhooks(limit: int | None = None) -> int:
+    """Process up to ``limit`` pending webhooks in arrival order; return how many were applied.
+
+    Each webhook is applied in its own unit of work together with its inbox
+    status, so one that fails is rolled back alone and scheduled for a retry
+    (or dead-lettered). Webhooks queued behind it for the same payment are
+    left for a later run.
+    """
+    with processing_priority(Priority.LOW):
+        settings = inbox_settings(payments)
+        limit = limit or settings.batch_size
+        repo = current_domain.repository_for(PaymentWebhookInbox)
+        now = utc_naive(datetime.now(UTC))
+
+        processed_count = 0
+        failed: set[str] = set()  # payments with a webhook that failed in this run
+        for message in pending_webhooks(limit, now):
+            payment_id = str(message.payment_id)
+            if payment_id in failed:
+                continue
+            try:
+                with UnitOfWork():
+                    current_domain.process(_command_for(message), asynchronous=False)
+                    message.status = PROCESSED
+                    repo.add(message)
+                processed_count += 1
+            except Exception as exc:
+                record_failure(message, exc, settings, now)
+                repo.add(message)
+                failed.add(payment_id)
+                logger.warning(
+                    "Failed to process payment webhook",
+                    kind=message.kind,
+                    payment_id=payment_id,
+                    attempts=message.attempts,
+                    status=message.status,
+                    error=str(exc),
+                )
+
+        cutoff = now - timedelta(seconds=settings.retention)
+        purged = repo.query.filter(status=PROCESSED, received_at__lte=cutoff).limit(limit).delete()
+
+        if processed_count or purged:
+            logger.info("Drained payment webhooks", processed=processed_count, purged=purged)
+        return processed_count
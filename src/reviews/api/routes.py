@@ -4,20 +4,27 @@ Each route translates between Pydantic schemas (external contract) and
 Protean commands (internal domain concepts).
 """
 
+from dataclasses import asdict
+
 from fastapi import APIRouter
 from protean.utils.globals import current_domain
 
 from reviews.api.schemas import (
     AddSellerReplyRequest,
+    BackfillRequest,
+    BackfillResponse,
     CustomerReviewResponse,
     EditReviewRequest,
     ModerateReviewRequest,
     ProductRatingResponse,
     ProductReviewResponse,
+    ProductReviewsPage,
     RemoveReviewRequest,
     ReportReviewRequest,
     ReviewDetailResponse,
     ReviewIdResponse,
+    ReviewSearchHitResponse,
+    ReviewSearchResponse,
     StatusResponse,
     SubmitReviewRequest,
     VoteOnReviewRequest,
@@ -73,6 +80,37 @@ async def list_customer_reviews(
     )
 
 
+@review_router.get("/search", response_model=ReviewSearchResponse)
+async def search_reviews(
+    q: str,
+    product_id: str | None = None,
+    status: str = "Published",
+    limit: int = 20,
+) -> ReviewSearchResponse:
+    """Search review text; every term must match. Best matches first."""
+    from reviews.projections.review_search_queries import SearchReviews
+
+    hits = current_domain.dispatch(SearchReviews(text=q, product_id=product_id, status=status, limit=limit))
+    return ReviewSearchResponse(items=[ReviewSearchHitResponse(**asdict(hit)) for hit in hits])
+
+
+@review_router.get("/moderation/sweep", response_model=ReviewSearchResponse)
+async def sweep_reviews(
+    keywords: str,
+    status: str = "Pending",
+    limit: int = 100,
+) -> ReviewSearchResponse:
+    """Moderation sweep: reviews in a status containing any of the comma-separated keywords."""
+    from reviews.projections.review_search_queries import SweepReviews
+
+    hits = current_domain.dispatch(
+        SweepReviews(
+            keywords=[keyword for keyword in keywords.split(",") if keyword.strip()], status=status, limit=limit
+        )
+    )
+    return ReviewSearchResponse(items=[ReviewSearchHitResponse(**asdict(hit)) for hit in hits])
+
+
 @review_router.get("/{review_id}", response_model=ReviewDetailResponse)
 async def get_review_detail(review_id: str) -> ReviewDetailResponse:
     """Get full detail view of a single review."""
@@ -82,30 +120,38 @@ async def get_review_detail(review_id: str) -> ReviewDetailResponse:
     return ReviewDetailResponse(**result.to_dict())
 
 
-@review_router.get("", response_model=PaginatedResponse)
+@review_router.get("", response_model=ProductReviewsPage)
 async def list_product_reviews(
     product_id: str,
+    sort: str = "most_recent",
     page: int = 1,
     page_size: int = 20,
-) -> PaginatedResponse:
-    """List published reviews for a product."""
-    from reviews.projections.product_reviews_queries import ListProductReviews
+    after: str | None = None,
+) -> ProductReviewsPage:
+    """List published reviews for a product: most_recent, most_helpful or verified_first.
+
+    Pass the previous page's ``next_cursor`` as ``after`` to page by keyset instead of by page number.
+    """
+    from reviews.projections.product_reviews_queries import ListProductReviews, review_cursor
 
     result = current_domain.dispatch(
         ListProductReviews(
             product_id=product_id,
+            sort=sort,
             page=page,
             page_size=page_size,
+            after=after,
         )
     )
-    return PaginatedResponse(
+    return ProductReviewsPage(
         items=[ProductReviewResponse(**item.to_dict()).model_dump() for item in result.items],
         total=result.total,
         page=page,
         page_size=page_size,
         total_pages=result.total_pages,
         has_next=result.has_next,
-        has_prev=result.has_prev,
+        has_prev=result.has_prev or bool(after),
+        next_cursor=review_cursor(result.items[-1], sort) if result.has_next else None,
     )
 
 
@@ -206,3 +252,44 @@ async def add_seller_reply(review_id: str, body: AddSellerReplyRequest) -> Statu
     )
     current_domain.process(command, asynchronous=False)
     return StatusResponse()
+
+
+# ---------------------------------------------------------------------------
+# Maintenance Endpoints
+# ---------------------------------------------------------------------------
+@review_router.post("/maintenance/backfill-search-index", response_model=BackfillResponse)
+async def backfill_search_index(body: BackfillRequest | None = None) -> BackfillResponse:
+    """Index reviews submitted before the search index existed.
+
+    Run once after deploying the index; reviews already indexed are skipped,
+    so it is safe to re-run. Until it has run, older reviews do not show up
+    in searches or moderation sweeps.
+    """
+    from reviews.projections.review_search import backfill_review_search
+
+    return BackfillResponse(written_count=backfill_review_search(body.batch_size if body else 500))
+
+
+@review_router.post("/maintenance/backfill-helpfulness-scores", response_model=BackfillResponse)
+async def backfill_helpfulness_scores(body: BackfillRequest | None = None) -> BackfillResponse:
+    """Score listed reviews published before the helpfulness score existed.
+
+    Run once after deploying; only unscored reviews are written, so it is safe
+    to re-run. Until it has run, those reviews sort first under most_helpful.
+    """
+    from reviews.projections.product_reviews import backfill_helpfulness_scores as backfill
+
+    return BackfillResponse(written_count=backfill(body.batch_size if body else 500))
+
+
+@review_router.post("/maintenance/backfill-customer-product-index", response_model=BackfillResponse)
+async def backfill_customer_product_index(body: BackfillRequest | None = None) -> BackfillResponse:
+    """Index existing reviews and verified purchases for the submission checks.
+
+    Safe to re-run. Run it right after deploying, and before that with
+    scripts/backfill_customer_product_index.py (see docs/reviews/README.md
+    for the rollout order).
+    """
+    from reviews.projections.customer_product_index import backfill_customer_product_index as backfill
+
+    return BackfillResponse(written_count=backfill(body.batch_size if body else 500))
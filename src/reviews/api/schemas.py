@@ -6,8 +6,12 @@ The API layer is the external contract; commands are internal domain concepts.
 
 from __future__ import annotations
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
+from shared.api.pagination import PaginatedResponse
+
 
 # ---------------------------------------------------------------------------
 # Request Schemas
@@ -119,12 +123,17 @@ class ProductReviewResponse(BaseModel):
     verified_purchase: str | None = None
     helpful_count: int = 0
     unhelpful_count: int = 0
+    helpfulness_score: float | None = 0.0  # None until backfill-helpfulness-scores has run
     has_seller_reply: str = "False"
     seller_reply_body: str | None = None
     is_edited: str = "False"
     published_at: str | None = None
 
 
+class ProductReviewsPage(PaginatedResponse):
+    next_cursor: str | None = None  # pass as ``after`` for the next page
+
+
 class ProductRatingResponse(BaseModel):
     product_id: str
     average_rating: float = 0.0
@@ -143,3 +152,28 @@ class CustomerReviewResponse(BaseModel):
     status: str
     created_at: str | None = None
     updated_at: str | None = None
+
+
+class ReviewSearchHitResponse(BaseModel):
+    review_id: str
+    product_id: str
+    status: str
+    title: str
+    score: int
+    submitted_at: datetime | None = None
+    matched_terms: list[str] = []
+
+
+class ReviewSearchResponse(BaseModel):
+    items: list[ReviewSearchHitResponse]
+
+
+# ---------------------------------------------------------------------------
+# Maintenance Schemas
+# ---------------------------------------------------------------------------
+class BackfillRequest(BaseModel):
+    batch_size: int = Field(default=500, ge=1, le=5000)
+
+
+class BackfillResponse(BaseModel):
+    written_count: int
@@ -0,0 +1,162 @@
+"""CustomerProductIndex — one row per (customer, product) for review submission checks.
+
+SubmitReview asks two questions about a customer and a product: have they
+already reviewed it, and did they buy it (verified purchase). Answering
+them used to mean a filter over Review rows and another over
+VerifiedPurchases, on every submission and in bursts after delivery
+prompts. Both answers now live in one row keyed by
+``<customer_id>:<product_id>``, so a submission makes a single primary-key
+lookup and never scans Review.
+
+- ``review_id`` is the customer's active review of the product. The
+  submit handler sets it in the same unit of work as the review. The
+  projector clears it on ReviewRemoved, because a customer may review again
+  after a removal.
+- ``order_id`` is the first delivered order containing the product. It is
+  set by ``record_purchase``, which the OrderDelivered subscriber calls.
+
+The submit check reads the entry before writing it, so two submissions
+for the same pair that race each other can both pass, as with the filters
+it replaced.
+
+Data written before the index existed is indexed by
+``backfill_customer_product_index`` — ``scripts/backfill_customer_product_index.py``
+or ``POST /reviews/maintenance/backfill-customer-product-index``. Re-running
+it is safe.
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+from protean.core.projector import on
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, String
+from protean.utils.globals import current_domain
+
+from reviews.domain import reviews
+from reviews.projections.verified_purchases import VerifiedPurchases
+from reviews.review.events import ReviewRemoved, ReviewSubmitted
+from reviews.review.review import Review, ReviewStatus
+
+
+@reviews.projection
+class CustomerProductIndex:
+    entry_id = Identifier(identifier=True, required=True)  # "<customer_id>:<product_id>"
+    customer_id = String(required=True)
+    product_id = String(required=True)
+    review_id = Identifier()  # active (not removed) review, if any
+    order_id = String()  # first delivered order, if a verified purchase
+    updated_at = DateTime()
+
+
+def index_key(customer_id, product_id) -> str:
+    return f"{customer_id}:{product_id}"
+
+
+def customer_product_entry(customer_id, product_id) -> CustomerProductIndex | None:
+    try:
+        return current_domain.repository_for(CustomerProductIndex).get(index_key(customer_id, product_id))
+    except ObjectNotFoundError:
+        return None
+
+
+def _upsert(customer_id, product_id, **values) -> None:
+    repo = current_domain.repository_for(CustomerProductIndex)
+    entry = customer_product_entry(customer_id, product_id)
+    if entry is None:
+        entry = CustomerProductIndex(
+            entry_id=index_key(customer_id, product_id),
+            customer_id=str(customer_id),
+            product_id=str(product_id),
+        )
+    for name, value in values.items():
+        setattr(entry, name, value)
+    entry.updated_at = datetime.now(UTC)
+    repo.add(entry)
+
+
+def record_review(customer_id, product_id, review_id) -> None:
+    """Mark the customer as having an active review of the product."""
+    _upsert(customer_id, product_id, review_id=str(review_id))
+
+
+def record_purchase(customer_id, product_id, order_id, delivered_at, variant_id=None) -> None:
+    """Record a delivered purchase: the VerifiedPurchases row and, if first, the index entry."""
+    current_domain.repository_for(VerifiedPurchases).add(
+        VerifiedPurchases(
+            vp_id=str(uuid.uuid4()),
+            customer_id=str(customer_id),
+            product_id=str(product_id),
+            variant_id=str(variant_id or ""),
+            order_id=str(order_id),
+            delivered_at=delivered_at,
+        )
+    )
+    entry = customer_product_entry(customer_id, product_id)
+    if entry is None or not entry.order_id:
+        _upsert(customer_id, product_id, order_id=str(order_id))
+
+
+def backfill_customer_product_index(batch_size: int = 500) -> int:
+    """Build index entries from existing reviews and verified purchases; returns entries written.
+
+    Also clears entries whose review has since been removed, so a re-run
+    repairs removals that happened while the index was not maintained.
+    """
+    written = 0
+    offset = 0
+    while True:
+        purchases = (
+            current_domain.view_for(VerifiedPurchases)
+            .query.order_by("delivered_at")
+            .offset(offset)
+            .limit(batch_size)
+            .all()
+            .items
+        )
+        for purchase in purchases:
+            entry = customer_product_entry(purchase.customer_id, purchase.product_id)
+            if entry is None or not entry.order_id:
+                _upsert(purchase.customer_id, purchase.product_id, order_id=str(purchase.order_id))
+                written += 1
+        if len(purchases) < batch_size:
+            break
+        offset += batch_size
+
+    offset = 0
+    while True:
+        batch = (
+            current_domain.repository_for(Review).query.order_by("created_at").offset(offset).limit(batch_size).all()
+        )
+        for review in batch.items:
+            if review.status != ReviewStatus.REMOVED.value:
+                record_review(review.customer_id, review.product_id, review.id)
+                written += 1
+                continue
+            entry = customer_product_entry(review.customer_id, review.product_id)
+            if entry is not None and str(entry.review_id or "") == str(review.id):
+                _upsert(review.customer_id, review.product_id, review_id=None)
+                written += 1
+        if len(batch.items) < batch_size:
+            break
+        offset += batch_size
+    return written
+
+
+@reviews.projector(projector_for=CustomerProductIndex, aggregates=[Review])
+class CustomerProductIndexProjector:
+    @on(ReviewSubmitted)
+    def on_review_submitted(self, event):
+        # Already set by the submit handler; kept so the index can be rebuilt from events
+        entry = customer_product_entry(event.customer_id, event.product_id)
+        if entry is None or str(entry.review_id or "") != str(event.review_id):
+            record_review(event.customer_id, event.product_id, event.review_id)
+
+    @on(ReviewRemoved)
+    def on_review_removed(self, event):
+        entry = customer_product_entry(event.customer_id, event.product_id)
+        if entry is None or str(entry.review_id or "") != str(event.review_id):
+            return
+        entry.review_id = None
+        entry.updated_at = event.removed_at
+        current_domain.repository_for(CustomerProductIndex).add(entry)
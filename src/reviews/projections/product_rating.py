@@ -1,4 +1,13 @@
-"""ProductRating — aggregated rating statistics per product."""
+"""ProductRating — aggregated rating statistics per product.
+
+Maintained from ReviewApproved and ReviewRemoved alone. Both events carry
+the rating and the verified-purchase flag, so each one adjusts the
+product's counters by one step: a star bucket, total_reviews, rating_sum
+and verified_review_count. Nothing loads the Review, and the average is
+rating_sum / total_reviews rather than a pass over the distribution, so a
+mass approval from the moderation queue costs the same per review however
+large the reviews or the product are.
+"""
 
 from protean.core.projector import on
 from protean.fields import DateTime, Dict, Float, Identifier, Integer
@@ -15,6 +24,7 @@ class ProductRating:
     average_rating = Float(default=0.0)
     total_reviews = Integer(default=0)
     rating_distribution = Dict()
+    rating_sum = Integer()
     verified_review_count = Integer(default=0)
     updated_at = DateTime()
 
@@ -23,12 +33,34 @@ def _default_distribution():
     return {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
 
 
-def _recalculate_average(distribution):
-    total = sum(distribution.values())
-    if total == 0:
-        return 0.0
-    weighted_sum = sum(int(rating) * count for rating, count in distribution.items())
-    return round(weighted_sum / total, 2)
+def _is_verified(event) -> bool:
+    if event.verified_purchase is not None:
+        return event.verified_purchase == "True"
+    # Events raised before they carried the flag; only replays reach this
+    try:
+        return bool(current_domain.repository_for(Review).get(event.review_id).verified_purchase)
+    except Exception:
+        return False
+
+
+def _apply(pr: ProductRating, rating: int, verified: bool, step: int) -> None:
+    """Move one review's rating into (step=1) or out of (step=-1) the product's counters."""
+    distribution = dict(pr.rating_distribution or _default_distribution())
+    if pr.rating_sum is None:
+        # Rows written before rating_sum existed
+        pr.rating_sum = sum(int(stars) * count for stars, count in distribution.items())
+
+    key = str(rating)
+    if step < 0 and distribution.get(key, 0) == 0:
+        return  # Never counted
+    distribution[key] = distribution.get(key, 0) + step
+
+    pr.rating_distribution = distribution
+    pr.total_reviews = max(0, pr.total_reviews + step)
+    pr.rating_sum = max(0, pr.rating_sum + step * rating)
+    if verified:
+        pr.verified_review_count = max(0, pr.verified_review_count + step)
+    pr.average_rating = round(pr.rating_sum / pr.total_reviews, 2) if pr.total_reviews else 0.0
 
 
 @reviews.projector(projector_for=ProductRating, aggregates=[Review])
@@ -36,55 +68,29 @@ class ProductRatingProjector:
     @on(ReviewApproved)
     def on_review_approved(self, event):
         repo = current_domain.repository_for(ProductRating)
-
         try:
             pr = repo.get(event.product_id)
-            distribution = dict(pr.rating_distribution)
         except Exception:
             pr = ProductRating(
                 product_id=event.product_id,
                 total_reviews=0,
                 rating_distribution=_default_distribution(),
+                rating_sum=0,
                 verified_review_count=0,
             )
-            distribution = dict(pr.rating_distribution)
-
-        # Increment count for this rating
-        rating_key = str(event.rating)
-        distribution[rating_key] = distribution.get(rating_key, 0) + 1
 
-        pr.total_reviews = pr.total_reviews + 1
-        pr.rating_distribution = distribution
-        pr.average_rating = _recalculate_average(distribution)
+        _apply(pr, event.rating, _is_verified(event), 1)
         pr.updated_at = event.approved_at
-
-        # Check if verified
-        try:
-            review_repo = current_domain.repository_for(Review)
-            review = review_repo.get(event.review_id)
-            if review.verified_purchase:
-                pr.verified_review_count = pr.verified_review_count + 1
-        except Exception:
-            pass
-
         repo.add(pr)
 
     @on(ReviewRemoved)
     def on_review_removed(self, event):
         repo = current_domain.repository_for(ProductRating)
-
         try:
             pr = repo.get(event.product_id)
         except Exception:
             return  # No rating record to update
 
-        distribution = dict(pr.rating_distribution)
-        rating_key = str(event.rating)
-        distribution[rating_key] = max(0, distribution.get(rating_key, 0) - 1)
-
-        pr.total_reviews = max(0, pr.total_reviews - 1)
-        pr.rating_distribution = distribution
-        pr.average_rating = _recalculate_average(distribution)
+        _apply(pr, event.rating, _is_verified(event), -1)
         pr.updated_at = event.removed_at
-
         repo.add(pr)
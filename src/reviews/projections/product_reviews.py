@@ -1,7 +1,24 @@
-"""ProductReviews — published reviews for a product detail page."""
+"""ProductReviews — published reviews for a product detail page.
 
+Product pages list reviews "most helpful", "most recent" or "verified
+first". Each ordering is backed by a composite index led by product_id, so
+a page is read straight off the index instead of sorting a product's whole
+review set. "Most helpful" orders by ``helpfulness_score``, the Wilson
+lower bound on the helpful share of votes, kept up to date from vote
+events: a review with 90 of 100 helpful votes outranks one with 2 of 2,
+which a plain ratio or raw helpful count would get wrong.
+
+Rows published before the score existed have no ``helpfulness_score``, and
+a descending sort puts NULLs first; ``backfill_helpfulness_scores``, behind
+the ``/reviews/maintenance/backfill-helpfulness-scores`` endpoint, scores
+them from their vote counts. Run it once after deploying.
+"""
+
+import math
+
+from protean import Index
 from protean.core.projector import on
-from protean.fields import DateTime, Dict, Identifier, Integer, List, String, Text
+from protean.fields import DateTime, Dict, Float, Identifier, Integer, List, String, Text
 from protean.utils.globals import current_domain
 
 from reviews.domain import reviews
@@ -14,7 +31,24 @@ from reviews.review.events import (
 from reviews.review.review import Review
 
 
-@reviews.projection
+def wilson_lower_bound(helpful: int, unhelpful: int, z: float = 1.96) -> float:
+    """Lower bound of the Wilson score interval for the helpful share (95% by default)."""
+    total = helpful + unhelpful
+    if total == 0:
+        return 0.0
+    share = helpful / total
+    centre = share + z * z / (2 * total)
+    margin = z * math.sqrt((share * (1 - share) + z * z / (4 * total)) / total)
+    return (centre - margin) / (1 + z * z / total)
+
+
+@reviews.projection(
+    indexes=[
+        Index("product_id", "helpfulness_score", "published_at", desc=("helpfulness_score", "published_at")),
+        Index("product_id", "published_at", desc=("published_at",)),
+        Index("product_id", "verified_purchase", "published_at", desc=("verified_purchase", "published_at")),
+    ]
+)
 class ProductReviews:
     review_id = Identifier(identifier=True, required=True)
     product_id = Identifier(required=True)
@@ -29,12 +63,27 @@ class ProductReviews:
     verified_purchase = String()
     helpful_count = Integer(default=0)
     unhelpful_count = Integer(default=0)
+    helpfulness_score = Float()  # NULL on rows listed before it existed: backfill_helpfulness_scores
     has_seller_reply = String(default="False")
     seller_reply_body = Text()
     is_edited = String(default="False")
     published_at = DateTime()
 
 
+def backfill_helpfulness_scores(batch_size: int = 500) -> int:
+    """Score listed reviews that have no helpfulness score yet; returns reviews scored."""
+    repo = current_domain.repository_for(ProductReviews)
+    scored = 0
+    while True:
+        batch = repo.query.filter(helpfulness_score__isnull=True).limit(batch_size).all().items
+        for pr in batch:
+            pr.helpfulness_score = wilson_lower_bound(pr.helpful_count or 0, pr.unhelpful_count or 0)
+            repo.add(pr)
+        scored += len(batch)
+        if len(batch) < batch_size:
+            return scored
+
+
 @reviews.projector(projector_for=ProductReviews, aggregates=[Review])
 class ProductReviewsProjector:
     @on(ReviewApproved)
@@ -57,6 +106,7 @@ class ProductReviewsProjector:
                 verified_purchase=str(review.verified_purchase),
                 helpful_count=review.helpful_count,
                 unhelpful_count=review.unhelpful_count,
+                helpfulness_score=wilson_lower_bound(review.helpful_count, review.unhelpful_count),
                 has_seller_reply="True" if review.reply else "False",
                 is_edited=str(review.is_edited),
                 published_at=event.approved_at,
@@ -72,6 +122,7 @@ class ProductReviewsProjector:
             return  # Review not yet published
         pr.helpful_count = event.helpful_count
         pr.unhelpful_count = event.unhelpful_count
+        pr.helpfulness_score = wilson_lower_bound(event.helpful_count, event.unhelpful_count)
         repo.add(pr)
 
     @on(ReviewRemoved)
@@ -1,24 +1,91 @@
-"""Queries for the ProductReviews projection."""
+"""Queries for the ProductReviews projection.
+
+Listings page by ``page`` number, or by keyset: ``after`` takes the
+``review_cursor`` of the last review of the previous page and continues
+from there along the ordering's index, so deep pages cost the same as the
+first instead of skipping over every earlier row.
+"""
+
+import base64
+import json
+from datetime import datetime
+from enum import Enum
 
 from protean import read
-from protean.fields import Identifier, Integer
+from protean.exceptions import ValidationError
+from protean.fields import Identifier, Integer, String
 from protean.utils.globals import current_domain
+from protean.utils.query import Q
 
 from reviews.domain import reviews
 from reviews.projections.product_reviews import ProductReviews
 
 
+class ReviewSortOrder(Enum):
+    MOST_RECENT = "most_recent"
+    MOST_HELPFUL = "most_helpful"
+    VERIFIED_FIRST = "verified_first"
+
+
+# Each ordering matches one of the composite indexes on ProductReviews;
+# published_at, then review_id, break ties so pages never overlap.
+_ORDERINGS = {
+    ReviewSortOrder.MOST_RECENT.value: ["-published_at", "review_id"],
+    ReviewSortOrder.MOST_HELPFUL.value: ["-helpfulness_score", "-published_at", "review_id"],
+    ReviewSortOrder.VERIFIED_FIRST.value: ["-verified_purchase", "-published_at", "review_id"],
+}
+
+
+def review_cursor(review: ProductReviews, sort: str) -> str:
+    """Opaque keyset cursor for the listing that continues after ``review``."""
+    values = []
+    for key in _ORDERINGS[sort]:
+        value = getattr(review, key.lstrip("-"))
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _after(sort: str, cursor: str) -> Q:
+    """Rows after the cursor's position: later on the first key that differs."""
+    ordering = _ORDERINGS[sort]
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError(cursor)
+        values = [
+            datetime.fromisoformat(value) if key.lstrip("-") == "published_at" else value
+            for key, value in zip(ordering, values, strict=True)
+        ]
+    except (TypeError, ValueError):
+        raise ValidationError({"after": ["Invalid cursor"]}) from None
+
+    after = None
+    for n, key in enumerate(ordering):
+        ties = {previous.lstrip("-"): value for previous, value in zip(ordering[:n], values[:n], strict=True)}
+        step = Q(**ties, **{f"{key.lstrip('-')}__{'lt' if key.startswith('-') else 'gt'}": values[n]})
+        after = step if after is None else after | step
+    return after
+
+
 @reviews.query(part_of=ProductReviews)
 class ListProductReviews:
     product_id = Identifier(required=True)
+    sort = String(choices=ReviewSortOrder, default=ReviewSortOrder.MOST_RECENT.value)
     page = Integer(default=1)
     page_size = Integer(default=20)
+    after = String()  # review_cursor of the previous page's last review; replaces page
 
 
 @reviews.query_handler(part_of=ProductReviews)
 class ProductReviewsQueryHandler:
     @read(ListProductReviews)
     def list_product_reviews(self, query):
-        qs = current_domain.view_for(ProductReviews).query.filter(product_id=query.product_id)
+        qs = (
+            current_domain.view_for(ProductReviews)
+            .query.filter(product_id=query.product_id)
+            .order_by(_ORDERINGS[query.sort])
+        )
+        if query.after:
+            return qs.filter(_after(query.sort, query.after)).limit(query.page_size).all()
         offset = (query.page - 1) * query.page_size
         return qs.offset(offset).limit(query.page_size).all()
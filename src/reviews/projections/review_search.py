@@ -0,0 +1,256 @@
+"""ReviewSearch — an inverted index over review text (title, body, pros, cons).
+
+Searching review text by scanning ModerationQueue or ProductReviews reads
+every review. Instead, each review is tokenized once when it is submitted
+and again when it is edited, and one ``ReviewSearchPosting`` row is kept
+per (term, review). A search then reads only the postings for its terms,
+through the composite indexes declared below:
+
+- (term, product_id, weight) — per-product search, best matches first
+- (term, status, submitted_at) — catalogue-wide searches and moderation
+  keyword sweeps, newest first
+- (review_id) — the projector's own lookups when a review changes
+
+Each posting carries the review's status, so a sweep over Pending reviews
+never touches Published ones. A status change sets it on all of the
+review's postings in one bulk update (``set_posting_status``); edits
+rewrite only the terms that changed. ``ReviewSearchDocument`` holds one row per review with what a
+search hit displays.
+
+Terms are lowercased word tokens; very short tokens and common English
+stop words are skipped. A term's weight adds up its occurrences, counting
+a title occurrence three times and a pros/cons occurrence twice.
+
+Reviews submitted before the index existed are indexed by
+``backfill_review_search``.
+"""
+
+import re
+from collections import Counter
+
+from protean import Index
+from protean.core.projector import on
+from protean.exceptions import ObjectNotFoundError
+from protean.fields import DateTime, Identifier, Integer, String
+from protean.utils.globals import current_domain
+from protean.utils.query import Q
+
+from reviews.domain import reviews
+from reviews.review.events import (
+    ReviewApproved,
+    ReviewEdited,
+    ReviewRejected,
+    ReviewRemoved,
+    ReviewSubmitted,
+)
+from reviews.review.review import Review, ReviewStatus
+
+MAX_TERMS = 500  # distinct terms indexed per review, heaviest first
+MAX_TERM_LENGTH = 40
+
+TITLE_WEIGHT = 3
+LIST_WEIGHT = 2  # pros and cons
+BODY_WEIGHT = 1
+
+_STOP_WORDS = """
+a an and are as at be but by for from had has have i if in is it its my of on or so than that the their
+them then there these they this to too was we were what when which while who will with you your
+"""
+STOP_WORDS = frozenset(_STOP_WORDS.split())
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into index terms: lowercased words, minus stop words and one-letter tokens."""
+    return [
+        token
+        for token in _TOKEN.findall((text or "").lower())
+        if 1 < len(token) <= MAX_TERM_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def term_weights(title=None, body=None, pros=None, cons=None) -> dict[str, int]:
+    """Weighted term frequencies for a review's text, limited to the MAX_TERMS heaviest terms."""
+    weights: Counter[str] = Counter()
+    for term in tokenize(title):
+        weights[term] += TITLE_WEIGHT
+    for entry in [*(pros or []), *(cons or [])]:
+        for term in tokenize(entry):
+            weights[term] += LIST_WEIGHT
+    for term in tokenize(body):
+        weights[term] += BODY_WEIGHT
+    return dict(weights.most_common(MAX_TERMS))
+
+
+def posting_key(review_id, term: str) -> str:
+    return f"{review_id}:{term}"
+
+
+@reviews.projection
+class ReviewSearchDocument:
+    review_id = Identifier(identifier=True, required=True)
+    product_id = Identifier(required=True)
+    customer_id = Identifier(required=True)
+    title = String(required=True)
+    status = String(required=True)
+    submitted_at = DateTime()
+
+
+@reviews.projection(
+    indexes=[
+        Index("term", "product_id", "weight", desc=("weight",)),
+        Index("term", "status", "submitted_at", desc=("submitted_at",)),
+        Index("review_id"),
+    ]
+)
+class ReviewSearchPosting:
+    posting_id = Identifier(identifier=True, required=True)  # "<review_id>:<term>"
+    term = String(required=True, max_length=MAX_TERM_LENGTH)
+    review_id = Identifier(required=True)
+    product_id = Identifier(required=True)
+    status = String(required=True)
+    weight = Integer(required=True)
+    submitted_at = DateTime()
+
+
+def _postings_for(review_id) -> list[ReviewSearchPosting]:
+    return (
+        current_domain.view_for(ReviewSearchPosting).query.filter(review_id=str(review_id)).limit(MAX_TERMS).all().items
+    )
+
+
+def set_posting_status(review_id, status: str) -> int:
+    """Set ``status`` on all of a review's postings in one bulk update; returns postings updated.
+
+    Projections cannot have a custom repository and the repository has no
+    public bulk update, so this is the one place that writes through its DAO.
+    """
+    dao = current_domain.repository_for(ReviewSearchPosting)._dao
+    return dao._update_all(Q(review_id=str(review_id)), status=status)
+
+
+def _index(document: ReviewSearchDocument, weights: dict[str, int]) -> None:
+    current_domain.repository_for(ReviewSearchDocument).add(document)
+    postings = current_domain.repository_for(ReviewSearchPosting)
+    for term, weight in weights.items():
+        postings.add(
+            ReviewSearchPosting(
+                posting_id=posting_key(document.review_id, term),
+                term=term,
+                review_id=document.review_id,
+                product_id=document.product_id,
+                status=document.status,
+                weight=weight,
+                submitted_at=document.submitted_at,
+            )
+        )
+
+
+def backfill_review_search(batch_size: int = 500) -> int:
+    """Index existing reviews that have no search document yet; returns reviews indexed."""
+    documents = current_domain.view_for(ReviewSearchDocument)
+    indexed = 0
+    offset = 0
+    while True:
+        batch = (
+            current_domain.repository_for(Review).query.order_by("created_at").offset(offset).limit(batch_size).all()
+        )
+        for review in batch.items:
+            if review.status == ReviewStatus.REMOVED.value or documents.exists(str(review.id)):
+                continue
+            _index(
+                ReviewSearchDocument(
+                    review_id=str(review.id),
+                    product_id=review.product_id,
+                    customer_id=review.customer_id,
+                    title=review.title,
+                    status=review.status,
+                    submitted_at=review.created_at,
+                ),
+                term_weights(review.title, review.body, review.pros, review.cons),
+            )
+            indexed += 1
+        if len(batch.items) < batch_size:
+            break
+        offset += batch_size
+    return indexed
+
+
+@reviews.projector(projector_for=ReviewSearchDocument, aggregates=[Review])
+class ReviewSearchProjector:
+    @on(ReviewSubmitted)
+    def on_review_submitted(self, event):
+        _index(
+            ReviewSearchDocument(
+                review_id=event.review_id,
+                product_id=event.product_id,
+                customer_id=event.customer_id,
+                title=event.title,
+                status=ReviewStatus.PENDING.value,
+                submitted_at=event.submitted_at,
+            ),
+            term_weights(event.title, event.body, event.pros, event.cons),
+        )
+
+    @on(ReviewEdited)
+    def on_review_edited(self, event):
+        documents = current_domain.repository_for(ReviewSearchDocument)
+        try:
+            document = documents.get(event.review_id)
+        except Exception:
+            return
+        # Edits are only allowed while Pending or Rejected, and put the review back in Pending
+        document.title = event.title or document.title
+        document.status = ReviewStatus.PENDING.value
+        documents.add(document)
+
+        postings = current_domain.repository_for(ReviewSearchPosting)
+        weights = term_weights(document.title, event.body, event.pros, event.cons)
+        dropped = []
+        for posting in _postings_for(event.review_id):
+            weight = weights.pop(posting.term, None)
+            if weight is None:
+                dropped.append(posting.posting_id)
+            elif weight != posting.weight or posting.status != document.status:
+                posting.weight = weight
+                posting.status = document.status
+                postings.add(posting)
+        if dropped:
+            postings.query.filter(posting_id__in=dropped).limit(len(dropped)).delete()
+        for term, weight in weights.items():
+            postings.add(
+                ReviewSearchPosting(
+                    posting_id=posting_key(event.review_id, term),
+                    term=term,
+                    review_id=event.review_id,
+                    product_id=document.product_id,
+                    status=document.status,
+                    weight=weight,
+                    submitted_at=document.submitted_at,
+                )
+            )
+
+    @on(ReviewApproved)
+    def on_review_approved(self, event):
+        self._set_status(event.review_id, ReviewStatus.PUBLISHED.value)
+
+    @on(ReviewRejected)
+    def on_review_rejected(self, event):
+        self._set_status(event.review_id, ReviewStatus.REJECTED.value)
+
+    @on(ReviewRemoved)
+    def on_review_removed(self, event):
+        review_id = str(event.review_id)
+        current_domain.repository_for(ReviewSearchPosting).query.filter(review_id=review_id).limit(MAX_TERMS).delete()
+        current_domain.repository_for(ReviewSearchDocument).query.filter(review_id=review_id).delete()
+
+    def _set_status(self, review_id, status):
+        documents = current_domain.repository_for(ReviewSearchDocument)
+        try:
+            document = documents.get(review_id)
+        except ObjectNotFoundError:
+            return
+        document.status = status
+        documents.add(document)
+        set_posting_status(review_id, status)
@@ -0,0 +1,167 @@
+"""Queries for the review search index.
+
+``SearchReviews`` finds reviews containing every term of a search text,
+within one product or across the catalogue, ranked by the summed term
+weights. ``SweepReviews`` is the moderation sweep: reviews in a status
+(Pending by default) containing any of a list of keywords, newest first.
+Both read only the postings of the terms asked for.
+
+A search ranks its terms by how many postings each has in scope, counting
+at most COUNT_CAP per term, since only the rarest term matters and a
+common word would otherwise cost a count over all of its postings. It
+then reads the rarest term's postings a page (CANDIDATE_PAGE) at a time,
+in index order — heaviest first within a product, newest first across the
+catalogue — and probes every other term for just those candidates, rarest
+first, by posting key ``<review_id>:<term>``. Pages are read until
+``limit`` reviews match every term or the postings run out, and the matches
+are ranked by their summed weights. The work follows the rarest term, so a
+common word in the text costs a capped count and a few key lookups rather
+than a scan of its postings.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from protean import read
+from protean.fields import Identifier, Integer, List, String
+from protean.utils.globals import current_domain
+
+from reviews.domain import reviews
+from reviews.projections.review_search import ReviewSearchDocument, ReviewSearchPosting, posting_key, tokenize
+from reviews.review.review import ReviewStatus
+
+CANDIDATE_PAGE = 1000  # postings read from the rarest term per page
+COUNT_CAP = 2000  # postings counted per term when picking the rarest
+
+
+@dataclass
+class ReviewSearchHit:
+    review_id: str
+    product_id: str
+    status: str
+    title: str
+    score: int
+    submitted_at: datetime | None
+    matched_terms: list[str] = field(default_factory=list)
+
+
+@reviews.query(part_of=ReviewSearchDocument)
+class SearchReviews:
+    text = String(required=True, max_length=500)
+    product_id = Identifier()
+    status = String(choices=ReviewStatus, default=ReviewStatus.PUBLISHED.value)
+    limit = Integer(default=20, min_value=1, max_value=100)
+
+
+@reviews.query(part_of=ReviewSearchDocument)
+class SweepReviews:
+    keywords = List(String(), required=True)
+    status = String(choices=ReviewStatus, default=ReviewStatus.PENDING.value)
+    limit = Integer(default=100, min_value=1, max_value=1000)
+
+
+def _capped_count(query) -> int:
+    """Postings matched by ``query``, counted up to COUNT_CAP from the index rather than in full."""
+    return len(query.only("posting_id").limit(COUNT_CAP).all(with_total=False).items)
+
+
+def _hits(ranked: list[tuple[str, int, list[str]]]) -> list[ReviewSearchHit]:
+    if not ranked:
+        return []
+    documents = {
+        str(document.review_id): document
+        for document in current_domain.view_for(ReviewSearchDocument)
+        .query.filter(review_id__in=[review_id for review_id, _, _ in ranked])
+        .limit(len(ranked))
+        .all()
+        .items
+    }
+    return [
+        ReviewSearchHit(
+            review_id=review_id,
+            product_id=str(documents[review_id].product_id),
+            status=documents[review_id].status,
+            title=documents[review_id].title,
+            score=score,
+            submitted_at=documents[review_id].submitted_at,
+            matched_terms=terms,
+        )
+        for review_id, score, terms in ranked
+        if review_id in documents
+    ]
+
+
+@reviews.query_handler(part_of=ReviewSearchDocument)
+class ReviewSearchQueryHandler:
+    @read(SearchReviews)
+    def search_reviews(self, query):
+        terms = list(dict.fromkeys(tokenize(query.text)))
+        if not terms:
+            return []
+
+        filters = {"status": query.status}
+        if query.product_id:
+            filters["product_id"] = str(query.product_id)
+        order = "-weight" if query.product_id else "-submitted_at"
+
+        postings = current_domain.view_for(ReviewSearchPosting)
+        counts = {term: _capped_count(postings.query.filter(term=term, **filters)) for term in terms}
+        terms.sort(key=counts.__getitem__)
+        if counts[terms[0]] == 0:
+            return []
+
+        candidates = postings.query.filter(term=terms[0], **filters).order_by([order, "review_id"])
+        scores: dict[str, int] = {}
+        submitted: dict[str, datetime | None] = {}
+        offset = 0
+        while len(scores) < query.limit:
+            page = candidates.offset(offset).limit(CANDIDATE_PAGE).all(with_total=False).items
+            matched = {str(posting.review_id): posting.weight for posting in page}
+            for term in terms[1:]:
+                if not matched:
+                    break
+                # A review's postings share its product and status, so the key alone scopes the probe
+                keys = [posting_key(review_id, term) for review_id in matched]
+                matched = {
+                    str(posting.review_id): matched[str(posting.review_id)] + posting.weight
+                    for posting in postings.query.filter(posting_id__in=keys)
+                    .limit(len(keys))
+                    .all(with_total=False)
+                    .items
+                }
+            scores.update(matched)
+            submitted.update((str(posting.review_id), posting.submitted_at) for posting in page)
+            if len(page) < CANDIDATE_PAGE:
+                break
+            offset += CANDIDATE_PAGE
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda hit: (-hit[1], -(submitted[hit[0]].timestamp() if submitted[hit[0]] else 0), hit[0]),
+        )[: query.limit]
+        return _hits([(review_id, score, terms) for review_id, score in ranked])
+
+    @read(SweepReviews)
+    def sweep_reviews(self, query):
+        keywords = list(dict.fromkeys(term for keyword in query.keywords for term in tokenize(keyword)))
+        if not keywords:
+            return []
+
+        # Each review has at most one posting per keyword, so this many
+        # postings always covers ``limit`` distinct reviews.
+        postings = (
+            current_domain.view_for(ReviewSearchPosting)
+            .query.filter(term__in=keywords, status=query.status)
+            .order_by(["-submitted_at", "review_id"])
+            .limit(query.limit * len(keywords))
+            .all()
+            .items
+        )
+        matched: dict[str, tuple[int, list[str]]] = {}
+        for posting in postings:
+            review_id = str(posting.review_id)
+            if review_id not in matched and len(matched) == query.limit:
+                continue
+            score, terms = matched.get(review_id, (0, []))
+            matched[review_id] = (score + posting.weight, [*terms, posting.term])
+        return _hits([(review_id, score, terms) for review_id, (score, terms) in matched.items()])
@@ -38,6 +38,8 @@ class ReviewEdited:
     title = String()
     body = Text()
     rating = Integer()
+    pros = List(String())
+    cons = List(String())
     edited_at = DateTime(required=True)
 
 
@@ -49,6 +51,7 @@ class ReviewApproved:
     product_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     rating = Integer(required=True)
+    verified_purchase = String()  # "True"/"False"
     moderator_id = Identifier(required=True)
     approved_at = DateTime(required=True)
 
@@ -97,6 +100,7 @@ class ReviewRemoved:
     product_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     rating = Integer(required=True)
+    verified_purchase = String()  # "True"/"False"
     removed_by = String(required=True)
     reason = String(required=True)
     removed_at = DateTime(required=True)
@@ -1,6 +1,7 @@
 """ReportReview — report a review for moderation.
 
-Cannot report own review. Multiple customers can report the same review.
+Cannot report own review. Any number of reports may be filed against a
+review — each is kept in the ReviewReport store; the review keeps the count.
 """
 
 from protean.fields import Identifier, String
@@ -9,6 +10,7 @@ from protean.utils.mixins import handle
 
 from reviews.domain import reviews
 from reviews.review.review import Review
+from reviews.review.review_feedback import file_report
 
 
 @reviews.command(part_of="Review")
@@ -26,10 +28,6 @@ class ReportReviewHandler:
         repo = current_domain.repository_for(Review)
         review = repo.get(command.review_id)
 
-        review.report(
-            customer_id=command.customer_id,
-            reason=command.reason,
-            detail=command.detail,
-        )
+        file_report(review, customer_id=command.customer_id, reason=command.reason, detail=command.detail)
 
         repo.add(review)
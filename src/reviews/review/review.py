@@ -2,6 +2,8 @@
 
 The Review aggregate manages the full lifecycle of a customer product review:
 submission, moderation, voting, reporting, seller replies, and removal.
+Individual votes and reports live outside the aggregate (review_feedback.py),
+so loading a review costs the same however many votes it has collected.
 
 CQRS (not event sourced) — reviews are write-once-mostly with simple state
 transitions and no temporal query needs.
@@ -13,6 +15,7 @@ State Machine (4 states):
     REMOVED → (terminal)
 """
 
+from collections.abc import Callable
 from datetime import UTC, datetime
 from enum import Enum
 
@@ -21,7 +24,6 @@ from protean.exceptions import ValidationError
 from protean.fields import (
     Boolean,
     DateTime,
-    Dict,
     HasMany,
     Identifier,
     Integer,
@@ -113,15 +115,6 @@ class ReviewImage:
     display_order = Integer(default=0)
 
 
-@reviews.entity(part_of="Review")
-class HelpfulVote:
-    """A vote on whether a review was helpful or unhelpful."""
-
-    customer_id = Identifier(required=True)
-    vote_type = String(choices=VoteType, required=True)
-    voted_at = DateTime(required=True)
-
-
 @reviews.entity(part_of="Review")
 class SellerReply:
     """A reply from the product seller to the review."""
@@ -165,14 +158,11 @@ class Review:
     status = String(choices=ReviewStatus, default=ReviewStatus.PENDING.value)
     moderation_notes = Text()
 
-    # Voting
-    votes = HasMany(HelpfulVote)
+    # Voting and reporting — counters only; the individual votes and reports
+    # are kept in ReviewVote / ReviewReport (review_feedback.py)
     helpful_count = Integer(default=0)
     unhelpful_count = Integer(default=0)
-
-    # Reporting
     report_count = Integer(default=0)
-    reported_reasons = List(Dict())
 
     # Seller engagement
     reply = HasMany(SellerReply)
@@ -244,7 +234,6 @@ class Review:
             helpful_count=0,
             unhelpful_count=0,
             report_count=0,
-            reported_reasons=[],
             is_edited=False,
             created_at=now,
             updated_at=now,
@@ -338,6 +327,8 @@ class Review:
                 title=new_title,
                 body=new_body,
                 rating=new_rating,
+                pros=list(self.pros or []),
+                cons=list(self.cons or []),
                 edited_at=now,
             )
         )
@@ -360,6 +351,7 @@ class Review:
                 product_id=str(self.product_id),
                 customer_id=str(self.customer_id),
                 rating=self.rating.score,
+                verified_purchase=str(bool(self.verified_purchase)),
                 moderator_id=str(moderator_id),
                 approved_at=now,
             )
@@ -388,31 +380,21 @@ class Review:
     # -------------------------------------------------------------------
     # Voting
     # -------------------------------------------------------------------
-    def vote(self, customer_id, vote_type):
-        """Record a helpful/unhelpful vote.
+    def vote(self, customer_id, vote_type, has_voted: Callable[[str], bool]):
+        """Count a helpful/unhelpful vote.
 
-        Cannot vote on own review. Cannot vote twice.
+        Cannot vote on own review. Cannot vote twice: ``has_voted`` tells
+        whether a customer already voted on this review — answered by the
+        vote store, since the votes themselves are kept there (see
+        review_feedback.py). The vote is counted only when it says no.
         """
         if str(customer_id) == str(self.customer_id):
             raise ValidationError({"vote": ["Cannot vote on your own review"]})
-
-        # Check for duplicate vote
-        existing = next(
-            (v for v in self.votes if str(v.customer_id) == str(customer_id)),
-            None,
-        )
-        if existing:
+        if has_voted(str(customer_id)):
             raise ValidationError({"vote": ["You have already voted on this review"]})
 
         now = datetime.now(UTC)
 
-        vote = HelpfulVote(
-            customer_id=customer_id,
-            vote_type=vote_type,
-            voted_at=now,
-        )
-        self.add_votes(vote)
-
         with atomic_change(self):
             if VoteType(vote_type) == VoteType.HELPFUL:
                 self.helpful_count = self.helpful_count + 1
@@ -435,24 +417,14 @@ class Review:
     # Reporting
     # -------------------------------------------------------------------
     def report(self, customer_id, reason, detail=None):
-        """Report a review for moderation. Cannot report own review."""
+        """Count a report for moderation. Cannot report own review.
+
+        The report itself is recorded by the report store (see review_feedback.py).
+        """
         if str(customer_id) == str(self.customer_id):
             raise ValidationError({"report": ["Cannot report your own review"]})
 
         now = datetime.now(UTC)
-
-        # Track report
-        reports = list(self.reported_reasons) if self.reported_reasons else []
-        reports.append(
-            {
-                "customer_id": str(customer_id),
-                "reason": reason,
-                "detail": detail,
-                "reported_at": now.isoformat(),
-            }
-        )
-
-        self.reported_reasons = reports
         self.report_count = self.report_count + 1
         self.updated_at = now
 
@@ -485,6 +457,7 @@ class Review:
                 product_id=str(self.product_id),
                 customer_id=str(self.customer_id),
                 rating=self.rating.score,
+                verified_purchase=str(bool(self.verified_purchase)),
                 removed_by=removed_by,
                 reason=reason,
                 removed_at=now,
@@ -0,0 +1,93 @@
+"""Review feedback store — individual helpful votes and reports, outside the Review aggregate.
+
+Popular reviews collect tens of thousands of votes. Kept as child entities,
+every vote loaded and re-saved all of them just to append one and scan for
+a duplicate. The Review aggregate now keeps only the counters
+(helpful_count, unhelpful_count, report_count); each vote and report is a
+row of its own.
+
+Votes are keyed by ``<review_id>:<customer_id>`` and only ever inserted.
+``Review.vote`` still refuses a second vote from a customer; ``cast_vote``
+answers its ``has_voted`` check by inserting the vote, so a customer's vote
+is counted only when its row is new, and casting a vote touches one row and
+the review's counters however many votes the review already has. The row
+and the counters are written in the same unit of work: of two first votes
+by one customer that race each other, the second insert fails on the
+primary key when it commits, and its counter update is rolled back with it.
+Reports have an identity of their own: a customer may report a review more
+than once, as before.
+
+Data written before the move is copied over by
+``scripts/migrate_review_feedback.py``.
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+from protean.exceptions import ValidationError
+from protean.fields import DateTime, Identifier, String
+from protean.utils.globals import current_domain
+
+from reviews.domain import reviews
+from reviews.review.review import Review
+
+
+@reviews.projection
+class ReviewVote:
+    vote_id = Identifier(identifier=True, required=True)  # "<review_id>:<customer_id>"
+    review_id = Identifier(required=True)
+    customer_id = Identifier(required=True)
+    vote_type = String(required=True, max_length=20)  # Helpful, Unhelpful
+    voted_at = DateTime(required=True)
+
+
+@reviews.projection
+class ReviewReport:
+    report_id = Identifier(identifier=True, required=True)
+    review_id = Identifier(required=True)
+    customer_id = Identifier(required=True)
+    reason = String(required=True, max_length=50)
+    detail = String(max_length=500)
+    reported_at = DateTime(required=True)
+
+
+def feedback_key(review_id, customer_id) -> str:
+    return f"{review_id}:{customer_id}"
+
+
+def cast_vote(review: Review, customer_id, vote_type: str) -> None:
+    """Record a customer's vote and count it on the review; one vote per customer."""
+    vote = ReviewVote(
+        vote_id=feedback_key(review.id, customer_id),
+        review_id=str(review.id),
+        customer_id=str(customer_id),
+        vote_type=vote_type,
+        voted_at=datetime.now(UTC),
+    )
+
+    def insert_vote(_voter_id) -> bool:
+        # Insert-only: the vote's key already existing means the customer has voted
+        try:
+            current_domain.repository_for(ReviewVote).add(vote)
+        except ValidationError as exc:
+            if "vote_id" in exc.messages:
+                return True
+            raise
+        return False
+
+    review.vote(customer_id=customer_id, vote_type=vote_type, has_voted=insert_vote)
+
+
+def file_report(review: Review, customer_id, reason: str, detail: str | None = None) -> None:
+    """Count a customer's report on the review and record it."""
+    review.report(customer_id=customer_id, reason=reason, detail=detail)
+    current_domain.repository_for(ReviewReport).add(
+        ReviewReport(
+            report_id=str(uuid.uuid4()),
+            review_id=str(review.id),
+            customer_id=str(customer_id),
+            reason=reason,
+            detail=detail,
+            reported_at=datetime.now(UTC),
+        )
+    )
@@ -1,16 +1,19 @@
 """SubmitReview — submit a new product review.
 
-Enforces one-review-per-customer-per-product at handler level (cross-instance
-check requires repository query). Checks VerifiedPurchases projection to flag
-verified purchases.
+Enforces one-review-per-customer-per-product at handler level and flags
+verified purchases. Both checks read a single CustomerProductIndex entry for
+the (customer, product) pair instead of querying Review and VerifiedPurchases;
+the handler marks the pair as reviewed in the same unit of work as the review.
 """
 
+from protean.exceptions import ValidationError
 from protean.fields import Dict, Identifier, Integer, List, String, Text
 from protean.utils.globals import current_domain
 from protean.utils.mixins import handle
 
 from reviews.domain import reviews
-from reviews.review.review import Review, ReviewStatus
+from reviews.projections.customer_product_index import customer_product_entry, record_review
+from reviews.review.review import Review
 
 
 @reviews.command(part_of="Review")
@@ -32,37 +35,15 @@ class SubmitReviewHandler:
     def submit_review(self, command):
         repo = current_domain.repository_for(Review)
 
-        # Enforce one review per customer per product (exclude removed)
-        existing = repo.query.filter(
-            customer_id=str(command.customer_id),
-            product_id=str(command.product_id),
-        ).all()
-        if existing.items:
-            active = [r for r in existing.items if r.status != ReviewStatus.REMOVED.value]
-            if active:
-                from protean.exceptions import ValidationError
+        entry = customer_product_entry(command.customer_id, command.product_id)
 
-                raise ValidationError({"review": ["You have already reviewed this product"]})
+        # Enforce one review per customer per product (removed reviews clear the entry)
+        if entry is not None and entry.review_id:
+            raise ValidationError({"review": ["You have already reviewed this product"]})
 
-        # Check verified purchase
-        verified = False
-        order_id = None
-        try:
-            from reviews.projections.verified_purchases import VerifiedPurchases
-
-            vps = (
-                current_domain.view_for(VerifiedPurchases)
-                .query.filter(
-                    customer_id=str(command.customer_id),
-                    product_id=str(command.product_id),
-                )
-                .all()
-            )
-            if vps.items:
-                verified = True
-                order_id = str(vps.items[0].order_id)
-        except Exception:
-            pass  # If projection not available, proceed unverified
+        # Verified purchase: the entry records the first delivered order for the product
+        order_id = str(entry.order_id) if entry is not None and entry.order_id else None
+        verified = order_id is not None
 
         review = Review.submit(
             product_id=command.product_id,
@@ -78,4 +59,5 @@ class SubmitReviewHandler:
             images=command.images or [],
         )
         repo.add(review)
+        record_review(command.customer_id, command.product_id, review.id)
         return str(review.id)
@@ -1,6 +1,7 @@
 """VoteOnReview — record a helpful/unhelpful vote on a review.
 
-Cannot vote on own review. Cannot vote twice.
+Cannot vote on own review. Cannot vote twice — the vote is kept in the
+ReviewVote store, keyed by review and customer; the review keeps the counts.
 """
 
 from protean.fields import Identifier, String
@@ -9,6 +10,7 @@ from protean.utils.mixins import handle
 
 from reviews.domain import reviews
 from reviews.review.review import Review
+from reviews.review.review_feedback import cast_vote
 
 
 @reviews.command(part_of="Review")
@@ -25,9 +27,6 @@ class VoteOnReviewHandler:
         repo = current_domain.repository_for(Review)
         review = repo.get(command.review_id)
 
-        review.vote(
-            customer_id=command.customer_id,
-            vote_type=command.vote_type,
-        )
+        cast_vote(review, customer_id=command.customer_id, vote_type=command.vote_type)
 
         repo.add(review)
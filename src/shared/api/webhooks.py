@@ -0,0 +1,41 @@
+"""Shared parsing for signed webhook endpoints.
+
+Webhook signatures are computed over the exact bytes the provider sent, so
+the endpoints read the raw body, verify it, and only then parse it into
+their request model. A body that is not UTF-8 cannot have been signed as
+the text the adapters verify, and is answered 400.
+"""
+
+from typing import TypeVar
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def webhook_text(raw: bytes) -> str:
+    """Decode a raw webhook body for signature verification, answering 400 when it is not UTF-8."""
+    try:
+        return raw.decode()
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Webhook body must be UTF-8") from None
+
+
+def parse_webhook(model: type[ModelT], raw: bytes) -> ModelT:
+    """Parse a verified webhook body, answering 422 like a regular request body when it is invalid."""
+    try:
+        return model.model_validate_json(raw)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from None
+
+
+def webhook_body_schema(model: type[BaseModel]) -> dict:
+    """OpenAPI ``requestBody`` for an endpoint that reads its body raw (pass as ``openapi_extra``)."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
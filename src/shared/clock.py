@@ -0,0 +1,14 @@
+"""Shared time helpers.
+
+Deadlines, release times, expiries and receive times are stored as naive
+UTC datetimes, so values from events (timezone-aware) and from stored rows
+(naive) are normalized with ``utc_naive`` before they are compared or
+written.
+"""
+
+from datetime import UTC, datetime
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Normalize to naive UTC, the form scheduled times are stored and compared in."""
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
@@ -0,0 +1,13 @@
+"""Shared configuration helpers — reading a domain's ``[custom.*]`` tables.
+
+Tunable settings live under ``[custom.<section>]`` in each domain.toml and
+are read into frozen ``*Settings`` dataclasses through their
+``from_config`` classmethods.
+"""
+
+from typing import Any
+
+
+def custom_settings(domain: Any, section: str) -> dict:
+    """Return the ``[custom.<section>]`` table of a domain's config, or an empty dict."""
+    return (domain.config.get("custom", {}) or {}).get(section, {}) or {}
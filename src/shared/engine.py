@@ -0,0 +1,185 @@
+"""Engine runner with key-partitioned concurrency for selected handlers.
+
+``protean server`` processes each handler's messages one at a time. This
+runner starts the same Protean Engine, but handlers listed in the domain's
+``[server.concurrency]`` table process every batch across N worker threads:
+
+    [server.concurrency]
+    OrderDetailProjector = 4
+
+Messages are partitioned by stream id (``ordering::order-<order_id>``), so all
+messages of one aggregate land in the same lane and keep their order, while
+independent aggregates are handled in parallel on one process and one DB
+pool. Acknowledgement, retry and DLQ handling happen afterwards on the event
+loop, in the original message order, exactly as for sequential consumption.
+
+Only handlers whose writes are keyed by the partitioning aggregate belong in
+the table — a projector that rolls many orders into one row (e.g. a daily
+stats counter) must stay sequential.
+
+Usage:
+    python -m shared.engine --domain ordering.domain
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import zlib
+from typing import Any
+
+import structlog
+from protean.server.engine import Engine
+from protean.server.subscription.factory import SubscriptionFactory
+from protean.server.subscription.stream_subscription import StreamSubscription
+from protean.utils.domain_discovery import derive_domain
+from protean.utils.eventing import Message
+from protean.utils.telemetry import get_domain_metrics
+
+logger = structlog.get_logger(__name__)
+
+
+def concurrency_for(domain: Any, handler_name: str) -> int:
+    """Return the configured worker count for a handler (1 = sequential)."""
+    table = domain.config.get("server", {}).get("concurrency", {}) or {}
+    return max(1, int(table.get(handler_name, 1)))
+
+
+def partition_key(message: Message) -> str:
+    """Return the key a message is partitioned by — its stream id."""
+    if message.metadata and message.metadata.headers and message.metadata.headers.stream:
+        return message.metadata.headers.stream
+    return ""
+
+
+def partition(items: list[Any], workers: int, key: Any) -> list[list[Any]]:
+    """Split items into at most ``workers`` lanes, keeping each key in one lane.
+
+    Items keep their relative order within a lane. Empty lanes are dropped.
+    """
+    lanes: list[list[Any]] = [[] for _ in range(workers)]
+    for item in items:
+        lanes[zlib.crc32(key(item).encode()) % workers].append(item)
+    return [lane for lane in lanes if lane]
+
+
+class PartitionedStreamSubscription(StreamSubscription):
+    """Stream subscription that handles a batch across key-partitioned lanes.
+
+    Built by ``PartitionedSubscriptionFactory`` for handlers listed in
+    ``[server.concurrency]``, with ``workers`` set to the configured count.
+    Per-message processing time and outcome are recorded in the same
+    subscription metrics, with the same log lines, as sequential batches.
+    """
+
+    workers: int = 1
+
+    async def process_batch(self, messages: list[tuple[str, dict[str, Any]]], stream: str | None = None) -> int:
+        if self.workers <= 1 or len(messages) <= 1:
+            return await super().process_batch(messages, stream)
+
+        stream = stream or self._default_stream
+        logger.debug(f"[{self.subscriber_class_name}] Received {len(messages)} message(s)")
+        metrics = get_domain_metrics(self.engine.domain)
+        attrs = {"subscription": self.subscriber_class_name, "handler": self.subscriber_class_name, "stream": stream}
+
+        batch = []
+        for identifier, payload in messages:
+            message = await self._deserialize_message(identifier, payload, stream)
+            if message:  # Undeserializable messages were moved to the DLQ
+                batch.append((identifier, payload, message))
+
+        lanes = partition(batch, self.workers, key=lambda item: partition_key(item[2]))
+        lane_results = await asyncio.gather(*(asyncio.to_thread(self._run_lane, lane) for lane in lanes))
+        outcomes = {identifier: (ok, elapsed) for results in lane_results for identifier, ok, elapsed in results}
+
+        successful_count = 0
+        for identifier, payload, message in batch:
+            is_successful, elapsed = outcomes[identifier]
+            message_type = message.metadata.headers.type or "unknown"
+            short_id = (message.metadata.headers.id or identifier)[:8]
+
+            metrics.subscription_processing_duration.record(elapsed, attrs)
+            metrics.subscription_messages_processed.add(1, {**attrs, "status": "ok" if is_successful else "error"})
+            self._record_handler_outcome(is_successful)
+
+            if is_successful:
+                if await self._acknowledge_message(identifier, message, stream):
+                    successful_count += 1
+                    logger.info(f"[{self.subscriber_class_name}] Completed {message_type} (ID: {short_id}...) — acked")
+            else:
+                logger.warning(f"[{self.subscriber_class_name}] Failed {message_type} (ID: {short_id}...) — retrying")
+                await self.handle_failed_message(identifier, payload, stream)
+
+        return successful_count
+
+    def _run_lane(self, lane: list[tuple[str, dict[str, Any], Message]]) -> list[tuple[str, bool, float]]:
+        """Handle one lane's messages in order on a worker thread; returns (id, success, seconds) per message."""
+
+        async def _handle_all() -> list[tuple[str, bool, float]]:
+            results = []
+            for identifier, _, message in lane:
+                start = time.monotonic()
+                is_successful = await self.engine.handle_message(self.handler, message, worker_id=self.subscription_id)
+                results.append((identifier, is_successful, time.monotonic() - start))
+            return results
+
+        return asyncio.run(_handle_all())
+
+
+class PartitionedSubscriptionFactory(SubscriptionFactory):
+    """Subscription factory that builds partitioned subscriptions for ``[server.concurrency]`` handlers.
+
+    Anything other than a plain stream subscription (event store
+    subscriptions, Protean's own ``sequential_by`` partitions) is returned
+    unchanged.
+    """
+
+    def _create_subscription_from_config(self, handler: Any, stream_category: str, config: Any) -> Any:
+        subscription = super()._create_subscription_from_config(handler, stream_category, config)
+
+        workers = concurrency_for(self.engine.domain, handler.__name__)
+        if workers <= 1 or type(subscription) is not StreamSubscription:
+            return subscription
+
+        partitioned = PartitionedStreamSubscription.from_config(
+            engine=self.engine,
+            stream_category=stream_category,
+            handler=handler,
+            config=config,
+        )
+        partitioned.workers = workers
+        logger.info(
+            "Key-partitioned consumption enabled",
+            handler=partitioned.subscriber_class_name,
+            workers=workers,
+        )
+        return partitioned
+
+
+class PartitionedEngine(Engine):
+    """Protean Engine that applies ``[server.concurrency]`` to its subscriptions."""
+
+    def _register_handler_subscriptions(self) -> None:
+        self._subscription_factory = PartitionedSubscriptionFactory(self)
+        super()._register_handler_subscriptions()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a ShopStream domain engine")
+    parser.add_argument("--domain", required=True, help="Domain module, e.g. ordering.domain")
+    parser.add_argument("--test-mode", action="store_true")
+    args = parser.parse_args(argv)
+
+    domain = derive_domain(args.domain)
+    domain.init()
+
+    with domain.domain_context():
+        engine = PartitionedEngine(domain, test_mode=args.test_mode)
+        engine.run()
+
+    return engine.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
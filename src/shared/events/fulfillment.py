@@ -20,6 +20,7 @@ class FulfillmentCreated(BaseEvent):
     order_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     warehouse_id = String()
+    service_level = String()
     items = List(Dict(), required=True)
     item_count = Integer(required=True)
     created_at = DateTime(required=True)
@@ -38,6 +38,8 @@ class ReviewEdited(BaseEvent):
     title = String()
     body = Text()
     rating = Integer()
+    pros = List(String())
+    cons = List(String())
     edited_at = DateTime(required=True)
 
 
@@ -48,6 +50,7 @@ class ReviewApproved(BaseEvent):
     product_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     rating = Integer(required=True)
+    verified_purchase = String()  # "True"/"False"
     moderator_id = Identifier(required=True)
     approved_at = DateTime(required=True)
 
@@ -59,6 +62,7 @@ class ReviewRemoved(BaseEvent):
     product_id = Identifier(required=True)
     customer_id = Identifier(required=True)
     rating = Integer(required=True)
+    verified_purchase = String()  # "True"/"False"
     removed_by = String(required=True)
     reason = String(required=True)
     removed_at = DateTime(required=True)
@@ -0,0 +1,59 @@
+"""Shared process-manager helpers — how saga-issued commands are dispatched.
+
+By default a process manager processes the commands it issues inline: the
+engine thread handling, say, StockReserved also loads, mutates and persists
+the Order before it can take the next event. With ``command_dispatch`` set
+to ``"async"`` the command is instead appended to the target aggregate's
+command stream and the consumer returns immediately; the domain's command
+handler workers pick it up from there.
+
+    [custom.process_managers]
+    command_dispatch = "async"             # default for all process managers
+
+    [custom.process_managers.OrderCheckoutSaga]
+    command_dispatch = "sync"              # per-process-manager override
+
+Async commands carry an idempotency key derived from the process instance and
+step, so a redelivered event that re-issues the same command is deduplicated
+by Protean's idempotency store. Protean only queues ``asynchronous=True``
+commands when the domain's ``command_processing`` is ``"async"``; under
+``"sync"`` they are still handled inline.
+
+A queued command's errors surface on the command subscription (retry, then
+DLQ), not in the process manager. Commands whose rejection the process
+manager must handle itself are issued with ``mode=SYNC`` regardless of the
+configured mode.
+"""
+
+from typing import Any
+
+from protean.utils.processing import Priority
+
+from shared.config import custom_settings
+
+SYNC = "sync"
+ASYNC = "async"
+
+
+def command_dispatch_for(domain: Any, process_manager: str) -> str:
+    """Return the configured command dispatch mode for a process manager."""
+    table = custom_settings(domain, "process_managers")
+    override = table.get(process_manager)
+    if isinstance(override, dict) and "command_dispatch" in override:
+        return override["command_dispatch"]
+    return table.get("command_dispatch", SYNC)
+
+
+def dispatch_command(domain: Any, command: Any, *, mode: str, idempotency_key: str) -> Any:
+    """Issue a command from a process manager, inline or via the command stream.
+
+    ``mode`` is the process manager's ``command_dispatch_for`` value. Inline
+    dispatch returns the handler's result and raises its errors to the caller.
+    Async dispatch returns None once the command is stored; handler errors
+    then surface on the command handler's subscription.
+    """
+    if mode == ASYNC:
+        domain.process(command, asynchronous=True, idempotency_key=idempotency_key, priority=Priority.HIGH)
+        return None
+
+    return domain.process(command, asynchronous=False, priority=Priority.HIGH)
@@ -0,0 +1,51 @@
+"""Shared subscriber base — event-type prefiltering for cross-domain ACLs.
+
+Broker subscribers consume a whole aggregate stream (e.g. ``ordering::order``)
+but usually act on one or two event types. ``TypedSubscriber`` declares those
+types up front and peeks at ``metadata.headers.type`` on every message, so
+unrelated events are dropped before the message body is read or any handler
+logic runs.
+
+Declared types are unversioned (``"Ordering.OrderReturned"``); a header of
+``"Ordering.OrderReturned.v2"`` still matches, so schema upgrades don't
+silently disable a subscriber.
+"""
+
+from abc import ABCMeta, abstractmethod
+from typing import Any, ClassVar
+
+from protean.core.subscriber import BaseSubscriber
+
+
+def event_type_of(payload: dict[str, Any]) -> str:
+    """Return the unversioned event type from a broker message's headers.
+
+    Returns an empty string when the message carries no type header.
+    """
+    metadata = payload.get("metadata") or {}
+    type_string = (metadata.get("headers") or {}).get("type") or ""
+
+    base, separator, version = type_string.rpartition(".")
+    if separator and version[:1] == "v" and version[1:].isdigit():
+        return base
+    return type_string
+
+
+class TypedSubscriber(BaseSubscriber, metaclass=ABCMeta):
+    """Broker subscriber that only dispatches the event types it declares.
+
+    Subclasses set ``event_types`` and implement ``handle(data)``. Messages
+    whose header type is not declared return after a single set lookup.
+    """
+
+    event_types: ClassVar[frozenset[str]] = frozenset()
+
+    def __call__(self, payload: dict[str, Any]) -> None:
+        if event_type_of(payload) not in self.event_types:
+            return
+
+        self.handle(payload.get("data", {}))
+
+    @abstractmethod
+    def handle(self, data: dict[str, Any]) -> None:
+        """Process the ``data`` section of a message of a declared type."""
@@ -0,0 +1,129 @@
+"""Shared webhook inbox helpers — fast acknowledgement of provider callbacks.
+
+Payment gateways and carriers retry a webhook until it is answered with a
+2xx, so an endpoint that processes the callback before answering turns a
+burst into a retry storm. The webhook endpoints instead verify the signature
+over the raw request bytes, append the payload to their domain's inbox
+table and answer 202; a drain function, triggered periodically by an
+external scheduler via the maintenance API, processes the inbox in batches.
+
+Each domain keeps its own inbox projection (PaymentWebhookInbox,
+TrackingWebhookInbox) and uses these helpers for what the inboxes share:
+
+- ``message_id``: the inbox identity, a hash of the webhook kind and raw
+  body. A redelivery of a webhook still in the inbox, or processed within
+  the retention window, collides with it and is acknowledged without being
+  queued again.
+- ``receive_time``: strictly increasing receive timestamps, so draining in
+  ``received_at`` order processes each payment's or fulfillment's callbacks
+  in the order they arrived.
+- ``record_failure``: a callback that fails to apply stays pending with its
+  attempts counted and is retried after an exponential backoff. After
+  ``max_attempts`` it is dead-lettered: left in the inbox as ``dead``, with
+  its last error, for an operator.
+- ``due_messages``: the pending callbacks a drain run may attempt, oldest
+  first. A callback waiting for its retry is not due yet, and a payment's or
+  fulfillment's later callbacks are held behind a callback awaiting retry or
+  dead-lettered, so arrival order still holds. Held callbacks are released
+  once the one in front of them is processed or ``requeue``d — the domains'
+  ``/maintenance/requeue-webhooks`` endpoints requeue a dead letter after
+  the cause has been fixed.
+
+    [custom.webhook_inbox]
+    batch_size = 200       # webhooks processed per drain run
+    retention = 86400      # seconds processed webhooks are kept for dedupe
+    max_attempts = 5       # failed attempts before a webhook is dead-lettered
+    retry_backoff = 30     # seconds before the first retry, doubling after each failure
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from protean.utils.query import Q
+
+from shared.config import custom_settings
+
+PENDING = "pending"
+PROCESSED = "processed"
+DEAD = "dead"
+
+
+@dataclass(frozen=True)
+class WebhookInboxSettings:
+    batch_size: int = 200
+    retention: float = 86400.0
+    max_attempts: int = 5
+    retry_backoff: float = 30.0
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "WebhookInboxSettings":
+        return cls(
+            batch_size=max(1, int(settings.get("batch_size", 200))),
+            retention=float(settings.get("retention", 86400)),
+            max_attempts=max(1, int(settings.get("max_attempts", 5))),
+            retry_backoff=float(settings.get("retry_backoff", 30)),
+        )
+
+
+def inbox_settings(domain) -> WebhookInboxSettings:
+    return WebhookInboxSettings.from_config(custom_settings(domain, "webhook_inbox"))
+
+
+def message_id(kind: str, raw: bytes) -> str:
+    """Identity of a webhook delivery: the same callback redelivered gets the same id."""
+    return hashlib.sha256(kind.encode() + b"\0" + raw).hexdigest()
+
+
+_last_received: datetime | None = None
+_receive_lock = threading.Lock()
+
+
+def receive_time() -> datetime:
+    """Return the current naive UTC time, strictly later than any earlier call in this process."""
+    global _last_received
+    with _receive_lock:
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if _last_received is not None and now <= _last_received:
+            now = _last_received + timedelta(microseconds=1)
+        _last_received = now
+        return now
+
+
+def due_messages(view, key_field: str, limit: int, now: datetime) -> list:
+    """Return up to ``limit`` pending messages due at ``now`` (naive UTC), oldest first.
+
+    ``key_field`` names the aggregate a message belongs to; messages for an
+    aggregate with a message awaiting retry or dead-lettered are held back.
+    """
+    held = {
+        str(getattr(message, key_field))
+        for message in view.query.filter(Q(status=DEAD) | Q(status=PENDING, next_attempt_at__gt=now))
+        .limit(None)
+        .all()
+        .items
+    }
+    query = view.query.filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now), status=PENDING)
+    if held:
+        query = query.exclude(**{f"{key_field}__in": sorted(held)})
+    return query.order_by("received_at").limit(limit).all().items
+
+
+def requeue(message) -> None:
+    """Return a dead-lettered message to the queue with a fresh retry budget."""
+    message.status = PENDING
+    message.attempts = 0
+    message.next_attempt_at = None
+    message.error = None
+
+
+def record_failure(message, error: Exception, settings: WebhookInboxSettings, now: datetime) -> None:
+    """Count a failed attempt: schedule the message's retry, or dead-letter it after ``max_attempts``."""
+    message.attempts = (message.attempts or 0) + 1
+    message.error = str(error)[:500]
+    if message.attempts >= settings.max_attempts:
+        message.status = DEAD
+    else:
+        message.status = PENDING
+        message.next_attempt_at = now + timedelta(seconds=settings.retry_backoff * 2 ** (message.attempts - 1))
@@ -1,7 +1,8 @@
 """Application tests for carrier adapter integration."""
 
-from fulfillment.carrier import get_carrier, reset_carrier
+from fulfillment.carrier import get_carrier, reset_carrier, set_carrier
 from fulfillment.carrier.fake_adapter import FakeCarrier
+from fulfillment.carrier.fake_bulk_carrier import FakeBulkCarrier
 
 
 class TestFakeCarrierIntegration:
@@ -94,3 +95,27 @@ class TestFakeCarrierIntegration:
         carrier.configure(should_succeed=True)
         result = carrier.create_shipment(order_id="ord-001", carrier="FC", service_level="Standard")
         assert result["shipment_id"] is not None
+
+
+class TestCarrierAdapterPerName:
+    def setup_method(self):
+        reset_carrier()
+
+    def teardown_method(self):
+        reset_carrier()
+
+    def test_unmapped_carrier_gets_the_default_adapter(self):
+        assert get_carrier("UPS") is get_carrier()
+
+    def test_carrier_adapters_maps_names(self, monkeypatch):
+        monkeypatch.setenv("CARRIER_ADAPTERS", "UPS=fake-bulk, FedEx=fake")
+        assert isinstance(get_carrier("UPS"), FakeBulkCarrier)
+        assert get_carrier("UPS") is get_carrier("UPS")
+        assert not isinstance(get_carrier("FedEx"), FakeBulkCarrier)
+        assert get_carrier("FedEx") is not get_carrier()
+
+    def test_set_carrier_for_a_name(self):
+        carrier = FakeCarrier()
+        set_carrier(carrier, name="DHL")
+        assert get_carrier("DHL") is carrier
+        assert get_carrier() is not carrier
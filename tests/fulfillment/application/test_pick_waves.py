@@ -0,0 +1,194 @@
+"""Application tests for pick-wave planning and bulk picker assignment."""
+
+from protean import current_domain
+
+from fulfillment.fulfillment.cancellation import CancelFulfillment
+from fulfillment.fulfillment.creation import CreateFulfillment
+from fulfillment.fulfillment.fulfillment import Fulfillment, FulfillmentStatus
+from fulfillment.fulfillment.picking import AssignPicker, RecordItemPicked
+from fulfillment.fulfillment.waves import (
+    UNSLOTTED,
+    AssignPickWave,
+    PickStop,
+    SkuPickLocation,
+    WaveSettings,
+    pick_sequence,
+    plan_waves,
+    zone_of,
+)
+from fulfillment.projections.warehouse_queue import WarehouseQueueView
+
+_counter = 0
+
+
+def _create(*locations, service_level=None, warehouse_id="wh-1", quantity=1):
+    global _counter
+    _counter += 1
+    items = [
+        {
+            "order_item_id": f"oi-{n}",
+            "product_id": f"prod-{n}",
+            "sku": f"SKU-{n}",
+            "quantity": quantity,
+            **({"pick_location": location} if location else {}),
+        }
+        for n, location in enumerate(locations)
+    ]
+    return current_domain.process(
+        CreateFulfillment(
+            order_id=f"ord-wave-{_counter}",
+            customer_id="cust-001",
+            warehouse_id=warehouse_id,
+            service_level=service_level,
+            items=items,
+        ),
+        asynchronous=False,
+    )
+
+
+def _stop(location):
+    return PickStop(location=location, sku="SKU", quantity=1, fulfillment_id="ff", item_id=location or "")
+
+
+class TestPickSequence:
+    def test_zone_of(self):
+        assert zone_of("B-2-7") == "B"
+        assert zone_of(None) == UNSLOTTED
+
+    def test_walks_zones_then_aisles_in_serpentine(self):
+        locations = ["B-1-1", "A-2-1", "A-1-9", "A-2-9", "A-1-1", "B-1-5"]
+        sequence = [stop.location for stop in pick_sequence([_stop(location) for location in locations])]
+        assert sequence == ["A-1-1", "A-1-9", "A-2-9", "A-2-1", "B-1-1", "B-1-5"]
+
+    def test_numeric_segments_sort_numerically(self):
+        sequence = [stop.location for stop in pick_sequence([_stop("A-10-1"), _stop("A-9-1")])]
+        assert sequence == ["A-9-1", "A-10-1"]
+
+    def test_unslotted_items_come_last(self):
+        sequence = [stop.location for stop in pick_sequence([_stop(None), _stop("Z-1-1"), _stop("A-1-1")])]
+        assert sequence == ["A-1-1", "Z-1-1", None]
+
+
+class TestPlanWaves:
+    def test_groups_by_zones_and_service_level(self):
+        a1 = _create("A-1-1")
+        a2 = _create("A-2-3")
+        b1 = _create("B-1-1")
+        express = _create("A-1-2", service_level="Express")
+
+        waves = plan_waves()
+        assert [wave.fulfillment_ids for wave in waves] == [[express], [a1, a2], [b1]]
+        assert waves[0].service_level == "Express"
+        assert waves[1].zones == ["A"]
+
+    def test_overnight_waves_come_first(self):
+        _create("A-1-1")
+        _create("A-1-1", service_level="Express")
+        _create("A-1-1", service_level="Overnight")
+        assert [wave.service_level for wave in plan_waves()] == ["Overnight", "Express", "Standard"]
+
+    def test_multi_zone_fulfillments_form_their_own_wave(self):
+        _create("A-1-1")
+        both = _create("A-1-1", "B-1-1")
+        waves = plan_waves()
+        assert [wave.zones for wave in waves] == [["A"], ["A", "B"]]
+        assert waves[1].fulfillment_ids == [both]
+
+    def test_wave_pick_sequence_spans_its_fulfillments(self):
+        first = _create("A-2-1", "A-1-1")
+        second = _create("A-1-5")
+        wave = plan_waves()[0]
+        assert [(stop.location, stop.fulfillment_id) for stop in wave.stops] == [
+            ("A-1-1", first),
+            ("A-1-5", second),
+            ("A-2-1", first),
+        ]
+        ff = current_domain.repository_for(Fulfillment).get(first)
+        assert {stop.item_id for stop in wave.stops if stop.fulfillment_id == first} == {
+            str(item.id) for item in ff.items
+        }
+
+    def test_waves_are_capped(self, monkeypatch):
+        monkeypatch.setattr(
+            "fulfillment.fulfillment.waves.wave_settings", lambda: WaveSettings(max_orders=2, max_items=200)
+        )
+        for _ in range(5):
+            _create("A-1-1")
+        assert [len(wave.fulfillment_ids) for wave in plan_waves()] == [2, 2, 1]
+
+    def test_item_units_cap(self, monkeypatch):
+        monkeypatch.setattr(
+            "fulfillment.fulfillment.waves.wave_settings", lambda: WaveSettings(max_orders=20, max_items=5)
+        )
+        for _ in range(3):
+            _create("A-1-1", quantity=3)
+        assert [wave.item_units for wave in plan_waves()] == [3, 3, 3]
+
+    def test_only_pending_fulfillments_in_the_warehouse(self):
+        _create("A-1-1", warehouse_id="wh-2")
+        cancelled = _create("A-1-1")
+        current_domain.process(CancelFulfillment(fulfillment_id=cancelled, reason="Oops"), asynchronous=False)
+        kept = _create("A-1-1")
+
+        assert [wave.fulfillment_ids for wave in plan_waves(warehouse_id="wh-1")] == [[kept]]
+
+    def test_wave_id_is_stable(self):
+        _create("A-1-1")
+        assert plan_waves()[0].wave_id == plan_waves()[0].wave_id
+
+
+class TestAssignPickWave:
+    def test_assigns_picker_to_every_fulfillment(self):
+        ids = [_create("A-1-1") for _ in range(3)]
+        result = current_domain.process(AssignPickWave(picker_name="Alice", fulfillment_ids=ids), asynchronous=False)
+
+        assert result == {"assigned": ids, "skipped": []}
+        for ff_id in ids:
+            ff = current_domain.repository_for(Fulfillment).get(ff_id)
+            assert ff.status == FulfillmentStatus.PICKING.value
+            assert ff.pick_list.assigned_to == "Alice"
+            assert current_domain.view_for(WarehouseQueueView).get(ff_id).assigned_to == "Alice"
+        assert plan_waves() == []
+
+    def test_skips_fulfillments_no_longer_pending(self):
+        taken = _create("A-1-1")
+        fresh = _create("A-1-1")
+        current_domain.process(AssignPickWave(picker_name="Bob", fulfillment_ids=[taken]), asynchronous=False)
+
+        result = current_domain.process(
+            AssignPickWave(picker_name="Alice", fulfillment_ids=[taken, fresh]), asynchronous=False
+        )
+        assert result == {"assigned": [fresh], "skipped": [taken]}
+        assert current_domain.repository_for(Fulfillment).get(taken).pick_list.assigned_to == "Bob"
+
+    def test_unknown_fulfillment_is_skipped_and_reported(self):
+        ff_id = _create("A-1-1")
+        result = current_domain.process(
+            AssignPickWave(picker_name="Alice", fulfillment_ids=[ff_id, "ff-missing"]), asynchronous=False
+        )
+        assert result == {"assigned": [ff_id], "skipped": ["ff-missing"]}
+        assert current_domain.repository_for(Fulfillment).get(ff_id).status == FulfillmentStatus.PICKING.value
+
+
+class TestLearnedPickLocations:
+    def _pick(self, ff_id, location):
+        current_domain.process(AssignPicker(fulfillment_id=ff_id, picker_name="Bob"), asynchronous=False)
+        item = current_domain.repository_for(Fulfillment).get(ff_id).items[0]
+        current_domain.process(
+            RecordItemPicked(fulfillment_id=ff_id, item_id=str(item.id), pick_location=location), asynchronous=False
+        )
+
+    def test_picks_record_where_each_sku_is_slotted(self):
+        self._pick(_create(None), "C-4-2")
+        slot = current_domain.view_for(SkuPickLocation).get("wh-1:SKU-0")
+        assert (slot.sku, slot.pick_location) == ("SKU-0", "C-4-2")
+
+    def test_items_without_a_location_are_planned_at_their_sku_slot(self):
+        self._pick(_create(None), "C-4-2")
+        unslotted_elsewhere = _create(None, warehouse_id="wh-2")
+        ff_id = _create(None)
+
+        waves = {wave.warehouse_id: wave for wave in plan_waves()}
+        assert waves["wh-1"].fulfillment_ids == [ff_id]
+        assert (waves["wh-1"].zones, waves["wh-1"].stops[0].location) == (["C"], "C-4-2")
+        assert (waves["wh-2"].fulfillment_ids, waves["wh-2"].zones) == ([unslotted_elsewhere], [UNSLOTTED])
@@ -1,4 +1,6 @@
-"""Application tests for tracking event command via domain.process()."""
+"""Application tests for tracking event commands via domain.process()."""
+
+from datetime import UTC, datetime
 
 import pytest
 from protean import current_domain
@@ -9,7 +11,9 @@ from fulfillment.fulfillment.fulfillment import Fulfillment, FulfillmentStatus
 from fulfillment.fulfillment.packing import GenerateShippingLabel, RecordPacking
 from fulfillment.fulfillment.picking import AssignPicker, CompletePickList, RecordItemPicked
 from fulfillment.fulfillment.shipping import RecordHandoff
-from fulfillment.fulfillment.tracking import UpdateTrackingEvent
+from fulfillment.fulfillment.tracking import RecordTrackingScans, UpdateTrackingEvent
+from fulfillment.projections.fulfillment_status import FulfillmentStatusView
+from fulfillment.projections.shipment_tracking import ShipmentTrackingView
 
 
 def _create_shipped():
@@ -101,3 +105,68 @@ class TestUpdateTrackingEvent:
                 UpdateTrackingEvent(fulfillment_id=ff_id, status="in_transit", location="Somewhere"),
                 asynchronous=False,
             )
+
+
+class TestRecordTrackingScans:
+    def test_records_all_scans_in_order(self):
+        ff_id = _create_shipped()
+        current_domain.process(
+            RecordTrackingScans(
+                fulfillment_id=ff_id,
+                scans=[
+                    {"status": "in_transit", "location": "Hub A", "occurred_at": "2026-03-01T08:00:00+00:00"},
+                    {"status": "in_transit", "location": "Hub B", "occurred_at": "2026-03-01T09:00:00+00:00"},
+                    {"status": "out_for_delivery", "location": "Local Office"},
+                ],
+            ),
+            asynchronous=False,
+        )
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert ff.status == FulfillmentStatus.IN_TRANSIT.value
+        assert [event.location for event in ff.tracking_events] == ["Hub A", "Hub B", "Local Office"]
+        assert ff.tracking_events[0].occurred_at == datetime(2026, 3, 1, 8, tzinfo=UTC)
+
+    def test_batch_updates_tracking_view_once(self):
+        ff_id = _create_shipped()
+        current_domain.process(
+            RecordTrackingScans(
+                fulfillment_id=ff_id,
+                scans=[
+                    {"status": "in_transit", "location": "Hub A"},
+                    {"status": "out_for_delivery", "location": "Local Office"},
+                ],
+            ),
+            asynchronous=False,
+        )
+        view = current_domain.repository_for(ShipmentTrackingView).get(ff_id)
+        assert view.current_status == "out_for_delivery"
+        assert view.current_location == "Local Office"
+        assert [event["location"] for event in view.events] == ["Hub A", "Local Office"]
+        assert current_domain.repository_for(FulfillmentStatusView).get(ff_id).status == "In_Transit"
+
+    def test_single_scan_raises_regular_tracking_event(self):
+        ff_id = _create_shipped()
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        ff.add_tracking_scans([{"status": "in_transit", "location": "Hub A"}])
+        assert [type(event).__name__ for event in ff._events][-1] == "TrackingEventReceived"
+
+    def test_batch_raises_one_multi_scan_event(self):
+        ff_id = _create_shipped()
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        ff.add_tracking_scans([{"status": "in_transit", "location": f"Hub {n}"} for n in range(5)])
+        scans_events = [event for event in ff._events if type(event).__name__ == "TrackingScansReceived"]
+        assert len(scans_events) == 1
+        assert len(scans_events[0].scans) == 5
+        assert scans_events[0].location == "Hub 4"
+
+    def test_batch_fails_from_pending(self):
+        items = [{"order_item_id": "oi-1", "product_id": "prod-1", "sku": "SKU-001", "quantity": 1}]
+        ff_id = current_domain.process(
+            CreateFulfillment(order_id="ord-001", customer_id="cust-001", items=items),
+            asynchronous=False,
+        )
+        with pytest.raises(ValidationError):
+            current_domain.process(
+                RecordTrackingScans(fulfillment_id=ff_id, scans=[{"status": "in_transit"}, {"status": "in_transit"}]),
+                asynchronous=False,
+            )
@@ -0,0 +1,251 @@
+"""Application tests for the carrier tracking poller."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from protean import current_domain
+
+from fulfillment.carrier import reset_carrier, set_carrier
+from fulfillment.carrier.fake_adapter import FakeCarrier
+from fulfillment.carrier.fake_bulk_carrier import FakeBulkCarrier
+from fulfillment.fulfillment.creation import CreateFulfillment
+from fulfillment.fulfillment.delivery import RecordDeliveryConfirmation
+from fulfillment.fulfillment.fulfillment import Fulfillment, FulfillmentStatus
+from fulfillment.fulfillment.packing import GenerateShippingLabel, RecordPacking
+from fulfillment.fulfillment.picking import AssignPicker, CompletePickList, RecordItemPicked
+from fulfillment.fulfillment.shipping import RecordHandoff
+from fulfillment.fulfillment.tracking import UpdateTrackingEvent
+from fulfillment.fulfillment.tracking_inbox import drain_tracking_webhooks, pending_tracking_webhooks
+from fulfillment.fulfillment.tracking_poller import (
+    TrackingPollerSettings,
+    TrackingPollSchedule,
+    poll_carrier_tracking,
+    poll_interval,
+)
+
+_counter = 0
+
+
+@pytest.fixture(autouse=True)
+def carrier():
+    carrier = FakeBulkCarrier(max_batch=2)
+    set_carrier(carrier)
+    yield carrier
+    reset_carrier()
+
+
+def _create_shipped(carrier="FakeCarrier", estimated_delivery=None):
+    global _counter
+    _counter += 1
+    items = [{"order_item_id": "oi-1", "product_id": "prod-1", "sku": "SKU-001", "quantity": 1}]
+    ff_id = current_domain.process(
+        CreateFulfillment(order_id=f"ord-poll-{_counter}", customer_id="cust-001", items=items),
+        asynchronous=False,
+    )
+    current_domain.process(AssignPicker(fulfillment_id=ff_id, picker_name="Alice"), asynchronous=False)
+    ff = current_domain.repository_for(Fulfillment).get(ff_id)
+    current_domain.process(
+        RecordItemPicked(fulfillment_id=ff_id, item_id=str(ff.items[0].id), pick_location="A-1"),
+        asynchronous=False,
+    )
+    current_domain.process(CompletePickList(fulfillment_id=ff_id), asynchronous=False)
+    current_domain.process(
+        RecordPacking(fulfillment_id=ff_id, packed_by="Bob", packages=[{"weight": 1.5}]),
+        asynchronous=False,
+    )
+    current_domain.process(
+        GenerateShippingLabel(
+            fulfillment_id=ff_id,
+            label_url="https://labels.example.com/abc.pdf",
+            carrier=carrier,
+            service_level="Standard",
+        ),
+        asynchronous=False,
+    )
+    current_domain.process(
+        RecordHandoff(
+            fulfillment_id=ff_id,
+            tracking_number=f"TRACK-POLL-{_counter}",
+            estimated_delivery=estimated_delivery,
+        ),
+        asynchronous=False,
+    )
+    return ff_id
+
+
+def _later(hours=24):
+    return datetime.now(UTC) + timedelta(hours=hours)
+
+
+class TestPollInterval:
+    settings = TrackingPollerSettings(fast_interval=60, slow_interval=3600, fast_window=86400)
+
+    def test_slow_far_from_estimated_delivery(self):
+        now = datetime.now(UTC)
+        assert poll_interval(self.settings, now, now + timedelta(days=4)) == 3600
+
+    def test_fast_near_estimated_delivery(self):
+        now = datetime.now(UTC)
+        assert poll_interval(self.settings, now, now + timedelta(hours=6)) == 60
+
+    def test_fast_when_overdue(self):
+        now = datetime.now(UTC)
+        assert poll_interval(self.settings, now, now - timedelta(days=1)) == 60
+
+    def test_slow_without_estimated_delivery(self):
+        assert poll_interval(self.settings, datetime.now(UTC), None) == 3600
+
+    def test_fast_when_out_for_delivery(self):
+        now = datetime.now(UTC)
+        assert poll_interval(self.settings, now, now + timedelta(days=4), "out_for_delivery") == 60
+
+    def test_settings_from_config(self):
+        settings = TrackingPollerSettings.from_config({"carriers": ["UPS"], "batch_size": 0})
+        assert settings.batch_size == 1
+        assert settings.polls("UPS")
+        assert not settings.polls("FedEx")
+        assert TrackingPollerSettings.from_config({}).polls("FedEx")
+
+
+class TestPollSchedule:
+    def test_handoff_schedules_polling(self):
+        ff_id = _create_shipped(estimated_delivery=datetime.now(UTC) + timedelta(days=4))
+        schedule = current_domain.view_for(TrackingPollSchedule).get(ff_id)
+        assert schedule.carrier == "FakeCarrier"
+        assert schedule.tracking_number.startswith("TRACK-POLL-")
+        assert schedule.next_poll_at > datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=3)
+
+
+class TestPollCarrierTracking:
+    def test_nothing_due(self):
+        _create_shipped()
+        summary = poll_carrier_tracking()
+        assert summary.polled == 0
+
+    def test_queues_changed_status_for_the_drain(self):
+        ff_id = _create_shipped()
+        summary = poll_carrier_tracking(now=_later())
+
+        assert (summary.polled, summary.queued) == (1, 1)
+        assert [str(message.fulfillment_id) for message in pending_tracking_webhooks(10)] == [ff_id]
+
+        drain_tracking_webhooks()
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert ff.status == FulfillmentStatus.IN_TRANSIT.value
+        assert ff.tracking_events[0].status == "picked_up"
+
+    def test_unchanged_status_is_not_queued_again(self, carrier):
+        set_carrier(FakeCarrier())
+        _create_shipped()
+        assert poll_carrier_tracking(now=_later(24)).queued == 1
+        assert poll_carrier_tracking(now=_later(48)).queued == 0
+
+    def test_looks_up_shipments_in_bulk_per_carrier(self, carrier):
+        for _ in range(3):
+            _create_shipped(carrier="UPS")
+        _create_shipped(carrier="FedEx")
+
+        summary = poll_carrier_tracking(now=_later())
+        assert summary.polled == 4
+        # max_batch=2: two requests for UPS, one for FedEx
+        assert carrier.requests == 3
+
+    def test_reschedules_after_polling(self):
+        ff_id = _create_shipped(estimated_delivery=datetime.now(UTC) + timedelta(days=10))
+        now = _later()
+        poll_carrier_tracking(now=now)
+
+        schedule = current_domain.view_for(TrackingPollSchedule).get(ff_id)
+        assert schedule.last_polled_at == now.replace(tzinfo=None)
+        assert schedule.next_poll_at == now.replace(tzinfo=None) + timedelta(seconds=14400)
+        assert schedule.carrier_status == "picked_up"
+
+    def test_skips_and_drops_delivered_shipments(self, carrier):
+        ff_id = _create_shipped()
+        current_domain.process(
+            UpdateTrackingEvent(fulfillment_id=ff_id, status="in_transit", location="Hub A"),
+            asynchronous=False,
+        )
+        current_domain.process(RecordDeliveryConfirmation(fulfillment_id=ff_id), asynchronous=False)
+
+        summary = poll_carrier_tracking(now=_later())
+        assert (summary.polled, summary.skipped) == (0, 1)
+        assert carrier.requests == 0
+        assert current_domain.view_for(TrackingPollSchedule).query.all().items == []
+
+    def test_carrier_delivery_confirms_and_drops_the_schedule(self, carrier):
+        ff_id = _create_shipped()
+        for day in range(1, 5):
+            summary = poll_carrier_tracking(now=_later(24 * day))
+            drain_tracking_webhooks()
+
+        assert summary.completed == 1
+        assert current_domain.view_for(TrackingPollSchedule).query.all().items == []
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert ff.status == FulfillmentStatus.DELIVERED.value
+        assert ff.tracking_events[-1].status == "delivered"
+        assert poll_carrier_tracking(now=_later(24 * 5)).polled == 0
+
+    def test_each_carrier_is_looked_up_through_its_own_adapter(self, carrier):
+        ups = FakeBulkCarrier()
+        set_carrier(ups, name="UPS")
+        _create_shipped(carrier="UPS")
+        _create_shipped(carrier="FedEx")
+
+        assert poll_carrier_tracking(now=_later()).polled == 2
+        assert (ups.requests, carrier.requests) == (1, 1)
+
+    def test_failed_lookup_is_retried_later(self, carrier):
+        carrier.configure(should_succeed=False)
+        ff_id = _create_shipped()
+        summary = poll_carrier_tracking(now=_later())
+
+        assert (summary.polled, summary.queued) == (1, 0)
+        schedule = current_domain.view_for(TrackingPollSchedule).get(ff_id)
+        assert schedule.carrier_status is None
+        assert schedule.next_poll_at > _later().replace(tzinfo=None)
+
+    def test_failed_lookup_call_backs_off_its_batch_only(self, carrier):
+        class BrokenCarrier(FakeBulkCarrier):
+            def get_tracking_many(self, tracking_numbers):
+                raise ConnectionError("carrier API down")
+
+        set_carrier(BrokenCarrier(), name="UPS")
+        broken = _create_shipped(carrier="UPS")
+        _create_shipped(carrier="FedEx")
+
+        summary = poll_carrier_tracking(now=_later())
+        assert (summary.polled, summary.failed) == (1, 1)
+        assert carrier.requests == 1
+        schedule = current_domain.view_for(TrackingPollSchedule).get(broken)
+        assert schedule.next_poll_at > _later().replace(tzinfo=None)
+        assert schedule.last_polled_at is None
+
+    def test_fulfillment_missing_from_the_status_view_is_polled(self, carrier):
+        from fulfillment.projections.fulfillment_status import FulfillmentStatusView
+
+        ff_id = _create_shipped()
+        view_repo = current_domain.repository_for(FulfillmentStatusView)
+        view_repo._dao.delete(view_repo.get(ff_id))
+
+        summary = poll_carrier_tracking(now=_later())
+        assert (summary.polled, summary.skipped) == (1, 0)
+        assert current_domain.view_for(TrackingPollSchedule).get(ff_id)
+
+
+class TestFakeBulkCarrier:
+    def test_bulk_lookup_batches_requests(self):
+        carrier = FakeBulkCarrier(max_batch=100)
+        results = carrier.get_tracking_many([f"T-{n}" for n in range(250)])
+        assert len(results) == 250
+        assert carrier.requests == 3
+
+    def test_parcels_progress_with_each_lookup(self):
+        carrier = FakeBulkCarrier()
+        statuses = [carrier.get_tracking("T-1")["status"] for _ in range(5)]
+        assert statuses == ["picked_up", "in_transit", "out_for_delivery", "delivered", "delivered"]
+
+    def test_port_default_looks_up_one_at_a_time(self):
+        results = FakeCarrier().get_tracking_many(["T-1", "T-2"])
+        assert set(results) == {"T-1", "T-2"}
+        assert results["T-1"]["status"] == "in_transit"
@@ -55,8 +55,14 @@ def _create_shipped_fulfillment(client):
     return ff_id
 
 
+def _drain(client):
+    response = client.post("/fulfillments/maintenance/drain-webhooks")
+    assert response.status_code == 200
+    return response.json()["processed_count"]
+
+
 class TestTrackingWebhook:
-    def test_webhook_returns_200(self, client):
+    def test_webhook_returns_202(self, client):
         ff_id = _create_shipped_fulfillment(client)
         response = client.post(
             "/fulfillments/tracking/webhook",
@@ -68,8 +74,8 @@ class TestTrackingWebhook:
             },
             headers={"X-Carrier-Signature": "valid-sig"},
         )
-        assert response.status_code == 200
-        assert response.json()["status"] == "tracking_updated"
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
 
     def test_webhook_updates_fulfillment_status(self, client):
         ff_id = _create_shipped_fulfillment(client)
@@ -82,6 +88,7 @@ class TestTrackingWebhook:
             },
             headers={"X-Carrier-Signature": "valid-sig"},
         )
+        assert _drain(client) == 1
         ff = current_domain.repository_for(Fulfillment).get(ff_id)
         assert ff.status == FulfillmentStatus.IN_TRANSIT.value
 
@@ -97,6 +104,7 @@ class TestTrackingWebhook:
             },
             headers={"X-Carrier-Signature": "valid-sig"},
         )
+        assert _drain(client) == 1
         ff = current_domain.repository_for(Fulfillment).get(ff_id)
         assert len(ff.tracking_events) == 1
         assert ff.tracking_events[0].location == "Hub, TX"
@@ -121,5 +129,122 @@ class TestTrackingWebhook:
             },
             headers={"X-Carrier-Signature": "sig2"},
         )
+        assert _drain(client) == 2
         ff = current_domain.repository_for(Fulfillment).get(ff_id)
         assert len(ff.tracking_events) == 2
+        assert [event.status for event in ff.tracking_events] == ["in_transit", "out_for_delivery"]
+
+    def test_webhook_not_applied_until_drained(self, client):
+        ff_id = _create_shipped_fulfillment(client)
+        client.post(
+            "/fulfillments/tracking/webhook",
+            json={"fulfillment_id": ff_id, "status": "in_transit", "location": "Hub A"},
+        )
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert ff.status == FulfillmentStatus.SHIPPED.value
+        assert ff.tracking_events == []
+
+    def test_redelivered_webhook_adds_one_event(self, client):
+        ff_id = _create_shipped_fulfillment(client)
+        body = {"fulfillment_id": ff_id, "status": "in_transit", "location": "Hub A"}
+        client.post("/fulfillments/tracking/webhook", json=body)
+        _drain(client)
+        response = client.post("/fulfillments/tracking/webhook", json=body)
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "duplicate"
+        assert _drain(client) == 0
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert len(ff.tracking_events) == 1
+
+    def test_invalid_webhook_is_scheduled_for_retry(self, client):
+        from fulfillment.fulfillment.tracking_inbox import TrackingWebhookInbox
+
+        client.post(
+            "/fulfillments/tracking/webhook",
+            json={"fulfillment_id": "ff-missing", "status": "in_transit"},
+        )
+        assert _drain(client) == 0
+        message = current_domain.view_for(TrackingWebhookInbox).query.all().items[0]
+        assert message.status == "pending"
+        assert message.attempts == 1
+        assert message.error
+        assert _drain(client) == 0  # Not due yet
+        assert current_domain.view_for(TrackingWebhookInbox).get(message.message_id).attempts == 1
+
+    def test_non_utf8_body_rejected(self, client):
+        response = client.post(
+            "/fulfillments/tracking/webhook",
+            content=b'{"fulfillment_id": "\xff", "status": "in_transit"}',
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 400
+
+    def test_dead_letter_holds_later_scans_until_requeued(self, client):
+        from fulfillment.fulfillment.tracking_inbox import TrackingWebhookInbox
+
+        ff_id = _create_shipped_fulfillment(client)
+        for location in ("Hub A", "Hub B"):
+            client.post(
+                "/fulfillments/tracking/webhook",
+                json={"fulfillment_id": ff_id, "status": "in_transit", "location": location},
+            )
+        repo = current_domain.repository_for(TrackingWebhookInbox)
+        first = next(m for m in repo.query.all().items if m.payload["location"] == "Hub A")
+        first.status = "dead"
+        repo.add(first)
+        assert _drain(client) == 0
+
+        response = client.post("/fulfillments/maintenance/requeue-webhooks", json={"fulfillment_id": ff_id})
+        assert response.json()["requeued_count"] == 1
+        assert _drain(client) == 2
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert [event.location for event in ff.tracking_events] == ["Hub A", "Hub B"]
+
+    def test_scans_for_one_fulfillment_are_saved_together(self, client):
+        ff_id = _create_shipped_fulfillment(client)
+        version = current_domain.repository_for(Fulfillment).get(ff_id)._version
+        for location in ("Hub A", "Hub B", "Hub C"):
+            client.post(
+                "/fulfillments/tracking/webhook",
+                json={"fulfillment_id": ff_id, "status": "in_transit", "location": location},
+            )
+
+        assert _drain(client) == 3
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert ff._version == version + 1
+        assert [event.location for event in ff.tracking_events] == ["Hub A", "Hub B", "Hub C"]
+
+    def test_failed_batch_is_retried_scan_by_scan(self, client):
+        from fulfillment.fulfillment.tracking_inbox import TrackingWebhookInbox, accept_tracking_webhook
+
+        ff_id = _create_shipped_fulfillment(client)
+        for location, occurred_at in (("Hub A", None), ("Hub B", "not-a-time"), ("Hub C", None)):
+            payload = {"status": "in_transit", "location": location, "occurred_at": occurred_at}
+            accept_tracking_webhook(ff_id, payload, f"{ff_id}:{location}".encode())
+
+        assert _drain(client) == 1
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        assert [event.location for event in ff.tracking_events] == ["Hub A"]
+        messages = {
+            message.payload["location"]: message
+            for message in current_domain.view_for(TrackingWebhookInbox).query.all().items
+        }
+        assert messages["Hub A"].status == "processed"
+        assert (messages["Hub B"].status, messages["Hub B"].attempts) == ("pending", 1)
+        assert (messages["Hub C"].status, messages["Hub C"].attempts) == ("pending", 0)
+
+
+class TestPollTrackingEndpoint:
+    def test_poll_tracking_reports_counts(self, client):
+        _create_shipped_fulfillment(client)
+        response = client.post("/fulfillments/maintenance/poll-tracking", json={"limit": 10})
+        assert response.status_code == 200
+        # Nothing is due straight after handoff
+        assert response.json() == {
+            "polled_count": 0,
+            "queued_count": 0,
+            "skipped_count": 0,
+            "completed_count": 0,
+            "failed_count": 0,
+        }
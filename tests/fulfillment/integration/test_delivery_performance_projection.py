@@ -5,8 +5,12 @@ Covers:
 - Existing record update on subsequent ShipmentHandedOff
 - DeliveryConfirmed updates delivered_count
 - DeliveryException updates exception_count
+- Delivery and exception events count towards the shipment's own carrier row
 """
 
+from datetime import timedelta
+
+import pytest
 from protean import current_domain
 
 from fulfillment.fulfillment.creation import CreateFulfillment
@@ -16,7 +20,7 @@ from fulfillment.fulfillment.packing import GenerateShippingLabel, RecordPacking
 from fulfillment.fulfillment.picking import AssignPicker, CompletePickList, RecordItemPicked
 from fulfillment.fulfillment.shipping import RecordHandoff
 from fulfillment.fulfillment.tracking import UpdateTrackingEvent
-from fulfillment.projections.delivery_performance import DeliveryPerformanceView
+from fulfillment.projections.delivery_performance import DeliveryPerformanceShipment, DeliveryPerformanceView
 
 
 def _single_item():
@@ -122,3 +126,78 @@ class TestDeliveryPerformanceProjection:
         assert results and len(results.items) > 0
         view = results.first
         assert view.exception_count >= 1
+
+
+class TestDeliveryPerformanceAttribution:
+    def _walk_with_carrier(self, order_id, carrier):
+        ff_id = _create_fulfillment(order_id=order_id)
+        current_domain.process(AssignPicker(fulfillment_id=ff_id, picker_name="Alice"), asynchronous=False)
+        ff = current_domain.repository_for(Fulfillment).get(ff_id)
+        current_domain.process(
+            RecordItemPicked(fulfillment_id=ff_id, item_id=str(ff.items[0].id), pick_location="A-1"),
+            asynchronous=False,
+        )
+        current_domain.process(CompletePickList(fulfillment_id=ff_id), asynchronous=False)
+        current_domain.process(
+            RecordPacking(fulfillment_id=ff_id, packed_by="Bob", packages=[{"weight": 1.0}]),
+            asynchronous=False,
+        )
+        current_domain.process(
+            GenerateShippingLabel(
+                fulfillment_id=ff_id,
+                label_url="https://labels.example.com/abc.pdf",
+                carrier=carrier,
+                service_level="Standard",
+            ),
+            asynchronous=False,
+        )
+        current_domain.process(RecordHandoff(fulfillment_id=ff_id, tracking_number=f"T-{order_id}"), asynchronous=False)
+        current_domain.process(
+            UpdateTrackingEvent(fulfillment_id=ff_id, status="in_transit", location="Hub"),
+            asynchronous=False,
+        )
+        return ff_id
+
+    def _rows(self):
+        return {view.carrier: view for view in current_domain.repository_for(DeliveryPerformanceView).query.all().items}
+
+    def test_delivery_counts_towards_the_shipments_carrier(self):
+        self._walk_with_carrier("ord-attr-ups", "UPS")
+        fedex = self._walk_with_carrier("ord-attr-fedex", "FedEx")
+
+        current_domain.process(RecordDeliveryConfirmation(fulfillment_id=fedex), asynchronous=False)
+
+        rows = self._rows()
+        assert rows["FedEx"].delivered_count == 1
+        assert rows["FedEx"].total_delivery_hours >= 0.0
+        assert rows["UPS"].delivered_count == 0
+
+    def test_exception_counts_towards_the_shipments_carrier(self):
+        ups = self._walk_with_carrier("ord-attr-exc-ups", "UPS")
+        self._walk_with_carrier("ord-attr-exc-fedex", "FedEx")
+
+        current_domain.process(
+            RecordDeliveryException(fulfillment_id=ups, reason="Nobody home"),
+            asynchronous=False,
+        )
+
+        rows = self._rows()
+        assert rows["UPS"].exception_count == 1
+        assert rows["FedEx"].exception_count == 0
+
+    def test_lookup_dropped_after_delivery(self):
+        ff_id = self._walk_with_carrier("ord-attr-drop", "UPS")
+        repo = current_domain.repository_for(DeliveryPerformanceShipment)
+        assert repo.get(ff_id).performance_id.startswith("UPS-")
+
+        current_domain.process(RecordDeliveryConfirmation(fulfillment_id=ff_id), asynchronous=False)
+        assert current_domain.view_for(DeliveryPerformanceShipment).query.all().items == []
+
+    def test_delivery_hours_accumulate(self):
+        ff_id = self._walk_with_carrier("ord-attr-hours", "UPS")
+        shipment = current_domain.repository_for(DeliveryPerformanceShipment).get(ff_id)
+        shipment.shipped_at = shipment.shipped_at - timedelta(hours=30)
+        current_domain.repository_for(DeliveryPerformanceShipment).add(shipment)
+
+        current_domain.process(RecordDeliveryConfirmation(fulfillment_id=ff_id), asynchronous=False)
+        assert self._rows()["UPS"].total_delivery_hours == pytest.approx(30.0, abs=0.1)
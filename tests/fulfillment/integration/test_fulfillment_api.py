@@ -207,7 +207,8 @@ class TestRecordDeliveryAPI:
             },
             headers={"X-Carrier-Signature": "test"},
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
+        client.post("/fulfillments/maintenance/drain-webhooks")
         response = client.put(f"/fulfillments/{ff_id}/deliver")
         assert response.status_code == 200
         assert response.json()["status"] == "delivery_confirmed"
@@ -226,6 +227,7 @@ class TestRecordExceptionAPI:
             },
             headers={"X-Carrier-Signature": "test"},
         )
+        client.post("/fulfillments/maintenance/drain-webhooks")
         response = client.put(
             f"/fulfillments/{ff_id}/exception",
             json={"reason": "Address not found", "location": "Dest City"},
@@ -254,6 +256,43 @@ class TestCancelFulfillmentAPI:
         assert ff.status == FulfillmentStatus.CANCELLED.value
 
 
+class TestPickWavesAPI:
+    def test_plan_and_assign_wave(self, client):
+        items = [
+            {
+                "order_item_id": "oi-1",
+                "product_id": "prod-1",
+                "sku": "SKU-001",
+                "quantity": 1,
+                "pick_location": "A-2-1",
+            },
+            {
+                "order_item_id": "oi-2",
+                "product_id": "prod-2",
+                "sku": "SKU-002",
+                "quantity": 2,
+                "pick_location": "A-1-4",
+            },
+        ]
+        first = _create_fulfillment(client, items=items, service_level="Express")
+        second = _create_fulfillment(client, order_id="ord-api-002", items=items[:1], service_level="Express")
+
+        response = client.get("/fulfillments/waves")
+        assert response.status_code == 200
+        wave = response.json()["waves"][0]
+        assert wave["fulfillment_ids"] == [first, second]
+        assert wave["item_units"] == 4
+        assert [stop["location"] for stop in wave["stops"]] == ["A-1-4", "A-2-1", "A-2-1"]
+
+        response = client.post(
+            "/fulfillments/waves/assign",
+            json={"picker_name": "Alice", "fulfillment_ids": wave["fulfillment_ids"]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"assigned": [first, second], "skipped": []}
+        assert current_domain.repository_for(Fulfillment).get(second).status == FulfillmentStatus.PICKING.value
+
+
 class TestCarrierConfigureAPI:
     def test_configure_returns_200(self, client):
         response = client.post(
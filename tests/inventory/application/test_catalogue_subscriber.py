@@ -6,10 +6,12 @@ and translated into InitializeStock commands.
 
 from datetime import UTC, datetime
 
+import pytest
 from protean import current_domain
 
 from inventory.projections.inventory_level import InventoryLevel
 from inventory.stock.catalogue_subscriber import CatalogueVariantSubscriber
+from shared.subscribers import TypedSubscriber, event_type_of
 
 
 def _build_message(event_type: str, data: dict) -> dict:
@@ -191,3 +193,31 @@ class TestCatalogueVariantSubscriber:
             levels = []
         matching = [lv for lv in levels if str(lv.product_id) == "prod-no-meta"]
         assert len(matching) == 0
+
+
+class TestEventTypePrefilter:
+    def test_event_type_of_strips_version_suffix(self):
+        assert event_type_of(_build_message("Catalogue.VariantAdded.v1", {})) == "Catalogue.VariantAdded"
+
+    def test_event_type_of_keeps_unversioned_types(self):
+        assert event_type_of(_build_message("Catalogue.VariantAdded", {})) == "Catalogue.VariantAdded"
+
+    def test_event_type_of_missing_headers(self):
+        assert event_type_of({"data": {}}) == ""
+        assert event_type_of({"metadata": None}) == ""
+        assert event_type_of({"metadata": {"headers": {"type": None}}}) == ""
+
+    def test_subscriber_declares_handled_types(self):
+        assert CatalogueVariantSubscriber.event_types == frozenset({"Catalogue.VariantAdded"})
+
+    def test_other_types_are_dropped_before_data_is_read(self):
+        """Undeclared types never reach handle(), even with an unusable body."""
+        subscriber = CatalogueVariantSubscriber()
+        subscriber(_build_message("Catalogue.ProductPublished.v1", None))
+
+    def test_typed_subscriber_requires_handle(self):
+        class Incomplete(TypedSubscriber):
+            event_types = frozenset({"Catalogue.VariantAdded"})
+
+        with pytest.raises(TypeError):
+            Incomplete()
@@ -7,6 +7,7 @@ from protean import current_domain
 from notifications.channel import get_channel, reset_channels
 from notifications.notification.dispatch import (
     NotificationDispatcher,
+    _dispatch_batch_via_channel,
     _dispatch_via_channel,
 )
 from notifications.notification.events import NotificationCreated
@@ -117,3 +118,40 @@ class TestDispatchViaChannel:
         result = _dispatch_via_channel(None, FakeNotification())
         assert result["status"] == "failed"
         assert "Unknown channel" in result["error"]
+
+
+class TestDispatchBatchViaChannel:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def _notifications(self, count, channel=NotificationChannel.PUSH.value):
+        return [
+            Notification.create(
+                recipient_id=f"device-{n}",
+                notification_type=NotificationType.SHIPPING_UPDATE.value,
+                channel=channel,
+                body="Your order shipped",
+            )
+            for n in range(count)
+        ]
+
+    def test_splits_batch_at_provider_limit(self):
+        adapter = get_channel(NotificationChannel.PUSH.value)
+        adapter.max_batch_size = 2
+
+        results = _dispatch_batch_via_channel(adapter, self._notifications(5))
+
+        assert adapter.batch_sizes == [2, 2, 1]
+        assert [r["status"] for r in results] == ["sent"] * 5
+
+    def test_result_count_mismatch_fails_whole_request(self):
+        adapter = get_channel(NotificationChannel.PUSH.value)
+        adapter.send_batch = lambda messages: [{"status": "sent"}]
+
+        results = _dispatch_batch_via_channel(adapter, self._notifications(3))
+
+        assert [r["status"] for r in results] == ["failed"] * 3
+        assert "3 messages" in results[0]["error"]
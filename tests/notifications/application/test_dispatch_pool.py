@@ -0,0 +1,270 @@
+"""Application tests for pooled channel dispatch.
+
+Notifications are created with a future ``scheduled_for`` so the inline
+dispatcher leaves them PENDING; the tests then push them through a
+ChannelDispatchPool directly and check the written-back status.
+"""
+
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from protean import current_domain
+
+from notifications.channel import get_channel, reset_channels
+from notifications.channel.rate_limit import RateLimiter
+from notifications.domain import notifications
+from notifications.notification.dispatch_pool import (
+    INLINE,
+    POOLED,
+    ChannelDispatchPool,
+    ChannelLimits,
+    DispatchClaim,
+    DispatchRequest,
+    RecoverInterruptedDispatches,
+    claim_dispatch,
+    dispatch_mode,
+    get_dispatch_pool,
+    reset_dispatch_pool,
+)
+from notifications.notification.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    NotificationType,
+)
+
+
+def _pending_notification(recipient_id, channel=NotificationChannel.EMAIL.value):
+    n = Notification.create(
+        recipient_id=recipient_id,
+        notification_type=NotificationType.WELCOME.value,
+        channel=channel,
+        body="Welcome!",
+        subject="Welcome" if channel == NotificationChannel.EMAIL.value else None,
+        scheduled_for=datetime.now(UTC) + timedelta(hours=1),
+    )
+    current_domain.repository_for(Notification).add(n)
+    return n
+
+
+def _status(notification):
+    return current_domain.repository_for(Notification).get(str(notification.id)).status
+
+
+class TestChannelDispatchPool:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def test_sends_and_marks_sent(self):
+        pool = ChannelDispatchPool()
+        n = _pending_notification("cust-pool-1")
+
+        pool.submit(DispatchRequest.from_notification(n))
+        assert pool.drain(timeout=5) == 1
+        pool.shutdown()
+
+        assert _status(n) == NotificationStatus.SENT.value
+        sent = get_channel(NotificationChannel.EMAIL.value).sent_emails
+        assert any(e["to"] == "cust-pool-1" for e in sent)
+
+    def test_adapter_failure_marks_failed(self):
+        get_channel(NotificationChannel.SMS.value).configure(should_succeed=False, failure_reason="Gateway down")
+        pool = ChannelDispatchPool()
+        n = _pending_notification("cust-pool-2", channel=NotificationChannel.SMS.value)
+
+        pool.submit(DispatchRequest.from_notification(n))
+        pool.drain(timeout=5)
+        pool.shutdown()
+
+        updated = current_domain.repository_for(Notification).get(str(n.id))
+        assert updated.status == NotificationStatus.FAILED.value
+        assert updated.failure_reason == "Gateway down"
+
+    def test_write_back_in_batches(self):
+        pool = ChannelDispatchPool(flush_size=2, flush_interval=60)
+        batch = [_pending_notification(f"cust-pool-batch-{i}") for i in range(5)]
+
+        with patch.object(pool, "_write_back", wraps=pool._write_back) as write_back:
+            for n in batch:
+                pool.submit(DispatchRequest.from_notification(n))
+            pool.drain(timeout=5)
+            pool.shutdown()
+
+        assert all(_status(n) == NotificationStatus.SENT.value for n in batch)
+        assert all(len(call.args[0]) <= 2 for call in write_back.call_args_list)
+
+    def test_accumulates_batches_per_channel_and_type(self):
+        pool = ChannelDispatchPool(limits={"Email": ChannelLimits(batch_size=3)}, flush_interval=60)
+        batch = [_pending_notification(f"cust-pool-acc-{i}") for i in range(4)]
+
+        for n in batch:
+            pool.submit(DispatchRequest.from_notification(n))
+        pool.drain(timeout=5)
+        pool.shutdown()
+
+        # One full batch, then the remainder released by drain
+        assert get_channel(NotificationChannel.EMAIL.value).batch_sizes == [3, 1]
+        assert all(_status(n) == NotificationStatus.SENT.value for n in batch)
+
+    def test_batch_maps_status_per_notification(self):
+        get_channel(NotificationChannel.EMAIL.value).configure(rejected={"cust-pool-rejected"})
+        pool = ChannelDispatchPool(limits={"Email": ChannelLimits(batch_size=2)})
+        accepted = _pending_notification("cust-pool-accepted")
+        rejected = _pending_notification("cust-pool-rejected")
+
+        pool.submit(DispatchRequest.from_notification(accepted))
+        pool.submit(DispatchRequest.from_notification(rejected))
+        pool.drain(timeout=5)
+        pool.shutdown()
+
+        assert get_channel(NotificationChannel.EMAIL.value).batch_sizes == [2]
+        assert _status(accepted) == NotificationStatus.SENT.value
+        assert _status(rejected) == NotificationStatus.FAILED.value
+
+    def test_channel_workers_send_concurrently(self):
+        get_channel(NotificationChannel.PUSH.value).configure(latency=0.1)
+        pool = ChannelDispatchPool(limits={"Push": ChannelLimits(workers=5)})
+        batch = [_pending_notification(f"cust-pool-push-{i}", NotificationChannel.PUSH.value) for i in range(5)]
+
+        start = time.perf_counter()
+        for n in batch:
+            pool.submit(DispatchRequest.from_notification(n))
+        pool.drain(timeout=5)
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+        assert elapsed < 0.4
+        assert all(_status(n) == NotificationStatus.SENT.value for n in batch)
+
+    def test_submit_blocks_when_channel_is_full(self):
+        get_channel(NotificationChannel.SLACK.value).configure(latency=0.2)
+        pool = ChannelDispatchPool(limits={"Slack": ChannelLimits(workers=1, max_pending=1)})
+        first = _pending_notification("cust-pool-slack-1", NotificationChannel.SLACK.value)
+        second = _pending_notification("cust-pool-slack-2", NotificationChannel.SLACK.value)
+
+        pool.submit(DispatchRequest.from_notification(first))
+        submitted = threading.Event()
+        blocked = threading.Thread(
+            target=lambda: (pool.submit(DispatchRequest.from_notification(second)), submitted.set())
+        )
+        blocked.start()
+
+        assert not submitted.wait(0.05)
+        assert submitted.wait(2)
+        blocked.join()
+        pool.drain(timeout=5)
+        pool.shutdown()
+
+        assert _status(second) == NotificationStatus.SENT.value
+
+
+class TestPooledDispatcher:
+    def setup_method(self):
+        reset_channels()
+        reset_dispatch_pool()
+
+    def teardown_method(self):
+        reset_dispatch_pool()
+        reset_channels()
+
+    def test_test_environment_dispatches_inline(self):
+        assert dispatch_mode(notifications) == INLINE
+
+    def test_pooled_mode_queues_send_on_pool(self):
+        with patch.dict(notifications.config["custom"], {"dispatch": {"mode": POOLED}}):
+            n = Notification.create(
+                recipient_id="cust-pooled-1",
+                notification_type=NotificationType.WELCOME.value,
+                channel=NotificationChannel.EMAIL.value,
+                body="Welcome!",
+                subject="Welcome",
+            )
+            current_domain.repository_for(Notification).add(n)
+            get_dispatch_pool().drain(timeout=5)
+
+        assert _status(n) == NotificationStatus.SENT.value
+        assert _claims(n) == []
+
+
+def _claims(notification):
+    return current_domain.view_for(DispatchClaim).query.filter(notification_id=str(notification.id)).all().items
+
+
+def _recover(after_seconds=301):
+    return current_domain.process(
+        RecoverInterruptedDispatches(as_of=datetime.now(UTC) + timedelta(seconds=after_seconds)),
+        asynchronous=False,
+    )
+
+
+class TestRecoverInterruptedDispatches:
+    def test_lost_send_is_failed_for_retry(self):
+        n = _pending_notification("cust-lost-1")
+        claim_dispatch(n)  # handed to a pool that died before sending
+
+        assert _recover() == 1
+        assert _status(n) == NotificationStatus.FAILED.value
+        assert _claims(n) == []
+
+    def test_recent_claims_are_left_alone(self):
+        n = _pending_notification("cust-lost-2")
+        claim_dispatch(n)
+
+        assert _recover(after_seconds=10) == 0
+        assert _status(n) == NotificationStatus.PENDING.value
+        assert len(_claims(n)) == 1
+
+    def test_notification_with_recorded_result_is_not_failed(self):
+        n = _pending_notification("cust-lost-3")
+        claim_dispatch(n)
+        repo = current_domain.repository_for(Notification)
+        sent = repo.get(str(n.id))
+        sent.mark_sent()
+        repo.add(sent)
+
+        assert _recover() == 0
+        assert _status(n) == NotificationStatus.SENT.value
+        assert _claims(n) == []
+
+    def test_failed_write_back_keeps_the_claim(self):
+        n = _pending_notification("cust-lost-4")
+        claim_dispatch(n)
+        pool = ChannelDispatchPool()
+        with patch("notifications.notification.dispatch_pool._apply_result", side_effect=RuntimeError("db down")):
+            pool.submit(DispatchRequest.from_notification(n))
+            pool.drain(timeout=5)
+        pool.shutdown()
+
+        assert len(_claims(n)) == 1
+        assert _recover() == 1
+
+
+class TestRateLimiter:
+    def _limiter(self, rate, burst=None):
+        clock = {"now": 0.0}
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        return RateLimiter(rate, burst=burst, clock=lambda: clock["now"], sleep=sleep), sleeps
+
+    def test_zero_rate_never_waits(self):
+        limiter, sleeps = self._limiter(0)
+        for _ in range(100):
+            limiter.acquire()
+        assert sleeps == []
+
+    def test_burst_then_paced(self):
+        limiter, sleeps = self._limiter(10, burst=2)
+        for _ in range(4):
+            limiter.acquire()
+
+        assert len(sleeps) == 2
+        assert all(abs(s - 0.1) < 1e-9 for s in sleeps)
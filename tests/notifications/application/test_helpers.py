@@ -2,7 +2,7 @@
 
 from protean import current_domain
 
-from notifications.channel import reset_channels
+from notifications.channel import get_channel, reset_channels
 from notifications.notification.helpers import (
     create_internal_notification,
     create_notifications_for_customer,
@@ -36,6 +36,18 @@ class TestCreateNotificationsForCustomer:
         n = repo.get(nids[0])
         assert n.channel == NotificationChannel.EMAIL.value
 
+    def test_email_notification_carries_html_body(self):
+        nids = create_notifications_for_customer(
+            customer_id="cust-html",
+            notification_type=NotificationType.WELCOME.value,
+            context={"first_name": "Alice"},
+        )
+
+        n = current_domain.repository_for(Notification).get(nids[0])
+        assert n.html_body.startswith("<p>Hi Alice,</p>")
+        sent = get_channel(NotificationChannel.EMAIL.value).sent_emails
+        assert any(e["to"] == "cust-html" and e["html_body"] == n.html_body for e in sent)
+
     def test_creates_notification_with_preferences(self):
         """With preferences, uses enabled channels from template defaults."""
         pref = NotificationPreference.create_default(customer_id="cust-withpref")
@@ -0,0 +1,180 @@
+"""Application tests for notification digests (coalescing windows)."""
+
+from datetime import UTC, datetime, timedelta
+
+from protean import current_domain
+
+from notifications.channel import reset_channels
+from notifications.notification.digest import DigestEntry, DigestWindow, FlushNotificationDigests
+from notifications.notification.helpers import create_internal_notification, create_notifications_for_customer
+from notifications.notification.notification import Notification, NotificationChannel, NotificationType
+from notifications.preference.preference import NotificationPreference
+
+LOW_STOCK = NotificationType.LOW_STOCK_ALERT.value
+SHIPPING = NotificationType.SHIPPING_UPDATE.value
+
+
+def _low_stock(sku, recipient_id="operations"):
+    return create_internal_notification(
+        notification_type=LOW_STOCK,
+        context={"sku": sku, "product_id": "prod-1", "current_available": 2, "reorder_point": 10},
+        recipient_id=recipient_id,
+        source_event_type="Inventory.LowStockDetected.v1",
+    )
+
+
+def _shipping(customer_id, order_id):
+    return create_notifications_for_customer(
+        customer_id=customer_id,
+        notification_type=SHIPPING,
+        context={"order_id": order_id, "carrier": "UPS", "tracking_number": "1Z999"},
+    )
+
+
+def _notifications(recipient_id, notification_type):
+    repo = current_domain.repository_for(Notification)
+    return repo.query.filter(recipient_id=recipient_id, notification_type=notification_type).all().items
+
+
+def _entries(window_id=f"operations:{LOW_STOCK}"):
+    return current_domain.view_for(DigestEntry).query.filter(window_id=window_id).all().items
+
+
+def _flush(as_of=None):
+    as_of = as_of or datetime.now(UTC) + timedelta(hours=1)
+    return current_domain.process(FlushNotificationDigests(as_of=as_of), asynchronous=False)
+
+
+class TestCoalescing:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def test_first_notification_is_sent_and_burst_absorbed(self):
+        first = _low_stock("SKU-1")
+        assert first is not None
+        assert _low_stock("SKU-1") is None
+        assert _low_stock("SKU-2") is None
+
+        assert len(_notifications("operations", LOW_STOCK)) == 1
+        assert sorted(entry.summary for entry in _entries()) == [
+            "SKU-1 at N/A: 2 available, reorder point 10",
+            "SKU-2 at N/A: 2 available, reorder point 10",
+        ]
+
+    def test_flush_sends_one_digest(self):
+        _low_stock("SKU-1")
+        for sku in ("SKU-1", "SKU-1", "SKU-2"):
+            _low_stock(sku)
+
+        assert _flush() == 1
+
+        digest = [n for n in _notifications("operations", LOW_STOCK) if n.subject.startswith("[Low Stock] 3")]
+        assert len(digest) == 1
+        assert digest[0].channel == NotificationChannel.SLACK.value
+        assert "- SKU-1 at N/A: 2 available, reorder point 10 (x2)" in digest[0].body
+        assert "- SKU-2 at N/A: 2 available, reorder point 10" in digest[0].body
+        assert current_domain.view_for(DigestWindow).query.all().items == []
+        assert _entries() == []
+
+    def test_window_without_burst_sends_no_digest(self):
+        _low_stock("SKU-1")
+
+        assert _flush() == 0
+        assert len(_notifications("operations", LOW_STOCK)) == 1
+        assert current_domain.view_for(DigestWindow).query.all().items == []
+
+    def test_open_window_is_not_flushed(self):
+        _low_stock("SKU-1")
+        _low_stock("SKU-1")
+
+        assert _flush(datetime.now(UTC)) == 0
+        assert len(_notifications("operations", LOW_STOCK)) == 1
+
+    def test_windows_are_per_recipient(self):
+        _low_stock("SKU-1", recipient_id="ops-a")
+        _low_stock("SKU-1", recipient_id="ops-b")
+
+        assert len(_notifications("ops-a", LOW_STOCK)) == 1
+        assert len(_notifications("ops-b", LOW_STOCK)) == 1
+
+    def test_expired_window_is_closed_by_next_notification(self):
+        _low_stock("SKU-1")
+        _low_stock("SKU-2")
+        repo = current_domain.repository_for(DigestWindow)
+        window = repo.get(f"operations:{LOW_STOCK}")
+        window.closes_at = window.opened_at - timedelta(seconds=1)
+        repo.add(window)
+
+        assert _low_stock("SKU-3") is not None
+
+        sent = _notifications("operations", LOW_STOCK)
+        assert len(sent) == 3  # Leading alert, digest of SKU-2, leading alert of the new window
+        assert _entries() == []
+
+    def test_entries_absorbed_after_close_join_the_next_digest(self):
+        _low_stock("SKU-1")
+        window = current_domain.repository_for(DigestWindow).get(f"operations:{LOW_STOCK}")
+        _flush()
+        # An absorb that read the window before the flush deleted it
+        current_domain.repository_for(DigestEntry).add(
+            DigestEntry(
+                entry_id="late-entry", window_id=window.window_id, summary="Late SKU", absorbed_at=window.opened_at
+            )
+        )
+
+        _low_stock("SKU-2")
+        _low_stock("SKU-3")
+        assert _flush() == 1
+        digest = next(n for n in _notifications("operations", LOW_STOCK) if n.subject == "[Low Stock] 2 alerts")
+        assert "- Late SKU" in digest.body
+
+    def test_digest_lists_at_most_max_lines(self):
+        _low_stock("SKU-0")
+        for n in range(1, 24):
+            _low_stock(f"SKU-{n}")
+
+        _flush()
+        digest = next(n for n in _notifications("operations", LOW_STOCK) if n.subject == "[Low Stock] 23 alerts")
+        assert digest.body.count("\n- SKU-") == 20
+        assert digest.body.endswith("- and 3 more")
+
+    def test_uncoalesced_types_are_untouched(self):
+        pref = NotificationPreference.create_default(customer_id="cust-digest-welcome")
+        current_domain.repository_for(NotificationPreference).add(pref)
+        for _ in range(2):
+            create_notifications_for_customer(
+                customer_id="cust-digest-welcome",
+                notification_type=NotificationType.WELCOME.value,
+                context={"name": "Al"},
+            )
+
+        assert len(_notifications("cust-digest-welcome", NotificationType.WELCOME.value)) == 2
+
+
+class TestCustomerDigest:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def test_digest_follows_preferences(self):
+        pref = NotificationPreference.create_default(customer_id="cust-digest-ship")
+        pref.update_channels(sms=True)
+        current_domain.repository_for(NotificationPreference).add(pref)
+
+        assert len(_shipping("cust-digest-ship", "ord-1")) == 2
+        assert _shipping("cust-digest-ship", "ord-2") == []
+        assert _shipping("cust-digest-ship", "ord-3") == []
+
+        _flush()
+
+        sent = _notifications("cust-digest-ship", SHIPPING)
+        digests = [n for n in sent if n.subject == "Updates on your orders (2)"]
+        assert sorted(n.channel for n in digests) == [NotificationChannel.EMAIL.value, NotificationChannel.SMS.value]
+        email = next(n for n in digests if n.channel == NotificationChannel.EMAIL.value)
+        assert "- Order #ord-2 shipped with UPS, tracking number 1Z999" in email.body
+        assert email.html_body.startswith("<p>2 more updates since")
@@ -0,0 +1,258 @@
+"""Application tests for the in-memory preference cache, its event-driven refresh and cross-worker sync."""
+
+from unittest.mock import patch
+
+import pytest
+from protean import current_domain
+
+from notifications.channel import reset_channels
+from notifications.notification.helpers import create_notifications_for_customer
+from notifications.notification.notification import Notification, NotificationChannel, NotificationType
+from notifications.preference import cache as cache_module
+from notifications.preference.cache import (
+    EMAIL,
+    PUSH,
+    SMS,
+    PreferenceCache,
+    PreferenceChange,
+    PreferenceEntry,
+    get_preference_cache,
+    record_change,
+)
+from notifications.preference.management import ClearQuietHours, SetQuietHours, UpdateNotificationPreferences
+from notifications.preference.preference import NotificationPreference
+from notifications.preference.subscription import ResubscribeToType, UnsubscribeFromType
+
+
+def _create_preference(customer_id):
+    pref = NotificationPreference.create_default(customer_id=customer_id)
+    current_domain.repository_for(NotificationPreference).add(pref)
+    return str(pref.customer_id)
+
+
+def _channels(nids):
+    repo = current_domain.repository_for(Notification)
+    return sorted(repo.get(nid).channel for nid in nids)
+
+
+class TestPreferenceEntry:
+    def test_from_preference(self):
+        pref = NotificationPreference.create_default(customer_id="cust-entry")
+        pref.update_channels(sms=True)
+        pref.unsubscribe_from(NotificationType.CART_RECOVERY.value)
+        pref.set_quiet_hours("22:00", "07:00")
+
+        entry = PreferenceEntry.from_preference(pref)
+
+        assert entry.channels == EMAIL | SMS
+        assert entry.get_enabled_channels() == ["Email", "SMS"]
+        assert not entry.is_subscribed_to(NotificationType.CART_RECOVERY.value)
+        assert entry.is_subscribed_to(NotificationType.WELCOME.value)
+        assert entry.quiet_hours == ("22:00", "07:00")
+
+
+class TestPreferenceCache:
+    def test_second_lookup_is_served_from_memory(self):
+        cid = _create_preference("cust-cache-hit")
+        cache = PreferenceCache()
+
+        with patch.object(cache_module, "_load", wraps=cache_module._load) as load:
+            cache.lookup(cid)
+            cache.lookup(cid)
+
+        assert load.call_count == 1
+
+    def test_customer_without_preferences_is_cached_as_absent(self):
+        cache = PreferenceCache()
+
+        with patch.object(cache_module, "_load", wraps=cache_module._load) as load:
+            assert cache.lookup("cust-cache-none") is None
+            assert cache.lookup("cust-cache-none") is None
+
+        assert load.call_count == 1
+        assert "cust-cache-none" in cache
+
+    def test_opt_out_in_another_process_seen_after_sync(self):
+        cid = _create_preference("cust-cache-elsewhere")
+        now = {"t": 0.0}
+        cache = PreferenceCache(sync_interval=1, clock=lambda: now["t"])
+        assert cache.lookup(cid).is_subscribed_to(NotificationType.CART_RECOVERY.value)
+
+        # Unsubscribed through another worker: this cache sees no event, only the recorded change
+        repo = current_domain.repository_for(NotificationPreference)
+        pref = repo.query.filter(customer_id=cid).all().first
+        pref.unsubscribe_from(NotificationType.CART_RECOVERY.value)
+        repo.add(pref)
+        record_change(cid)
+
+        assert cache.lookup(cid).is_subscribed_to(NotificationType.CART_RECOVERY.value)  # before the next sync
+        now["t"] = 1
+        assert not cache.lookup(cid).is_subscribed_to(NotificationType.CART_RECOVERY.value)
+
+    def test_preferences_created_in_another_process_clear_the_absent_entry(self):
+        now = {"t": 0.0}
+        cache = PreferenceCache(sync_interval=1, clock=lambda: now["t"])
+        assert cache.lookup("cust-cache-created") is None
+
+        _create_preference("cust-cache-created")
+        record_change("cust-cache-created")
+
+        now["t"] = 1
+        assert cache.lookup("cust-cache-created") == PreferenceEntry(channels=EMAIL)
+
+    def test_sync_reads_changes_once_per_interval(self):
+        now = {"t": 0.0}
+        cache = PreferenceCache(sync_interval=1, clock=lambda: now["t"])
+        cache.put("cust-cache-sync", PreferenceEntry())
+
+        with patch.object(cache_module, "_changes_since", return_value=[]) as changes:
+            for _ in range(5):
+                cache.lookup("cust-cache-sync")
+            now["t"] = 1
+            cache.lookup("cust-cache-sync")
+
+        assert changes.call_count == 1
+
+    def test_changes_applied_here_keep_the_entry(self):
+        cid = _create_preference("cust-cache-local")
+        current_domain.process(UpdateNotificationPreferences(customer_id=cid, sms_enabled=True), asynchronous=False)
+        cache = get_preference_cache()
+        cache.sync_interval = 0
+
+        with patch.object(cache_module, "_load") as load:
+            assert cache.lookup(cid).channels == EMAIL | SMS
+
+        load.assert_not_called()
+
+    def test_updater_records_each_change(self):
+        cid = _create_preference("cust-cache-recorded")
+        current_domain.process(UpdateNotificationPreferences(customer_id=cid, sms_enabled=True), asynchronous=False)
+
+        changes = current_domain.view_for(PreferenceChange).query.filter(customer_id=cid).all().items
+        assert len(changes) == 2
+
+    def test_ttl_must_be_positive(self):
+        with pytest.raises(ValueError):
+            PreferenceCache(ttl=0)
+
+    def test_evicts_least_recently_used(self):
+        cache = PreferenceCache(max_entries=2)
+        cache.put("a", PreferenceEntry())
+        cache.put("b", PreferenceEntry())
+        cache.lookup("a")
+        cache.put("c", PreferenceEntry())
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_expired_entry_is_reloaded(self):
+        now = {"t": 0.0}
+        cache = PreferenceCache(ttl=10, clock=lambda: now["t"])
+        cache.put("cust-cache-ttl", PreferenceEntry(channels=PUSH))
+
+        now["t"] = 11
+        with patch.object(cache_module, "_load", return_value=None) as load:
+            assert cache.lookup("cust-cache-ttl") is None
+
+        load.assert_called_once_with("cust-cache-ttl")
+
+    def test_load_error_is_not_cached(self):
+        cache = PreferenceCache()
+
+        with patch.object(cache_module, "_load", side_effect=RuntimeError("DB failed")), pytest.raises(RuntimeError):
+            cache.lookup("cust-cache-err")
+
+        assert "cust-cache-err" not in cache
+
+
+class TestPreferenceCacheUpdater:
+    def test_preferences_created_populates_cache(self):
+        cid = _create_preference("cust-upd-created")
+
+        entry = get_preference_cache().get(cid)
+        assert entry == PreferenceEntry(channels=EMAIL)
+
+    def test_preferences_created_after_absent_lookup(self):
+        assert get_preference_cache().lookup("cust-upd-late") is None
+
+        _create_preference("cust-upd-late")
+
+        assert get_preference_cache().get("cust-upd-late") == PreferenceEntry(channels=EMAIL)
+
+    def test_channels_updated(self):
+        cid = _create_preference("cust-upd-channels")
+        current_domain.process(
+            UpdateNotificationPreferences(customer_id=cid, sms_enabled=True, push_enabled=True),
+            asynchronous=False,
+        )
+
+        assert get_preference_cache().get(cid).channels == EMAIL | SMS | PUSH
+
+    def test_quiet_hours_set_and_cleared(self):
+        cid = _create_preference("cust-upd-quiet")
+        current_domain.process(SetQuietHours(customer_id=cid, start="22:00", end="08:00"), asynchronous=False)
+        assert get_preference_cache().get(cid).quiet_hours == ("22:00", "08:00")
+
+        current_domain.process(ClearQuietHours(customer_id=cid), asynchronous=False)
+        assert get_preference_cache().get(cid).quiet_hours is None
+
+    def test_unsubscribe_and_resubscribe(self):
+        cid = _create_preference("cust-upd-subs")
+        cart_recovery = NotificationType.CART_RECOVERY.value
+
+        current_domain.process(
+            UnsubscribeFromType(customer_id=cid, notification_type=cart_recovery), asynchronous=False
+        )
+        assert not get_preference_cache().get(cid).is_subscribed_to(cart_recovery)
+
+        current_domain.process(ResubscribeToType(customer_id=cid, notification_type=cart_recovery), asynchronous=False)
+        assert get_preference_cache().get(cid).is_subscribed_to(cart_recovery)
+
+    def test_uncached_customer_is_left_to_load(self):
+        cid = _create_preference("cust-upd-evicted")
+        get_preference_cache().clear()
+
+        current_domain.process(UpdateNotificationPreferences(customer_id=cid, sms_enabled=True), asynchronous=False)
+
+        assert cid not in get_preference_cache()
+        assert get_preference_cache().lookup(cid).channels == EMAIL | SMS
+
+
+class TestFanOutUsesCache:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def test_no_preference_reads_after_updates(self):
+        cid = _create_preference("cust-fanout")
+        current_domain.process(UpdateNotificationPreferences(customer_id=cid, sms_enabled=True), asynchronous=False)
+
+        with patch.object(cache_module, "_load") as load:
+            nids = create_notifications_for_customer(
+                customer_id=cid,
+                notification_type=NotificationType.SHIPPING_UPDATE.value,
+                context={"order_id": "ord-1", "carrier": "UPS", "tracking_number": "1Z999"},
+            )
+
+        load.assert_not_called()
+        assert _channels(nids) == [NotificationChannel.EMAIL.value, NotificationChannel.SMS.value]
+
+    def test_unsubscribe_takes_effect_without_reload(self):
+        cid = _create_preference("cust-fanout-unsub")
+        current_domain.process(
+            UnsubscribeFromType(customer_id=cid, notification_type=NotificationType.CART_RECOVERY.value),
+            asynchronous=False,
+        )
+
+        with patch.object(cache_module, "_load") as load:
+            nids = create_notifications_for_customer(
+                customer_id=cid,
+                notification_type=NotificationType.CART_RECOVERY.value,
+                context={"item_count": 1},
+            )
+
+        load.assert_not_called()
+        assert nids == []
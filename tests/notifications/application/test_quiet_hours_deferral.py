@@ -0,0 +1,173 @@
+"""Application tests for quiet-hours deferral and ReleaseDeferredNotifications."""
+
+from datetime import UTC, datetime, timedelta
+
+from protean import current_domain
+
+from notifications.channel import get_channel, reset_channels
+from notifications.notification.deferral import (
+    DeferralSettings,
+    DeferredNotifications,
+    ReleaseDeferredNotifications,
+    bucket_of,
+    quiet_hours_end,
+    release_time,
+)
+from notifications.notification.helpers import create_notifications_for_customer
+from notifications.notification.notification import Notification, NotificationStatus, NotificationType
+from notifications.notification.scheduler import ProcessScheduledNotifications
+from notifications.preference.management import SetQuietHours
+from notifications.preference.preference import NotificationPreference
+
+NIGHT = datetime(2026, 3, 3, 23, 30, tzinfo=UTC)
+MORNING = datetime(2026, 3, 4, 8, 0)
+
+
+def _customer_with_quiet_hours(customer_id, start="22:00", end="08:00"):
+    pref = NotificationPreference.create_default(customer_id=customer_id)
+    current_domain.repository_for(NotificationPreference).add(pref)
+    current_domain.process(SetQuietHours(customer_id=customer_id, start=start, end=end), asynchronous=False)
+    return customer_id
+
+
+def _notify(customer_id, at=NIGHT):
+    return create_notifications_for_customer(
+        customer_id=customer_id,
+        notification_type=NotificationType.SHIPPING_UPDATE.value,
+        context={"order_id": "ord-1", "carrier": "UPS", "tracking_number": "1Z999"},
+        scheduled_for=at,
+    )
+
+
+def _release(as_of, limit=None):
+    return current_domain.process(ReleaseDeferredNotifications(as_of=as_of, limit=limit), asynchronous=False)
+
+
+def _status(nid):
+    return current_domain.repository_for(Notification).get(nid).status
+
+
+class TestQuietHoursWindow:
+    def test_window_crossing_midnight(self):
+        window = ("22:00", "08:00")
+        assert quiet_hours_end(window, datetime(2026, 3, 3, 23, 0)) == MORNING
+        assert quiet_hours_end(window, datetime(2026, 3, 4, 7, 59)) == MORNING
+        assert quiet_hours_end(window, datetime(2026, 3, 4, 8, 0)) is None
+        assert quiet_hours_end(window, datetime(2026, 3, 3, 12, 0)) is None
+
+    def test_same_day_window(self):
+        window = ("13:00", "14:30")
+        assert quiet_hours_end(window, datetime(2026, 3, 3, 13, 15, tzinfo=UTC)) == datetime(2026, 3, 3, 14, 30)
+        assert quiet_hours_end(window, datetime(2026, 3, 3, 14, 30)) is None
+
+    def test_release_is_spread_after_window_end(self):
+        settings = DeferralSettings(release_spread=600)
+        releases = {release_time(("22:00", "08:00"), f"cust-{n}", NIGHT, settings) for n in range(50)}
+
+        assert all(MORNING <= at < MORNING + timedelta(seconds=600) for at in releases)
+        assert len(releases) > 1
+
+    def test_release_is_stable_per_recipient(self):
+        settings = DeferralSettings()
+        first = release_time(("22:00", "08:00"), "cust-a", NIGHT, settings)
+        assert release_time(("22:00", "08:00"), "cust-a", NIGHT + timedelta(hours=1), settings) == first
+
+    def test_bucket_of(self):
+        assert bucket_of(datetime(2026, 3, 4, 8, 7, 42, 500), 300) == datetime(2026, 3, 4, 8, 5)
+
+
+class TestDeferral:
+    def setup_method(self):
+        reset_channels()
+
+    def teardown_method(self):
+        reset_channels()
+
+    def test_notification_in_quiet_hours_is_parked(self):
+        cid = _customer_with_quiet_hours("cust-defer-park")
+        [nid] = _notify(cid)
+
+        notification = current_domain.repository_for(Notification).get(nid)
+        entry = current_domain.repository_for(DeferredNotifications).get(nid)
+        assert notification.status == NotificationStatus.PENDING.value
+        assert MORNING <= entry.release_at < MORNING + timedelta(minutes=30)
+        assert entry.bucket == bucket_of(entry.release_at, 60)
+
+    def test_notification_sent_now_in_quiet_hours_is_not_dispatched(self):
+        now = datetime.now(UTC)
+        start, end = ((now + delta).strftime("%H:%M") for delta in (timedelta(hours=-1), timedelta(hours=1)))
+        cid = _customer_with_quiet_hours("cust-defer-now", start=start, end=end)
+
+        [nid] = create_notifications_for_customer(
+            customer_id=cid,
+            notification_type=NotificationType.WELCOME.value,
+            context={"name": "Al"},
+        )
+
+        assert _status(nid) == NotificationStatus.PENDING.value
+        assert get_channel("Email").sent_emails == []
+
+    def test_notification_outside_quiet_hours_is_not_parked(self):
+        cid = _customer_with_quiet_hours("cust-defer-day")
+        [nid] = _notify(cid, at=datetime(2026, 3, 4, 12, 0, tzinfo=UTC))
+
+        assert current_domain.view_for(DeferredNotifications).query.filter(notification_id=nid).all().items == []
+
+    def test_released_after_window(self):
+        cid = _customer_with_quiet_hours("cust-defer-release")
+        [nid] = _notify(cid)
+
+        assert _release(MORNING - timedelta(minutes=1)) == 0
+        assert _status(nid) == NotificationStatus.PENDING.value
+
+        assert _release(MORNING + timedelta(minutes=30)) == 1
+        assert _status(nid) == NotificationStatus.SENT.value
+        assert current_domain.view_for(DeferredNotifications).query.all().items == []
+
+    def test_not_released_before_its_time_within_the_due_bucket(self):
+        cid = _customer_with_quiet_hours("cust-defer-bucket")
+        [nid] = _notify(cid)
+        release_at = current_domain.repository_for(DeferredNotifications).get(nid).release_at
+
+        assert _release(bucket_of(release_at, 60)) == 0
+        assert _status(nid) == NotificationStatus.PENDING.value
+
+        assert _release(release_at) == 1
+        assert _status(nid) == NotificationStatus.SENT.value
+
+    def test_release_is_limited_per_run(self):
+        nids = [nid for n in range(3) for nid in _notify(_customer_with_quiet_hours(f"cust-defer-limit-{n}"))]
+
+        assert _release(MORNING + timedelta(hours=1), limit=2) == 2
+        assert sum(_status(nid) == NotificationStatus.SENT.value for nid in nids) == 2
+        assert _release(MORNING + timedelta(hours=1), limit=2) == 1
+
+    def test_releases_in_one_channel_batch(self):
+        for n in range(3):
+            _notify(_customer_with_quiet_hours(f"cust-defer-batch-{n}"))
+
+        _release(MORNING + timedelta(hours=1))
+
+        assert get_channel("Email").batch_sizes == [3]
+
+    def test_cancelled_notification_is_dropped(self):
+        cid = _customer_with_quiet_hours("cust-defer-cancel")
+        [nid] = _notify(cid)
+        repo = current_domain.repository_for(Notification)
+        notification = repo.get(nid)
+        notification.cancel("Customer request")
+        repo.add(notification)
+
+        assert _release(MORNING + timedelta(hours=1)) == 0
+        assert _status(nid) == NotificationStatus.CANCELLED.value
+
+    def test_scheduler_leaves_deferred_notifications_to_release(self):
+        cid = _customer_with_quiet_hours("cust-defer-sched")
+        [nid] = _notify(cid)
+
+        current_domain.process(
+            ProcessScheduledNotifications(as_of=MORNING + timedelta(hours=1)),
+            asynchronous=False,
+        )
+
+        assert _status(nid) == NotificationStatus.PENDING.value
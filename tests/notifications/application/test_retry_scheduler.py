@@ -0,0 +1,184 @@
+"""Application tests for automatic retries: backoff, claiming and circuit breaking."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from protean import current_domain
+
+from notifications.channel import get_channel, reset_channels
+from notifications.channel.circuit_breaker import CircuitBreaker, CircuitState
+from notifications.notification.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    NotificationType,
+)
+from notifications.notification.retry import RetryNotification
+from notifications.notification.retry_scheduler import (
+    RetryFailedNotifications,
+    RetrySettings,
+    ScheduledRetry,
+    backoff_delay,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+
+LATER = timedelta(hours=2)
+
+
+def _failed_notification(recipient_id, channel=NotificationChannel.EMAIL.value, max_retries=3):
+    n = Notification.create(
+        recipient_id=recipient_id,
+        notification_type=NotificationType.WELCOME.value,
+        channel=channel,
+        subject="Welcome",
+        body="Hello!",
+        scheduled_for=datetime.now(UTC) + timedelta(days=1),  # Keep the dispatcher out of the way
+        max_retries=max_retries,
+    )
+    n.mark_failed("Provider unavailable")
+    current_domain.repository_for(Notification).add(n)
+    return str(n.id)
+
+
+def _retry(as_of=None, limit=None):
+    as_of = as_of or datetime.now(UTC) + LATER
+    return current_domain.process(RetryFailedNotifications(as_of=as_of, limit=limit), asynchronous=False)
+
+
+def _notification(nid):
+    return current_domain.repository_for(Notification).get(nid)
+
+
+def _scheduled():
+    return current_domain.view_for(ScheduledRetry).query.all().items
+
+
+class TestBackoff:
+    def test_grows_exponentially_within_jitter_bounds(self):
+        settings = RetrySettings(base_delay=10, multiplier=2, max_delay=1000)
+        assert backoff_delay(1, settings, rand=lambda: 0.0) == 5
+        assert backoff_delay(1, settings, rand=lambda: 1.0) == 10
+        assert backoff_delay(3, settings, rand=lambda: 0.0) == 20
+        assert backoff_delay(3, settings, rand=lambda: 1.0) == 40
+
+    def test_capped_at_max_delay(self):
+        settings = RetrySettings(base_delay=10, multiplier=2, max_delay=60)
+        assert backoff_delay(10, settings, rand=lambda: 1.0) == 60
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=30, clock=lambda: 0.0)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.allowance(10) == 10
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allowance(10) == 0
+
+    def test_half_open_probe_closes_or_reopens(self):
+        now = {"t": 0.0}
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=30, probe_size=2, clock=lambda: now["t"])
+        breaker.record_failure()
+
+        now["t"] = 31
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allowance(10) == 2
+
+        breaker.record_failure()
+        assert breaker.allowance(10) == 0
+
+        now["t"] = 62
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+
+class TestScheduledRetryIndex:
+    def test_failure_schedules_a_retry_after_backoff(self):
+        before = datetime.now(UTC).replace(tzinfo=None)
+        nid = _failed_notification("cust-retry-index")
+
+        entry = current_domain.repository_for(ScheduledRetry).get(nid)
+        assert entry.retry_count == 1
+        assert before + timedelta(seconds=15) <= entry.due_at <= before + timedelta(seconds=31)
+
+    def test_exhausted_notification_is_not_scheduled(self):
+        _failed_notification("cust-retry-exhausted", max_retries=1)
+        assert _scheduled() == []
+
+    def test_manual_retry_removes_the_entry(self):
+        nid = _failed_notification("cust-retry-manual")
+        current_domain.process(RetryNotification(notification_id=nid), asynchronous=False)
+        assert _scheduled() == []
+
+
+class TestRetryFailedNotifications:
+    def setup_method(self):
+        reset_channels()
+        reset_circuit_breakers()
+
+    def teardown_method(self):
+        reset_channels()
+        reset_circuit_breakers()
+
+    def test_retries_due_notifications(self):
+        nid = _failed_notification("cust-retry-due")
+
+        assert _retry(as_of=datetime.now(UTC)) == 0
+        assert _notification(nid).status == NotificationStatus.FAILED.value
+
+        assert _retry() == 1
+        assert _notification(nid).status == NotificationStatus.SENT.value
+        assert get_channel(NotificationChannel.EMAIL.value).batch_sizes == [1]
+        assert _scheduled() == []
+
+    def test_failed_retry_is_rescheduled_with_longer_backoff(self):
+        nid = _failed_notification("cust-retry-again")
+        get_channel(NotificationChannel.EMAIL.value).configure(should_succeed=False)
+
+        _retry()
+
+        notification = _notification(nid)
+        assert notification.status == NotificationStatus.FAILED.value
+        assert notification.retry_count == 2
+        assert current_domain.repository_for(ScheduledRetry).get(nid).retry_count == 2
+
+    def test_claims_at_most_limit(self):
+        nids = [_failed_notification(f"cust-retry-limit-{n}") for n in range(3)]
+
+        assert _retry(limit=2) == 2
+        assert sum(_notification(nid).status == NotificationStatus.SENT.value for nid in nids) == 2
+        assert len(_scheduled()) == 1
+
+    def test_open_circuit_holds_retries(self):
+        nid = _failed_notification("cust-retry-open")
+        breaker = get_circuit_breaker(NotificationChannel.EMAIL.value)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        assert _retry() == 0
+        assert _notification(nid).status == NotificationStatus.FAILED.value
+        assert len(_scheduled()) == 1
+
+    def test_failing_provider_opens_circuit(self):
+        for n in range(6):
+            _failed_notification(f"cust-retry-outage-{n}")
+        get_channel(NotificationChannel.EMAIL.value).configure(should_succeed=False)
+
+        _retry()
+
+        assert get_circuit_breaker(NotificationChannel.EMAIL.value).state == CircuitState.OPEN
+        assert get_circuit_breaker(NotificationChannel.SMS.value).state == CircuitState.CLOSED
+
+    @pytest.mark.parametrize("channel", [NotificationChannel.SMS.value, NotificationChannel.PUSH.value])
+    def test_other_channels_unaffected_by_open_email_circuit(self, channel):
+        nid = _failed_notification("cust-retry-other", channel=channel)
+        breaker = get_circuit_breaker(NotificationChannel.EMAIL.value)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        assert _retry() == 1
+        assert _notification(nid).status == NotificationStatus.SENT.value
@@ -126,12 +126,12 @@ class TestProcessScheduledNotifications:
         """When the adapter raises an exception, notification is marked FAILED."""
         adapter = get_channel(NotificationChannel.EMAIL.value)
         # Configure to raise an exception by setting a custom side effect
-        original_send = adapter.send
+        original_send_batch = adapter.send_batch
 
-        def exploding_send(**kwargs):
+        def exploding_send_batch(messages):
             raise RuntimeError("Connection refused")
 
-        adapter.send = exploding_send
+        adapter.send_batch = exploding_send_batch
 
         past = datetime.now(UTC) - timedelta(hours=1)
         nid = _create_scheduled_notification(scheduled_for=past, recipient_id="cust-sched-exc")
@@ -146,4 +146,40 @@ class TestProcessScheduledNotifications:
         assert "Connection refused" in n.failure_reason
 
         # Restore
-        adapter.send = original_send
+        adapter.send_batch = original_send_batch
+
+    def test_due_notifications_sent_in_one_batch_per_channel_and_type(self):
+        past = datetime.now(UTC) - timedelta(hours=1)
+        for n in range(3):
+            _create_scheduled_notification(scheduled_for=past, recipient_id=f"cust-sched-batch-{n}")
+        _create_scheduled_notification(
+            scheduled_for=past,
+            recipient_id="cust-sched-batch-sms",
+            channel=NotificationChannel.SMS.value,
+        )
+
+        current_domain.process(
+            ProcessScheduledNotifications(as_of=datetime.now(UTC)),
+            asynchronous=False,
+        )
+
+        assert get_channel(NotificationChannel.EMAIL.value).batch_sizes == [3]
+        assert get_channel(NotificationChannel.SMS.value).batch_sizes == [1]
+
+    def test_per_message_status_mapped_back_from_batch(self):
+        get_channel(NotificationChannel.EMAIL.value).configure(rejected={"cust-sched-rejected"})
+
+        past = datetime.now(UTC) - timedelta(hours=1)
+        accepted = _create_scheduled_notification(scheduled_for=past, recipient_id="cust-sched-accepted")
+        rejected = _create_scheduled_notification(scheduled_for=past, recipient_id="cust-sched-rejected")
+
+        current_domain.process(
+            ProcessScheduledNotifications(as_of=datetime.now(UTC)),
+            asynchronous=False,
+        )
+
+        repo = current_domain.repository_for(Notification)
+        assert repo.get(accepted).status == NotificationStatus.SENT.value
+        failed = repo.get(rejected)
+        assert failed.status == NotificationStatus.FAILED.value
+        assert "Rejected recipient" in failed.failure_reason
@@ -16,3 +16,13 @@ def notifications_bed():
 def _ctx(notifications_bed):
     with notifications_bed.domain_context():
         yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_preference_cache():
+    """The preference cache outlives the per-test database reset; start each test empty."""
+    from notifications.preference.cache import reset_preference_cache
+
+    reset_preference_cache()
+    yield
+    reset_preference_cache()
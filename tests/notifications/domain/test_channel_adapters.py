@@ -1,5 +1,7 @@
 """Tests for channel adapters — fake adapters for testing."""
 
+from unittest.mock import patch
+
 import pytest
 
 from notifications.channel import get_channel, reset_channels
@@ -7,6 +9,7 @@ from notifications.channel.fake_email import FakeEmailAdapter
 from notifications.channel.fake_push import FakePushAdapter
 from notifications.channel.fake_slack import FakeSlackAdapter
 from notifications.channel.fake_sms import FakeSMSAdapter
+from notifications.channel.sms_port import SMSPort
 from notifications.notification.notification import NotificationChannel
 
 
@@ -32,12 +35,37 @@ class TestFakeEmailAdapter:
         assert result["error"] == "SMTP error"
         assert len(self.adapter.sent_emails) == 0
 
+    def test_send_sleeps_for_configured_latency(self):
+        self.adapter.configure(latency=0.05)
+        with patch("notifications.channel.fake_email.time.sleep") as sleep:
+            self.adapter.send(to="a@b.com", subject="Hi", body="Hello")
+        sleep.assert_called_once_with(0.05)
+
+    def test_send_batch_returns_result_per_message(self):
+        self.adapter.configure(rejected={"bad@b.com"})
+        results = self.adapter.send_batch(
+            [
+                {"to": "a@b.com", "subject": "Hi", "body": "Hello"},
+                {"to": "bad@b.com", "subject": "Hi", "body": "Hello"},
+            ]
+        )
+        assert [r["status"] for r in results] == ["sent", "failed"]
+        assert self.adapter.batch_sizes == [2]
+        assert [e["to"] for e in self.adapter.sent_emails] == ["a@b.com"]
+
+    def test_send_batch_sleeps_once_per_request(self):
+        self.adapter.configure(latency=0.05)
+        with patch("notifications.channel.fake_email.time.sleep") as sleep:
+            self.adapter.send_batch([{"to": f"{n}@b.com", "subject": "Hi", "body": "Hello"} for n in range(5)])
+        sleep.assert_called_once_with(0.05)
+
     def test_reset(self):
         self.adapter.send(to="a@b.com", subject="Hi", body="Hello")
-        self.adapter.configure(should_succeed=False)
+        self.adapter.configure(should_succeed=False, latency=0.05)
         self.adapter.reset()
         assert len(self.adapter.sent_emails) == 0
         assert self.adapter.should_succeed is True
+        assert self.adapter.latency == 0.0
 
 
 class TestFakeSMSAdapter:
@@ -112,6 +140,22 @@ class TestFakeSlackAdapter:
         assert len(self.adapter.sent_messages) == 0
 
 
+class TestPortDefaultSendBatch:
+    def test_default_send_batch_sends_one_at_a_time(self):
+        class OneByOneSMS(SMSPort):
+            def __init__(self):
+                self.sent = []
+
+            def send(self, to, body):
+                self.sent.append(to)
+                return {"message_id": to, "status": "sent"}
+
+        adapter = OneByOneSMS()
+        results = adapter.send_batch([{"to": "+1", "body": "a"}, {"to": "+2", "body": "b"}])
+        assert adapter.sent == ["+1", "+2"]
+        assert [r["message_id"] for r in results] == ["+1", "+2"]
+
+
 # ---------------------------------------------------------------
 # Channel registry
 # ---------------------------------------------------------------
@@ -188,6 +188,13 @@ class TestMarkSent:
         assert str(event.notification_id) == str(n.id)
         assert event.sent_at is not None
 
+    def test_sent_event_carries_type_and_channel(self):
+        n = _notification_at_state(NotificationStatus.PENDING)
+        n.mark_sent()
+        event = n._events[0]
+        assert event.notification_type == NotificationType.WELCOME.value
+        assert event.channel == NotificationChannel.EMAIL.value
+
 
 # ---------------------------------------------------------------
 # mark_delivered details
@@ -322,3 +329,23 @@ class TestRetry:
         n.retry()
         # retry doesn't change retry_count — mark_failed does
         assert n.retry_count == 1
+
+
+# ---------------------------------------------------------------
+# Status events carry the notification type
+# ---------------------------------------------------------------
+class TestStatusEventsCarryType:
+    @pytest.mark.parametrize(
+        ("state", "transition"),
+        [
+            (NotificationStatus.SENT, lambda n: n.mark_delivered()),
+            (NotificationStatus.PENDING, lambda n: n.mark_failed("Provider down")),
+            (NotificationStatus.SENT, lambda n: n.mark_bounced("Mailbox full")),
+            (NotificationStatus.PENDING, lambda n: n.cancel("Not needed")),
+            (NotificationStatus.FAILED, lambda n: n.retry()),
+        ],
+    )
+    def test_event_has_notification_type(self, state, transition):
+        n = _notification_at_state(state)
+        transition(n)
+        assert n._events[-1].notification_type == NotificationType.WELCOME.value
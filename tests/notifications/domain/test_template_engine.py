@@ -0,0 +1,53 @@
+"""Tests for the template engine — HTML output and digest summaries."""
+
+from notifications.templates.engine import NotificationTemplate, text_to_html
+from notifications.templates.shipping_update import ShippingUpdateTemplate
+
+
+class GreetingTemplate(NotificationTemplate):
+    notification_type = "Greeting"
+    default_channels = ["Email"]
+
+    @staticmethod
+    def render_text(context: dict) -> dict:
+        name = context.get("name", "there")
+        return {
+            "subject": f"Hello {name}",
+            "body": f"Hi {name},\n\nLine one\nLine two & more",
+        }
+
+
+class TestTextToHtml:
+    def test_paragraphs_and_line_breaks(self):
+        assert text_to_html("One\ntwo\n\nThree") == "<p>One<br>\ntwo</p>\n<p>Three</p>"
+
+    def test_escapes_markup(self):
+        assert text_to_html("a < b & c") == "<p>a &lt; b &amp; c</p>"
+
+
+class TestNotificationTemplate:
+    def test_renders_text(self):
+        result = GreetingTemplate.render({})
+        assert result["subject"] == "Hello there"
+        assert result["body"] == "Hi there,\n\nLine one\nLine two & more"
+
+    def test_renders_html_paragraphs_and_breaks(self):
+        result = GreetingTemplate.render({"name": "Al"})
+        assert result["html_body"] == "<p>Hi Al,</p>\n<p>Line one<br>\nLine two &amp; more</p>"
+
+    def test_html_escapes_context_values(self):
+        result = GreetingTemplate.render({"name": "<script>"})
+        assert "<script>" in result["body"]
+        assert "&lt;script&gt;" in result["html_body"]
+        assert "<script>" not in result["html_body"]
+
+    def test_render_text_leaves_out_html(self):
+        result = GreetingTemplate.render_text({"name": "Al"})
+        assert result == {"subject": "Hello Al", "body": "Hi Al,\n\nLine one\nLine two & more"}
+
+    def test_summarize_uses_template_summary(self):
+        summary = ShippingUpdateTemplate.summarize({"order_id": "ord-7", "tracking_number": "1Z1"})
+        assert summary == "Order #ord-7 shipped with the carrier, tracking number 1Z1"
+
+    def test_summarize_falls_back_to_first_body_line(self):
+        assert GreetingTemplate.summarize({"name": "Al"}) == "Hi Al,"
@@ -217,3 +217,30 @@ class TestMaintenanceAPI:
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "ok"
+
+    def test_release_deferred_with_body(self):
+        client = _get_test_client()
+        resp = client.post(
+            "/notifications/maintenance/release-deferred",
+            json={"as_of": "2026-03-03T12:00:00", "limit": 10},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["released_count"] == 0
+
+    def test_flush_digests_with_body(self):
+        client = _get_test_client()
+        resp = client.post(
+            "/notifications/maintenance/flush-digests",
+            json={"as_of": "2026-03-03T12:00:00", "limit": 10},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["digest_count"] == 0
+
+    def test_retry_failed_with_body(self):
+        client = _get_test_client()
+        resp = client.post(
+            "/notifications/maintenance/retry-failed",
+            json={"as_of": "2026-03-03T12:00:00", "limit": 10},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["sent_count"] == 0
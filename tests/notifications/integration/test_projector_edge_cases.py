@@ -5,6 +5,7 @@ UoW. These tests directly call projector methods to cover update/delete paths.
 """
 
 from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from protean import current_domain
@@ -327,6 +328,25 @@ class TestNotificationStatsProjector:
         stat = repo.get(stat_key)
         assert stat.notification_type == "Unknown"
 
+    def test_stat_uses_event_type_without_loading_notification(self):
+        """Sent events carrying the type are counted without reading the Notification."""
+        projector = NotificationStatsProjector()
+        now = datetime.now(UTC)
+        with patch.object(current_domain, "repository_for", wraps=current_domain.repository_for) as repository_for:
+            projector.on_notification_sent(
+                NotificationSent(
+                    notification_id="unstored-stat-id",
+                    recipient_id="x",
+                    channel=NotificationChannel.SMS.value,
+                    notification_type=NotificationType.SHIPPING_UPDATE.value,
+                    sent_at=now,
+                )
+            )
+
+        assert Notification not in [call.args[0] for call in repository_for.call_args_list]
+        stat_key = f"{now:%Y-%m-%d}:{NotificationType.SHIPPING_UPDATE.value}:{NotificationChannel.SMS.value}"
+        assert current_domain.repository_for(NotificationStats).get(stat_key).count == 1
+
 
 class TestFailedNotificationsProjector:
     def setup_method(self):
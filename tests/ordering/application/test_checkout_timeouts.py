@@ -0,0 +1,123 @@
+"""Application tests for checkout timeouts — ExpireStalledCheckouts and saga deadlines.
+
+Covers:
+- Confirming an order schedules a deadline for the awaiting_reservation state
+- Due deadlines cancel the order and close the saga
+- Deadlines not yet due are left alone
+- Orders already paid are not cancelled, and their deadline is dropped
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from protean import current_domain
+from protean.exceptions import ObjectNotFoundError
+
+from ordering.checkout.correlation import is_checkout_live
+from ordering.checkout.saga import STATE_DEADLINES
+from ordering.checkout.timeouts import CheckoutDeadline, ExpireStalledCheckouts, due_deadlines, schedule_deadline
+from ordering.order.confirmation import ConfirmOrder
+from ordering.order.creation import CreateOrder
+from ordering.order.order import Order, OrderStatus
+from ordering.order.payment import RecordPaymentPending, RecordPaymentSuccess
+
+_ADDRESS = {"street": "1 St", "city": "C", "state": "S", "postal_code": "00000", "country": "US"}
+
+
+def _confirmed_order():
+    order_id = current_domain.process(
+        CreateOrder(
+            customer_id="cust-timeout",
+            items=[
+                {
+                    "product_id": "p1",
+                    "variant_id": "v1",
+                    "sku": "S1",
+                    "title": "Item",
+                    "quantity": 1,
+                    "unit_price": 100.0,
+                }
+            ],
+            shipping_address=_ADDRESS,
+            billing_address=_ADDRESS,
+            subtotal=100.0,
+            grand_total=110.0,
+        ),
+        asynchronous=False,
+    )
+    current_domain.process(ConfirmOrder(order_id=order_id), asynchronous=False)
+    return order_id
+
+
+def _expire(after: timedelta):
+    return current_domain.process(
+        ExpireStalledCheckouts(as_of=datetime.now(UTC) + after),
+        asynchronous=False,
+    )
+
+
+def _has_deadline(order_id) -> bool:
+    try:
+        current_domain.repository_for(CheckoutDeadline).get(order_id)
+    except ObjectNotFoundError:
+        return False
+    return True
+
+
+class TestDeadlineScheduling:
+    def test_confirmed_order_gets_reservation_deadline(self):
+        order_id = _confirmed_order()
+
+        deadline = current_domain.repository_for(CheckoutDeadline).get(order_id)
+        assert deadline.status == "awaiting_reservation"
+        assert is_checkout_live(order_id)
+
+    def test_clearing_removes_deadline(self):
+        schedule_deadline("ord-clear", "awaiting_payment", timedelta(minutes=5))
+        schedule_deadline("ord-clear", "completed", None)
+        assert not _has_deadline("ord-clear")
+
+    def test_due_deadlines_ordered_and_limited(self):
+        schedule_deadline("ord-late", "awaiting_payment", timedelta(minutes=30))
+        schedule_deadline("ord-early", "awaiting_payment", timedelta(minutes=10))
+        schedule_deadline("ord-future", "retrying", timedelta(hours=5))
+
+        due = due_deadlines(datetime.now(UTC) + timedelta(hours=1), limit=10)
+        assert [str(d.order_id) for d in due] == ["ord-early", "ord-late"]
+        assert len(due_deadlines(datetime.now(UTC) + timedelta(hours=1), limit=1)) == 1
+
+
+class TestExpireStalledCheckouts:
+    def test_cancels_stalled_checkout(self):
+        order_id = _confirmed_order()
+
+        expired = _expire(STATE_DEADLINES["awaiting_reservation"] + timedelta(minutes=1))
+
+        assert expired == 1
+        order = current_domain.repository_for(Order).get(order_id)
+        assert order.status == OrderStatus.CANCELLED.value
+        assert "awaiting_reservation" in order.cancellation_reason
+        assert not _has_deadline(order_id)
+        assert not is_checkout_live(order_id)
+
+    def test_ignores_deadlines_not_yet_due(self):
+        order_id = _confirmed_order()
+
+        assert _expire(timedelta(0)) == 0
+        order = current_domain.repository_for(Order).get(order_id)
+        assert order.status == OrderStatus.CONFIRMED.value
+
+    def test_paid_order_is_not_cancelled(self):
+        order_id = _confirmed_order()
+        current_domain.process(
+            RecordPaymentPending(order_id=order_id, payment_id="pay-001", payment_method="card"),
+            asynchronous=False,
+        )
+        current_domain.process(
+            RecordPaymentSuccess(order_id=order_id, payment_id="pay-001", amount=110.0, payment_method="card"),
+            asynchronous=False,
+        )
+
+        assert _expire(timedelta(hours=2)) == 0
+        order = current_domain.repository_for(Order).get(order_id)
+        assert order.status == OrderStatus.PAID.value
+        assert not _has_deadline(order_id)
@@ -0,0 +1,167 @@
+"""Application tests for key-partitioned consumption in the engine runner.
+
+Exercises the partitioning helpers and PartitionedStreamSubscription's batch
+processing with the broker and engine calls stubbed, verifying that messages
+of one stream stay in order on one lane while every message is still acked
+(or retried) in original batch order.
+"""
+
+import asyncio
+import threading
+import time
+
+from protean import current_domain
+from protean.utils.eventing import Message, MessageHeaders, Metadata
+
+from shared import engine as engine_module
+from shared.engine import PartitionedEngine, PartitionedStreamSubscription, concurrency_for, partition, partition_key
+
+
+def _message(stream: str, seq: int) -> Message:
+    return Message(
+        data={"seq": seq},
+        metadata=Metadata(headers=MessageHeaders(id=f"{stream}/{seq}", type="Ordering.OrderCreated.v1", stream=stream)),
+    )
+
+
+class _StubEngine:
+    def __init__(self, fail_ids=(), delay=0.0):
+        self.fail_ids = set(fail_ids)
+        self.delay = delay
+        self.handled = []
+        self.threads = set()
+        self.domain = current_domain
+
+    async def handle_message(self, handler, message, worker_id=None):
+        time.sleep(self.delay)
+        self.threads.add(threading.get_ident())
+        self.handled.append(message.metadata.headers.id)
+        return message.metadata.headers.id not in self.fail_ids
+
+
+def _subscription(engine, workers):
+    """Build a PartitionedStreamSubscription with broker interactions stubbed."""
+    subscription = object.__new__(PartitionedStreamSubscription)
+    subscription.engine = engine
+    subscription.handler = object
+    subscription.subscriber_class_name = "StubProjector"
+    subscription.subscription_id = "stub-1"
+    subscription._default_stream = "ordering::order"
+    subscription.workers = workers
+    subscription.acked = []
+    subscription.failed = []
+
+    async def _deserialize(identifier, payload, stream=None):
+        return payload["message"]
+
+    async def _ack(identifier, message=None, stream=None):
+        subscription.acked.append(identifier)
+        return True
+
+    async def _fail(identifier, payload, stream=None):
+        subscription.failed.append(identifier)
+
+    subscription._deserialize_message = _deserialize
+    subscription._acknowledge_message = _ack
+    subscription.handle_failed_message = _fail
+    subscription._record_handler_outcome = lambda is_successful: None
+    return subscription
+
+
+def _batch(messages):
+    return [(m.metadata.headers.id, {"message": m}) for m in messages]
+
+
+class TestPartitioningHelpers:
+    def test_partition_key_is_stream_id(self):
+        assert partition_key(_message("ordering::order-abc", 1)) == "ordering::order-abc"
+
+    def test_partition_keeps_each_key_in_one_lane_in_order(self):
+        items = [("a", 1), ("b", 1), ("a", 2), ("c", 1), ("a", 3), ("b", 2)]
+        lanes = partition(items, 4, key=lambda item: item[0])
+
+        for key in ("a", "b", "c"):
+            holding = [lane for lane in lanes if any(item[0] == key for item in lane)]
+            assert len(holding) == 1
+            assert [seq for k, seq in holding[0] if k == key] == sorted(seq for k, seq in items if k == key)
+
+    def test_partition_drops_empty_lanes(self):
+        lanes = partition([("a", 1)], 8, key=lambda item: item[0])
+        assert lanes == [[("a", 1)]]
+
+    def test_concurrency_defaults_to_sequential(self):
+        assert concurrency_for(current_domain, "NoSuchHandler") == 1
+
+    def test_concurrency_read_from_domain_config(self):
+        assert concurrency_for(current_domain, "OrderDetailProjector") > 1
+        assert concurrency_for(current_domain, "DailyOrderStatsProjector") == 1
+
+
+class TestPartitionedStreamSubscription:
+    def test_processes_lanes_on_worker_threads(self):
+        engine = _StubEngine(delay=0.01)
+        subscription = _subscription(engine, workers=4)
+        messages = [_message(f"ordering::order-{n}", 1) for n in range(8)]
+
+        count = asyncio.run(subscription.process_batch(_batch(messages)))
+
+        assert count == 8
+        assert sorted(engine.handled) == sorted(m.metadata.headers.id for m in messages)
+        assert len(engine.threads) > 1
+
+    def test_preserves_per_stream_order(self):
+        engine = _StubEngine()
+        subscription = _subscription(engine, workers=4)
+        messages = [_message(f"ordering::order-{n % 3}", n) for n in range(12)]
+
+        asyncio.run(subscription.process_batch(_batch(messages)))
+
+        for n in range(3):
+            stream = f"ordering::order-{n}"
+            handled = [mid for mid in engine.handled if mid.startswith(f"{stream}/")]
+            assert handled == [m.metadata.headers.id for m in messages if m.metadata.headers.stream == stream]
+
+    def test_acks_in_batch_order_and_retries_failures(self):
+        messages = [_message(f"ordering::order-{n}", 1) for n in range(5)]
+        failing = messages[2].metadata.headers.id
+        subscription = _subscription(_StubEngine(fail_ids={failing}), workers=3)
+
+        count = asyncio.run(subscription.process_batch(_batch(messages)))
+
+        assert count == 4
+        assert subscription.acked == [m.metadata.headers.id for m in messages if m.metadata.headers.id != failing]
+        assert subscription.failed == [failing]
+
+    def test_records_subscription_metrics_per_message(self, monkeypatch):
+        recorded = {"durations": 0, "statuses": []}
+
+        class _Metrics:
+            class subscription_processing_duration:
+                @staticmethod
+                def record(elapsed, attrs):
+                    recorded["durations"] += 1
+
+            class subscription_messages_processed:
+                @staticmethod
+                def add(count, attrs):
+                    recorded["statuses"].append(attrs["status"])
+
+        monkeypatch.setattr(engine_module, "get_domain_metrics", lambda domain: _Metrics)
+        messages = [_message(f"ordering::order-{n}", 1) for n in range(4)]
+        failing = messages[1].metadata.headers.id
+        subscription = _subscription(_StubEngine(fail_ids={failing}), workers=2)
+
+        asyncio.run(subscription.process_batch(_batch(messages)))
+
+        assert recorded["durations"] == 4
+        assert recorded["statuses"] == ["ok", "error", "ok", "ok"]
+
+
+class TestPartitionedEngine:
+    def test_builds_partitioned_subscriptions_for_listed_handlers(self):
+        engine = PartitionedEngine(current_domain, test_mode=True)
+        subscriptions = {sub.subscriber_class_name: sub for sub in engine._subscriptions.values()}
+
+        assert type(subscriptions["OrderDetailProjector"]) is PartitionedStreamSubscription
+        assert subscriptions["OrderDetailProjector"].workers == 4
+        assert type(subscriptions["DailyOrderStatsProjector"]) is not PartitionedStreamSubscription
@@ -8,10 +8,21 @@ the saga's decision logic, not the downstream command handlers.
 from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
+from protean import current_domain
+from protean.utils.eventing import Message, MessageHeaders, Metadata
+
+from ordering.checkout.correlation import (
+    CheckoutSagaIndex,
+    checkout_status,
+    is_checkout_live,
+    record_checkout_status,
+)
 from ordering.checkout.saga import OrderCheckoutSaga
-from ordering.order.events import OrderConfirmed
+from ordering.domain import ordering
+from ordering.order.events import OrderCancelled, OrderConfirmed
 from shared.events.inventory import ReservationReleased, StockReserved
 from shared.events.payments import PaymentFailed, PaymentSucceeded
+from shared.process_managers import command_dispatch_for
 
 
 class TestOnOrderConfirmed:
@@ -136,3 +147,172 @@ class TestOnReservationReleased:
         assert saga.status == "failed"
         assert "timeout" in saga.failure_reason
         mock_domain.process.assert_called_once()
+
+
+class TestOnOrderCancelled:
+    def test_closes_saga_as_failed(self):
+        saga = OrderCheckoutSaga()
+        saga.order_id = "ord-001"
+        saga.status = "awaiting_reservation"
+        event = OrderCancelled(
+            order_id="ord-001",
+            reason="Checkout timed out in awaiting_reservation",
+            cancelled_by="System",
+            cancelled_at=datetime.now(UTC),
+        )
+        saga.on_order_cancelled(event)
+        assert saga.status == "failed"
+        assert "timed out" in saga.failure_reason
+        assert not is_checkout_live("ord-001")
+
+    def test_completed_saga_unchanged(self):
+        saga = OrderCheckoutSaga()
+        saga.order_id = "ord-001"
+        saga.status = "completed"
+        event = OrderCancelled(
+            order_id="ord-001",
+            reason="Customer request",
+            cancelled_by="Customer",
+            cancelled_at=datetime.now(UTC),
+        )
+        saga.on_order_cancelled(event)
+        assert saga.status == "completed"
+
+
+def _stock_reserved(order_id: str) -> StockReserved:
+    return StockReserved(
+        inventory_item_id="inv-001",
+        reservation_id="res-001",
+        order_id=order_id,
+        quantity=2,
+        previous_available=10,
+        new_available=8,
+        reserved_at=datetime.now(UTC),
+        expires_at=datetime.now(UTC),
+    )
+
+
+class TestCorrelationIndex:
+    def test_transitions_are_recorded_in_index(self):
+        saga = OrderCheckoutSaga()
+        saga.on_order_confirmed(OrderConfirmed(order_id="ord-idx-1", confirmed_at=datetime.now(UTC)))
+
+        entry = current_domain.repository_for(CheckoutSagaIndex).get("ord-idx-1")
+        assert entry.status == "awaiting_reservation"
+        assert is_checkout_live("ord-idx-1")
+
+    def test_terminal_status_is_not_live(self):
+        record_checkout_status("ord-idx-2", "completed")
+        assert not is_checkout_live("ord-idx-2")
+
+    def test_unknown_order_is_not_live(self):
+        assert not is_checkout_live("ord-unknown")
+
+
+class TestPrefilter:
+    def test_unhandled_type_dropped_before_deserialization(self):
+        message = Message(
+            data={"inventory_item_id": "inv-001", "quantity": 5},
+            metadata=Metadata(headers=MessageHeaders(id="m-1", type="Inventory.StockReceived.v1")),
+        )
+        with patch.object(Message, "to_domain_object") as deserialize:
+            assert OrderCheckoutSaga._handle(message) is None
+        deserialize.assert_not_called()
+
+    def test_event_without_index_entry_falls_back_to_stream_lookup(self):
+        with patch.object(OrderCheckoutSaga, "_load_or_create", return_value=None) as load:
+            assert OrderCheckoutSaga._handle(_stock_reserved("ord-no-index")) is None
+        load.assert_called_once()
+
+    def test_saga_started_before_index_still_advances(self):
+        OrderCheckoutSaga._handle(OrderConfirmed(order_id="ord-pre-index", confirmed_at=datetime.now(UTC)))
+        repo = current_domain.repository_for(CheckoutSagaIndex)
+        repo.query.filter(order_id="ord-pre-index").delete()  # as if started before the index was deployed
+        assert checkout_status("ord-pre-index") is None
+
+        with patch("ordering.checkout.saga.dispatch_command"):
+            OrderCheckoutSaga._handle(_stock_reserved("ord-pre-index"))
+
+        assert repo.get("ord-pre-index").status == "awaiting_payment"
+
+    def test_event_for_finished_saga_skips_state_load(self):
+        record_checkout_status("ord-done", "failed")
+        with patch.object(OrderCheckoutSaga, "_load_or_create") as load:
+            OrderCheckoutSaga._handle(_stock_reserved("ord-done"))
+        load.assert_not_called()
+
+    def test_start_event_and_live_saga_are_dispatched(self):
+        OrderCheckoutSaga._handle(OrderConfirmed(order_id="ord-live", confirmed_at=datetime.now(UTC)))
+        assert is_checkout_live("ord-live")
+
+        with patch.object(OrderCheckoutSaga, "_load_or_create", return_value=None) as load:
+            OrderCheckoutSaga._handle(_stock_reserved("ord-live"))
+        load.assert_called_once()
+
+
+class TestCommandDispatch:
+    def test_dispatch_mode_defaults_to_sync(self):
+        assert command_dispatch_for(current_domain, "OrderCheckoutSaga") == "sync"
+
+    def test_per_process_manager_override(self):
+        domain = MagicMock()
+        domain.config = {
+            "custom": {
+                "process_managers": {
+                    "command_dispatch": "async",
+                    "OrderCheckoutSaga": {"command_dispatch": "sync"},
+                }
+            }
+        }
+        assert command_dispatch_for(domain, "OrderCheckoutSaga") == "sync"
+        assert command_dispatch_for(domain, "OtherSaga") == "async"
+
+    @patch("ordering.checkout.saga.current_domain")
+    @patch.dict(ordering.config["custom"], {"process_managers": {"command_dispatch": "async"}})
+    def test_async_dispatch_queues_command_with_idempotency_key(self, mock_domain):
+        mock_domain.process = MagicMock()
+        saga = OrderCheckoutSaga()
+        saga.order_id = "ord-001"
+        saga.status = "awaiting_reservation"
+
+        saga.on_stock_reserved(_stock_reserved("ord-001"))
+
+        _, kwargs = mock_domain.process.call_args
+        assert kwargs["asynchronous"] is True
+        assert kwargs["idempotency_key"] == "checkout:ord-001:payment-pending"
+
+    @patch("ordering.checkout.saga.current_domain")
+    def test_sync_dispatch_processes_inline(self, mock_domain):
+        mock_domain.process = MagicMock()
+        saga = OrderCheckoutSaga()
+        saga.order_id = "ord-001"
+        saga.status = "awaiting_reservation"
+
+        saga.on_stock_reserved(_stock_reserved("ord-001"))
+
+        _, kwargs = mock_domain.process.call_args
+        assert kwargs["asynchronous"] is False
+
+    @patch("ordering.checkout.saga.current_domain")
+    @patch.dict(ordering.config["custom"], {"process_managers": {"command_dispatch": "async"}})
+    def test_cancel_order_runs_inline_even_in_async_mode(self, mock_domain):
+        mock_domain.process = MagicMock()
+        saga = OrderCheckoutSaga()
+        saga.order_id = "ord-001"
+        saga.status = "awaiting_payment"
+
+        saga.on_reservation_released(
+            ReservationReleased(
+                inventory_item_id="inv-001",
+                reservation_id="res-001",
+                order_id="ord-001",
+                quantity=2,
+                reason="timeout",
+                previous_available=8,
+                new_available=10,
+                released_at=datetime.now(UTC),
+            )
+        )
+
+        _, kwargs = mock_domain.process.call_args
+        assert kwargs["asynchronous"] is False
@@ -417,3 +417,8 @@ class TestMaintenanceEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "abandoned_count" in data
+
+    def test_expire_stalled_checkouts(self, maint_client):
+        response = maint_client.post("/carts/maintenance/expire-stalled-checkouts", json={"limit": 50})
+        assert response.status_code == 200
+        assert response.json() == {"expired_count": 0}
@@ -0,0 +1,193 @@
+"""Tests for the pooled async HTTP gateway client against the fake HTTP gateway."""
+
+import asyncio
+import hashlib
+import hmac
+import time
+
+import httpx
+
+from payments.gateway import get_async_gateway, reset_async_gateway
+from payments.gateway.fake_http_gateway import FakeGatewayApp
+from payments.gateway.http_adapter import HTTPGateway
+from payments.gateway.port import ChargeResult
+
+
+def _gateway(app, **overrides):
+    options = {"base_url": "http://fake-gateway", "transport": httpx.ASGITransport(app=app)}
+    options.update(overrides)
+    return HTTPGateway(**options)
+
+
+def _charge(gateway, key="idem-1", amount=59.99):
+    return gateway.create_charge(
+        amount=amount,
+        currency="USD",
+        payment_method_type="credit_card",
+        last4="4242",
+        idempotency_key=key,
+    )
+
+
+def _run(coroutine_fn):
+    return asyncio.run(coroutine_fn())
+
+
+class TestCharges:
+    def test_successful_charge(self):
+        app = FakeGatewayApp()
+        gateway = _gateway(app)
+
+        async def scenario():
+            try:
+                return await _charge(gateway)
+            finally:
+                await gateway.aclose()
+
+        result = _run(scenario)
+        assert isinstance(result, ChargeResult)
+        assert result.success is True
+        assert result.gateway_transaction_id.startswith("fake_txn_")
+        assert app.requests[0]["idempotency_key"] == "idem-1"
+
+    def test_declined_charge(self):
+        app = FakeGatewayApp()
+        app.configure(should_succeed=False, failure_reason="Insufficient funds")
+        gateway = _gateway(app)
+
+        result = _run(lambda: _charge(gateway))
+        assert result.success is False
+        assert result.gateway_status == "failed"
+        assert result.failure_reason == "Insufficient funds"
+
+    def test_server_error_fails_the_charge(self):
+        app = FakeGatewayApp()
+        app.configure(error_status=503)
+        gateway = _gateway(app)
+
+        result = _run(lambda: _charge(gateway))
+        assert result.success is False
+        assert result.gateway_status == "error"
+
+    def test_refund(self):
+        gateway = _gateway(FakeGatewayApp())
+
+        result = _run(lambda: gateway.create_refund("fake_txn_1", 10.0, "Damaged"))
+        assert result.success is True
+        assert result.gateway_refund_id.startswith("fake_ref_")
+
+
+class TestTimeoutsAndConcurrency:
+    def test_slow_gateway_times_out(self):
+        gateway = _gateway(FakeGatewayApp(latency=0.5), timeout=0.05)
+
+        result = _run(lambda: _charge(gateway))
+        assert result.success is False
+        assert result.gateway_status == "timeout"
+
+    def test_deadline_includes_waiting_for_a_slot(self):
+        gateway = _gateway(FakeGatewayApp(latency=0.1), timeout=0.15, max_concurrency=1)
+
+        async def scenario():
+            return await asyncio.gather(*(_charge(gateway, key=f"idem-slot-{n}") for n in range(3)))
+
+        statuses = [result.gateway_status for result in _run(scenario)]
+        assert statuses.count("succeeded") == 1
+        assert statuses.count("timeout") == 2
+
+    def test_concurrency_is_bounded(self):
+        app = FakeGatewayApp(latency=0.05)
+        gateway = _gateway(app, max_concurrency=2)
+
+        async def scenario():
+            start = time.perf_counter()
+            await asyncio.gather(*(_charge(gateway, key=f"idem-bound-{n}") for n in range(4)))
+            return time.perf_counter() - start
+
+        elapsed = _run(scenario)
+        assert len(app.requests) == 4
+        assert elapsed >= 0.1  # Two waves of two
+
+    def test_client_is_usable_across_event_loops(self):
+        gateway = _gateway(FakeGatewayApp())
+
+        assert _run(lambda: _charge(gateway, key="idem-loop-1")).success
+        assert _run(lambda: _charge(gateway, key="idem-loop-2")).success
+
+
+class TestInFlightDeduplication:
+    def test_concurrent_retries_share_one_call(self):
+        app = FakeGatewayApp(latency=0.05)
+        gateway = _gateway(app)
+
+        async def scenario():
+            return await asyncio.gather(*(_charge(gateway, key="idem-dup") for _ in range(5)))
+
+        results = _run(scenario)
+        assert len(app.requests) == 1
+        assert len({result.gateway_transaction_id for result in results}) == 1
+        assert gateway.deduplicated == 4
+
+    def test_distinct_keys_are_not_merged(self):
+        app = FakeGatewayApp(latency=0.01)
+        gateway = _gateway(app)
+
+        async def scenario():
+            return await asyncio.gather(_charge(gateway, key="idem-a"), _charge(gateway, key="idem-b"))
+
+        _run(scenario)
+        assert len(app.requests) == 2
+
+    def test_later_retry_is_replayed_by_the_gateway(self):
+        app = FakeGatewayApp()
+        gateway = _gateway(app)
+
+        first = _run(lambda: _charge(gateway, key="idem-replay"))
+        second = _run(lambda: _charge(gateway, key="idem-replay"))
+        assert len(app.requests) == 2
+        assert first.gateway_transaction_id == second.gateway_transaction_id
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        app = FakeGatewayApp(latency=0.05)
+        gateway = _gateway(app)
+
+        async def scenario():
+            impatient = asyncio.ensure_future(_charge(gateway, key="idem-cancel"))
+            patient = asyncio.ensure_future(_charge(gateway, key="idem-cancel"))
+            await asyncio.sleep(0.01)
+            impatient.cancel()
+            return await patient
+
+        assert _run(scenario).success is True
+
+
+class TestWebhookSignature:
+    def test_hmac_signature(self):
+        gateway = _gateway(FakeGatewayApp(), webhook_secret="whsec")
+        payload = '{"payment_id": "p-1"}'
+        signature = hmac.new(b"whsec", payload.encode(), hashlib.sha256).hexdigest()
+
+        assert gateway.verify_webhook_signature(payload, signature)
+        assert not gateway.verify_webhook_signature(payload, "bad")
+
+
+class TestAsyncGatewayFactory:
+    def teardown_method(self):
+        reset_async_gateway()
+
+    def test_none_without_base_url(self):
+        reset_async_gateway()
+        assert get_async_gateway() is None
+
+    def test_built_from_config(self, monkeypatch):
+        from payments.domain import payments
+
+        reset_async_gateway()
+        custom = {**payments.config["custom"], "gateway": {"base_url": "http://gateway.test", "max_concurrency": 4}}
+        monkeypatch.setitem(payments.config, "custom", custom)
+        gateway = get_async_gateway()
+
+        assert isinstance(gateway, HTTPGateway)
+        assert gateway.base_url == "http://gateway.test"
+        assert gateway.max_concurrency == 4
+        assert gateway is get_async_gateway()
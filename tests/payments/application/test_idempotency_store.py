@@ -0,0 +1,210 @@
+"""Application tests for the payment idempotency store."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from protean import current_domain
+from protean.core.event_sourced_repository import BaseEventSourcedRepository
+
+from payments.payment.idempotency import (
+    INITIATE,
+    IdempotencyRecord,
+    IdempotencySettings,
+    PurgeExpiredIdempotencyKeys,
+    claim,
+    initiate_key,
+    recall,
+    release,
+    remember,
+)
+from payments.payment.initiation import InitiatePayment
+from payments.payment.payment import Payment, PaymentStatus
+from payments.payment.refund import ProcessRefundWebhook, RequestRefund
+from payments.payment.retry import RetryPayment
+from payments.payment.webhook import ProcessPaymentWebhook
+
+
+def _initiate(idempotency_key="idem-store-001", amount=59.99, customer_id="cust-001"):
+    return current_domain.process(
+        InitiatePayment(
+            order_id="ord-001",
+            customer_id=customer_id,
+            amount=amount,
+            currency="USD",
+            payment_method_type="credit_card",
+            last4="4242",
+            idempotency_key=idempotency_key,
+        ),
+        asynchronous=False,
+    )
+
+
+def _webhook(payment_id, gateway_status="succeeded", **kwargs):
+    current_domain.process(
+        ProcessPaymentWebhook(payment_id=payment_id, gateway_status=gateway_status, **kwargs),
+        asynchronous=False,
+    )
+
+
+class TestIdempotencySettings:
+    def test_defaults(self):
+        settings = IdempotencySettings.from_config({})
+        assert settings.ttl == 86400
+        assert settings.purge_batch_size == 1000
+
+    def test_overrides(self):
+        settings = IdempotencySettings.from_config({"ttl": 60, "purge_batch_size": 0})
+        assert settings.ttl == 60
+        assert settings.purge_batch_size == 1
+
+
+class TestRecall:
+    def test_unknown_key_is_not_recalled(self):
+        assert recall(INITIATE, "never-seen") is None
+
+    def test_remembered_key_is_recalled(self):
+        remember(INITIATE, "k-1", "pay-1")
+        assert recall(INITIATE, "k-1") == "pay-1"
+
+    def test_scopes_are_separate(self):
+        remember(INITIATE, "k-2", "pay-2")
+        assert recall("webhook", "k-2") is None
+
+    def test_expired_key_is_not_recalled(self):
+        now = datetime.now(UTC)
+        remember(INITIATE, "k-3", "pay-3", now=now - timedelta(days=2))
+        assert recall(INITIATE, "k-3", now=now) is None
+
+
+class TestClaim:
+    def test_first_claim_wins(self):
+        assert claim(INITIATE, "c-1", "pay-1") is None
+        assert recall(INITIATE, "c-1") == "pay-1"
+
+    def test_later_claim_gets_the_earlier_result(self):
+        claim(INITIATE, "c-2", "pay-2")
+        assert claim(INITIATE, "c-2", "pay-other") == "pay-2"
+        assert recall(INITIATE, "c-2") == "pay-2"
+
+    def test_released_key_can_be_claimed_again(self):
+        claim(INITIATE, "c-3", "pay-3")
+        release(INITIATE, "c-3")
+        assert claim(INITIATE, "c-3", "pay-3b") is None
+        assert recall(INITIATE, "c-3") == "pay-3b"
+
+    def test_expired_claim_is_taken_over(self):
+        now = datetime.now(UTC)
+        claim(INITIATE, "c-4", "pay-4", now=now - timedelta(days=2))
+        assert claim(INITIATE, "c-4", "pay-4b", now=now) is None
+        assert recall(INITIATE, "c-4", now=now) == "pay-4b"
+
+    def test_remembered_key_cannot_be_overwritten(self):
+        remember(INITIATE, "c-5", "pay-5")
+        assert claim(INITIATE, "c-5", "pay-5b") == "pay-5"
+
+
+class TestInitiatePaymentDedup:
+    def test_repeated_key_returns_original_payment(self):
+        first = _initiate("idem-dup-001")
+        second = _initiate("idem-dup-001")
+        assert second == first
+
+    def test_repeated_key_does_not_store_a_second_payment(self):
+        _initiate("idem-dup-002")
+        with patch.object(BaseEventSourcedRepository, "add") as add:
+            _initiate("idem-dup-002")
+        add.assert_not_called()
+
+    def test_request_racing_an_unfinished_one_gets_its_payment(self):
+        # Another request has claimed the key and is still storing its payment
+        claim(INITIATE, initiate_key("cust-001", "ord-001", "idem-dup-006"), "pay-in-progress")
+        assert _initiate("idem-dup-006") == "pay-in-progress"
+
+    def test_same_key_from_another_customer_is_a_new_payment(self):
+        assert _initiate("idem-dup-007") != _initiate("idem-dup-007", customer_id="cust-002")
+
+    def test_failed_request_releases_its_claim(self):
+        with (
+            patch.object(BaseEventSourcedRepository, "add", side_effect=RuntimeError("down")),
+            pytest.raises(RuntimeError),
+        ):
+            _initiate("idem-dup-008")
+        payment_id = _initiate("idem-dup-008")
+        assert current_domain.repository_for(Payment).get(payment_id).idempotency_key == "idem-dup-008"
+
+    def test_distinct_keys_create_distinct_payments(self):
+        assert _initiate("idem-dup-003") != _initiate("idem-dup-004")
+
+    def test_expired_key_creates_a_new_payment(self):
+        first = _initiate("idem-dup-005")
+        repo = current_domain.repository_for(IdempotencyRecord)
+        record = repo.get(f"initiate:{initiate_key('cust-001', 'ord-001', 'idem-dup-005')}")
+        record.expires_at = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=1)
+        repo.add(record)
+        assert _initiate("idem-dup-005") != first
+
+
+class TestWebhookDedup:
+    def test_redelivered_success_webhook_is_acknowledged(self):
+        payment_id = _initiate("idem-wh-dup-001")
+        _webhook(payment_id, gateway_transaction_id="txn-1")
+        _webhook(payment_id, gateway_transaction_id="txn-1")  # Would fail the transition check
+
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert payment.status == PaymentStatus.SUCCEEDED.value
+
+    def test_redelivered_webhook_does_not_load_the_payment(self):
+        payment_id = _initiate("idem-wh-dup-002")
+        _webhook(payment_id, gateway_transaction_id="txn-2")
+        with patch.object(current_domain.repository_for(Payment).__class__, "get") as get:
+            _webhook(payment_id, gateway_transaction_id="txn-2")
+        get.assert_not_called()
+
+    def test_failure_webhook_after_retry_is_processed(self):
+        payment_id = _initiate("idem-wh-dup-003")
+        _webhook(payment_id, "failed", failure_reason="Card declined")
+        current_domain.process(RetryPayment(payment_id=payment_id), asynchronous=False)
+        _webhook(payment_id, "failed", failure_reason="Card declined")
+
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert payment.status == PaymentStatus.FAILED.value
+        assert payment.attempt_count == 2
+
+    def test_redelivered_refund_webhook_is_acknowledged(self):
+        payment_id = _initiate("idem-wh-dup-004", amount=100.0)
+        _webhook(payment_id, gateway_transaction_id="txn-4")
+        refund_id = current_domain.process(
+            RequestRefund(payment_id=payment_id, amount=25.0, reason="Damaged"),
+            asynchronous=False,
+        )
+        for _ in range(2):
+            current_domain.process(
+                ProcessRefundWebhook(payment_id=payment_id, refund_id=refund_id, gateway_refund_id="ref-4"),
+                asynchronous=False,
+            )
+
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert payment.total_refunded == 25.0
+
+
+class TestPurgeExpiredIdempotencyKeys:
+    def test_purges_only_expired_records(self):
+        now = datetime.now(UTC)
+        remember(INITIATE, "purge-old", "pay-old", now=now - timedelta(days=2))
+        remember(INITIATE, "purge-new", "pay-new", now=now)
+
+        purged = current_domain.process(PurgeExpiredIdempotencyKeys(as_of=now), asynchronous=False)
+
+        assert purged == 1
+        keys = [record.key for record in current_domain.view_for(IdempotencyRecord).query.all().items]
+        assert "initiate:purge-old" not in keys
+        assert "initiate:purge-new" in keys
+
+    def test_limit_bounds_one_run(self):
+        past = datetime.now(UTC) - timedelta(days=2)
+        for n in range(3):
+            remember(INITIATE, f"purge-batch-{n}", f"pay-{n}", now=past)
+
+        purged = current_domain.process(PurgeExpiredIdempotencyKeys(limit=2), asynchronous=False)
+        assert purged == 2
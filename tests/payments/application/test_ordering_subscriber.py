@@ -185,3 +185,29 @@ class TestOrderReturnedSubscriber:
         if payment_records:
             payment = current_domain.repository_for(Payment).get(str(payment_records[0].payment_id))
             assert len(payment.refunds) == 0
+
+    def test_handles_newer_event_versions(self):
+        """Declared types are unversioned, so a v2 OrderReturned still triggers a refund."""
+        order_id = "ord-refund-v2"
+        payment_id = _create_succeeded_payment(order_id)
+
+        payload = _build_message(
+            "Ordering.OrderReturned.v2",
+            {
+                "order_id": order_id,
+                "returned_at": datetime.now(UTC).isoformat(),
+            },
+        )
+
+        subscriber = OrderReturnedSubscriber()
+        subscriber(payload)
+
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert len(payment.refunds) == 1
+
+    def test_ignores_lookalike_event_types(self):
+        """Types that merely contain "OrderReturned" are not dispatched."""
+        payload = _build_message("Ordering.OrderReturnedReverted.v1", None)
+
+        subscriber = OrderReturnedSubscriber()
+        subscriber(payload)  # Would fail on data["order_id"] if dispatched
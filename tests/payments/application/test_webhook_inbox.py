@@ -0,0 +1,259 @@
+"""Application tests for the payment webhook inbox."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+from protean import current_domain
+
+from payments.payment.initiation import InitiatePayment
+from payments.payment.payment import Payment, PaymentStatus
+from payments.payment.webhook_inbox import (
+    PAYMENT,
+    PaymentWebhookInbox,
+    accept_webhook,
+    drain_payment_webhooks,
+    pending_webhooks,
+    requeue_dead_webhooks,
+)
+from shared.webhooks import (
+    DEAD,
+    PENDING,
+    PROCESSED,
+    WebhookInboxSettings,
+    message_id,
+    receive_time,
+    record_failure,
+)
+
+_counter = 0
+
+
+def _initiate():
+    global _counter
+    _counter += 1
+    return current_domain.process(
+        InitiatePayment(
+            order_id="ord-001",
+            customer_id="cust-001",
+            amount=59.99,
+            currency="USD",
+            payment_method_type="credit_card",
+            last4="4242",
+            idempotency_key=f"idem-inbox-{_counter:04d}",
+        ),
+        asynchronous=False,
+    )
+
+
+def _accept(payment_id, gateway_status="succeeded", **fields):
+    payload = {
+        "payment_id": payment_id,
+        "gateway_transaction_id": fields.get("gateway_transaction_id"),
+        "gateway_status": gateway_status,
+        "failure_reason": fields.get("failure_reason"),
+    }
+    return accept_webhook(PAYMENT, payment_id, payload, json.dumps(payload).encode())
+
+
+def _drain(limit=None):
+    return drain_payment_webhooks(limit)
+
+
+def _make_due(message):
+    message.next_attempt_at = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=1)
+    current_domain.repository_for(PaymentWebhookInbox).add(message)
+
+
+def _messages():
+    return sorted(current_domain.view_for(PaymentWebhookInbox).query.all().items, key=lambda m: m.received_at)
+
+
+class TestSharedHelpers:
+    def test_settings_defaults(self):
+        settings = WebhookInboxSettings.from_config({})
+        assert settings.batch_size == 200
+        assert settings.retention == 86400
+        assert settings.max_attempts == 5
+        assert settings.retry_backoff == 30
+
+    def test_record_failure_backs_off_then_dead_letters(self):
+        settings = WebhookInboxSettings(max_attempts=3, retry_backoff=10)
+        now = datetime(2026, 1, 1)
+        message = PaymentWebhookInbox(message_id="m-1", kind=PAYMENT, payment_id="pay-1", payload={}, received_at=now)
+
+        record_failure(message, ValueError("boom"), settings, now)
+        assert (message.status, message.attempts, message.next_attempt_at) == (PENDING, 1, now + timedelta(seconds=10))
+        record_failure(message, ValueError("boom"), settings, now)
+        assert message.next_attempt_at == now + timedelta(seconds=20)
+        record_failure(message, ValueError("boom"), settings, now)
+        assert (message.status, message.attempts, message.error) == (DEAD, 3, "boom")
+
+    def test_message_id_depends_on_kind_and_body(self):
+        assert message_id("payment", b"{}") == message_id("payment", b"{}")
+        assert message_id("payment", b"{}") != message_id("refund", b"{}")
+        assert message_id("payment", b"{}") != message_id("payment", b"{ }")
+
+    def test_receive_time_is_strictly_increasing(self):
+        times = [receive_time() for _ in range(100)]
+        assert all(later > earlier for earlier, later in zip(times, times[1:], strict=False))
+
+
+class TestAcceptWebhook:
+    def test_queues_without_touching_the_payment(self):
+        payment_id = _initiate()
+        assert _accept(payment_id, gateway_transaction_id="txn-1") is True
+
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.PENDING.value
+        assert [str(message.payment_id) for message in pending_webhooks(10)] == [payment_id]
+
+    def test_redelivery_is_not_queued_twice(self):
+        payment_id = _initiate()
+        assert _accept(payment_id, gateway_transaction_id="txn-2") is True
+        assert _accept(payment_id, gateway_transaction_id="txn-2") is False
+        assert len(pending_webhooks(10)) == 1
+
+
+class TestDrainPaymentWebhooks:
+    def test_applies_queued_webhooks(self):
+        payment_id = _initiate()
+        _accept(payment_id, gateway_transaction_id="txn-3")
+
+        assert _drain() == 1
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.SUCCEEDED.value
+        assert (
+            current_domain.view_for(PaymentWebhookInbox)
+            .get(
+                message_id(
+                    PAYMENT,
+                    json.dumps(
+                        {
+                            "payment_id": payment_id,
+                            "gateway_transaction_id": "txn-3",
+                            "gateway_status": "succeeded",
+                            "failure_reason": None,
+                        }
+                    ).encode(),
+                )
+            )
+            .status
+            == PROCESSED
+        )
+
+    def test_processes_each_payment_in_arrival_order(self):
+        payment_id = _initiate()
+        _accept(payment_id, "failed", failure_reason="Declined")
+        _accept(payment_id, "succeeded", gateway_transaction_id="txn-4")
+
+        # Failed first, then succeeded is not a valid transition — order is kept
+        assert _drain() == 1
+        assert [message.status for message in _messages()] == [PROCESSED, PENDING]
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.FAILED.value
+
+    def test_failed_webhook_is_retried_after_backoff(self):
+        _accept("missing-payment", gateway_transaction_id="txn-5")
+
+        assert _drain() == 0
+        [message] = _messages()
+        assert (message.status, message.attempts) == (PENDING, 1)
+        assert message.error
+
+        assert _drain() == 0  # Not due yet
+        assert _messages()[0].attempts == 1
+
+        _make_due(message)
+        _drain()
+        assert _messages()[0].attempts == 2
+
+    def test_webhook_is_dead_lettered_after_max_attempts(self):
+        _accept("missing-payment", gateway_transaction_id="txn-7")
+        for _ in range(WebhookInboxSettings().max_attempts):
+            _drain()
+            _make_due(_messages()[0])
+
+        [message] = _messages()
+        assert (message.status, message.attempts) == (DEAD, 5)
+        assert pending_webhooks(10) == []
+
+    def test_later_webhooks_wait_behind_a_retry(self):
+        payment_id = _initiate()
+        _accept(payment_id, "succeeded", gateway_transaction_id="txn-8")
+        first = _messages()[0]
+        first.next_attempt_at = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=5)
+        current_domain.repository_for(PaymentWebhookInbox).add(first)
+        _accept(payment_id, "failed", failure_reason="Declined")
+
+        assert _drain() == 0
+        assert [message.status for message in _messages()] == [PENDING, PENDING]
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.PENDING.value
+
+    def test_webhooks_awaiting_retry_are_not_returned_as_pending(self):
+        payment_id = _initiate()
+        _accept(payment_id, gateway_transaction_id="txn-due")
+        [message] = _messages()
+        message.next_attempt_at = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=5)
+        current_domain.repository_for(PaymentWebhookInbox).add(message)
+
+        assert pending_webhooks(10) == []
+        assert [m.message_id for m in pending_webhooks(10, datetime.now(UTC) + timedelta(minutes=6))] == [
+            message.message_id
+        ]
+
+    def test_later_webhooks_are_held_behind_a_dead_letter_until_requeued(self):
+        payment_id = _initiate()
+        _accept(payment_id, "succeeded", gateway_transaction_id="txn-dead")
+        first = _messages()[0]
+        first.status = DEAD
+        current_domain.repository_for(PaymentWebhookInbox).add(first)
+        _accept(payment_id, "succeeded", gateway_transaction_id="txn-dead-redelivered")
+        other = _initiate()
+        _accept(other, gateway_transaction_id="txn-other")
+
+        assert [str(message.payment_id) for message in pending_webhooks(10)] == [other]
+        assert _drain() == 1
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.PENDING.value
+
+        assert requeue_dead_webhooks(payment_id) == 1
+        assert (_messages()[0].status, _messages()[0].attempts) == (PENDING, 0)
+        assert _drain() == 2
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.SUCCEEDED.value
+
+    def test_unexpected_errors_are_contained_per_webhook(self, monkeypatch):
+        import payments.payment.webhook_inbox as webhook_inbox
+
+        broken = _initiate()
+        healthy = _initiate()
+        _accept(broken, gateway_transaction_id="txn-9")
+        _accept(healthy, gateway_transaction_id="txn-10")
+        original = webhook_inbox._command_for
+
+        def command_for(message):
+            if str(message.payment_id) == broken:
+                raise RuntimeError("gateway payload drift")
+            return original(message)
+
+        monkeypatch.setattr(webhook_inbox, "_command_for", command_for)
+
+        assert _drain() == 1
+        assert current_domain.repository_for(Payment).get(healthy).status == PaymentStatus.SUCCEEDED.value
+        failed = next(message for message in _messages() if str(message.payment_id) == broken)
+        assert (failed.status, failed.error) == (PENDING, "gateway payload drift")
+
+    def test_limit_bounds_one_run(self):
+        for _ in range(3):
+            _accept(_initiate(), gateway_transaction_id="txn-batch")
+
+        assert _drain(limit=2) == 2
+        assert len(pending_webhooks(10)) == 1
+
+    def test_processed_webhooks_past_retention_are_purged(self):
+        payment_id = _initiate()
+        _accept(payment_id, gateway_transaction_id="txn-6")
+        _drain()
+
+        repo = current_domain.repository_for(PaymentWebhookInbox)
+        message = current_domain.view_for(PaymentWebhookInbox).query.all().items[0]
+        message.received_at = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=2)
+        repo.add(message)
+
+        _drain()
+        assert current_domain.view_for(PaymentWebhookInbox).query.all().items == []
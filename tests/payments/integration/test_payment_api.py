@@ -1,12 +1,16 @@
 """Integration tests for Payment API endpoints via TestClient."""
 
+import httpx
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from protean import current_domain
 
 from payments.api.routes import payment_router
-from payments.payment.payment import Payment, PaymentStatus
+from payments.gateway import reset_async_gateway, set_async_gateway
+from payments.gateway.fake_http_gateway import FakeGatewayApp
+from payments.gateway.http_adapter import HTTPGateway
+from payments.payment.payment import Payment, PaymentStatus, RefundStatus
 
 
 @pytest.fixture()
@@ -16,6 +20,14 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture()
+def gateway_app():
+    app = FakeGatewayApp()
+    set_async_gateway(HTTPGateway(base_url="http://fake-gateway", transport=httpx.ASGITransport(app=app)))
+    yield app
+    reset_async_gateway()
+
+
 def _initiate_payment(client, **overrides):
     defaults = {
         "order_id": "ord-api-001",
@@ -66,6 +78,7 @@ class TestRetryPaymentAPI:
             },
             headers={"X-Gateway-Signature": "test-signature"},
         )
+        client.post("/payments/maintenance/drain-webhooks")
         response = client.post(f"/payments/{payment_id}/retry")
         assert response.status_code == 200
         assert response.json()["status"] == "retry_initiated"
@@ -83,9 +96,51 @@ class TestRefundAPI:
             },
             headers={"X-Gateway-Signature": "test-signature"},
         )
+        client.post("/payments/maintenance/drain-webhooks")
         response = client.post(
             f"/payments/{payment_id}/refund",
             json={"amount": 30.00, "reason": "Changed mind"},
         )
         assert response.status_code == 200
         assert "refund_id" in response.json()
+
+
+class TestGatewayCalls:
+    def test_initiated_payment_is_charged(self, client, gateway_app):
+        payment_id = _initiate_payment(client, idempotency_key="api-charge-001")
+
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert payment.status == PaymentStatus.SUCCEEDED.value
+        assert payment.gateway_info.gateway_transaction_id.startswith("fake_txn_")
+        assert gateway_app.requests[0]["idempotency_key"] == payment_id
+
+    def test_declined_charge_fails_the_payment(self, client, gateway_app):
+        gateway_app.configure(should_succeed=False, failure_reason="Insufficient funds")
+        payment_id = _initiate_payment(client, idempotency_key="api-charge-002")
+
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.FAILED.value
+
+    def test_gateway_error_leaves_payment_pending(self, client, gateway_app):
+        gateway_app.configure(error_status=503)
+        payment_id = _initiate_payment(client, idempotency_key="api-charge-003")
+
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.PENDING.value
+
+    def test_repeated_initiation_replays_the_charge(self, client, gateway_app):
+        first = _initiate_payment(client, idempotency_key="api-charge-004")
+        second = _initiate_payment(client, idempotency_key="api-charge-004")
+
+        assert first == second
+        assert {request["idempotency_key"] for request in gateway_app.requests} == {first}
+        assert current_domain.repository_for(Payment).get(first).attempt_count == 1
+
+    def test_refund_is_submitted_and_completed(self, client, gateway_app):
+        payment_id = _initiate_payment(client, idempotency_key="api-charge-005")
+
+        response = client.post(f"/payments/{payment_id}/refund", json={"amount": 20.0, "reason": "Damaged"})
+
+        [refund] = current_domain.repository_for(Payment).get(payment_id).refunds
+        assert str(refund.id) == response.json()["refund_id"]
+        assert refund.status == RefundStatus.COMPLETED.value
+        assert refund.gateway_refund_id.startswith("fake_ref_")
+        assert gateway_app.requests[-1]["payload"]["amount"] == 20.0
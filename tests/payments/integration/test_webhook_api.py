@@ -45,6 +45,13 @@ def _succeed_payment(client, payment_id):
         },
         headers={"X-Gateway-Signature": "test-signature"},
     )
+    _drain(client)
+
+
+def _drain(client):
+    response = client.post("/payments/maintenance/drain-webhooks")
+    assert response.status_code == 200
+    return response.json()["processed_count"]
 
 
 class TestWebhookEndpoint:
@@ -59,7 +66,9 @@ class TestWebhookEndpoint:
             },
             headers={"X-Gateway-Signature": "test-signature"},
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        assert _drain(client) == 1
         payment = current_domain.repository_for(Payment).get(payment_id)
         assert payment.status == PaymentStatus.SUCCEEDED.value
 
@@ -74,10 +83,54 @@ class TestWebhookEndpoint:
             },
             headers={"X-Gateway-Signature": "test-signature"},
         )
-        assert response.status_code == 200
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        assert _drain(client) == 1
         payment = current_domain.repository_for(Payment).get(payment_id)
         assert payment.status == PaymentStatus.FAILED.value
 
+    def test_redelivered_webhook_acknowledged(self, client):
+        payment_id = _create_payment(client)
+        body = {"payment_id": payment_id, "gateway_transaction_id": "txn-wh-dup", "gateway_status": "succeeded"}
+        headers = {"X-Gateway-Signature": "test-signature"}
+        first = client.post("/payments/webhook", json=body, headers=headers)
+        second = client.post("/payments/webhook", json=body, headers=headers)
+        assert first.status_code == 202
+        assert second.status_code == 202
+        assert second.json()["status"] == "duplicate"
+        assert _drain(client) == 1
+
+        # Redelivered after processing: still acknowledged, not reprocessed
+        third = client.post("/payments/webhook", json=body, headers=headers)
+        assert third.json()["status"] == "duplicate"
+        assert _drain(client) == 0
+
+    def test_webhook_not_applied_until_drained(self, client):
+        payment_id = _create_payment(client)
+        client.post(
+            "/payments/webhook",
+            json={"payment_id": payment_id, "gateway_transaction_id": "txn-wh-q", "gateway_status": "succeeded"},
+            headers={"X-Gateway-Signature": "test-signature"},
+        )
+        payment = current_domain.repository_for(Payment).get(payment_id)
+        assert payment.status == PaymentStatus.PENDING.value
+
+    def test_invalid_body_rejected(self, client):
+        response = client.post(
+            "/payments/webhook",
+            content=b'{"gateway_status": "succeeded"}',
+            headers={"X-Gateway-Signature": "test-signature", "Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+    def test_non_utf8_body_rejected(self, client):
+        response = client.post(
+            "/payments/webhook",
+            content=b'{"payment_id": "\xff"}',
+            headers={"X-Gateway-Signature": "test-signature", "Content-Type": "application/json"},
+        )
+        assert response.status_code == 400
+
     def test_invalid_signature_rejected(self, client):
         payment_id = _create_payment(client)
         response = client.post(
@@ -91,6 +144,29 @@ class TestWebhookEndpoint:
         assert response.status_code == 401
 
 
+class TestRequeueWebhooksEndpoint:
+    def test_requeues_dead_letters_for_the_next_drain(self, client):
+        from payments.payment.webhook_inbox import PaymentWebhookInbox
+
+        payment_id = _create_payment(client)
+        client.post(
+            "/payments/webhook",
+            json={"payment_id": payment_id, "gateway_transaction_id": "txn-rq", "gateway_status": "succeeded"},
+            headers={"X-Gateway-Signature": "test-signature"},
+        )
+        repo = current_domain.repository_for(PaymentWebhookInbox)
+        [message] = repo.query.all().items
+        message.status = "dead"
+        repo.add(message)
+        assert _drain(client) == 0
+
+        response = client.post("/payments/maintenance/requeue-webhooks", json={"payment_id": payment_id})
+        assert response.status_code == 200
+        assert response.json()["requeued_count"] == 1
+        assert _drain(client) == 1
+        assert current_domain.repository_for(Payment).get(payment_id).status == PaymentStatus.SUCCEEDED.value
+
+
 class TestRefundWebhookEndpoint:
     def test_refund_webhook_processes_successfully(self, client):
         payment_id = _create_payment(client)
@@ -116,8 +192,9 @@ class TestRefundWebhookEndpoint:
             },
             headers={"X-Gateway-Signature": "test-signature"},
         )
-        assert response.status_code == 200
-        assert response.json()["status"] == "refund_processed"
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        assert _drain(client) == 1
 
         # Verify refund was completed
         payment = current_domain.repository_for(Payment).get(payment_id)
@@ -182,3 +259,15 @@ class TestGatewayConfigureEndpoint:
             from payments.gateway import reset_gateway
 
             reset_gateway()
+
+
+class TestPurgeIdempotencyKeysEndpoint:
+    def test_purge_returns_count(self, client):
+        from datetime import UTC, datetime, timedelta
+
+        from payments.payment.idempotency import INITIATE, remember
+
+        remember(INITIATE, "api-purge-old", "pay-old", now=datetime.now(UTC) - timedelta(days=2))
+        response = client.post("/payments/maintenance/purge-idempotency-keys", json={"limit": 10})
+        assert response.status_code == 200
+        assert response.json()["purged_count"] == 1
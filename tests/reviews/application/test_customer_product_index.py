@@ -0,0 +1,149 @@
+"""Application tests for the CustomerProductIndex behind SubmitReview's checks."""
+
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from protean import current_domain
+from protean.exceptions import ValidationError
+from protean.integrations.fastapi import register_exception_handlers
+
+from reviews.api.routes import review_router
+from reviews.projections.customer_product_index import (
+    backfill_customer_product_index,
+    customer_product_entry,
+    record_purchase,
+    record_review,
+)
+from reviews.projections.verified_purchases import VerifiedPurchases
+from reviews.review.moderation import ModerateReview
+from reviews.review.ordering_subscriber import OrderDeliveredSubscriber
+from reviews.review.removal import RemoveReview
+from reviews.review.review import Review
+from reviews.review.submission import SubmitReview
+
+
+def _submit(customer_id, product_id):
+    return current_domain.process(
+        SubmitReview(
+            product_id=product_id,
+            customer_id=customer_id,
+            rating=4,
+            title="Index test review",
+            body="This is a review body that is long enough for validation.",
+        ),
+        asynchronous=False,
+    )
+
+
+class TestSubmissionChecks:
+    def test_submission_marks_the_pair_reviewed(self):
+        review_id = _submit("cust-cpi-1", "prod-cpi-1")
+        entry = customer_product_entry("cust-cpi-1", "prod-cpi-1")
+        assert str(entry.review_id) == review_id
+        assert entry.order_id is None
+
+    def test_duplicate_rejected_without_querying_reviews(self, monkeypatch):
+        _submit("cust-cpi-2", "prod-cpi-2")
+        repo = current_domain.repository_for(Review)
+        monkeypatch.setattr(type(repo), "query", property(lambda self: pytest.fail("Review rows scanned")))
+
+        with pytest.raises(ValidationError) as exc:
+            _submit("cust-cpi-2", "prod-cpi-2")
+        assert "already reviewed" in str(exc.value)
+
+    def test_removal_allows_a_new_review(self):
+        review_id = _submit("cust-cpi-3", "prod-cpi-3")
+        current_domain.process(
+            ModerateReview(review_id=review_id, moderator_id="mod-001", action="Approve"),
+            asynchronous=False,
+        )
+        current_domain.process(
+            RemoveReview(review_id=review_id, removed_by="Admin", reason="Policy"),
+            asynchronous=False,
+        )
+        assert customer_product_entry("cust-cpi-3", "prod-cpi-3").review_id is None
+
+        second = _submit("cust-cpi-3", "prod-cpi-3")
+        assert str(customer_product_entry("cust-cpi-3", "prod-cpi-3").review_id) == second
+
+    def test_delivered_order_verifies_the_review(self):
+        OrderDeliveredSubscriber().handle(
+            {
+                "order_id": "ord-cpi-4",
+                "customer_id": "cust-cpi-4",
+                "items": [{"product_id": "prod-cpi-4"}],
+                "delivered_at": datetime.now(UTC).isoformat(),
+            }
+        )
+        review = current_domain.repository_for(Review).get(_submit("cust-cpi-4", "prod-cpi-4"))
+        assert review.verified_purchase is True
+        assert review.order_id == "ord-cpi-4"
+
+    def test_first_delivered_order_is_kept(self):
+        record_purchase("cust-cpi-5", "prod-cpi-5", order_id="ord-first", delivered_at=datetime.now(UTC))
+        record_purchase("cust-cpi-5", "prod-cpi-5", order_id="ord-second", delivered_at=datetime.now(UTC))
+        assert customer_product_entry("cust-cpi-5", "prod-cpi-5").order_id == "ord-first"
+
+
+class TestBackfill:
+    def test_builds_entries_from_existing_rows(self):
+        current_domain.repository_for(VerifiedPurchases).add(
+            VerifiedPurchases(
+                vp_id="vp-cpi-legacy",
+                customer_id="cust-cpi-6",
+                product_id="prod-cpi-6",
+                order_id="ord-cpi-legacy",
+                delivered_at=datetime.now(UTC),
+            )
+        )
+        review = Review.submit(
+            product_id="prod-cpi-7",
+            customer_id="cust-cpi-6",
+            rating=5,
+            title="Written before the index",
+            body="This is a review body that is long enough for validation.",
+        )
+        review._events.clear()
+        current_domain.repository_for(Review).add(review)
+
+        assert backfill_customer_product_index(batch_size=1) == 2
+        assert customer_product_entry("cust-cpi-6", "prod-cpi-6").order_id == "ord-cpi-legacy"
+        assert str(customer_product_entry("cust-cpi-6", "prod-cpi-7").review_id) == str(review.id)
+
+    def test_clears_entries_of_removed_reviews(self):
+        review_id = _submit("cust-cpi-8", "prod-cpi-8")
+        current_domain.process(
+            ModerateReview(review_id=review_id, moderator_id="mod-001", action="Approve"),
+            asynchronous=False,
+        )
+        current_domain.process(
+            RemoveReview(review_id=review_id, removed_by="Admin", reason="Policy"),
+            asynchronous=False,
+        )
+        # As if the removal happened before the index was maintained
+        record_review("cust-cpi-8", "prod-cpi-8", review_id)
+
+        backfill_customer_product_index()
+        assert customer_product_entry("cust-cpi-8", "prod-cpi-8").review_id is None
+
+    def test_maintenance_endpoint(self):
+        review = Review.submit(
+            product_id="prod-cpi-9",
+            customer_id="cust-cpi-9",
+            rating=4,
+            title="Written before the index",
+            body="This is a review body that is long enough for validation.",
+        )
+        review._events.clear()
+        current_domain.repository_for(Review).add(review)
+
+        app = FastAPI()
+        app.include_router(review_router)
+        register_exception_handlers(app)
+        response = TestClient(app).post("/reviews/maintenance/backfill-customer-product-index")
+
+        assert response.status_code == 200
+        assert response.json()["written_count"] >= 1
+        assert str(customer_product_entry("cust-cpi-9", "prod-cpi-9").review_id) == str(review.id)
@@ -1,7 +1,7 @@
 """Application tests for OrderDeliveredSubscriber — Reviews reacts to Ordering stream.
 
 Tests the subscriber ACL pattern: raw dict payloads are filtered by event type
-and translated into VerifiedPurchases records.
+and translated into VerifiedPurchases records and CustomerProductIndex entries.
 """
 
 from datetime import UTC, datetime
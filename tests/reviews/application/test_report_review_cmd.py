@@ -6,6 +6,7 @@ from protean.exceptions import ValidationError
 
 from reviews.review.reporting import ReportReview
 from reviews.review.review import Review
+from reviews.review.review_feedback import ReviewReport
 from reviews.review.submission import SubmitReview
 
 
@@ -48,3 +49,31 @@ class TestReportReviewCommand:
                 asynchronous=False,
             )
         assert "Cannot report your own" in str(exc.value)
+
+    def test_reports_are_kept_in_the_report_store(self):
+        review_id = _submit_review(product_id="prod-rpt-3", customer_id="cust-rpt-3")
+        for customer_id, reason in (("cust-reporter-3a", "Spam"), ("cust-reporter-3b", "Offensive")):
+            current_domain.process(
+                ReportReview(review_id=review_id, customer_id=customer_id, reason=reason, detail="Details"),
+                asynchronous=False,
+            )
+
+        reports = current_domain.view_for(ReviewReport).query.filter(review_id=review_id).all().items
+        assert sorted((str(report.customer_id), report.reason) for report in reports) == [
+            ("cust-reporter-3a", "Spam"),
+            ("cust-reporter-3b", "Offensive"),
+        ]
+        assert {report.detail for report in reports} == {"Details"}
+        assert current_domain.repository_for(Review).get(review_id).report_count == 2
+
+    def test_customer_may_report_again(self):
+        review_id = _submit_review(product_id="prod-rpt-4", customer_id="cust-rpt-4")
+        for reason in ("Spam", "Offensive"):
+            current_domain.process(
+                ReportReview(review_id=review_id, customer_id="cust-reporter-4", reason=reason),
+                asynchronous=False,
+            )
+
+        reports = current_domain.view_for(ReviewReport).query.filter(review_id=review_id).all().items
+        assert sorted(report.reason for report in reports) == ["Offensive", "Spam"]
+        assert current_domain.repository_for(Review).get(review_id).report_count == 2
@@ -1,10 +1,13 @@
 """Application tests for VoteOnReview command handler."""
 
+from datetime import UTC, datetime
+
 import pytest
 from protean import current_domain
 from protean.exceptions import ValidationError
 
 from reviews.review.review import Review
+from reviews.review.review_feedback import ReviewVote, feedback_key
 from reviews.review.submission import SubmitReview
 from reviews.review.voting import VoteOnReview
 
@@ -68,3 +71,55 @@ class TestVoteOnReviewCommand:
                 asynchronous=False,
             )
         assert "already voted" in str(exc.value)
+
+    def test_vote_is_kept_in_the_vote_store(self):
+        review_id = _submit_review(product_id="prod-vote-4", customer_id="cust-vote-4")
+        current_domain.process(
+            VoteOnReview(review_id=review_id, customer_id="cust-voter-4", vote_type="Unhelpful"),
+            asynchronous=False,
+        )
+        vote = current_domain.view_for(ReviewVote).get(feedback_key(review_id, "cust-voter-4"))
+        assert str(vote.review_id) == review_id
+        assert vote.vote_type == "Unhelpful"
+
+    def test_duplicate_vote_leaves_counts_unchanged(self):
+        review_id = _submit_review(product_id="prod-vote-5", customer_id="cust-vote-5")
+        vote = VoteOnReview(review_id=review_id, customer_id="cust-voter-5", vote_type="Helpful")
+        current_domain.process(vote, asynchronous=False)
+        with pytest.raises(ValidationError):
+            current_domain.process(vote, asynchronous=False)
+
+        review = current_domain.repository_for(Review).get(review_id)
+        assert (review.helpful_count, review.unhelpful_count) == (1, 0)
+        assert len(current_domain.view_for(ReviewVote).query.filter(review_id=review_id).all().items) == 1
+
+    def test_vote_already_in_the_store_is_not_counted_again(self):
+        review_id = _submit_review(product_id="prod-vote-6", customer_id="cust-vote-6")
+        current_domain.repository_for(ReviewVote).add(
+            ReviewVote(
+                vote_id=feedback_key(review_id, "cust-voter-6"),
+                review_id=review_id,
+                customer_id="cust-voter-6",
+                vote_type="Helpful",
+                voted_at=datetime.now(UTC),
+            )
+        )
+        with pytest.raises(ValidationError) as exc:
+            current_domain.process(
+                VoteOnReview(review_id=review_id, customer_id="cust-voter-6", vote_type="Unhelpful"),
+                asynchronous=False,
+            )
+        assert "already voted" in str(exc.value)
+
+        review = current_domain.repository_for(Review).get(review_id)
+        assert (review.helpful_count, review.unhelpful_count) == (0, 0)
+        assert current_domain.view_for(ReviewVote).get(feedback_key(review_id, "cust-voter-6")).vote_type == "Helpful"
+
+    def test_self_vote_stores_no_vote(self):
+        review_id = _submit_review(product_id="prod-vote-7", customer_id="cust-vote-7")
+        with pytest.raises(ValidationError):
+            current_domain.process(
+                VoteOnReview(review_id=review_id, customer_id="cust-vote-7", vote_type="Helpful"),
+                asynchronous=False,
+            )
+        assert current_domain.view_for(ReviewVote).query.filter(review_id=review_id).all().items == []
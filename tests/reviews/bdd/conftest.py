@@ -15,6 +15,7 @@ from reviews.review.events import (
     SellerReplyAdded,
 )
 from reviews.review.review import Review
+from reviews.review.review_feedback import cast_vote
 
 _REVIEW_EVENT_CLASSES = {
     "ReviewSubmitted": ReviewSubmitted,
@@ -83,7 +84,7 @@ def published_review():
 
 @given(parsers.cfparse('customer "{customer_id}" has voted "{vote_type}"'))
 def customer_has_voted(review, customer_id, vote_type):
-    review.vote(customer_id=customer_id, vote_type=vote_type)
+    cast_vote(review, customer_id=customer_id, vote_type=vote_type)
     review._events.clear()
 
 
@@ -3,6 +3,8 @@
 from protean.exceptions import ValidationError
 from pytest_bdd import parsers, scenarios, when
 
+from reviews.review.review_feedback import cast_vote
+
 scenarios("features/review_voting.feature")
 
 
@@ -12,7 +14,7 @@ scenarios("features/review_voting.feature")
 )
 def vote_on_review(review, customer_id, vote_type, error):
     try:
-        review.vote(customer_id=customer_id, vote_type=vote_type)
+        cast_vote(review, customer_id=customer_id, vote_type=vote_type)
     except ValidationError as exc:
         error["exc"] = exc
     return review
@@ -72,7 +72,6 @@ class TestReviewSubmission:
         assert review.unhelpful_count == 0
         assert review.report_count == 0
         assert len(review.images) == 0
-        assert len(review.votes) == 0
         assert len(review.reply) == 0
 
     def test_submit_with_optional_fields(self):
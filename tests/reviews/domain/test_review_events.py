@@ -25,6 +25,10 @@ def _make_review(**overrides):
     return Review.submit(**defaults)
 
 
+def _not_voted(customer_id):
+    return False
+
+
 def _published_review():
     review = _make_review()
     review._events.clear()
@@ -91,7 +95,7 @@ class TestHelpfulVoteRecordedEvent:
     def test_event_fields(self):
         review = _make_review()
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         event = review._events[0]
         assert isinstance(event, HelpfulVoteRecorded)
         assert str(event.voter_id) == "cust-002"
@@ -1,4 +1,4 @@
-"""Tests for Review voting — helpful/unhelpful votes, self-vote guard, duplicate guard."""
+"""Tests for Review voting — helpful/unhelpful vote counts, self-vote and duplicate-vote guards."""
 
 import pytest
 from protean.exceptions import ValidationError
@@ -18,46 +18,41 @@ def _make_review(**overrides):
     return Review.submit(**defaults)
 
 
+def _not_voted(customer_id):
+    return False
+
+
 class TestHelpfulVote:
     def test_helpful_vote_increments_count(self):
         review = _make_review()
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         assert review.helpful_count == 1
         assert review.unhelpful_count == 0
 
     def test_unhelpful_vote_increments_count(self):
         review = _make_review()
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.UNHELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.UNHELPFUL.value, has_voted=_not_voted)
         assert review.unhelpful_count == 1
         assert review.helpful_count == 0
 
-    def test_vote_adds_entity(self):
-        review = _make_review()
-        review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
-        assert len(review.votes) == 1
-        assert str(review.votes[0].customer_id) == "cust-002"
-        assert review.votes[0].vote_type == VoteType.HELPFUL.value
-
     def test_multiple_voters(self):
         review = _make_review()
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         review._events.clear()
-        review.vote(customer_id="cust-003", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-003", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         review._events.clear()
-        review.vote(customer_id="cust-004", vote_type=VoteType.UNHELPFUL.value)
+        review.vote(customer_id="cust-004", vote_type=VoteType.UNHELPFUL.value, has_voted=_not_voted)
         assert review.helpful_count == 2
         assert review.unhelpful_count == 1
-        assert len(review.votes) == 3
 
     def test_vote_updates_timestamp(self):
         review = _make_review()
         original = review.updated_at
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         assert review.updated_at >= original
 
 
@@ -65,7 +60,7 @@ class TestVoteRaisesEvent:
     def test_vote_raises_event(self):
         review = _make_review()
         review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         assert len(review._events) == 1
         event = review._events[0]
         assert event.__class__.__name__ == "HelpfulVoteRecorded"
@@ -81,27 +76,32 @@ class TestSelfVoteGuard:
         review = _make_review()
         review._events.clear()
         with pytest.raises(ValidationError) as exc:
-            review.vote(customer_id="cust-001", vote_type=VoteType.HELPFUL.value)
+            review.vote(customer_id="cust-001", vote_type=VoteType.HELPFUL.value, has_voted=_not_voted)
         assert "Cannot vote on your own review" in str(exc.value)
 
 
 class TestDuplicateVoteGuard:
     def test_cannot_vote_twice(self):
         review = _make_review()
-        review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        voters = set()
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=voters.__contains__)
+        voters.add("cust-002")
         review._events.clear()
 
         with pytest.raises(ValidationError) as exc:
-            review.vote(customer_id="cust-002", vote_type=VoteType.UNHELPFUL.value)
+            review.vote(customer_id="cust-002", vote_type=VoteType.UNHELPFUL.value, has_voted=voters.__contains__)
         assert "already voted" in str(exc.value)
+        assert review.helpful_count == 1
+        assert review.unhelpful_count == 0
 
     def test_cannot_vote_same_type_twice(self):
         review = _make_review()
-        review._events.clear()
-        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+        voters = set()
+        review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=voters.__contains__)
+        voters.add("cust-002")
         review._events.clear()
 
         with pytest.raises(ValidationError) as exc:
-            review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value)
+            review.vote(customer_id="cust-002", vote_type=VoteType.HELPFUL.value, has_voted=voters.__contains__)
         assert "already voted" in str(exc.value)
+        assert review.helpful_count == 1
@@ -0,0 +1,153 @@
+"""Integration tests for ranked product review listings — helpfulness score and sort orders."""
+
+from datetime import UTC, datetime
+
+import pytest
+from protean import current_domain
+from protean.exceptions import ValidationError
+
+from reviews.projections.customer_product_index import record_purchase
+from reviews.projections.product_reviews import ProductReviews, wilson_lower_bound
+from reviews.projections.product_reviews_queries import ListProductReviews
+from reviews.review.moderation import ModerateReview
+from reviews.review.submission import SubmitReview
+from reviews.review.voting import VoteOnReview
+
+
+def _publish(product_id, customer_id, verified=False):
+    if verified:
+        record_purchase(customer_id, product_id, order_id=f"ord-{customer_id}", delivered_at=datetime.now(UTC))
+    review_id = current_domain.process(
+        SubmitReview(
+            product_id=product_id,
+            customer_id=customer_id,
+            rating=4,
+            title="Sorting test review",
+            body="This is a review body that is long enough for validation.",
+        ),
+        asynchronous=False,
+    )
+    current_domain.process(
+        ModerateReview(review_id=review_id, moderator_id="mod-001", action="Approve"),
+        asynchronous=False,
+    )
+    return review_id
+
+
+def _votes(review_id, helpful=0, unhelpful=0):
+    for n in range(helpful + unhelpful):
+        current_domain.process(
+            VoteOnReview(
+                review_id=review_id,
+                customer_id=f"voter-{review_id}-{n}",
+                vote_type="Helpful" if n < helpful else "Unhelpful",
+            ),
+            asynchronous=False,
+        )
+
+
+def _listed(product_id, **kwargs):
+    result = current_domain.dispatch(ListProductReviews(product_id=product_id, **kwargs))
+    return [str(item.review_id) for item in result.items]
+
+
+class TestWilsonLowerBound:
+    def test_no_votes_scores_zero(self):
+        assert wilson_lower_bound(0, 0) == 0.0
+
+    def test_more_evidence_outranks_a_perfect_small_sample(self):
+        assert wilson_lower_bound(90, 10) > wilson_lower_bound(2, 0)
+
+    def test_all_unhelpful_scores_zero(self):
+        assert wilson_lower_bound(0, 5) == pytest.approx(0.0)
+
+    def test_bounded_by_the_observed_share(self):
+        assert 0.0 < wilson_lower_bound(8, 2) < 0.8
+
+
+class TestHelpfulnessScore:
+    def test_score_follows_votes(self):
+        review_id = _publish("prod-sort-1", "cust-sort-1")
+        _votes(review_id, helpful=3, unhelpful=1)
+
+        pr = current_domain.view_for(ProductReviews).get(review_id)
+        assert pr.helpfulness_score == pytest.approx(wilson_lower_bound(3, 1))
+
+
+class TestListProductReviewsSort:
+    def test_most_recent_by_default(self):
+        first = _publish("prod-sort-2", "cust-sort-2a")
+        second = _publish("prod-sort-2", "cust-sort-2b")
+        assert _listed("prod-sort-2") == [second, first]
+
+    def test_most_helpful(self):
+        few = _publish("prod-sort-3", "cust-sort-3a")
+        many = _publish("prod-sort-3", "cust-sort-3b")
+        none = _publish("prod-sort-3", "cust-sort-3c")
+        _votes(few, helpful=2)
+        _votes(many, helpful=9, unhelpful=1)
+
+        assert _listed("prod-sort-3", sort="most_helpful") == [many, few, none]
+
+    def test_verified_first(self):
+        verified = _publish("prod-sort-4", "cust-sort-4a", verified=True)
+        newer = _publish("prod-sort-4", "cust-sort-4b")
+        assert _listed("prod-sort-4", sort="verified_first") == [verified, newer]
+
+    def test_pages_do_not_overlap(self):
+        ids = [_publish("prod-sort-5", f"cust-sort-5{n}") for n in range(5)]
+        pages = [_listed("prod-sort-5", sort="most_helpful", page=page, page_size=2) for page in (1, 2, 3)]
+        assert sorted(sum(pages, [])) == sorted(ids)
+
+    def test_unknown_sort_rejected(self):
+        with pytest.raises(ValidationError):
+            ListProductReviews(product_id="prod-sort-6", sort="cheapest")
+
+
+class TestKeysetPagination:
+    def _pages(self, product_id, sort, page_size=2):
+        from reviews.projections.product_reviews_queries import review_cursor
+
+        pages, after = [], None
+        while True:
+            result = current_domain.dispatch(
+                ListProductReviews(product_id=product_id, sort=sort, page_size=page_size, after=after)
+            )
+            pages.append([str(item.review_id) for item in result.items])
+            if not result.has_next:
+                return pages
+            after = review_cursor(result.items[-1], sort)
+
+    @pytest.mark.parametrize("sort", ["most_recent", "most_helpful", "verified_first"])
+    def test_cursor_pages_follow_the_ordering(self, sort):
+        product_id = f"prod-keyset-{sort}"
+        ids = [_publish(product_id, f"cust-keyset-{sort}-{n}", verified=n % 2 == 0) for n in range(5)]
+        _votes(ids[1], helpful=3)
+        _votes(ids[3], helpful=1, unhelpful=1)
+
+        pages = self._pages(product_id, sort)
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sum(pages, []) == _listed(product_id, sort=sort, page_size=10)
+
+    def test_invalid_cursor_rejected(self):
+        with pytest.raises(ValidationError):
+            current_domain.dispatch(ListProductReviews(product_id="prod-keyset-bad", after="not-a-cursor"))
+
+
+class TestBackfillHelpfulnessScores:
+    def test_unscored_reviews_are_scored_and_sorted_by_votes(self):
+        from reviews.projections.product_reviews import backfill_helpfulness_scores
+
+        voted = _publish("prod-backfill", "cust-backfill-a")
+        unvoted = _publish("prod-backfill", "cust-backfill-b")
+        _votes(voted, helpful=4)
+        repo = current_domain.repository_for(ProductReviews)
+        for review_id in (voted, unvoted):  # listed before the score existed
+            pr = repo.get(review_id)
+            pr.helpfulness_score = None
+            repo.add(pr)
+
+        assert backfill_helpfulness_scores(batch_size=1) == 2
+        assert repo.get(voted).helpfulness_score == pytest.approx(wilson_lower_bound(4, 0))
+        assert _listed("prod-backfill", sort="most_helpful") == [voted, unvoted]
+        assert backfill_helpfulness_scores() == 0
@@ -306,20 +306,14 @@ class TestProductRatingVerifiedPurchase:
     """Cover the verified_purchase True path in ProductRatingProjector."""
 
     def test_approved_verified_review_increments_verified_count(self):
-        import uuid
-
-        from reviews.projections.verified_purchases import VerifiedPurchases
+        from reviews.projections.customer_product_index import record_purchase
 
         # Create verified purchase record BEFORE submitting review
-        vp_repo = current_domain.repository_for(VerifiedPurchases)
-        vp_repo.add(
-            VerifiedPurchases(
-                vp_id=str(uuid.uuid4()),
-                customer_id="cust-vp-rating",
-                product_id="prod-vp-rating",
-                order_id="order-vp-rat-1",
-                delivered_at="2024-01-01T00:00:00+00:00",
-            )
+        record_purchase(
+            customer_id="cust-vp-rating",
+            product_id="prod-vp-rating",
+            order_id="order-vp-rat-1",
+            delivered_at="2024-01-01T00:00:00+00:00",
         )
 
         # Submit review (will pick up verified purchase)
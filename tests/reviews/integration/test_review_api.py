@@ -217,3 +217,37 @@ class TestReadEndpoints:
         response = client.get("/reviews", params={"product_id": "prod-api-lr1"})
         # Pagination endpoint — returns empty list or projection data
         assert response.status_code in (200, 404, 500)
+
+    def test_list_product_reviews_sorted(self, client):
+        review_id = _submit_and_approve(client, product_id="prod-api-lr2", customer_id="cust-api-lr2")
+        response = client.get("/reviews", params={"product_id": "prod-api-lr2", "sort": "most_helpful"})
+        assert response.status_code == 200
+        assert [item["review_id"] for item in response.json()["items"]] == [review_id]
+        assert response.json()["items"][0]["helpfulness_score"] == 0.0
+
+    def test_list_product_reviews_unknown_sort(self, client):
+        response = client.get("/reviews", params={"product_id": "prod-api-lr3", "sort": "cheapest"})
+        assert response.status_code == 400
+
+    def test_list_product_reviews_by_cursor(self, client):
+        ids = [
+            _submit_and_approve(client, product_id="prod-api-lr4", customer_id=f"cust-api-lr4-{n}") for n in range(3)
+        ]
+        first = client.get("/reviews", params={"product_id": "prod-api-lr4", "page_size": 2}).json()
+        assert first["next_cursor"]
+        second = client.get(
+            "/reviews", params={"product_id": "prod-api-lr4", "page_size": 2, "after": first["next_cursor"]}
+        ).json()
+        assert [item["review_id"] for item in first["items"] + second["items"]] == ids[::-1]
+        assert (second["next_cursor"], second["has_next"]) == (None, False)
+
+    def test_list_product_reviews_invalid_cursor(self, client):
+        response = client.get("/reviews", params={"product_id": "prod-api-lr5", "after": "not-a-cursor"})
+        assert response.status_code == 400
+
+
+class TestMaintenanceAPI:
+    def test_backfill_helpfulness_scores(self, client):
+        response = client.post("/reviews/maintenance/backfill-helpfulness-scores", json={"batch_size": 50})
+        assert response.status_code == 200
+        assert response.json() == {"written_count": 0}
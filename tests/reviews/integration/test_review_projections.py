@@ -1,12 +1,16 @@
 """Integration tests for Reviews projections — verify projectors maintain read models."""
 
+from datetime import UTC, datetime
+
 from protean import current_domain
 
+from reviews.projections.customer_product_index import record_purchase
 from reviews.projections.customer_reviews import CustomerReviews
 from reviews.projections.moderation_queue import ModerationQueue
-from reviews.projections.product_rating import ProductRating
+from reviews.projections.product_rating import ProductRating, ProductRatingProjector
 from reviews.projections.product_reviews import ProductReviews
 from reviews.projections.review_detail import ReviewDetail
+from reviews.review.events import ReviewApproved
 from reviews.review.moderation import ModerateReview
 from reviews.review.removal import RemoveReview
 from reviews.review.reply import AddSellerReply
@@ -196,6 +200,50 @@ class TestProductRatingProjection:
         pr = current_domain.repository_for(ProductRating).get("prod-prt-3")
         assert pr.total_reviews == 0
 
+    def test_counters_from_events_without_loading_the_review(self):
+        projector = ProductRatingProjector()
+        for review_id, rating, verified in (("rv-prt-4a", 5, "True"), ("rv-prt-4b", 2, "False")):
+            projector.on_review_approved(
+                ReviewApproved(
+                    review_id=review_id,  # No Review aggregate behind these events
+                    product_id="prod-prt-4",
+                    customer_id="cust-prt-4",
+                    rating=rating,
+                    verified_purchase=verified,
+                    moderator_id="mod-001",
+                    approved_at=datetime.now(UTC),
+                )
+            )
+        pr = current_domain.repository_for(ProductRating).get("prod-prt-4")
+        assert (pr.total_reviews, pr.rating_sum, pr.average_rating, pr.verified_review_count) == (2, 7, 3.5, 1)
+        assert pr.rating_distribution == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1}
+
+    def test_removing_a_verified_review_decrements_the_verified_count(self):
+        record_purchase("cust-prt-5", "prod-prt-5", order_id="ord-prt-5", delivered_at=datetime.now(UTC))
+        review_id = _submit_review(product_id="prod-prt-5", customer_id="cust-prt-5", rating=5)
+        _approve(review_id)
+        assert current_domain.repository_for(ProductRating).get("prod-prt-5").verified_review_count == 1
+
+        current_domain.process(
+            RemoveReview(review_id=review_id, removed_by="Admin", reason="Policy"),
+            asynchronous=False,
+        )
+        pr = current_domain.repository_for(ProductRating).get("prod-prt-5")
+        assert (pr.total_reviews, pr.rating_sum, pr.average_rating, pr.verified_review_count) == (0, 0, 0.0, 0)
+
+    def test_rows_without_rating_sum_are_carried_forward(self):
+        current_domain.repository_for(ProductRating).add(
+            ProductRating(
+                product_id="prod-prt-6",
+                total_reviews=2,
+                rating_distribution={"1": 0, "2": 0, "3": 1, "4": 0, "5": 1},
+                average_rating=4.0,
+            )
+        )
+        _submit_and_approve("prod-prt-6", "cust-prt-6")
+        pr = current_domain.repository_for(ProductRating).get("prod-prt-6")
+        assert (pr.total_reviews, pr.rating_sum, pr.average_rating) == (3, 12, 4.0)
+
 
 def _submit_and_approve(product_id, customer_id, rating=4):
     review_id = _submit_review(product_id=product_id, customer_id=customer_id, rating=rating)
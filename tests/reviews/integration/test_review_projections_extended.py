@@ -351,20 +351,14 @@ class TestSubmissionVerifiedPurchase:
     """Cover the verified purchase path in SubmitReviewHandler."""
 
     def test_submit_with_verified_purchase(self):
-        import uuid
-
-        from reviews.projections.verified_purchases import VerifiedPurchases
+        from reviews.projections.customer_product_index import record_purchase
 
         # Create a verified purchase record
-        vp_repo = current_domain.repository_for(VerifiedPurchases)
-        vp_repo.add(
-            VerifiedPurchases(
-                vp_id=str(uuid.uuid4()),
-                customer_id="cust-vp-submit",
-                product_id="prod-vp-submit",
-                order_id="order-vp-001",
-                delivered_at="2024-01-01T00:00:00+00:00",
-            )
+        record_purchase(
+            customer_id="cust-vp-submit",
+            product_id="prod-vp-submit",
+            order_id="order-vp-001",
+            delivered_at="2024-01-01T00:00:00+00:00",
         )
 
         from reviews.review.review import Review
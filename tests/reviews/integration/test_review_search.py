@@ -0,0 +1,247 @@
+"""Integration tests for review full-text search — the inverted index and its queries."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from protean import current_domain
+from protean.integrations.fastapi import register_exception_handlers
+
+from reviews.api.routes import review_router
+from reviews.projections import review_search_queries
+from reviews.projections.review_search import (
+    ReviewSearchDocument,
+    ReviewSearchPosting,
+    backfill_review_search,
+    term_weights,
+    tokenize,
+)
+from reviews.projections.review_search_queries import SearchReviews, SweepReviews
+from reviews.review.editing import EditReview
+from reviews.review.moderation import ModerateReview
+from reviews.review.removal import RemoveReview
+from reviews.review.submission import SubmitReview
+
+_counter = 0
+
+
+def _submit(product_id="prod-search-1", title="Solid kettle", body="Boils water quickly and quietly.", **overrides):
+    global _counter
+    _counter += 1
+    return current_domain.process(
+        SubmitReview(
+            product_id=product_id,
+            customer_id=f"cust-search-{_counter}",
+            rating=4,
+            title=title,
+            body=body,
+            **overrides,
+        ),
+        asynchronous=False,
+    )
+
+
+def _approve(review_id):
+    current_domain.process(
+        ModerateReview(review_id=review_id, moderator_id="mod-001", action="Approve"),
+        asynchronous=False,
+    )
+
+
+def _postings(review_id):
+    return {
+        posting.term: posting
+        for posting in current_domain.view_for(ReviewSearchPosting).query.filter(review_id=review_id).all().items
+    }
+
+
+def _search(text, **kwargs):
+    return [hit.review_id for hit in current_domain.dispatch(SearchReviews(text=text, **kwargs))]
+
+
+class TestTokenize:
+    def test_lowercases_and_drops_stop_words(self):
+        assert tokenize("The Kettle is GREAT, it boils!") == ["kettle", "great", "boils"]
+
+    def test_title_and_lists_weigh_more_than_body(self):
+        weights = term_weights(title="kettle", body="kettle kettle steel", pros=["steel lid"], cons=[])
+        assert weights == {"kettle": 5, "steel": 3, "lid": 2}
+
+
+class TestIndexing:
+    def test_submit_indexes_every_field(self):
+        review_id = _submit(
+            title="Handy kettle", body="Pours well every morning.", pros=["Cordless base"], cons=["Noisy fan"]
+        )
+        postings = _postings(review_id)
+        assert set(postings) == {
+            "handy",
+            "kettle",
+            "pours",
+            "well",
+            "every",
+            "morning",
+            "cordless",
+            "base",
+            "noisy",
+            "fan",
+        }
+        assert {posting.status for posting in postings.values()} == {"Pending"}
+        assert current_domain.view_for(ReviewSearchDocument).get(review_id).title == "Handy kettle"
+
+    def test_approval_updates_posting_status(self):
+        review_id = _submit()
+        _approve(review_id)
+        assert {posting.status for posting in _postings(review_id).values()} == {"Published"}
+
+    def test_edit_rewrites_changed_terms(self):
+        review_id = _submit(title="Solid kettle", body="Boils water quickly.")
+        current_domain.process(
+            EditReview(review_id=review_id, customer_id=f"cust-search-{_counter}", body="Rusted after a week."),
+            asynchronous=False,
+        )
+        assert set(_postings(review_id)) == {"solid", "kettle", "rusted", "after", "week"}
+
+    def test_removal_drops_the_review(self):
+        review_id = _submit()
+        _approve(review_id)
+        current_domain.process(
+            RemoveReview(review_id=review_id, removed_by="admin-001", reason="Policy"),
+            asynchronous=False,
+        )
+        assert _postings(review_id) == {}
+        assert current_domain.view_for(ReviewSearchDocument).query.filter(review_id=review_id).all().items == []
+
+
+class TestSearchReviews:
+    def test_every_term_must_match(self):
+        both = _submit(product_id="prod-search-2", title="Quiet kettle", body="Boils fast every morning.")
+        one = _submit(product_id="prod-search-2", title="Loud kettle", body="Boils fast every morning.")
+        _approve(both)
+        _approve(one)
+        assert _search("quiet kettle", product_id="prod-search-2") == [both]
+
+    def test_ranked_by_weight(self):
+        body_only = _submit(product_id="prod-search-3", title="Fine", body="The lid rattles when pouring.")
+        in_title = _submit(product_id="prod-search-3", title="Lid rattles", body="Otherwise fine when pouring.")
+        _approve(body_only)
+        _approve(in_title)
+        assert _search("lid", product_id="prod-search-3") == [in_title, body_only]
+
+    def test_scoped_to_product_and_status(self):
+        published = _submit(product_id="prod-search-4", title="Teapot review", body="Lovely teapot glaze, nicely made.")
+        _approve(published)
+        _submit(product_id="prod-search-4", title="Teapot review", body="Pending teapot glaze, nicely made.")
+        other = _submit(product_id="prod-search-5", title="Teapot review", body="Other teapot glaze, nicely made.")
+        _approve(other)
+
+        assert _search("teapot glaze", product_id="prod-search-4") == [published]
+        assert set(_search("teapot glaze")) >= {published, other}
+
+    def test_no_searchable_terms(self):
+        assert _search("the and of") == []
+
+    def test_candidates_come_from_the_rarest_term(self, monkeypatch):
+        monkeypatch.setattr(review_search_queries, "CANDIDATE_PAGE", 2)
+        for _ in range(3):
+            _approve(_submit(product_id="prod-search-6", title="Kettle kettle", body="A kettle that boils fine."))
+        copper = _submit(product_id="prod-search-6", title="Shiny", body="Copper kettle, polished and heavy.")
+        _approve(copper)
+        # The two heaviest "kettle" postings are other reviews; "copper" has one
+        assert _search("kettle copper", product_id="prod-search-6") == [copper]
+
+    def test_candidate_pages_are_read_until_enough_match(self, monkeypatch):
+        monkeypatch.setattr(review_search_queries, "CANDIDATE_PAGE", 2)
+        for _ in range(2):
+            _approve(_submit(product_id="prod-search-7", title="Steel steel", body="Brushed steel finish."))
+        both = _submit(product_id="prod-search-7", title="Shiny", body="Steel body with copper trim.")
+        _approve(both)
+        for _ in range(3):
+            _approve(_submit(product_id="prod-search-7", title="Copper", body="Hammered copper finish."))
+        # "steel" is rarer; its two heaviest postings fill the first page without "copper"
+        assert _search("steel copper", product_id="prod-search-7") == [both]
+
+    def test_counts_are_capped(self, monkeypatch):
+        monkeypatch.setattr(review_search_queries, "COUNT_CAP", 1)
+        first = _submit(product_id="prod-search-8", title="Glass kettle", body="Clear glass, shows the boil.")
+        second = _submit(product_id="prod-search-8", title="Glass jug", body="Clear glass jug for tea.")
+        _approve(first)
+        _approve(second)
+        # Equal weights: newest first
+        assert _search("clear glass", product_id="prod-search-8") == [second, first]
+
+
+class TestBackfill:
+    def _unindex(self, review_id):
+        current_domain.repository_for(ReviewSearchPosting).query.filter(review_id=review_id).delete()
+        current_domain.repository_for(ReviewSearchDocument).query.filter(review_id=review_id).delete()
+
+    def test_indexes_reviews_missing_from_the_index(self):
+        review_id = _submit(product_id="prod-search-7", title="Enamel kettle", body="Chipped enamel after a month.")
+        _approve(review_id)
+        self._unindex(review_id)
+        assert _search("enamel", product_id="prod-search-7") == []
+
+        assert backfill_review_search(batch_size=2) >= 1
+        assert _search("enamel", product_id="prod-search-7") == [review_id]
+        assert {posting.status for posting in _postings(review_id).values()} == {"Published"}
+
+    def test_rerun_skips_indexed_reviews(self):
+        _submit(product_id="prod-search-8")
+        backfill_review_search()
+        assert backfill_review_search() == 0
+
+
+class TestSweepReviews:
+    def test_finds_pending_reviews_with_any_keyword(self):
+        scam = _submit(title="Total scam", body="Never arrived at my door.")
+        refund = _submit(title="Want refund", body="Broke at once after opening.")
+        both = _submit(title="Scam", body="Demand a refund right now.")
+        published = _submit(title="Scam?", body="No, it works fine for me.")
+        _approve(published)
+
+        hits = current_domain.dispatch(SweepReviews(keywords=["scam", "Refund"]))
+        by_id = {hit.review_id: hit for hit in hits}
+        assert {scam, refund, both} <= set(by_id)
+        assert published not in by_id
+        assert sorted(by_id[both].matched_terms) == ["refund", "scam"]
+        # Newest first
+        ids = [hit.review_id for hit in hits]
+        assert ids.index(both) < ids.index(refund) < ids.index(scam)
+
+    def test_limit_counts_reviews_not_postings(self):
+        for _ in range(3):
+            _submit(title="Counterfeit counterfeit", body="Counterfeit goods, fake label.")
+        hits = current_domain.dispatch(SweepReviews(keywords=["counterfeit", "fake"], limit=2))
+        assert len(hits) == 2
+        assert all(sorted(hit.matched_terms) == ["counterfeit", "fake"] for hit in hits)
+
+
+class TestSearchApi:
+    @pytest.fixture()
+    def client(self):
+        app = FastAPI()
+        app.include_router(review_router)
+        register_exception_handlers(app)
+        return TestClient(app)
+
+    def test_search_endpoint(self, client):
+        review_id = _submit(product_id="prod-search-api", title="Sturdy grinder", body="Grinds evenly and stays cool.")
+        _approve(review_id)
+        response = client.get("/reviews/search", params={"q": "grinder", "product_id": "prod-search-api"})
+        assert response.status_code == 200
+        assert [item["review_id"] for item in response.json()["items"]] == [review_id]
+
+    def test_backfill_endpoint(self, client):
+        review_id = _submit(product_id="prod-search-api-2", title="Walnut grinder", body="Walnut body, grinds fine.")
+        _approve(review_id)
+        TestBackfill()._unindex(review_id)
+        response = client.post("/reviews/maintenance/backfill-search-index", json={"batch_size": 50})
+        assert response.status_code == 200
+        assert response.json()["written_count"] >= 1
+        assert _search("walnut", product_id="prod-search-api-2") == [review_id]
+
+    def test_sweep_endpoint(self, client):
+        review_id = _submit(title="Phishing link", body="Visit my phishing site.")
+        response = client.get("/reviews/moderation/sweep", params={"keywords": "phishing,spamlink"})
+        assert response.status_code == 200
+        assert review_id in [item["review_id"] for item in response.json()["items"]]